@@ -6,6 +6,7 @@ to provide proper Google ADK implementation for insurance customer service.
 """
 
 import os
+import sys
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 
@@ -24,28 +25,55 @@ openrouter_model = f"openrouter/{model_name}"
 print(f"🔧 Customer Service Agent: Using model {openrouter_model} with OpenRouter")
 print(f"🔑 Customer Service Agent: API key configured: {bool(openrouter_api_key)}")
 
-# Initialize monitoring if available
-try:
-    from monitoring.setup.monitoring_setup import MonitoringManager
-    monitoring = MonitoringManager()
-    monitoring_enabled = monitoring.is_monitoring_enabled()
-    if monitoring_enabled:
-        print("✅ Customer Service Agent: Monitoring enabled")
-    else:
-        print("ℹ️  Customer Service Agent: Monitoring disabled")
-except ImportError:
-    monitoring = None
-    monitoring_enabled = False
-    print("ℹ️  Customer Service Agent: Monitoring not available")
+# Monitoring providers are built on first use rather than at import
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'tools'))
+from startup_tools import create_lazy_monitoring, create_policy_server_check, create_request_timing_callbacks
+from context_compaction import create_compaction_callback
+from intent_router import create_intent_router_callback
+from model_pipeline import chain_after_model, chain_before_model
+from model_router import create_routed_model
+from response_cache import create_response_cache_callbacks
+
+# Policy server reachability (used by the intent fast path) is checked in the
+# background and reported through the monitoring health checker
+policy_server_check = create_policy_server_check("insurance_customer_service")
+_monitoring = create_lazy_monitoring("Customer Service Agent", health_checks=[policy_server_check])
+before_agent_timing, after_agent_timing = create_request_timing_callbacks(
+    "insurance_customer_service", monitoring=_monitoring.get
+)
+
+# Repeated questions are answered from cache without calling the model
+if os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true":
+    cache_lookup, cache_store = create_response_cache_callbacks(
+        "insurance_customer_service", monitoring=_monitoring.get
+    )
+else:
+    cache_lookup = cache_store = None
+
+# Simple policy lookups are answered straight from the policy server
+intent_fast_path = None
+if os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true":
+    intent_fast_path = create_intent_router_callback("insurance_customer_service", monitoring=_monitoring.get)
+
+
+def openrouter_llm(model: str) -> LiteLlm:
+    """LiteLLM OpenRouter model per official docs"""
+    return LiteLlm(model=model, api_key=openrouter_api_key, api_base="https://openrouter.ai/api/v1")
+
+
+# Route each request to the cheapest models.yaml tier that can handle it
+if os.getenv("MODEL_ROUTING_ENABLED", "false").lower() == "true":
+    customer_service_model = create_routed_model(
+        "domain_agent", openrouter_llm, "insurance_customer_service", monitoring=_monitoring.get,
+        primary_model=f"openrouter/{model_name}" if os.getenv("PRIMARY_MODEL") else None
+    )
+else:
+    customer_service_model = openrouter_llm(openrouter_model)  # "openrouter/openai/gpt-4o-mini"
 
 # Create the insurance customer service agent using LiteLLM OpenRouter per official docs
 root_agent = LlmAgent(
     name="insurance_customer_service", 
-    model=LiteLlm(
-        model=openrouter_model,  # "openrouter/openai/gpt-4o-mini"
-        api_key=openrouter_api_key,
-        api_base="https://openrouter.ai/api/v1"
-    ),
+    model=customer_service_model,
     instruction=(
         "You are a helpful insurance customer service agent powered by OpenRouter. "
         "Assist customers with policy inquiries, claim status checks, "
@@ -55,6 +83,26 @@ root_agent = LlmAgent(
         "let the customer know you'll look that up for them."
     ),
     description="An insurance customer service agent that helps with policy and claim inquiries using OpenRouter models",
+    # Model-call pipeline: answer from cache or the rules fast path, else compact the conversation
+    before_model_callback=chain_before_model(
+        cache_lookup,
+        intent_fast_path,
+        create_compaction_callback("insurance_customer_service", monitoring=_monitoring.get)
+    ),
+    after_model_callback=chain_after_model(cache_store),
+    # Per-turn latency breakdown (llm, mcp, ...) into spans and histograms
+    before_agent_callback=before_agent_timing,
+    after_agent_callback=after_agent_timing,
     # Add tools here when needed - for now keeping it simple
     # tools=[policy_search_tool, claim_lookup_tool]
-) 
\ No newline at end of file
+)
+
+
+def __getattr__(name: str):
+    """Resolve lazily-initialized module attributes on first access."""
+    if name == "monitoring":
+        return _monitoring.get()
+    if name == "monitoring_enabled":
+        manager = _monitoring.get()
+        return bool(manager and manager.is_monitoring_enabled())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
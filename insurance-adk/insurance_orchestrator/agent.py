@@ -6,6 +6,7 @@ It follows Google ADK multi-agent patterns with LiteLLM + OpenRouter integration
 """
 
 import os
+import sys
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
 import litellm
@@ -26,28 +27,44 @@ litellm.set_debug = True
 print(f"🔧 Orchestrator Agent: Using model {model_name} with OpenRouter")
 print(f"🔑 Orchestrator Agent: API key configured: {bool(openrouter_api_key)}")
 
-# Initialize monitoring if available
-try:
-    from monitoring.setup.monitoring_setup import MonitoringManager
-    monitoring = MonitoringManager()
-    monitoring_enabled = monitoring.is_monitoring_enabled()
-    if monitoring_enabled:
-        print("✅ Orchestrator Agent: Monitoring enabled")
-    else:
-        print("ℹ️  Orchestrator Agent: Monitoring disabled")
-except ImportError:
-    monitoring = None
-    monitoring_enabled = False
-    print("ℹ️  Orchestrator Agent: Monitoring not available")
-
-# Create LiteLLM model for orchestration
-orchestrator_model = LiteLlm(
-    model="openrouter/"+model_name,  # "openrouter/anthropic/claude-3-5-sonnet"
-    api_key=openrouter_api_key,
-    api_base="https://openrouter.ai/api/v1"
-   
+# Monitoring providers are built on first use rather than at import
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'tools'))
+from startup_tools import create_lazy_monitoring, create_policy_server_check, create_request_timing_callbacks
+from context_compaction import create_compaction_callback
+from intent_router import create_intent_router_callback
+from model_pipeline import chain_before_model
+from model_router import create_routed_model
+
+# Policy server reachability (used by the intent fast path) is checked in the
+# background and reported through the monitoring health checker
+policy_server_check = create_policy_server_check("insurance_orchestrator")
+_monitoring = create_lazy_monitoring("Orchestrator Agent", health_checks=[policy_server_check])
+before_agent_timing, after_agent_timing = create_request_timing_callbacks(
+    "insurance_orchestrator", monitoring=_monitoring.get
 )
 
+# Simple policy lookups are answered straight from the policy server;
+# only ambiguous requests reach the orchestrator LLM
+intent_fast_path = None
+if os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true":
+    intent_fast_path = create_intent_router_callback("insurance_orchestrator", monitoring=_monitoring.get)
+
+
+def openrouter_llm(model: str) -> LiteLlm:
+    """LiteLLM model served through OpenRouter"""
+    return LiteLlm(model=model, api_key=openrouter_api_key, api_base="https://openrouter.ai/api/v1")
+
+
+# Create LiteLLM model for orchestration; with routing enabled, simple requests
+# go to the cheapest models.yaml tier and only hard ones to the strong model
+if os.getenv("MODEL_ROUTING_ENABLED", "false").lower() == "true":
+    orchestrator_model = create_routed_model(
+        "orchestrator", openrouter_llm, "insurance_orchestrator", monitoring=_monitoring.get,
+        primary_model=f"openrouter/{model_name}" if os.getenv("PRIMARY_MODEL") else None
+    )
+else:
+    orchestrator_model = openrouter_llm("openrouter/" + model_name)  # "openrouter/anthropic/claude-3-5-sonnet"
+
 # Create the insurance orchestrator agent
 root_agent = LlmAgent(
     name="insurance_orchestrator",
@@ -62,6 +79,24 @@ root_agent = LlmAgent(
         "Always provide coordinated, coherent responses that combine insights from all relevant agents."
     ),
     description="Orchestrator agent that coordinates multi-agent workflows for comprehensive insurance services using OpenRouter models",
+    # Model-call pipeline: rules fast path, else compact long conversations for the LLM
+    before_model_callback=chain_before_model(
+        intent_fast_path,
+        create_compaction_callback("insurance_orchestrator", monitoring=_monitoring.get)
+    ),
+    # Per-turn latency breakdown (llm, mcp, ...) into spans and histograms
+    before_agent_callback=before_agent_timing,
+    after_agent_callback=after_agent_timing,
     # Sub-agents will be configured at the application layer through API calls
     # tools=[agent_communication_tool, workflow_management_tool]
-) 
\ No newline at end of file
+)
+
+
+def __getattr__(name: str):
+    """Resolve lazily-initialized module attributes on first access."""
+    if name == "monitoring":
+        return _monitoring.get()
+    if name == "monitoring_enabled":
+        manager = _monitoring.get()
+        return bool(manager and manager.is_monitoring_enabled())
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,16 @@
 """
-Insurance Technical Agent - Google ADK v1.2.1 with Native MCP Integration
+Insurance Technical Agent - Google ADK v1.2.1 with MCP Integration
 
-This agent uses ADK's built-in MCPToolset for automatic MCP tool discovery
-and registration, eliminating the need for manual tool wrappers.
+Policy server tools are discovered over streamable HTTP and exposed as ADK
+function tools; each call carries the agent turn's trace context in MCP `_meta`.
 """
 
 import os
+import sys
 import logging
 from typing import Dict, Any, List
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,42 +32,66 @@ openrouter_model = f"openrouter/{model_name}"
 print(f"🔧 Technical Agent: Using model {openrouter_model} with OpenRouter")
 print(f"🔑 Technical Agent: API key configured: {bool(openrouter_api_key)}")
 
-# Create LiteLLM model for technical operations
-technical_model = LiteLlm(
-    model=openrouter_model,  # "openrouter/openai/gpt-4o-mini"
-    api_key=openrouter_api_key,
-    api_base="https://openrouter.ai/api/v1"
+# Lazy startup helpers shared by the agent modules
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'tools'))
+from startup_tools import (
+    LazyToolset, create_lazy_monitoring, create_policy_server_check, create_request_timing_callbacks,
+    lazy_instruction, policy_server_reachable
 )
+from context_compaction import create_compaction_callback
+from model_pipeline import chain_before_model
+from model_router import create_routed_model
+from intent_router import PolicyToolClient
+from policy_toolset import PolicyToolset
 
-# Initialize monitoring if available
-try:
-    from monitoring.setup.monitoring_setup import MonitoringManager
-    monitoring = MonitoringManager()
-    monitoring_enabled = monitoring.is_monitoring_enabled()
-    if monitoring_enabled:
-        logger.info("✅ Technical Agent: Monitoring enabled")
-    else:
-        logger.info("ℹ️  Technical Agent: Monitoring disabled")
-except ImportError:
-    monitoring = None
-    monitoring_enabled = False
-    logger.info("ℹ️  Technical Agent: Monitoring not available")
-
-# Use ADK's native MCP integration for automatic tool discovery
+
+# Add MCP connection validation
+def validate_mcp_connection():
+    """Validate MCP connection to policy server."""
+    try:
+        # Test basic connectivity (the policy server has no /health route; any
+        # non-5xx answer from the MCP endpoint means it is up)
+        if policy_server_reachable(policy_server_url):
+            logger.info("✅ Technical Agent: Policy server health check passed")
+            return True
+        else:
+            logger.warning("⚠️  Technical Agent: Policy server health check failed")
+            return False
+    except Exception as e:
+        logger.warning(f"⚠️  Technical Agent: Policy server connectivity issue: {e}")
+        return False
+
+# Validate connection in the background so import never blocks on the network;
+# the result is reported through the monitoring health checker
+mcp_connection_check = create_policy_server_check("insurance_technical_agent", validate_mcp_connection)
+
+# Monitoring providers (Prometheus, Langfuse) are built on first use, not at import
+_monitoring = create_lazy_monitoring("Technical Agent", health_checks=[mcp_connection_check])
+before_agent_timing, after_agent_timing = create_request_timing_callbacks(
+    "insurance_technical_agent", monitoring=_monitoring.get
+)
+
+
+def openrouter_llm(model: str) -> LiteLlm:
+    """LiteLLM model served through OpenRouter"""
+    return LiteLlm(model=model, api_key=openrouter_api_key, api_base="https://openrouter.ai/api/v1")
+
+
+# Create LiteLLM model for technical operations, routed across models.yaml tiers
+if os.getenv("MODEL_ROUTING_ENABLED", "false").lower() == "true":
+    technical_model = create_routed_model(
+        "technical_agent", openrouter_llm, "insurance_technical_agent", monitoring=_monitoring.get,
+        primary_model=f"openrouter/{model_name}" if os.getenv("PRIMARY_MODEL") else None
+    )
+else:
+    technical_model = openrouter_llm(openrouter_model)  # "openrouter/openai/gpt-4o-mini"
+
+# Discover the policy server's MCP tools over streamable HTTP
 def create_mcp_tools():
-    """Create MCP toolset using ADK's native capabilities."""
+    """Create the policy MCP toolset; calls propagate the turn's trace context."""
     try:
-        # ADK automatically discovers and registers all MCP tools
-        mcp_toolset = MCPToolset(
-            connection_params=StdioServerParameters(
-                command='python',
-                args=['../policy_server/main.py']  # Path to policy server
-            ),
-            # Optional: Filter specific tools if needed
-            tool_filter=['policy_lookup', 'claims_data', 'coverage_analysis']
-        )
-        
-        logger.info("✅ Technical Agent: ADK MCPToolset created - tools will be auto-discovered")
+        mcp_toolset = PolicyToolset(PolicyToolClient(policy_server_url))
+        logger.info("✅ Technical Agent: Policy MCP toolset created - tools will be auto-discovered")
         return [mcp_toolset]
         
     except Exception as e:
@@ -78,10 +102,6 @@ def create_mcp_tools():
 def load_session_tool():
     """Load local session management tool."""
     try:
-        import sys
-        import os
-        sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'tools'))
-        
         from session_tools import session_management_tool
         return session_management_tool
         
@@ -89,13 +109,19 @@ def load_session_tool():
         logger.warning(f"Could not load session tool: {e}")
         return None
 
-# Create tools list combining MCP and local tools
-tools = create_mcp_tools()
+def create_mcp_toolset():
+    """Build the MCP toolset; called by LazyToolset on first tool discovery."""
+    toolsets = create_mcp_tools()
+    return toolsets[0] if toolsets else None
+
+# Create tools list combining MCP and local tools.
+# The MCP toolset is only constructed when ADK first discovers tools.
+tools = [LazyToolset(create_mcp_toolset, name="policy MCP toolset")]
 session_tool = load_session_tool()
 if session_tool:
     tools.append(session_tool)
 
-logger.info(f"✅ Technical Agent: Initialized with {len(tools)} tool(s)")
+logger.info(f"✅ Technical Agent: Registered {len(tools)} tool source(s)")
 
 # Load prompt configuration
 def load_prompts():
@@ -149,37 +175,33 @@ def get_default_prompt():
 root_agent = LlmAgent(
     name="insurance_technical_agent",
     model=technical_model,
-    instruction=load_prompts(),
+    instruction=lazy_instruction(load_prompts),  # Prompt YAML read on first turn
     description=(
         "Technical agent for complex insurance operations, policy analysis, and backend processing "
         "using OpenRouter models with MCP policy server integration"
     ),
-    tools=tools  # MCP tools for policy server access
+    tools=tools,  # MCP tools for policy server access
+    # Model-call pipeline: compact long conversations and repeated tool results
+    before_model_callback=chain_before_model(
+        create_compaction_callback("insurance_technical_agent", monitoring=_monitoring.get)
+    ),
+    # Per-turn latency breakdown (llm, mcp, ...) into spans and histograms
+    before_agent_callback=before_agent_timing,
+    after_agent_callback=after_agent_timing
 )
 
-# Add MCP connection validation
-def validate_mcp_connection():
-    """Validate MCP connection to policy server."""
-    try:
-        # Test basic connectivity
-        import requests
-        response = requests.get(f"{policy_server_url}/health", timeout=5)
-        if response.status_code == 200:
-            logger.info("✅ Technical Agent: Policy server health check passed")
-            return True
-        else:
-            logger.warning(f"⚠️  Technical Agent: Policy server health check failed with status {response.status_code}")
-            return False
-    except Exception as e:
-        logger.warning(f"⚠️  Technical Agent: Policy server connectivity issue: {e}")
-        return False
 
-# Validate connection on startup
-mcp_connected = validate_mcp_connection()
-if mcp_connected:
-    logger.info("🔗 Technical Agent: MCP integration ready")
-else:
-    logger.warning("⚠️  Technical Agent: Operating without MCP connectivity")
+def __getattr__(name: str) -> Any:
+    """Resolve lazily-initialized module attributes on first access."""
+    if name == "monitoring":
+        return _monitoring.get()
+    if name == "monitoring_enabled":
+        manager = _monitoring.get()
+        return bool(manager and manager.is_monitoring_enabled())
+    if name == "mcp_connected":
+        return mcp_connection_check.healthy
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Export agent configuration
 __all__ = ['root_agent', 'validate_mcp_connection', 'mcp_connected'] 
\ No newline at end of file
@@ -0,0 +1,278 @@
+"""
+Conversation Context Compaction
+Caps the prompt sent to the LLM for long insurance conversations
+
+- the last `keep_last_turns` turns are sent verbatim
+- older turns are folded into a rolling summary, refreshed incrementally and
+  only once the prompt crosses `summary_trigger_tokens`; the ADK callback
+  appends it to the system instruction so user/model turns still alternate
+- repeated MCP tool results are sent once; earlier copies become stubs
+- prompt tokens before and after compaction are exported via monitoring
+
+Summary state lives in the ADK session state, so it survives restarts and is
+shared by replicas that share a session service.
+"""
+import hashlib
+import logging
+import os
+import re
+from dataclasses import dataclass, replace
+from typing import Any, Callable, List, MutableMapping, Optional
+
+try:
+    from model_pipeline import content_text, estimate_tokens, genai_types, is_user_message
+except ImportError:  # imported as tools.context_compaction
+    from tools.model_pipeline import content_text, estimate_tokens, genai_types, is_user_message
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_STATE_KEY = "context_compaction:summary"
+SUMMARIZED_TURNS_STATE_KEY = "context_compaction:summarized_turns"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+DUPLICATE_NOTE = "[Same result as a later {tool} call - omitted]"
+
+
+@dataclass
+class ContextItem:
+    """One message in the prompt, independent of the LLM framework"""
+    role: str  # "user", "model" or "tool"
+    text: str
+    tool_name: Optional[str] = None
+    tool_fingerprint: Optional[str] = None
+    starts_turn: bool = False
+    deduplicated: bool = False
+    original: Any = None
+
+
+@dataclass
+class CompactionResult:
+    """Compacted prompt plus what was done to it"""
+    items: List[ContextItem]
+    tokens_before: int
+    tokens_after: int
+    summary: Optional[str] = None  # rolling summary (with SUMMARY_PREFIX) standing in for older turns
+    summary_refreshed: bool = False
+    summarized_turns: int = 0
+    deduplicated: int = 0
+
+
+def extractive_summarizer(max_line_chars: int = 160) -> Callable[[str, List[ContextItem]], str]:
+    """
+    Offline summarizer: one line per message, appended to the previous summary.
+
+    Swap in an LLM-backed summarizer with the same signature for abstractive
+    summaries.
+    """
+
+    def summarize(previous: str, items: List[ContextItem]) -> str:
+        lines = [previous] if previous else []
+        for item in items:
+            text = re.sub(r"\s+", " ", item.text).strip()
+            if item.role == "tool":
+                lines.append(f"- Looked up {item.tool_name or 'policy data'}")
+            elif text:
+                speaker = "Customer" if item.role == "user" else "Agent"
+                lines.append(f"- {speaker}: {text[:max_line_chars]}")
+        return "\n".join(lines)
+
+    return summarize
+
+
+class ContextCompactor:
+    """Applies the keep-recent / rolling-summary / dedupe policy to a prompt"""
+
+    def __init__(
+        self,
+        keep_last_turns: int = 6,
+        summary_trigger_tokens: int = 3000,
+        summary_max_tokens: int = 600,
+        summarizer: Optional[Callable[[str, List[ContextItem]], str]] = None,
+        token_counter: Callable[[str], int] = estimate_tokens
+    ):
+        self.keep_last_turns = keep_last_turns
+        self.summary_trigger_tokens = summary_trigger_tokens
+        self.summary_max_tokens = summary_max_tokens
+        self.summarizer = summarizer or extractive_summarizer()
+        self.count_tokens = token_counter
+
+    @classmethod
+    def from_env(cls) -> "ContextCompactor":
+        """Build from CONTEXT_* environment variables"""
+        return cls(
+            keep_last_turns=int(os.getenv("CONTEXT_KEEP_LAST_TURNS", "6")),
+            summary_trigger_tokens=int(os.getenv("CONTEXT_SUMMARY_TRIGGER_TOKENS", "3000")),
+            summary_max_tokens=int(os.getenv("CONTEXT_SUMMARY_MAX_TOKENS", "600")),
+        )
+
+    def compact(self, items: List[ContextItem], state: MutableMapping[str, Any]) -> CompactionResult:
+        """
+        Compact `items` (oldest first) using and updating summary `state`.
+
+        Turn indices are counted from the start of the conversation, so the
+        summary only ever absorbs turns it has not seen before.
+        """
+        tokens_before = self._tokens(items)
+        starts = [index for index, item in enumerate(items) if item.starts_turn]
+        older_turns = max(0, len(starts) - self.keep_last_turns)
+
+        summarized = min(state.get(SUMMARIZED_TURNS_STATE_KEY) or 0, older_turns)
+        summary = (state.get(SUMMARY_STATE_KEY) or "") if summarized else ""
+        if starts:
+            recent_start = starts[older_turns]
+            pending_start = starts[summarized] if summarized < older_turns else recent_start
+            preamble, pending, recent = items[:starts[0]], items[pending_start:recent_start], items[recent_start:]
+        else:
+            preamble, pending, recent = [], [], list(items)
+
+        refreshed = False
+        prompt_tokens = self.count_tokens(summary) + self._tokens(preamble + pending + recent)
+        if pending and prompt_tokens > self.summary_trigger_tokens:
+            summary = self._trim(self.summarizer(summary, pending))
+            summarized = older_turns
+            state[SUMMARY_STATE_KEY] = summary
+            state[SUMMARIZED_TURNS_STATE_KEY] = summarized
+            pending = []
+            refreshed = True
+
+        summary_text = SUMMARY_PREFIX + summary if summarized and summary else None
+        compacted, deduplicated = self._deduplicate_tool_results(preamble + pending + recent)
+
+        return CompactionResult(
+            items=compacted,
+            tokens_before=tokens_before,
+            tokens_after=self._tokens(compacted) + (self.count_tokens(summary_text) if summary_text else 0),
+            summary=summary_text,
+            summary_refreshed=refreshed,
+            summarized_turns=summarized,
+            deduplicated=deduplicated,
+        )
+
+    def _deduplicate_tool_results(self, items: List[ContextItem]):
+        """Keep the latest copy of each identical tool result"""
+        seen = set()
+        result = list(items)
+        deduplicated = 0
+        for index in range(len(result) - 1, -1, -1):
+            item = result[index]
+            if item.role != "tool" or not item.tool_fingerprint:
+                continue
+            if item.tool_fingerprint in seen:
+                result[index] = replace(
+                    item, text=DUPLICATE_NOTE.format(tool=item.tool_name or "tool"), deduplicated=True
+                )
+                deduplicated += 1
+            else:
+                seen.add(item.tool_fingerprint)
+        return result, deduplicated
+
+    def _trim(self, summary: str) -> str:
+        """Drop the oldest summary lines beyond summary_max_tokens"""
+        lines = summary.splitlines()
+        while len(lines) > 1 and self.count_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
+
+    def _tokens(self, items: List[ContextItem]) -> int:
+        return sum(self.count_tokens(item.text) for item in items)
+
+
+# ADK adapter
+
+def items_from_contents(contents: List[Any]) -> List[ContextItem]:
+    """Wrap ADK Content objects as ContextItems"""
+    items = []
+    for content in contents:
+        parts = getattr(content, "parts", None) or []
+        responses = [part.function_response for part in parts if getattr(part, "function_response", None) is not None]
+        text = content_text(content)
+        if responses:
+            items.append(ContextItem(
+                role="tool",
+                text=text,
+                tool_name=",".join(sorted({response.name for response in responses})),
+                tool_fingerprint=hashlib.sha256(text.encode()).hexdigest(),
+                original=content,
+            ))
+        else:
+            items.append(ContextItem(
+                role=getattr(content, "role", None) or "user",
+                text=text,
+                starts_turn=is_user_message(content),
+                original=content,
+            ))
+    return items
+
+
+def contents_from_items(items: List[ContextItem]) -> List[Any]:
+    """Turn ContextItems back into ADK Content, keeping originals untouched"""
+    contents = []
+    for item in items:
+        if item.original is not None and not item.deduplicated:
+            contents.append(item.original)
+        elif item.deduplicated:
+            # Keep the function_response parts so they still pair with their calls
+            parts = [
+                genai_types.Part(function_response=genai_types.FunctionResponse(
+                    id=part.function_response.id,
+                    name=part.function_response.name,
+                    response={"result": item.text},
+                )) if getattr(part, "function_response", None) is not None else part
+                for part in item.original.parts
+            ]
+            contents.append(genai_types.Content(role=item.original.role, parts=parts))
+        else:
+            contents.append(genai_types.Content(role=item.role, parts=[genai_types.Part(text=item.text)]))
+    return contents
+
+
+def append_system_instruction(llm_request: Any, text: str) -> None:
+    """Add `text` to the request's system instruction, after any agent instruction"""
+    if hasattr(llm_request, "append_instructions"):
+        llm_request.append_instructions([text])
+        return
+    config = llm_request.config
+    existing = getattr(config, "system_instruction", None)
+    config.system_instruction = f"{existing}\n\n{text}" if existing else text
+
+
+def create_compaction_callback(
+    agent_name: str,
+    compactor: Optional[ContextCompactor] = None,
+    monitoring: Optional[Callable[[], Any]] = None
+) -> Callable[[Any, Any], None]:
+    """
+    Build an ADK before_model_callback that compacts llm_request.contents.
+
+    The rolling summary goes into the system instruction rather than a
+    synthetic user message, which would sit next to the first kept user turn.
+
+    `monitoring` returns the MonitoringManager (or None) and is only called
+    when a turn is recorded.
+    """
+    compactor = compactor or ContextCompactor.from_env()
+
+    def compact_context(callback_context: Any, llm_request: Any) -> None:
+        try:
+            items = items_from_contents(llm_request.contents or [])
+            result = compactor.compact(items, callback_context.state)
+            llm_request.contents = contents_from_items(result.items)
+            if result.summary:
+                append_system_instruction(llm_request, result.summary)
+        except Exception as e:
+            logger.warning(f"Context compaction skipped for {agent_name}: {e}")
+            return None
+
+        if result.summary_refreshed:
+            logger.info(
+                f"{agent_name}: summarized {result.summarized_turns} turns "
+                f"({result.tokens_before} → {result.tokens_after} prompt tokens)"
+            )
+        manager = monitoring() if monitoring else None
+        if manager is not None and hasattr(manager, "record_prompt_tokens"):
+            manager.record_prompt_tokens(
+                agent_name, result.tokens_before, result.tokens_after,
+                result.summary_refreshed, result.deduplicated
+            )
+        return None
+
+    return compact_context
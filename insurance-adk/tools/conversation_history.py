@@ -0,0 +1,292 @@
+"""
+Conversation History Storage
+Bounded per-session windows with append-only compressed spill segments
+
+The session record keeps only the most recent turns. Once the window is
+`spill_batch` turns over `window_size`, the oldest `spill_batch` turns are
+written as one gzip'd JSON Lines segment and dropped from the record, so
+appends are amortized O(1), session records stay small (cheap to persist in
+any SessionStore), and the last k turns are read in O(k) while they fit in the
+window. Older turns are read back from segments newest-first.
+
+Segments live either in a spill directory (single replica: other processes
+cannot see it) or, when a SessionStore is given, in the session store itself
+under `<session_id>#history#<first_turn>` keys with their own TTL, so every
+replica sharing the store can read them and they expire with the session.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    from session_store import SessionStore
+except ImportError:  # imported as tools.conversation_history
+    from tools.session_store import SessionStore
+
+try:
+    from monitoring.setup.request_timing import phase
+except ImportError:  # monitoring not on the path - nullcontext("session_io") is a no-op
+    from contextlib import nullcontext as phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_SIZE = int(os.getenv("CONVERSATION_WINDOW_SIZE", "50"))
+DEFAULT_SPILL_BATCH = int(os.getenv("CONVERSATION_SPILL_BATCH", "50"))
+# Turns carry customer PII: the default directory is per user, and spill
+# directories and segments are created owner-only (0700 / 0600)
+DEFAULT_SPILL_DIR = os.getenv(
+    "CONVERSATION_SPILL_DIR",
+    os.path.join(tempfile.gettempdir(), f"insurance-adk-history-{getattr(os, 'getuid', lambda: 'user')()}")
+)
+
+HISTORY_KEY = "conversation_history"
+COUNT_KEY = "conversation_count"
+SEGMENTS_KEY = "conversation_segments"
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+class ConversationHistory:
+    """
+    Window + spill policy for the `conversation_history` list of a session.
+
+    With a `store`, segments are written through it and their first turn
+    indexes are kept in the session record under `conversation_segments`.
+    Otherwise they go to `spill_dir`, and with `spill_dir=None` turns that
+    leave the window are discarded.
+    """
+
+    def __init__(
+        self,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        spill_batch: int = DEFAULT_SPILL_BATCH,
+        spill_dir: Optional[str] = DEFAULT_SPILL_DIR,
+        store: Optional[SessionStore] = None,
+        segment_ttl_seconds: float = 24 * 3600
+    ):
+        if window_size < 1 or spill_batch < 1:
+            raise ValueError("window_size and spill_batch must be positive")
+        self.window_size = window_size
+        self.spill_batch = spill_batch
+        self.spill_dir = spill_dir or None
+        self._spill_dir_checked = False
+        self.store = store
+        self.segment_ttl_seconds = segment_ttl_seconds
+        self._lock = threading.Lock()
+        self._spilled_turns = 0
+        self._discarded_turns = 0
+
+    def append(self, session_id: str, session_data: Dict[str, Any], entry: Dict[str, Any]) -> int:
+        """Append a turn to the session record; returns the turn's index"""
+        window = session_data.setdefault(HISTORY_KEY, [])
+        count = session_data.get(COUNT_KEY, len(window))
+        window.append(entry)
+        session_data[COUNT_KEY] = count + 1
+
+        if len(window) >= self.window_size + self.spill_batch:
+            first_turn = session_data[COUNT_KEY] - len(window)
+            overflow = window[:self.spill_batch]
+            with phase("session_io"):
+                self._spill(session_id, session_data, first_turn, overflow)
+            del window[:self.spill_batch]
+        return count
+
+    def last(self, session_id: str, session_data: Dict[str, Any], k: int) -> List[Dict[str, Any]]:
+        """The most recent k turns, oldest first"""
+        if k <= 0:
+            return []
+        window = session_data.get(HISTORY_KEY, [])
+        if k <= len(window):
+            return window[-k:]
+
+        count = session_data.get(COUNT_KEY, len(window))
+        with phase("session_io"):
+            older = self._read_spilled(session_id, session_data, count - len(window), k - len(window))
+        return older + list(window)
+
+    def count(self, session_data: Dict[str, Any]) -> int:
+        """Total turns in the conversation, including spilled ones"""
+        return session_data.get(COUNT_KEY, len(session_data.get(HISTORY_KEY, [])))
+
+    def drop(self, session_id: str, session_data: Optional[Dict[str, Any]] = None) -> None:
+        """Delete spilled segments for a session"""
+        if self.store is not None:
+            for first_turn in (session_data or {}).get(SEGMENTS_KEY, []):
+                self.store.delete(self._segment_key(session_id, first_turn))
+        elif self.spill_dir:
+            shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+
+    def refresh(self, session_id: str, session_data: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        """Slide store-held segment deadlines along with their session"""
+        segments = session_data.get(SEGMENTS_KEY)
+        if self.store is None or not segments:
+            return
+        keys = [self._segment_key(session_id, first_turn) for first_turn in segments]
+        self.store.versions(keys, refresh_ttl=ttl_seconds or self.segment_ttl_seconds)
+
+    def prune(self, older_than_seconds: float) -> int:
+        """Delete spill directories untouched for `older_than_seconds`"""
+        # Store-held segments expire through their own TTL
+        if self.store is not None or not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return 0
+        cutoff = time.time() - older_than_seconds
+        removed = 0
+        for entry in os.scandir(self.spill_dir):
+            if entry.is_dir() and entry.stat().st_mtime < cutoff:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        return removed
+
+    def get_status(self) -> Dict[str, Any]:
+        """Window configuration and spill counters"""
+        return {
+            "window_size": self.window_size,
+            "spill_batch": self.spill_batch,
+            "spill_dir": None if self.store is not None else self.spill_dir,
+            "spill_backend": self.store.backend_name if self.store is not None else ("disk" if self.spill_dir else None),
+            "spilled_turns_total": self._spilled_turns,
+            "discarded_turns_total": self._discarded_turns,
+        }
+
+    def _spill(self, session_id: str, session_data: Dict[str, Any], first_turn: int,
+               entries: List[Dict[str, Any]]) -> None:
+        if self.store is not None:
+            self._spill_to_store(session_id, session_data, first_turn, entries)
+            return
+        if not self.spill_dir:
+            with self._lock:
+                self._discarded_turns += len(entries)
+            return
+        try:
+            if not self._spill_dir_checked:
+                _ensure_private_dir(self.spill_dir)
+                self._spill_dir_checked = True
+            directory = self._session_dir(session_id)
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            path = os.path.join(directory, f"{first_turn:010d}.jsonl.gz")
+            partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            os.replace(partial, path)
+            with self._lock:
+                self._spilled_turns += len(entries)
+        except OSError as e:
+            logger.warning(f"Failed to spill conversation history for {session_id}: {e}")
+            with self._lock:
+                self._discarded_turns += len(entries)
+
+    def _spill_to_store(self, session_id: str, session_data: Dict[str, Any], first_turn: int,
+                        entries: List[Dict[str, Any]]) -> None:
+        try:
+            self.store.put(
+                self._segment_key(session_id, first_turn),
+                {"turns": json.loads(json.dumps(entries, default=str))},
+                self.segment_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"Failed to spill conversation history for {session_id}: {e}")
+            with self._lock:
+                self._discarded_turns += len(entries)
+            return
+        session_data.setdefault(SEGMENTS_KEY, []).append(first_turn)
+        with self._lock:
+            self._spilled_turns += len(entries)
+
+    def _read_spilled(self, session_id: str, session_data: Dict[str, Any], before_turn: int,
+                      k: int) -> List[Dict[str, Any]]:
+        """Up to k turns preceding `before_turn`, oldest first"""
+        if before_turn <= 0:
+            return []
+        if self.store is not None:
+            return self._read_from_store(session_id, session_data, before_turn, k)
+        if not self.spill_dir:
+            return []
+        directory = self._session_dir(session_id)
+        try:
+            segments = sorted(
+                (int(name.split(".", 1)[0]), name)
+                for name in os.listdir(directory) if name.endswith(".jsonl.gz")
+            )
+        except (OSError, ValueError):
+            return []
+
+        collected: List[List[Dict[str, Any]]] = []
+        needed = k
+        for first_turn, name in reversed(segments):
+            if first_turn >= before_turn:
+                continue
+            try:
+                with gzip.open(os.path.join(directory, name), "rt", encoding="utf-8") as f:
+                    entries = [json.loads(line) for line in f]
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable history segment {name}: {e}")
+                continue
+            entries = entries[:max(0, before_turn - first_turn)]
+            collected.append(entries[-needed:])
+            needed -= len(collected[-1])
+            if needed <= 0:
+                break
+
+        return [entry for segment in reversed(collected) for entry in segment]
+
+    def _read_from_store(self, session_id: str, session_data: Dict[str, Any], before_turn: int,
+                         k: int) -> List[Dict[str, Any]]:
+        # Segments are contiguous, so the ones covering the last k turns are
+        # known up front and fetched in a single batched read
+        wanted: List[int] = []
+        end = before_turn
+        needed = k
+        for first_turn in sorted(session_data.get(SEGMENTS_KEY, []), reverse=True):
+            if first_turn >= before_turn:
+                continue
+            wanted.append(first_turn)
+            needed -= end - first_turn
+            end = first_turn
+            if needed <= 0:
+                break
+        if not wanted:
+            return []
+
+        keys = {first_turn: self._segment_key(session_id, first_turn) for first_turn in wanted}
+        try:
+            found = self.store.get_many(keys.values())
+        except Exception as e:
+            logger.warning(f"Failed to read conversation history for {session_id}: {e}")
+            return []
+
+        collected: List[Dict[str, Any]] = []
+        for first_turn in reversed(wanted):
+            entry = found.get(keys[first_turn])
+            if entry is None:
+                logger.warning(f"Missing history segment {keys[first_turn]}")
+                continue
+            collected.extend(entry[1].get("turns", [])[:max(0, before_turn - first_turn)])
+        return collected[-k:]
+
+    @staticmethod
+    def _segment_key(session_id: str, first_turn: int) -> str:
+        return f"{session_id}#history#{first_turn:010d}"
+
+    def _session_dir(self, session_id: str) -> str:
+        name = session_id if _SAFE_ID.match(session_id) else hashlib.sha256(session_id.encode()).hexdigest()
+        return os.path.join(self.spill_dir, name)
+
+
+def _ensure_private_dir(path: str) -> None:
+    """Create `path` owner-only, or refuse an existing one owned by someone else"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.stat(path)
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"spill directory {path} is owned by uid {info.st_uid}")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
@@ -0,0 +1,331 @@
+"""
+Rules-Based Intent Fast Path
+Answers simple policy lookups without an LLM call
+
+A compiled keyword/regex classifier recognises a few high-volume intents
+(policy list, deductible, payment due, agent contact). When exactly one of
+them matches with high confidence the matching policy MCP tool is called
+directly and its result is rendered through a template; anything ambiguous,
+multi-part or action-oriented falls through to the LLM.
+
+Classifications are recorded with method="rules" through
+MonitoringManager.record_intent_analysis.
+"""
+import inspect
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+try:
+    from fastmcp import Client as MCPClient
+except ImportError:  # fastmcp not installed - pass call_tool explicitly
+    MCPClient = None
+
+try:
+    from model_pipeline import is_user_message, last_user_text, text_response, user_id_of
+except ImportError:  # imported as tools.intent_router
+    from tools.model_pipeline import is_user_message, last_user_text, text_response, user_id_of
+
+logger = logging.getLogger(__name__)
+
+ToolCaller = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+def _money(value: Any) -> str:
+    return f"${value:,.2f}" if isinstance(value, (int, float)) else str(value or "n/a")
+
+
+def _policy_label(item: Dict[str, Any]) -> str:
+    kind = item.get("policy_type") or item.get("type") or "Policy"
+    number = item.get("policy_id") or item.get("id")
+    return f"{str(kind).title()} policy {number}" if number else f"{str(kind).title()} policy"
+
+
+def _render_policy_list(policies: List[Dict[str, Any]]) -> str:
+    lines = [f"You have {len(policies)} polic{'y' if len(policies) == 1 else 'ies'}:"]
+    for policy in policies:
+        cycle = f" {policy['billing_cycle']}" if policy.get("billing_cycle") else ""
+        lines.append(
+            f"- {_policy_label(policy)} ({policy.get('status', 'unknown')}): "
+            f"premium {_money(policy.get('premium'))}{cycle}"
+        )
+    return "\n".join(lines)
+
+
+def _render_deductibles(deductibles: List[Dict[str, Any]]) -> str:
+    lines = ["Here are your deductibles:"]
+    for item in deductibles:
+        lines.append(f"- {_policy_label(item)}: {_money(item.get('deductible'))}")
+    return "\n".join(lines)
+
+
+def _render_payments(payments: List[Dict[str, Any]]) -> str:
+    lines = ["Here are your upcoming payments:"]
+    for item in payments:
+        due = item.get("next_payment_due") or "not scheduled"
+        method = f" via {item['payment_method']}" if item.get("payment_method") else ""
+        lines.append(f"- {_policy_label(item)}: {_money(item.get('premium'))} due {due}{method}")
+    return "\n".join(lines)
+
+
+def _render_agent(agent: Dict[str, Any]) -> str:
+    contact = ", ".join(
+        f"{label} {agent[key]}" for key, label in (("phone", "phone"), ("email", "email")) if agent.get(key)
+    )
+    return f"Your agent is {agent.get('name', 'not available')}" + (f" ({contact})." if contact else ".")
+
+
+@dataclass
+class IntentRule:
+    """A fast-path intent: trigger patterns, the policy tool to call and a renderer"""
+    intent: str
+    tool: str
+    patterns: Sequence[str]
+    render: Callable[[Any], str]
+    generic: bool = False  # yields to a specific intent matched in the same message
+
+
+DEFAULT_INTENT_RULES = [
+    IntentRule(
+        "policy_list", "get_policies",
+        [r"\b(?:list|show|see|view)\b.*\bpolic(?:y|ies)\b", r"\bwhat\b.*\bpolicies\b",
+         r"\bwhich\b.*\bpolicies\b", r"\bpolicies\b.*\bdo i have\b", r"\bmy policies\b"],
+        _render_policy_list,
+        generic=True,
+    ),
+    IntentRule(
+        "deductible", "get_deductibles",
+        [r"\bdeductibles?\b"],
+        _render_deductibles,
+    ),
+    IntentRule(
+        "payment_due", "get_payment_information",
+        [r"\b(?:next|upcoming)\b.*\b(?:payment|bill|premium)\b", r"\b(?:payment|bill|premium)\b.*\bdue\b",
+         r"\bwhen\b.*\b(?:pay|payment|bill)\b", r"\bdue date\b"],
+        _render_payments,
+    ),
+    IntentRule(
+        "agent_contact", "get_agent",
+        [r"\b(?:my|an?) (?:insurance )?agent\b", r"\bagent'?s\b.*\b(?:phone|email|number|contact)\b",
+         r"\b(?:contact|reach|call|email)\b.*\bagent\b"],
+        _render_agent,
+    ),
+]
+
+# Words that signal reasoning, comparisons or account changes - always the LLM's job
+DEFAULT_ESCALATION_PATTERN = (
+    r"\b(?:why|should|compare|difference|explain|recommend|change|update|cancel|increase|lower|"
+    r"reduce|raise|switch|add|remove|file|claim|dispute|refund|if|would|could|not|never|wrong)\b"
+)
+
+
+@dataclass
+class IntentMatch:
+    """Classifier output"""
+    intent: str
+    confidence: float
+    rule: Optional[IntentRule] = None
+    matched: List[str] = field(default_factory=list)
+
+
+class IntentClassifier:
+    """
+    Keyword/regex classifier; each intent's patterns are compiled into one
+    alternation at startup.
+
+    Confidence is high only when exactly one intent matches a short message
+    with no escalation words; otherwise it drops below the fast-path threshold.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[IntentRule] = DEFAULT_INTENT_RULES,
+        escalation_pattern: str = DEFAULT_ESCALATION_PATTERN,
+        max_words: int = 16
+    ):
+        self.rules = {rule.intent: rule for rule in rules}
+        self.max_words = max_words
+        self._patterns = [
+            (rule.intent, re.compile("|".join(f"(?:{pattern})" for pattern in rule.patterns), re.IGNORECASE))
+            for rule in rules
+        ]
+        self._escalation = re.compile(escalation_pattern, re.IGNORECASE)
+
+    def classify(self, text: str) -> IntentMatch:
+        """Best intent for `text` with a confidence in [0, 1]"""
+        text = text.strip().lower().replace("’", "'")
+        if not text:
+            return IntentMatch("unknown", 0.0)
+
+        sentences = re.split(r"[.?!;\n]+", text)
+        matched = [
+            intent for intent, pattern in self._patterns
+            if any(pattern.search(sentence) for sentence in sentences)
+        ]
+
+        if not matched:
+            return IntentMatch("unknown", 0.0)
+        specific = [intent for intent in matched if not self.rules[intent].generic]
+        if specific:
+            matched = specific
+        if len(matched) > 1:
+            return IntentMatch("ambiguous", 0.3, matched=matched)
+
+        confidence = 0.95
+        if self._escalation.search(text):
+            confidence -= 0.5
+        words = len(text.split())
+        if words > self.max_words:
+            confidence -= 0.05 * (words - self.max_words)
+        return IntentMatch(matched[0], max(confidence, 0.0), self.rules[matched[0]], matched)
+
+
+def _trace_meta() -> Dict[str, str]:
+    """W3C trace context of the current span for MCP `_meta` (empty without monitoring)."""
+    try:
+        from monitoring.providers.opentelemetry_provider import inject_trace_context
+    except ImportError:
+        return {}
+    return dict(inject_trace_context({}))
+
+
+class PolicyToolClient:
+    """
+    Calls policy MCP server tools directly over streamable HTTP
+
+    Each call carries the current trace context in MCP `_meta`, so the policy
+    server's tool span joins the agent turn's trace.
+    """
+
+    def __init__(self, url: Optional[Any] = None, timeout_seconds: float = 5.0):
+        if MCPClient is None:
+            raise RuntimeError("fastmcp is not installed")
+        self.url = url or os.getenv("POLICY_SERVER_URL", "http://localhost:8001/mcp")
+        self.timeout_seconds = timeout_seconds
+        self._client = None  # built on first call to keep agent import cheap
+        self._accepts_meta = False
+
+    def _connect(self) -> Any:
+        if self._client is None:
+            self._client = MCPClient(self.url, timeout=self.timeout_seconds)
+            try:
+                self._accepts_meta = "meta" in inspect.signature(self._client.call_tool).parameters
+            except (TypeError, ValueError):
+                self._accepts_meta = False
+        return self._client
+
+    async def list_tools(self) -> List[Any]:
+        """Tool definitions (name, description, inputSchema) advertised by the server"""
+        client = self._connect()
+        async with client:
+            return await client.list_tools()
+
+    async def __call__(self, tool: str, arguments: Dict[str, Any]) -> Any:
+        client = self._connect()
+        meta = _trace_meta() if self._accepts_meta else None
+        async with client:
+            if meta:
+                result = await client.call_tool(tool, arguments, timeout=self.timeout_seconds, meta=meta)
+            else:
+                result = await client.call_tool(tool, arguments, timeout=self.timeout_seconds)
+        if getattr(result, "data", None) is not None:
+            return result.data
+        structured = getattr(result, "structured_content", None)
+        if structured is not None:
+            return structured.get("result", structured)
+        text = "".join(getattr(block, "text", "") for block in getattr(result, "content", None) or [])
+        return json.loads(text) if text else None
+
+
+class IntentRouter:
+    """Classifies a message and, for confident simple intents, answers it from a policy tool"""
+
+    def __init__(
+        self,
+        call_tool: ToolCaller,
+        classifier: Optional[IntentClassifier] = None,
+        min_confidence: float = 0.85,
+        monitoring: Optional[Callable[[], Any]] = None
+    ):
+        self.call_tool = call_tool
+        self.classifier = classifier or IntentClassifier()
+        self.min_confidence = min_confidence
+        self._monitoring = monitoring
+
+    async def answer(self, text: str, customer_id: Optional[str]) -> Optional[str]:
+        """Templated answer, or None when the LLM should handle the message"""
+        start = time.perf_counter()
+        match = self.classifier.classify(text)
+        if match.rule is None or match.confidence < self.min_confidence or not customer_id:
+            self._record(match, False, start)
+            return None
+
+        tool_start = time.perf_counter()
+        try:
+            data = await self.call_tool(match.rule.tool, {"customer_id": customer_id})
+            tool_ok = True
+        except Exception as e:
+            logger.warning(f"Fast-path tool {match.rule.tool} failed, deferring to LLM: {e}")
+            data, tool_ok = None, False
+        self._record_tool(match.rule.tool, tool_ok, tool_start)
+
+        if not data or (isinstance(data, dict) and data.get("error")):
+            self._record(match, False, start)
+            return None
+        answer = match.rule.render(data)
+        self._record(match, True, start)
+        return answer
+
+    def _manager(self) -> Any:
+        return self._monitoring() if self._monitoring else None
+
+    def _record(self, match: IntentMatch, answered: bool, start: float) -> None:
+        manager = self._manager()
+        if manager is not None:
+            manager.record_intent_analysis(
+                match.intent, match.confidence, "rules", answered, time.perf_counter() - start
+            )
+
+    def _record_tool(self, tool: str, success: bool, start: float) -> None:
+        manager = self._manager()
+        if manager is not None and hasattr(manager, "record_mcp_call"):
+            elapsed = time.perf_counter() - start
+            manager.record_phase("mcp", elapsed)
+            manager.record_mcp_call(tool, success, elapsed)
+
+
+def create_intent_router_callback(
+    agent_name: str,
+    router: Optional[IntentRouter] = None,
+    monitoring: Optional[Callable[[], Any]] = None
+) -> Callable[..., Any]:
+    """
+    Build an ADK before_model_callback that answers fast-path intents.
+
+    Only the first model call of a turn is considered; the customer id is the
+    ADK user id (or the "customer_id" session state key).
+    """
+    if router is None:
+        router = IntentRouter(
+            PolicyToolClient(),
+            min_confidence=float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.85")),
+            monitoring=monitoring,
+        )
+
+    async def route_intent(callback_context: Any, llm_request: Any) -> Any:
+        contents = getattr(llm_request, "contents", None) or []
+        if not contents or not is_user_message(contents[-1]):
+            return None
+        customer_id = callback_context.state.get("customer_id") or user_id_of(callback_context)
+        try:
+            answer = await router.answer(last_user_text(llm_request), customer_id)
+        except Exception as e:
+            logger.warning(f"Intent fast path skipped for {agent_name}: {e}")
+            return None
+        return text_response(answer) if answer else None
+
+    return route_intent
@@ -0,0 +1,134 @@
+"""
+Model Call Pipeline Helpers
+Chains ADK before/after model callbacks into ordered pipeline stages and
+provides the request/response text helpers those stages share.
+
+A before-model stage may rewrite the request in place (e.g. context
+compaction) or return an LlmResponse to answer without calling the model
+(e.g. response cache, fast-path routing); later stages are then skipped.
+"""
+import inspect
+import json
+from typing import Any, Callable, List, Optional
+
+try:
+    from google.genai import types as genai_types
+    from google.adk.models.llm_response import LlmResponse
+except ImportError:  # ADK not installed - only the ADK-free helpers are usable
+    genai_types = None
+    LlmResponse = None
+
+
+async def _call(callback: Callable[..., Any], *args: Any) -> Any:
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+def chain_before_model(*callbacks: Optional[Callable[..., Any]]) -> Callable[..., Any]:
+    """Run before-model stages in order until one returns a response"""
+    stages = [callback for callback in callbacks if callback is not None]
+
+    async def before_model(callback_context: Any, llm_request: Any) -> Any:
+        for stage in stages:
+            response = await _call(stage, callback_context, llm_request)
+            if response is not None:
+                return response
+        return None
+
+    return before_model
+
+
+def chain_after_model(*callbacks: Optional[Callable[..., Any]]) -> Callable[..., Any]:
+    """Run after-model stages in order; each sees the latest (possibly replaced) response"""
+    stages = [callback for callback in callbacks if callback is not None]
+
+    async def after_model(callback_context: Any, llm_response: Any) -> Any:
+        replaced = None
+        for stage in stages:
+            result = await _call(stage, callback_context, replaced or llm_response)
+            if result is not None:
+                replaced = result
+        return replaced
+
+    return after_model
+
+
+def part_text(part: Any) -> str:
+    """Text carried by a content part, including tool calls and results"""
+    if getattr(part, "text", None):
+        return part.text
+    function_call = getattr(part, "function_call", None)
+    if function_call is not None:
+        return f"{function_call.name}({json.dumps(function_call.args or {}, default=str, sort_keys=True)})"
+    function_response = getattr(part, "function_response", None)
+    if function_response is not None:
+        return json.dumps(function_response.response or {}, default=str, sort_keys=True)
+    return ""
+
+
+def content_text(content: Any) -> str:
+    """Concatenated text of a Content"""
+    return "\n".join(filter(None, (part_text(part) for part in getattr(content, "parts", None) or [])))
+
+
+def is_user_message(content: Any) -> bool:
+    """A user turn typed by the customer (not a tool result)"""
+    parts = getattr(content, "parts", None) or []
+    return getattr(content, "role", None) == "user" and any(getattr(part, "text", None) for part in parts) \
+        and not any(getattr(part, "function_response", None) is not None for part in parts)
+
+
+def last_user_text(llm_request: Any) -> str:
+    """Most recent customer message in a request"""
+    for content in reversed(getattr(llm_request, "contents", None) or []):
+        if is_user_message(content):
+            return "\n".join(part.text for part in content.parts if getattr(part, "text", None))
+    return ""
+
+
+def response_text(llm_response: Any) -> str:
+    """Text of a model response"""
+    content = getattr(llm_response, "content", None)
+    return content_text(content) if content is not None else ""
+
+
+def text_response(text: str) -> Any:
+    """Build a final model-style LlmResponse carrying `text`"""
+    if LlmResponse is None:
+        raise RuntimeError("google-adk is not installed")
+    return LlmResponse(content=genai_types.Content(role="model", parts=[genai_types.Part(text=text)]))
+
+
+def session_id_of(callback_context: Any) -> Optional[str]:
+    """Session id behind an ADK CallbackContext, if available"""
+    invocation = getattr(callback_context, "_invocation_context", None)
+    session = getattr(invocation, "session", None)
+    return getattr(session, "id", None)
+
+
+def user_id_of(callback_context: Any) -> Optional[str]:
+    """ADK user id (the customer id for insurance sessions), if available"""
+    invocation = getattr(callback_context, "_invocation_context", None)
+    return getattr(invocation, "user_id", None)
+
+
+def is_final_text(llm_response: Any) -> bool:
+    """A complete text answer (not partial, an error or a tool call)"""
+    content = getattr(llm_response, "content", None)
+    if content is None or getattr(llm_response, "partial", False) or getattr(llm_response, "error_code", None):
+        return False
+    parts = getattr(content, "parts", None) or []
+    return any(getattr(part, "text", None) for part in parts) \
+        and not any(getattr(part, "function_call", None) is not None for part in parts)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return (len(text) + 3) // 4
+
+
+def contents_tokens(contents: List[Any], counter: Callable[[str], int] = estimate_tokens) -> int:
+    """Estimated prompt tokens for a list of Content"""
+    return sum(counter(content_text(content)) for content in contents)
@@ -0,0 +1,323 @@
+"""
+Complexity-Based Model Routing
+Sends each request to the cheapest model tier predicted to handle it
+
+- tiers come from config/models.yaml, cheapest first
+- a request's complexity score picks the starting tier
+- a response that fails the confidence/validation check is retried on the
+  next stronger tier; when streaming, a tier that may still be escalated is
+  buffered until its final response is assessed, and only the last tier a
+  request can reach streams straight through
+- provider errors fall back to the next tier up, then to cheaper tiers
+
+Every attempt is recorded through MonitoringManager.record_llm_call with the
+routing decision in its metadata. Agents only route when MODEL_ROUTING_ENABLED
+is true; the thresholds in models.yaml are untuned defaults.
+"""
+import logging
+import math
+import os
+import re
+import time
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+try:
+    from google.adk.models.base_llm import BaseLlm
+except ImportError:  # ADK not installed - RoutedLlm is unavailable
+    BaseLlm = None
+
+try:
+    from model_pipeline import contents_tokens, estimate_tokens, is_user_message, last_user_text, response_text
+except ImportError:  # imported as tools.model_router
+    from tools.model_pipeline import contents_tokens, estimate_tokens, is_user_message, last_user_text, response_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'models.yaml')
+
+Validator = Callable[[Any, Any], Optional[str]]
+
+_REASONING = re.compile(
+    r"\b(?:compare|comparison|explain|why|analy[sz]e|analysis|recommend|calculate|estimate|risk|assess|"
+    r"versus|vs|trade-?offs?|pros and cons|scenario|what if|should i)\b",
+    re.IGNORECASE
+)
+_HEDGING = re.compile(
+    r"\b(?:i'?m not sure|i am not sure|i don'?t know|i do not know|i cannot|i can'?t|unable to|"
+    r"not able to|as an ai)\b",
+    re.IGNORECASE
+)
+
+
+def estimate_complexity(llm_request: Any) -> float:
+    """Heuristic difficulty score in [0, 1] for a request"""
+    contents = getattr(llm_request, "contents", None) or []
+    text = last_user_text(llm_request)
+
+    tool_results = 0
+    for content in reversed(contents):
+        if is_user_message(content):
+            break
+        tool_results += sum(
+            1 for part in getattr(content, "parts", None) or []
+            if getattr(part, "function_response", None) is not None
+        )
+
+    score = min(contents_tokens(contents) / 8000, 0.3)
+    score += min(len(_REASONING.findall(text)) * 0.2, 0.6)
+    score += 0.15 if text.count("?") > 1 else 0.0
+    score += 0.15 if len(text.split()) > 60 else 0.0
+    score += min(tool_results * 0.1, 0.2)
+    return min(score, 1.0)
+
+
+def response_confidence(llm_request: Any, llm_response: Any) -> Tuple[float, Optional[str]]:
+    """Heuristic confidence in a response and, if lowered, why"""
+    if getattr(llm_response, "error_code", None):
+        return 0.0, f"error {llm_response.error_code}"
+
+    content = getattr(llm_response, "content", None)
+    parts = getattr(content, "parts", None) or []
+    calls = [part.function_call for part in parts if getattr(part, "function_call", None) is not None]
+    if calls:
+        declared = set(getattr(llm_request, "tools_dict", None) or {})
+        unknown = [call.name for call in calls if declared and call.name not in declared]
+        if unknown:
+            return 0.0, f"unknown tool {unknown[0]}"
+        return 1.0, None
+
+    text = response_text(llm_response).strip()
+    if not text:
+        return 0.0, "empty response"
+    if str(getattr(llm_response, "finish_reason", "") or "").upper().endswith("MAX_TOKENS"):
+        return 0.3, "truncated"
+    if _HEDGING.search(text):
+        return 0.4, "hedged answer"
+
+    avg_logprobs = getattr(llm_response, "avg_logprobs", None)
+    if avg_logprobs is not None:
+        return math.exp(avg_logprobs), "low token probability"
+    return 1.0, None
+
+
+def load_routing_config(
+    agent_key: str, path: str = DEFAULT_MODELS_PATH, primary_model: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Tiers and thresholds for `agent_key` from models.yaml.
+
+    An explicitly configured `primary_model` (PRIMARY_MODEL) that is not one
+    of the tiers is added as the strongest tier rather than silently ignored.
+    """
+    with open(path, 'r') as f:
+        config = yaml.safe_load(f) or {}
+
+    model_config = config.get('models', {}).get(agent_key, {})
+    tiers = list(model_config.get('tiers') or [])
+    if not tiers:
+        # Without explicit tiers treat the fallback model as the cheap one
+        tiers = [name for name in (model_config.get('fallback'), model_config.get('primary')) if name]
+    tiers = list(dict.fromkeys(tiers))
+    if primary_model and primary_model not in tiers:
+        tiers.append(primary_model)
+        logger.warning(f"{agent_key}: PRIMARY_MODEL {primary_model} is not a routing tier; added as the strongest tier")
+    elif primary_model:
+        logger.info(f"{agent_key}: PRIMARY_MODEL {primary_model} is routing tier {tiers.index(primary_model) + 1} of {len(tiers)}")
+    routing = config.get('routing', {})
+    return {
+        'tiers': tiers,
+        'complexity_threshold': float(routing.get('complexity_threshold', 0.6)),
+        'min_confidence': float(routing.get('min_confidence', 0.6)),
+    }
+
+
+class ModelRouter:
+    """
+    Routes requests across model tiers (cheapest first).
+
+    Each tier is a (name, model) pair where `model` exposes ADK's
+    `generate_content_async(llm_request, stream)` async generator.
+    """
+
+    def __init__(
+        self,
+        tiers: Sequence[Tuple[str, Any]],
+        agent_name: str = "agent",
+        complexity_threshold: float = 0.6,
+        min_confidence: float = 0.6,
+        validator: Optional[Validator] = None,
+        monitoring: Optional[Callable[[], Any]] = None
+    ):
+        if not tiers:
+            raise ValueError("at least one model tier is required")
+        self.tiers = list(tiers)
+        self.agent_name = agent_name
+        self.complexity_threshold = complexity_threshold
+        self.min_confidence = min_confidence
+        self.validator = validator
+        self._monitoring = monitoring
+
+    def choose_tier(self, llm_request: Any) -> Tuple[int, float]:
+        """Starting tier index and the complexity score behind it"""
+        complexity = estimate_complexity(llm_request)
+        return (len(self.tiers) - 1 if complexity >= self.complexity_threshold else 0), complexity
+
+    def assess(self, llm_request: Any, llm_response: Any) -> Tuple[float, Optional[str]]:
+        """Confidence check plus the optional validator"""
+        confidence, reason = response_confidence(llm_request, llm_response)
+        if confidence >= self.min_confidence and self.validator is not None:
+            problem = self.validator(llm_request, llm_response)
+            if problem:
+                return 0.0, problem
+        return confidence, reason
+
+    async def generate(self, llm_request: Any, stream: bool = False) -> AsyncGenerator[Any, None]:
+        """Yield the responses of the tier that ends up answering"""
+        start, complexity = self.choose_tier(llm_request)
+        # Escalate upwards from the starting tier, then fall back to cheaper ones
+        order = list(range(start, len(self.tiers))) + list(range(start - 1, -1, -1))
+        decision = "routed"
+        accepted: Optional[List[Any]] = None
+        last_error: Optional[Exception] = None
+
+        for index in order:
+            name, model = self.tiers[index]
+            # Only a tier that cannot be escalated any further streams live
+            if stream and not (start <= index < len(self.tiers) - 1):
+                yielded = False
+                started = time.perf_counter()
+                try:
+                    final = None
+                    async for response in model.generate_content_async(llm_request, stream=True):
+                        yielded = True
+                        final = response
+                        yield response
+                except Exception as e:
+                    self._record(name, llm_request, None, started, decision, complexity, error=e)
+                    if yielded:
+                        raise
+                    if accepted is not None:
+                        break  # escalation failed - keep the weaker tier's answer
+                    last_error, decision = e, "fallback"
+                    continue
+                self._record(name, llm_request, final, started, decision, complexity)
+                return
+
+            started = time.perf_counter()
+            try:
+                responses = [response async for response in model.generate_content_async(llm_request, stream=stream)]
+                if not responses:
+                    raise RuntimeError("model returned no response")
+            except Exception as e:
+                self._record(name, llm_request, None, started, decision, complexity, error=e)
+                if accepted is not None:
+                    break  # escalation failed - keep the weaker tier's answer
+                last_error, decision = e, "fallback"
+                continue
+
+            # Streams end with the aggregated (non-partial) response
+            final = next((response for response in reversed(responses) if not getattr(response, "partial", False)),
+                         responses[-1])
+            confidence, reason = self.assess(llm_request, final)
+            self._record(name, llm_request, final, started, decision, complexity, confidence, reason)
+            if confidence >= self.min_confidence or index < start or index == len(self.tiers) - 1:
+                accepted = responses
+                break
+            accepted = accepted or responses
+            logger.info(f"{self.agent_name}: escalating from {name} ({reason})")
+            decision = "escalated"
+
+        if accepted is None:
+            raise last_error or RuntimeError("no model tier produced a response")
+        for response in accepted:
+            yield response
+
+    def _record(
+        self,
+        model_name: str,
+        llm_request: Any,
+        llm_response: Any,
+        started: float,
+        decision: str,
+        complexity: float,
+        confidence: Optional[float] = None,
+        reason: Optional[str] = None,
+        error: Optional[Exception] = None
+    ) -> None:
+        # Monitoring must never fail a turn the model already answered
+        try:
+            self._record_call(model_name, llm_request, llm_response, started, decision, complexity,
+                              confidence, reason, error)
+        except Exception as e:
+            logger.warning(f"{self.agent_name}: failed to record model call: {e}")
+
+    def _record_call(
+        self,
+        model_name: str,
+        llm_request: Any,
+        llm_response: Any,
+        started: float,
+        decision: str,
+        complexity: float,
+        confidence: Optional[float],
+        reason: Optional[str],
+        error: Optional[Exception]
+    ) -> None:
+        manager = self._monitoring() if self._monitoring else None
+        if manager is None:
+            return
+        elapsed = time.perf_counter() - started
+        manager.record_phase("llm", elapsed)
+        usage = getattr(llm_response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) \
+            or contents_tokens(getattr(llm_request, "contents", None) or [])
+        completion_tokens = getattr(usage, "candidates_token_count", None) \
+            or (estimate_tokens(response_text(llm_response)) if llm_response is not None else 0)
+        manager.record_llm_call(
+            model_name, prompt_tokens, completion_tokens, prompt_tokens + completion_tokens,
+            elapsed, error is None,
+            error=str(error) if error is not None else None,
+            metadata={
+                "agent": self.agent_name,
+                "routing_decision": decision,
+                "complexity": round(complexity, 3),
+                "confidence": round(confidence, 3) if confidence is not None else None,
+                "escalation_reason": reason,
+            }
+        )
+
+
+if BaseLlm is not None:
+
+    class RoutedLlm(BaseLlm):
+        """ADK model that delegates every request to a ModelRouter"""
+
+        router: Any = None
+
+        async def generate_content_async(self, llm_request: Any, stream: bool = False):
+            async for response in self.router.generate(llm_request, stream):
+                yield response
+
+
+def create_routed_model(
+    agent_key: str,
+    model_factory: Callable[[str], Any],
+    agent_name: Optional[str] = None,
+    monitoring: Optional[Callable[[], Any]] = None,
+    config_path: str = DEFAULT_MODELS_PATH,
+    primary_model: Optional[str] = None
+) -> Any:
+    """Build a RoutedLlm over the models.yaml tiers for `agent_key` (plus `primary_model`, if set)"""
+    if BaseLlm is None:
+        raise RuntimeError("google-adk is not installed")
+    config = load_routing_config(agent_key, config_path, primary_model)
+    router = ModelRouter(
+        [(name, model_factory(name)) for name in config['tiers']],
+        agent_name=agent_name or agent_key,
+        complexity_threshold=config['complexity_threshold'],
+        min_confidence=config['min_confidence'],
+        monitoring=monitoring,
+    )
+    return RoutedLlm(model=f"router/{agent_key}", router=router)
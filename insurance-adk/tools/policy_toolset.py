@@ -0,0 +1,84 @@
+"""
+Policy MCP Toolset
+Exposes the policy server's tools to ADK agents over streamable HTTP
+
+Tools are listed once through PolicyToolClient and wrapped as ADK
+FunctionTools, so every call goes through the same client as the intent fast
+path and carries the agent turn's W3C trace context in MCP `_meta`. ADK's
+MCPToolset cannot do this: its connection headers are fixed when the session
+is opened.
+"""
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    from google.adk.tools import FunctionTool
+    from google.adk.tools.base_toolset import BaseToolset
+except ImportError:  # ADK not installed - tool_function still usable on its own
+    FunctionTool = None
+    BaseToolset = None
+
+try:
+    from intent_router import PolicyToolClient, ToolCaller
+except ImportError:  # imported as tools.policy_toolset
+    from tools.intent_router import PolicyToolClient, ToolCaller
+
+logger = logging.getLogger(__name__)
+
+_JSON_TYPES = {"string": str, "integer": int, "number": float, "boolean": bool, "array": list, "object": dict}
+
+
+def tool_function(
+    name: str, description: Optional[str], input_schema: Optional[Dict[str, Any]], call_tool: ToolCaller
+) -> Callable[..., Any]:
+    """Async function with the MCP tool's name, docstring and signature that calls it through `call_tool`"""
+    schema = input_schema or {}
+    required = set(schema.get("required") or [])
+    parameters = []
+    for param, spec in (schema.get("properties") or {}).items():
+        annotation = _JSON_TYPES.get((spec or {}).get("type"), str)
+        if param in required:
+            parameters.append(inspect.Parameter(param, inspect.Parameter.KEYWORD_ONLY, annotation=annotation))
+        else:
+            parameters.append(inspect.Parameter(
+                param, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[annotation]
+            ))
+
+    async def invoke(**kwargs: Any) -> Any:
+        return await call_tool(name, {key: value for key, value in kwargs.items() if value is not None})
+
+    invoke.__name__ = invoke.__qualname__ = name
+    invoke.__doc__ = description or name
+    invoke.__signature__ = inspect.Signature(parameters)
+    return invoke
+
+
+if BaseToolset is not None:
+
+    class PolicyToolset(BaseToolset):
+        """ADK toolset of the policy server's MCP tools, called through PolicyToolClient"""
+
+        def __init__(self, client: Optional[PolicyToolClient] = None, tool_filter: Optional[Sequence[str]] = None):
+            super().__init__()
+            self._client = client or PolicyToolClient()
+            self._tool_filter = set(tool_filter) if tool_filter else None
+            self._tools: Optional[List[Any]] = None
+
+        async def get_tools(self, readonly_context: Any = None) -> List[Any]:
+            if self._tools is None:
+                try:
+                    listed = await self._client.list_tools()
+                except Exception as e:  # server down - retry on the next turn
+                    logger.warning(f"Policy MCP tool discovery failed: {e}")
+                    return []
+                self._tools = [
+                    FunctionTool(tool_function(tool.name, tool.description, tool.inputSchema, self._client))
+                    for tool in listed
+                    if self._tool_filter is None or tool.name in self._tool_filter
+                ]
+                logger.info(f"Discovered {len(self._tools)} policy MCP tool(s)")
+            return self._tools
+
+        async def close(self) -> None:
+            self._tools = None
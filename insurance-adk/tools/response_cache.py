@@ -0,0 +1,388 @@
+"""
+Customer Service Response Cache
+Answers repeated questions without an LLM round-trip
+
+- exact tier: normalized prompt text
+- semantic tier (optional): cosine similarity of prompt embeddings in a local
+  vector index, with a pluggable embedding function
+- entries are scoped to the customer, the customer data snapshot version and
+  a digest of the preceding turns, so a data change never serves a stale
+  answer and a short follow-up ("yes", "tell me more") is never answered from
+  an unrelated conversation; entries expire after a TTL
+
+Hits and misses are counted per tier and exported via monitoring.
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pure-python similarity search
+    np = None
+
+try:
+    from model_pipeline import (
+        content_text, is_final_text, is_user_message, last_user_text, response_text, text_response, user_id_of
+    )
+except ImportError:  # imported as tools.response_cache
+    from tools.model_pipeline import (
+        content_text, is_final_text, is_user_message, last_user_text, response_text, text_response, user_id_of
+    )
+
+logger = logging.getLogger(__name__)
+
+APP_DATA_VERSION_KEY = "app:customer_data_version"
+USER_DATA_VERSION_KEY = "user:customer_data_version"
+
+# The policy server's dataset; its modification time is the app-wide data version
+DEFAULT_DATA_FILE = Path(__file__).resolve().parent.parent.parent / "data" / "mock_data.json"
+
+Embedder = Callable[[str], Sequence[float]]
+
+_CONTRACTIONS = {
+    "what's": "what is", "when's": "when is", "where's": "where is", "how's": "how is",
+    "who's": "who is", "it's": "it is", "that's": "that is", "i'm": "i am", "i've": "i have",
+    "i'd": "i would", "don't": "do not", "doesn't": "does not", "isn't": "is not",
+    "aren't": "are not", "can't": "cannot", "won't": "will not", "didn't": "did not",
+}
+_FILLER = re.compile(r"^(?:(?:hi|hello|hey|please|thanks|thank you|ok|okay)\b\s*)+|(?:\s*\b(?:please|thanks|thank you))+$")
+
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase, expand contractions, drop punctuation and greetings/pleasantries"""
+    text = text.lower().replace("’", "'")
+    text = re.sub(r"[a-z]+'[a-z]+", lambda m: _CONTRACTIONS.get(m.group(0), m.group(0).replace("'", "")), text)
+    text = re.sub(r"[^a-z0-9$.%/-]+", " ", text)
+    text = re.sub(r"(?<![0-9])[.]|[.](?![0-9])", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return _FILLER.sub("", text).strip()
+
+
+def hashing_embedder(dimensions: int = 512) -> Embedder:
+    """
+    Offline embedding: signed feature hashing of words and word bigrams.
+
+    Good enough for reworded near-duplicates; plug in a model-backed
+    embedder for true paraphrase matching.
+    """
+
+    def embed(text: str) -> List[float]:
+        words = normalize_prompt(text).split()
+        vector = [0.0] * dimensions
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        return vector
+
+    return embed
+
+
+def _unit(vector: Sequence[float]) -> List[float]:
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else list(vector)
+
+
+class VectorIndex:
+    """Brute-force cosine index over unit vectors, partitioned into buckets"""
+
+    def __init__(self):
+        self._buckets: Dict[Any, Dict[Any, List[float]]] = {}
+        self._matrices: Dict[Any, Tuple[List[Any], Any]] = {}
+
+    def add(self, bucket: Any, key: Any, vector: Sequence[float]) -> None:
+        self._buckets.setdefault(bucket, {})[key] = _unit(vector)
+        self._matrices.pop(bucket, None)
+
+    def remove(self, bucket: Any, key: Any) -> None:
+        vectors = self._buckets.get(bucket)
+        if vectors is not None and vectors.pop(key, None) is not None:
+            self._matrices.pop(bucket, None)
+            if not vectors:
+                del self._buckets[bucket]
+
+    def search(self, bucket: Any, vector: Sequence[float]) -> Optional[Tuple[Any, float]]:
+        """Best (key, cosine similarity) in `bucket`, or None if it is empty"""
+        vectors = self._buckets.get(bucket)
+        if not vectors:
+            return None
+        query = _unit(vector)
+        if np is None:
+            return max(
+                ((key, sum(a * b for a, b in zip(query, candidate))) for key, candidate in vectors.items()),
+                key=lambda item: item[1]
+            )
+        if bucket not in self._matrices:
+            self._matrices[bucket] = (list(vectors), np.asarray(list(vectors.values()), dtype=np.float32))
+        keys, matrix = self._matrices[bucket]
+        scores = matrix @ np.asarray(query, dtype=np.float32)
+        best = int(scores.argmax())
+        return keys[best], float(scores[best])
+
+    def __len__(self) -> int:
+        return sum(len(vectors) for vectors in self._buckets.values())
+
+
+@dataclass
+class CacheHit:
+    """A cached response and how it was found"""
+    response: str
+    tier: str  # "exact" or "semantic"
+    similarity: float = 1.0
+
+
+@dataclass
+class _Entry:
+    response: str
+    expires_at: float
+    has_vector: bool = False
+
+
+class ResponseCache:
+    """
+    Exact + semantic response cache keyed by (scope, data version, context, prompt).
+
+    `scope` is usually the customer id; `data_version` is the snapshot version
+    of that customer's data; `context` is a digest of the turns before the
+    prompt (empty for the first message). With `embedder=None` only the exact
+    tier is used.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600,
+        max_entries: int = 10_000,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: float = 0.92,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str, str, str], _Entry]" = OrderedDict()
+        self._index = VectorIndex()
+        self._stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """Build from RESPONSE_CACHE_* environment variables"""
+        semantic = os.getenv("RESPONSE_CACHE_SEMANTIC", "false").lower() == "true"
+        return cls(
+            ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "600")),
+            max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000")),
+            embedder=hashing_embedder() if semantic else None,
+            similarity_threshold=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.92")),
+        )
+
+    def get(self, prompt: str, scope: str = "", data_version: str = "0", context: str = "") -> Optional[CacheHit]:
+        """Cached response for `prompt`, trying the exact tier first"""
+        normalized = normalize_prompt(prompt)
+        if not normalized:
+            return None
+        key = (scope, str(data_version), context, normalized)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._live(key, now)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["exact_hits"] += 1
+                return CacheHit(entry.response, "exact")
+
+        if self.embedder is not None:
+            vector = self.embedder(normalized)
+            with self._lock:
+                found = self._index.search(key[:3], vector)
+                if found is not None and found[1] >= self.similarity_threshold:
+                    entry = self._live(found[0], now)
+                    if entry is not None:
+                        self._entries.move_to_end(found[0])
+                        self._stats["semantic_hits"] += 1
+                        return CacheHit(entry.response, "semantic", found[1])
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def put(
+        self,
+        prompt: str,
+        response: str,
+        scope: str = "",
+        data_version: str = "0",
+        ttl_seconds: Optional[float] = None,
+        context: str = ""
+    ) -> None:
+        """Cache `response` for `prompt`"""
+        normalized = normalize_prompt(prompt)
+        if not normalized or not response:
+            return
+        key = (scope, str(data_version), context, normalized)
+        vector = self.embedder(normalized) if self.embedder is not None else None
+        expires_at = self._clock() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+        with self._lock:
+            self._entries[key] = _Entry(response, expires_at, vector is not None)
+            self._entries.move_to_end(key)
+            if vector is not None:
+                self._index.add(key[:3], key, vector)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, scope: Optional[str] = None, data_version: Optional[str] = None) -> int:
+        """Drop entries for a scope (optionally one data version), or everything"""
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (scope is None or key[0] == scope) and (data_version is None or key[1] == str(data_version))
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from either tier"""
+        with self._lock:
+            hits = self._stats["exact_hits"] + self._stats["semantic_hits"]
+            lookups = hits + self._stats["misses"]
+        return hits / lookups if lookups else 0.0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Size, configuration and hit counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "semantic_tier": self.embedder is not None,
+            "similarity_threshold": self.similarity_threshold,
+            "hit_rate": self.hit_rate(),
+            **stats,
+        }
+
+    def _live(self, key: Tuple[str, str, str, str], now: float) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            self._remove(key)
+            return None
+        return entry
+
+    def _remove(self, key: Tuple[str, str, str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.has_vector:
+            self._index.remove(key[:3], key)
+
+
+# ADK adapter
+
+def dataset_version(path: Optional[Path] = None) -> str:
+    """Modification time of the policy dataset (POLICY_DATA_FILE), or "0" if it is not reachable"""
+    path = path or Path(os.getenv("POLICY_DATA_FILE", DEFAULT_DATA_FILE))
+    try:
+        return str(path.stat().st_mtime_ns)
+    except OSError:
+        return "0"
+
+
+def data_version_of(state: Any) -> str:
+    """Customer data snapshot version: the dataset version plus app- and user-scoped session state"""
+    return f"{dataset_version()}.{state.get(APP_DATA_VERSION_KEY, 0)}.{state.get(USER_DATA_VERSION_KEY, 0)}"
+
+
+def bump_data_version(state: Any, app_wide: bool = False) -> None:
+    """
+    Record a customer data change in session state.
+
+    Tools that modify a customer's policies or claims call this so earlier
+    cached answers for that customer (or everyone, with app_wide) stop matching.
+    """
+    key = APP_DATA_VERSION_KEY if app_wide else USER_DATA_VERSION_KEY
+    state[key] = int(state.get(key, 0) or 0) + 1
+
+
+def context_digest(contents: Sequence[Any], turns: int = 2) -> str:
+    """Digest of the `turns` messages before the last one ("" for a first message)"""
+    previous = [normalize_prompt(content_text(content)) for content in contents[-turns - 1:-1]] if turns else []
+    if not any(previous):
+        return ""
+    return hashlib.blake2b("\x1f".join(previous).encode(), digest_size=8).hexdigest()
+
+
+def create_response_cache_callbacks(
+    agent_name: str,
+    cache: Optional[ResponseCache] = None,
+    monitoring: Optional[Callable[[], Any]] = None,
+    max_pending: int = 1024,
+    context_turns: int = 2
+) -> Tuple[Callable[..., Any], Callable[..., Any]]:
+    """
+    Build (before_model_callback, after_model_callback) for an ADK agent.
+
+    Only the first model call of a turn (the request ends with the
+    customer's message) is looked up; a hit is returned as the model
+    response, so the LLM is skipped. The key includes a digest of the last
+    `context_turns` messages before it, so follow-ups only match the same
+    conversation state. The final text answer of a miss is stored under the
+    key computed before the call.
+    """
+    cache = cache or ResponseCache.from_env()
+    pending: "OrderedDict[str, Tuple[str, str, str, str]]" = OrderedDict()
+    pending_lock = threading.Lock()
+
+    def record(result: str) -> None:
+        manager = monitoring() if monitoring else None
+        if manager is not None and hasattr(manager, "record_response_cache"):
+            manager.record_response_cache(agent_name, result)
+
+    def lookup_response(callback_context: Any, llm_request: Any) -> Any:
+        contents = getattr(llm_request, "contents", None) or []
+        if not contents or not is_user_message(contents[-1]):
+            return None
+        try:
+            prompt = last_user_text(llm_request)
+            scope = user_id_of(callback_context) or ""
+            version = data_version_of(callback_context.state)
+            context = context_digest(contents, context_turns)
+            hit = cache.get(prompt, scope, version, context)
+        except Exception as e:
+            logger.warning(f"Response cache lookup failed for {agent_name}: {e}")
+            return None
+
+        if hit is not None:
+            record(f"{hit.tier}_hit")
+            return text_response(hit.response)
+
+        record("miss")
+        with pending_lock:
+            pending[callback_context.invocation_id] = (prompt, scope, version, context)
+            while len(pending) > max_pending:
+                pending.popitem(last=False)
+        return None
+
+    def store_response(callback_context: Any, llm_response: Any) -> None:
+        if getattr(llm_response, "partial", False):
+            return None
+        with pending_lock:
+            key = pending.pop(callback_context.invocation_id, None)
+        if key is not None and is_final_text(llm_response):
+            prompt, scope, version, context = key
+            cache.put(prompt, response_text(llm_response), scope, version, context=context)
+        return None
+
+    return lookup_response, store_response
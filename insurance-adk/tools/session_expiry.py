@@ -0,0 +1,80 @@
+"""
+Session Expiry Index
+Hashed timing wheel for idle-timeout expiry with O(1) schedule and cancel
+"""
+import math
+from typing import Dict, List, Set
+
+
+class TimingWheel:
+    """
+    Buckets keys by deadline tick.
+
+    `schedule` and `cancel` are O(1); `pop_expired` only visits ticks that
+    have elapsed since the previous call, so a reaper pass costs the number of
+    elapsed ticks plus the number of expired keys - never the number of live
+    keys. Deadlines are rounded up to the next tick, so keys expire at most
+    one tick late and never early.
+    """
+
+    def __init__(self, tick_seconds: float = 1.0, now: float = 0.0):
+        if tick_seconds <= 0:
+            raise ValueError("tick_seconds must be positive")
+        self.tick_seconds = tick_seconds
+        self._slots: Dict[int, Set[str]] = {}
+        self._slot_of: Dict[str, int] = {}
+        self._cursor = math.floor(now / tick_seconds)
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Expire `key` at `deadline` (replaces any previous deadline)"""
+        slot = max(math.ceil(deadline / self.tick_seconds), self._cursor + 1)
+        previous = self._slot_of.get(key)
+        if previous == slot:
+            return
+        if previous is not None:
+            self._discard(key, previous)
+        self._slots.setdefault(slot, set()).add(key)
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str) -> None:
+        """Forget `key` if scheduled"""
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            bucket = self._slots.get(slot)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._slots[slot]
+
+    def pop_expired(self, now: float) -> List[str]:
+        """Remove and return every key whose deadline is <= now"""
+        target = math.floor(now / self.tick_seconds)
+        expired: List[str] = []
+        if target <= self._cursor:
+            return expired
+
+        if target - self._cursor > len(self._slots):
+            # Long gap since the last pass: cheaper to visit occupied slots
+            slots = sorted(slot for slot in self._slots if slot <= target)
+        else:
+            slots = [slot for slot in range(self._cursor + 1, target + 1) if slot in self._slots]
+
+        for slot in slots:
+            for key in self._slots.pop(slot):
+                del self._slot_of[key]
+                expired.append(key)
+        self._cursor = target
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slot_of
+
+    def _discard(self, key: str, slot: int) -> None:
+        bucket = self._slots.get(slot)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._slots[slot]
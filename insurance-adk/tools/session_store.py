@@ -0,0 +1,704 @@
+"""
+Session Store Backends
+Pluggable, versioned persistence behind SessionManager
+
+Backends:
+- InMemorySessionStore: process-local, LRU-bounded, timing-wheel expiry
+- SQLiteSessionStore: shared file in WAL mode (replicas on one host/volume)
+- RedisSessionStore: any Redis-protocol client; reads and writes are pipelined
+
+Every write bumps a per-session version. NearCacheSessionStore keeps a small
+local copy of hot sessions and revalidates it with a cheap version lookup, so
+agent replicas can share sessions without sticky routing.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from session_expiry import TimingWheel
+except ImportError:  # imported as tools.session_store
+    from tools.session_expiry import TimingWheel
+
+logger = logging.getLogger(__name__)
+
+# touch() results
+TOUCHED = "touched"
+EXPIRED = "expired"
+MISSING = "missing"
+
+SessionEntry = Tuple[int, Dict[str, Any]]
+
+
+class SessionStore(ABC):
+    """Versioned session persistence; the version increases on every write"""
+
+    backend_name = "abstract"
+
+    @abstractmethod
+    def get(self, session_id: str, refresh_ttl: Optional[float] = None) -> Optional[SessionEntry]:
+        """Return (version, data), optionally sliding the expiry to now + refresh_ttl"""
+
+    @abstractmethod
+    def put(self, session_id: str, data: Dict[str, Any], ttl_seconds: float) -> int:
+        """Write a session and return its new version"""
+
+    @abstractmethod
+    def touch(self, session_id: str, ttl_seconds: float) -> str:
+        """Slide the expiry; returns TOUCHED, EXPIRED or MISSING"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Remove a session"""
+
+    def version(self, session_id: str) -> Optional[int]:
+        """Current version without fetching the payload"""
+        return self.versions([session_id]).get(session_id)
+
+    def versions(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, int]:
+        """Current versions of the sessions that exist, optionally sliding their expiry"""
+        result = {}
+        for session_id in session_ids:
+            entry = self.get(session_id, refresh_ttl)
+            if entry is not None:
+                result[session_id] = entry[0]
+        return result
+
+    def get_many(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, SessionEntry]:
+        """Fetch several sessions"""
+        result = {}
+        for session_id in session_ids:
+            entry = self.get(session_id, refresh_ttl)
+            if entry is not None:
+                result[session_id] = entry
+        return result
+
+    def put_many(self, items: Dict[str, Dict[str, Any]], ttl_seconds: float) -> Dict[str, int]:
+        """Write several sessions"""
+        return {session_id: self.put(session_id, data, ttl_seconds) for session_id, data in items.items()}
+
+    def purge_expired(self) -> int:
+        """Drop expired sessions; backends with native expiry return 0"""
+        return 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Backend statistics"""
+        return {"backend": self.backend_name}
+
+    def close(self) -> None:
+        """Release backend resources"""
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local store.
+
+    Sessions are kept in least-recently-used order and capped at
+    `max_sessions`. Deadlines are monotonic floats indexed in a timing wheel,
+    so purge_expired only visits expired sessions. Data is stored by
+    reference, matching the original SessionManager semantics.
+    """
+
+    backend_name = "memory"
+
+    def __init__(self, max_sessions: int = 100000, tick_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self.sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._expiry = TimingWheel(tick_seconds=tick_seconds, now=clock())
+        self._lock = threading.RLock()
+        self._evicted = 0
+        self._expired = 0
+
+    def get(self, session_id: str, refresh_ttl: Optional[float] = None) -> Optional[SessionEntry]:
+        with self._lock:
+            if not self._live(session_id):
+                return None
+            if refresh_ttl is not None:
+                self._schedule(session_id, refresh_ttl)
+            self.sessions.move_to_end(session_id)
+            return self._versions[session_id], self.sessions[session_id]
+
+    def put(self, session_id: str, data: Dict[str, Any], ttl_seconds: float) -> int:
+        with self._lock:
+            self.sessions[session_id] = data
+            self.sessions.move_to_end(session_id)
+            self._versions[session_id] = self._versions.get(session_id, 0) + 1
+            self._schedule(session_id, ttl_seconds)
+            while len(self.sessions) > self.max_sessions:
+                evicted_id, _ = self.sessions.popitem(last=False)
+                self._forget(evicted_id)
+                self._evicted += 1
+                logger.info(f"Evicted least recently used session: {evicted_id}")
+            return self._versions[session_id]
+
+    def touch(self, session_id: str, ttl_seconds: float) -> str:
+        with self._lock:
+            if session_id not in self.sessions:
+                return MISSING
+            if not self._live(session_id):
+                return EXPIRED
+            self._schedule(session_id, ttl_seconds)
+            self.sessions.move_to_end(session_id)
+            return TOUCHED
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            existed = self.sessions.pop(session_id, None) is not None
+            self._forget(session_id)
+            return existed
+
+    def versions(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, int]:
+        with self._lock:
+            result = {sid: self._versions[sid] for sid in session_ids if self._live(sid)}
+            if refresh_ttl is not None:
+                for session_id in result:
+                    self._schedule(session_id, refresh_ttl)
+            return result
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            expired_sessions = self._expiry.pop_expired(self._clock())
+            for session_id in expired_sessions:
+                self.sessions.pop(session_id, None)
+                self._versions.pop(session_id, None)
+                self._deadlines.pop(session_id, None)
+            self._expired += len(expired_sessions)
+            return len(expired_sessions)
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend_name,
+                "active_sessions": len(self.sessions),
+                "max_sessions": self.max_sessions,
+                "scheduled_expiries": len(self._expiry),
+                "evicted_total": self._evicted,
+                "expired_total": self._expired,
+            }
+
+    def _live(self, session_id: str) -> bool:
+        """Whether the session exists and is unexpired; drops it if expired"""
+        if session_id not in self.sessions:
+            return False
+        if self._clock() <= self._deadlines.get(session_id, 0.0):
+            return True
+        self.sessions.pop(session_id, None)
+        self._forget(session_id)
+        self._expired += 1
+        return False
+
+    def _schedule(self, session_id: str, ttl_seconds: float) -> None:
+        deadline = self._clock() + ttl_seconds
+        self._deadlines[session_id] = deadline
+        self._expiry.schedule(session_id, deadline)
+
+    def _forget(self, session_id: str) -> None:
+        self._versions.pop(session_id, None)
+        self._deadlines.pop(session_id, None)
+        self._expiry.cancel(session_id)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite store in WAL mode.
+
+    Readers never block the writer, so several agent processes on one host
+    (or a shared volume) can use the same file. Expiry uses wall-clock
+    timestamps with an index, so purges only touch expired rows.
+    """
+
+    backend_name = "sqlite"
+    _BATCH = 500
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " data TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def get(self, session_id: str, refresh_ttl: Optional[float] = None) -> Optional[SessionEntry]:
+        return self.get_many([session_id], refresh_ttl).get(session_id)
+
+    def get_many(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, SessionEntry]:
+        ids = list(session_ids)
+        result = {}
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for batch in self._batches(ids):
+                    marks = ",".join("?" * len(batch))
+                    if refresh_ttl is not None:
+                        self._conn.execute(
+                            f"UPDATE sessions SET expires_at = ? WHERE expires_at >= ? AND session_id IN ({marks})",
+                            (now + refresh_ttl, now, *batch)
+                        )
+                    rows = self._conn.execute(
+                        f"SELECT session_id, version, data FROM sessions "
+                        f"WHERE expires_at >= ? AND session_id IN ({marks})",
+                        (now, *batch)
+                    )
+                    for session_id, version, data in rows:
+                        result[session_id] = (version, json.loads(data))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def put(self, session_id: str, data: Dict[str, Any], ttl_seconds: float) -> int:
+        return self.put_many({session_id: data}, ttl_seconds)[session_id]
+
+    def put_many(self, items: Dict[str, Dict[str, Any]], ttl_seconds: float) -> Dict[str, int]:
+        expires_at = self._clock() + ttl_seconds
+        payloads = [(session_id, json.dumps(data, default=str)) for session_id, data in items.items()]
+        result = {}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for session_id, payload in payloads:
+                    (version,) = self._conn.execute(
+                        "INSERT INTO sessions (session_id, version, data, expires_at) VALUES (?, 1, ?, ?) "
+                        "ON CONFLICT(session_id) DO UPDATE SET version = version + 1, "
+                        "data = excluded.data, expires_at = excluded.expires_at RETURNING version",
+                        (session_id, payload, expires_at)
+                    ).fetchone()
+                    result[session_id] = version
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def touch(self, session_id: str, ttl_seconds: float) -> str:
+        now = self._clock()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE sessions SET expires_at = ? WHERE session_id = ? AND expires_at >= ?",
+                (now + ttl_seconds, session_id, now)
+            ).rowcount
+            if updated:
+                return TOUCHED
+            expired = self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ? AND expires_at < ?", (session_id, now)
+            ).rowcount
+            return EXPIRED if expired else MISSING
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+
+    def versions(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, int]:
+        ids = list(session_ids)
+        now = self._clock()
+        result = {}
+        with self._lock:
+            for batch in self._batches(ids):
+                marks = ",".join("?" * len(batch))
+                if refresh_ttl is not None:
+                    self._conn.execute(
+                        f"UPDATE sessions SET expires_at = ? WHERE expires_at >= ? AND session_id IN ({marks})",
+                        (now + refresh_ttl, now, *batch)
+                    )
+                rows = self._conn.execute(
+                    f"SELECT session_id, version FROM sessions WHERE expires_at >= ? AND session_id IN ({marks})",
+                    (now, *batch)
+                )
+                result.update(rows)
+        return result
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE expires_at < ?", (self._clock(),)).rowcount
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return {"backend": self.backend_name, "path": self.path, "stored_sessions": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _batches(self, ids: List[str]) -> Iterable[List[str]]:
+        for start in range(0, len(ids), self._BATCH):
+            yield ids[start:start + self._BATCH]
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis-protocol store.
+
+    Each session is a hash {v: version, d: json} with a native TTL. Multi-key
+    reads and writes, and read-plus-TTL-refresh, are sent as one pipeline.
+    Works with redis-py or the InProcessRedis stand-in.
+    """
+
+    backend_name = "redis"
+
+    def __init__(self, client: Any, prefix: str = "insurance:session:"):
+        self._client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "insurance:session:") -> "RedisSessionStore":
+        """Connect with redis-py (optional dependency)"""
+        import redis
+        return cls(redis.Redis.from_url(url), prefix)
+
+    def get(self, session_id: str, refresh_ttl: Optional[float] = None) -> Optional[SessionEntry]:
+        return self.get_many([session_id], refresh_ttl).get(session_id)
+
+    def get_many(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, SessionEntry]:
+        ids = list(session_ids)
+        if not ids:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        for session_id in ids:
+            key = self._key(session_id)
+            pipe.hmget(key, "v", "d")
+            if refresh_ttl is not None:
+                pipe.expire(key, self._seconds(refresh_ttl))
+        replies = pipe.execute()
+        step = 2 if refresh_ttl is not None else 1
+
+        result = {}
+        for index, session_id in enumerate(ids):
+            version, data = replies[index * step]
+            if version is not None and data is not None:
+                result[session_id] = (int(version), json.loads(data))
+        return result
+
+    def put(self, session_id: str, data: Dict[str, Any], ttl_seconds: float) -> int:
+        return self.put_many({session_id: data}, ttl_seconds)[session_id]
+
+    def put_many(self, items: Dict[str, Dict[str, Any]], ttl_seconds: float) -> Dict[str, int]:
+        pipe = self._client.pipeline(transaction=True)
+        for session_id, data in items.items():
+            key = self._key(session_id)
+            pipe.hset(key, mapping={"d": json.dumps(data, default=str)})
+            pipe.hincrby(key, "v", 1)
+            pipe.expire(key, self._seconds(ttl_seconds))
+        replies = pipe.execute()
+        return {session_id: int(replies[index * 3 + 1]) for index, session_id in enumerate(items)}
+
+    def touch(self, session_id: str, ttl_seconds: float) -> str:
+        # Redis drops expired keys itself, so expired and missing look the same
+        return TOUCHED if self._client.expire(self._key(session_id), self._seconds(ttl_seconds)) else MISSING
+
+    def delete(self, session_id: str) -> bool:
+        return bool(self._client.delete(self._key(session_id)))
+
+    def versions(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, int]:
+        ids = list(session_ids)
+        if not ids:
+            return {}
+        pipe = self._client.pipeline(transaction=False)
+        for session_id in ids:
+            key = self._key(session_id)
+            pipe.hget(key, "v")
+            if refresh_ttl is not None:
+                pipe.expire(key, self._seconds(refresh_ttl))
+        replies = pipe.execute()
+        step = 2 if refresh_ttl is not None else 1
+        return {
+            session_id: int(replies[index * step])
+            for index, session_id in enumerate(ids)
+            if replies[index * step] is not None
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"backend": self.backend_name, "prefix": self.prefix}
+
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if close:
+            close()
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    @staticmethod
+    def _seconds(ttl: float) -> int:
+        return max(1, int(ttl))
+
+
+class InProcessRedis:
+    """
+    Local stand-in for a Redis server.
+
+    Implements the hash, expiry and pipeline commands RedisSessionStore uses,
+    with redis-py return conventions (bytes values, int counters). Counts
+    round trips so pipelining can be verified without a server.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._hashes: Dict[str, Dict[str, bytes]] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.round_trips = 0
+
+    def pipeline(self, transaction: bool = True) -> "InProcessRedis._Pipeline":
+        return InProcessRedis._Pipeline(self)
+
+    def hmget(self, key: str, *fields: str) -> List[Optional[bytes]]:
+        return self._call("hmget", key, *fields)
+
+    def hget(self, key: str, field: str) -> Optional[bytes]:
+        return self._call("hget", key, field)
+
+    def hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        return self._call("hset", key, mapping)
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        return self._call("hincrby", key, field, amount)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        return self._call("expire", key, seconds)
+
+    def delete(self, *keys: str) -> int:
+        return self._call("delete", *keys)
+
+    def _call(self, command: str, *args: Any) -> Any:
+        return self._execute([(command, args)])[0]
+
+    def _execute(self, commands: List[Tuple[str, Tuple[Any, ...]]]) -> List[Any]:
+        with self._lock:
+            self.round_trips += 1
+            return [getattr(self, f"_cmd_{command}")(*args) for command, args in commands]
+
+    def _hash(self, key: str, create: bool = False) -> Optional[Dict[str, bytes]]:
+        deadline = self._expires.get(key)
+        if deadline is not None and self._clock() >= deadline:
+            self._hashes.pop(key, None)
+            self._expires.pop(key, None)
+        if create:
+            return self._hashes.setdefault(key, {})
+        return self._hashes.get(key)
+
+    def _cmd_hmget(self, key: str, *fields: str) -> List[Optional[bytes]]:
+        values = self._hash(key) or {}
+        return [values.get(field) for field in fields]
+
+    def _cmd_hget(self, key: str, field: str) -> Optional[bytes]:
+        return (self._hash(key) or {}).get(field)
+
+    def _cmd_hset(self, key: str, mapping: Dict[str, Any]) -> int:
+        values = self._hash(key, create=True)
+        added = sum(1 for field in mapping if field not in values)
+        values.update({field: str(value).encode() for field, value in mapping.items()})
+        return added
+
+    def _cmd_hincrby(self, key: str, field: str, amount: int) -> int:
+        values = self._hash(key, create=True)
+        current = int(values.get(field, b"0")) + amount
+        values[field] = str(current).encode()
+        return current
+
+    def _cmd_expire(self, key: str, seconds: int) -> bool:
+        if self._hash(key) is None:
+            return False
+        self._expires[key] = self._clock() + seconds
+        return True
+
+    def _cmd_delete(self, *keys: str) -> int:
+        removed = 0
+        for key in keys:
+            if self._hash(key) is not None:
+                del self._hashes[key]
+                self._expires.pop(key, None)
+                removed += 1
+        return removed
+
+    class _Pipeline:
+        """Buffers commands and sends them in one round trip"""
+
+        def __init__(self, server: "InProcessRedis"):
+            self._server = server
+            self._commands: List[Tuple[str, Tuple[Any, ...]]] = []
+
+        def __getattr__(self, command: str) -> Callable[..., "InProcessRedis._Pipeline"]:
+            if not hasattr(self._server, f"_cmd_{command}"):
+                raise AttributeError(command)
+
+            def queue(*args: Any, **kwargs: Any) -> "InProcessRedis._Pipeline":
+                self._commands.append((command, args + tuple(kwargs.values())))
+                return self
+
+            return queue
+
+        def execute(self) -> List[Any]:
+            commands, self._commands = self._commands, []
+            return self._server._execute(commands) if commands else []
+
+
+class NearCacheSessionStore(SessionStore):
+    """
+    Small local LRU in front of a shared store.
+
+    Cached sessions are revalidated with a version lookup (no payload
+    transfer) before use; entries validated within `revalidate_after_seconds`
+    are served without any round trip. Cached payloads are kept serialized so
+    callers always receive their own copy.
+    """
+
+    def __init__(self, backend: SessionStore, max_entries: int = 1024,
+                 revalidate_after_seconds: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.backend = backend
+        self.backend_name = f"{backend.backend_name}+near_cache"
+        self.max_entries = max_entries
+        self.revalidate_after_seconds = revalidate_after_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[int, str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    def get(self, session_id: str, refresh_ttl: Optional[float] = None) -> Optional[SessionEntry]:
+        return self.get_many([session_id], refresh_ttl).get(session_id)
+
+    def get_many(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, SessionEntry]:
+        ids = list(session_ids)
+        now = self._clock()
+        result: Dict[str, SessionEntry] = {}
+        to_check: Dict[str, int] = {}
+        current: Dict[str, int] = {}
+        with self._lock:
+            for session_id in ids:
+                cached = self._entries.get(session_id)
+                if cached is None:
+                    continue
+                version, payload, validated_at = cached
+                if refresh_ttl is None and now - validated_at < self.revalidate_after_seconds:
+                    self._entries.move_to_end(session_id)
+                    result[session_id] = (version, json.loads(payload))
+                    self._stats["hits"] += 1
+                else:
+                    to_check[session_id] = version
+
+        if to_check:
+            current = self.backend.versions(to_check, refresh_ttl)
+            with self._lock:
+                for session_id, version in to_check.items():
+                    cached = self._entries.get(session_id)
+                    if cached is not None and current.get(session_id) == version == cached[0]:
+                        self._entries[session_id] = (version, cached[1], now)
+                        self._entries.move_to_end(session_id)
+                        result[session_id] = (version, json.loads(cached[1]))
+                        self._stats["revalidated"] += 1
+                    elif session_id not in current:
+                        self._entries.pop(session_id, None)
+
+        # Uncached, or cached at an older version (deleted sessions are skipped)
+        missing = [sid for sid in ids if sid not in result and (sid not in to_check or sid in current)]
+        if missing:
+            fetched = self.backend.get_many(missing, refresh_ttl)
+            with self._lock:
+                self._stats["misses"] += len(missing)
+                for session_id, (version, data) in fetched.items():
+                    self._remember(session_id, version, data, now)
+            result.update(fetched)
+        return result
+
+    def put(self, session_id: str, data: Dict[str, Any], ttl_seconds: float) -> int:
+        return self.put_many({session_id: data}, ttl_seconds)[session_id]
+
+    def put_many(self, items: Dict[str, Dict[str, Any]], ttl_seconds: float) -> Dict[str, int]:
+        versions = self.backend.put_many(items, ttl_seconds)
+        now = self._clock()
+        with self._lock:
+            for session_id, version in versions.items():
+                self._remember(session_id, version, items[session_id], now)
+        return versions
+
+    def touch(self, session_id: str, ttl_seconds: float) -> str:
+        status = self.backend.touch(session_id, ttl_seconds)
+        if status != TOUCHED:
+            with self._lock:
+                self._entries.pop(session_id, None)
+        return status
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            self._entries.pop(session_id, None)
+        return self.backend.delete(session_id)
+
+    def versions(self, session_ids: Iterable[str], refresh_ttl: Optional[float] = None) -> Dict[str, int]:
+        return self.backend.versions(session_ids, refresh_ttl)
+
+    def purge_expired(self) -> int:
+        return self.backend.purge_expired()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            near_cache = {"entries": len(self._entries), "max_entries": self.max_entries, **self._stats}
+        return {**self.backend.get_status(), "backend": self.backend_name, "near_cache": near_cache}
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def _remember(self, session_id: str, version: int, data: Dict[str, Any], now: float) -> None:
+        self._entries[session_id] = (version, json.dumps(data, default=str), now)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def create_session_store(
+    backend: Optional[str] = None,
+    max_sessions: int = 100000,
+    tick_seconds: float = 60.0
+) -> SessionStore:
+    """
+    Build the store selected by SESSION_STORE (memory, sqlite, redis).
+
+    Shared backends get a near-cache of SESSION_NEAR_CACHE_SIZE entries
+    (0 disables it). Falls back to the in-memory store when the requested
+    backend is unavailable.
+    """
+    backend = (backend or os.getenv("SESSION_STORE", "memory")).lower()
+    store: Optional[SessionStore] = None
+
+    if backend == "sqlite":
+        path = os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+        try:
+            store = SQLiteSessionStore(path)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  SQLite session store unavailable ({e}) - using in-memory sessions")
+    elif backend == "redis":
+        url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        try:
+            store = RedisSessionStore.from_url(url)
+        except ImportError:
+            logger.warning("⚠️  redis package not installed - using in-memory sessions")
+    elif backend != "memory":
+        logger.warning(f"⚠️  Unknown SESSION_STORE '{backend}' - using in-memory sessions")
+
+    if store is None:
+        return InMemorySessionStore(max_sessions=max_sessions, tick_seconds=tick_seconds)
+
+    near_cache_size = int(os.getenv("SESSION_NEAR_CACHE_SIZE", "1024"))
+    if near_cache_size > 0:
+        store = NearCacheSessionStore(store, max_entries=near_cache_size)
+    logger.info(f"✅ Session store: {store.backend_name}")
+    return store
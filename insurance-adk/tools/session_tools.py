@@ -5,20 +5,78 @@ Migrated from existing session management system
 import uuid
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, List, Callable
 from datetime import datetime, timedelta
 
+try:
+    from conversation_history import ConversationHistory
+    from session_store import EXPIRED, InMemorySessionStore, SessionStore, create_session_store
+except ImportError:  # imported as tools.session_tools
+    from tools.conversation_history import ConversationHistory
+    from tools.session_store import EXPIRED, InMemorySessionStore, SessionStore, create_session_store
+
+try:
+    from monitoring.setup.request_timing import phase
+except ImportError:  # monitoring not on the path - nullcontext("session_io") is a no-op
+    from contextlib import nullcontext as phase
+
+DEFAULT_SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+DEFAULT_MAX_SESSIONS = int(os.getenv("SESSION_MAX_COUNT", "100000"))
+DEFAULT_REAPER_INTERVAL_SECONDS = float(os.getenv("SESSION_REAPER_INTERVAL", "60"))
+HISTORY_PRUNE_INTERVAL_SECONDS = 3600
+
 
 class SessionManager:
-    """Session management for ADK system - direct migration from current system"""
+    """
+    Session management for ADK system - direct migration from current system
+
+    Sessions are persisted through a pluggable SessionStore (in-memory,
+    SQLite or Redis, see session_store.py) so agent replicas can share them.
+    The default in-memory store is LRU-bounded with timing-wheel expiry, and
+    an optional background reaper thread purges expired sessions.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_SESSION_TTL_SECONDS,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        reaper_interval_seconds: float = DEFAULT_REAPER_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[SessionStore] = None,
+        history: Optional[ConversationHistory] = None
+    ):
         self.name = "session_manager"
         self.description = "Manage customer sessions - migrated from current system"
-        # Use same session storage as current system
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.reaper_interval_seconds = reaper_interval_seconds
+        self.store = store or InMemorySessionStore(
+            max_sessions=max_sessions,
+            tick_seconds=max(1.0, ttl_seconds / 1440),
+            clock=clock
+        )
+        # Shared backends keep spilled turns in the store so every replica can
+        # read them; the local spill directory only serves a single process
+        if history is None and not isinstance(self.store, InMemorySessionStore):
+            history = ConversationHistory(
+                store=getattr(self.store, "backend", self.store),
+                segment_ttl_seconds=ttl_seconds
+            )
+        self.history = history or ConversationHistory()
+        self._lock = threading.Lock()
+        self._last_history_prune = time.monotonic()
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
         self.logger = logging.getLogger(__name__)
     
+    @property
+    def sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Locally held sessions (empty for shared backends)"""
+        return getattr(self.store, "sessions", {})
+    
     def create_session(self, customer_id: Optional[str] = None) -> str:
         """Create a new session"""
         session_id = str(uuid.uuid4())
@@ -33,37 +91,44 @@ class SessionManager:
             "context": {}
         }
         
-        self.sessions[session_id] = session_data
+        with phase("session_io"):
+            self.store.put(session_id, session_data, self.ttl_seconds)
         self.logger.info(f"Created session {session_id} for customer {customer_id}")
         return session_id
     
     def get_session_data(self, session_id: str) -> Dict[str, Any]:
         """Get session data - same as current system"""
-        if session_id not in self.sessions:
-            # Create default session if not exists
-            return {
-                "session_id": session_id,
-                "authenticated": False,
-                "customer_id": None,
-                "conversation_history": [],
-                "preferences": {},
-                "context": {},
-                "created_at": datetime.now().isoformat(),
-                "last_activity": datetime.now().isoformat()
-            }
+        # Read and slide the idle deadline in one store round trip
+        with phase("session_io"):
+            entry = self.store.get(session_id, refresh_ttl=self.ttl_seconds)
+        if entry is not None:
+            # Update last activity
+            session_data = entry[1]
+            session_data["last_activity"] = datetime.now().isoformat()
+            with phase("session_io"):
+                self.history.refresh(session_id, session_data, self.ttl_seconds)
+            return session_data
         
-        # Update last activity
-        self.sessions[session_id]["last_activity"] = datetime.now().isoformat()
-        return self.sessions[session_id]
+        # Create default session if not exists
+        return {
+            "session_id": session_id,
+            "authenticated": False,
+            "customer_id": None,
+            "conversation_history": [],
+            "preferences": {},
+            "context": {},
+            "created_at": datetime.now().isoformat(),
+            "last_activity": datetime.now().isoformat()
+        }
     
     def update_session(self, session_id: str, updates: Dict[str, Any]) -> bool:
         """Update session - same as current system"""
         try:
-            if session_id not in self.sessions:
-                self.sessions[session_id] = self.get_session_data(session_id)
-            
-            self.sessions[session_id].update(updates)
-            self.sessions[session_id]["last_activity"] = datetime.now().isoformat()
+            session_data = self.get_session_data(session_id)
+            session_data.update(updates)
+            session_data["last_activity"] = datetime.now().isoformat()
+            with phase("session_io"):
+                self.store.put(session_id, session_data, self.ttl_seconds)
             
             self.logger.debug(f"Updated session {session_id}")
             return True
@@ -72,6 +137,13 @@ class SessionManager:
             self.logger.error(f"Error updating session {session_id}: {str(e)}")
             return False
     
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session together with its spilled conversation history"""
+        with phase("session_io"):
+            entry = self.store.get(session_id)
+            self.history.drop(session_id, entry[1] if entry is not None else None)
+            return self.store.delete(session_id)
+    
     def authenticate_customer(self, session_id: str, customer_id: str) -> bool:
         """Authenticate customer - current system logic"""
         try:
@@ -101,8 +173,11 @@ class SessionManager:
                 "intent": intent
             }
             
-            session_data["conversation_history"].append(conversation_entry)
-            self.update_session(session_id, {"conversation_history": session_data["conversation_history"]})
+            # Appends to the bounded window; older turns spill to segments
+            self.history.append(session_id, session_data, conversation_entry)
+            session_data["last_activity"] = datetime.now().isoformat()
+            with phase("session_io"):
+                self.store.put(session_id, session_data, self.ttl_seconds)
             
             return True
             
@@ -113,47 +188,67 @@ class SessionManager:
     def get_conversation_history(self, session_id: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get conversation history for session"""
         session_data = self.get_session_data(session_id)
-        history = session_data.get("conversation_history", [])
         
         # Return most recent entries
-        return history[-limit:] if len(history) > limit else history
+        return self.history.last(session_id, session_data, limit)
     
     def validate_session(self, session_id: str) -> bool:
         """Validate session data"""
         if not session_id:
             return False
         
-        session_data = self.get_session_data(session_id)
-        
-        # Check if session is expired (24 hours)
-        try:
-            last_activity = datetime.fromisoformat(session_data.get("last_activity", ""))
-            if datetime.now() - last_activity > timedelta(hours=24):
-                self.logger.warning(f"Session {session_id} expired")
-                return False
-        except:
-            pass
+        # Check if session is expired (idle longer than the TTL)
+        with phase("session_io"):
+            touched = self.store.touch(session_id, self.ttl_seconds)
+        if touched == EXPIRED:
+            self.logger.warning(f"Session {session_id} expired")
+            return False
         
         return True
     
     def cleanup_expired_sessions(self) -> int:
         """Remove expired sessions"""
-        current_time = datetime.now()
-        expired_sessions = []
-        
-        for session_id, session_data in self.sessions.items():
+        removed = self.store.purge_expired()
+        if removed:
+            self.logger.info(f"Cleaned up {removed} expired sessions")
+        return removed
+    
+    def start_reaper(self) -> None:
+        """Run cleanup_expired_sessions on a daemon thread (idempotent)"""
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper_stop.clear()
+                self._reaper = threading.Thread(
+                    target=self._reap, name="session-reaper", daemon=True
+                )
+                self._reaper.start()
+    
+    def stop_reaper(self) -> None:
+        """Stop the background reaper"""
+        self._reaper_stop.set()
+        if self._reaper is not None:
+            self._reaper.join(timeout=5)
+            self._reaper = None
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Session store and expiry statistics"""
+        return {
+            **self.store.get_status(),
+            "history": self.history.get_status(),
+            "ttl_seconds": self.ttl_seconds,
+            "reaper_running": self._reaper is not None and self._reaper.is_alive()
+        }
+    
+    def _reap(self) -> None:
+        while not self._reaper_stop.wait(self.reaper_interval_seconds):
             try:
-                last_activity = datetime.fromisoformat(session_data.get("last_activity", ""))
-                if current_time - last_activity > timedelta(hours=24):
-                    expired_sessions.append(session_id)
-            except:
-                expired_sessions.append(session_id)  # Invalid timestamp
-        
-        for session_id in expired_sessions:
-            del self.sessions[session_id]
-            self.logger.info(f"Cleaned up expired session: {session_id}")
-        
-        return len(expired_sessions)
+                self.cleanup_expired_sessions()
+                # Disk-spilled history outlives its session; sweep it hourly
+                if time.monotonic() - self._last_history_prune >= HISTORY_PRUNE_INTERVAL_SECONDS:
+                    self._last_history_prune = time.monotonic()
+                    self.history.prune(self.ttl_seconds)
+            except Exception as e:
+                self.logger.error(f"Session reaper error: {str(e)}")
     
     def get_customer_context(self, session_id: str) -> Dict[str, Any]:
         """Extract customer context from session"""
@@ -164,7 +259,7 @@ class SessionManager:
             "authenticated": session_data.get("authenticated", False),
             "preferences": session_data.get("preferences", {}),
             "last_activity": session_data.get("last_activity"),
-            "conversation_count": len(session_data.get("conversation_history", [])),
+            "conversation_count": self.history.count(session_data),
             "session_duration": self._calculate_session_duration(session_data)
         }
     
@@ -240,9 +335,17 @@ class AuthenticationManager:
 
 
 # Factory functions
-def create_session_manager() -> SessionManager:
-    """Create session manager instance"""
-    return SessionManager()
+def create_session_manager(start_reaper: bool = True) -> SessionManager:
+    """Create session manager on the SESSION_STORE backend with its expiry reaper"""
+    manager = SessionManager(
+        store=create_session_store(
+            max_sessions=DEFAULT_MAX_SESSIONS,
+            tick_seconds=max(1.0, DEFAULT_SESSION_TTL_SECONDS / 1440)
+        )
+    )
+    if start_reaper:
+        manager.start_reaper()
+    return manager
 
 
 def create_auth_manager() -> AuthenticationManager:
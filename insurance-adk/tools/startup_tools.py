@@ -0,0 +1,285 @@
+"""
+Lazy Startup Helpers for ADK Agent Modules
+
+Keeps agent module import cheap: providers, toolsets and prompt files are
+built on first use, and connectivity checks run in the background and are
+reported through health status instead of blocking import.
+"""
+import contextvars
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    from google.adk.tools.base_toolset import BaseToolset
+except ImportError:  # ADK not installed - LazyToolset is unavailable
+    BaseToolset = None
+
+logger = logging.getLogger(__name__)
+
+
+class Lazy:
+    """Thread-safe value that is built by `factory` on first access"""
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        self._factory = factory
+        self._name = name or getattr(factory, "__name__", "lazy")
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._initialized = False
+        self.init_seconds: Optional[float] = None
+
+    def get(self) -> Any:
+        """Return the value, building it on first call"""
+        if self._initialized:
+            return self._value
+        with self._lock:
+            if not self._initialized:
+                start = time.perf_counter()
+                self._value = self._factory()
+                self.init_seconds = time.perf_counter() - start
+                self._initialized = True
+                logger.debug(f"Initialized {self._name} in {self.init_seconds:.3f}s")
+        return self._value
+
+    @property
+    def initialized(self) -> bool:
+        """Whether the value has been built"""
+        return self._initialized
+
+
+class BackgroundCheck:
+    """
+    Runs a connectivity check on a daemon thread.
+
+    The result is available through `get_status()` without ever blocking
+    the caller; status is "pending" until the first run completes.
+    """
+
+    def __init__(self, name: str, check: Callable[[], bool], interval_seconds: Optional[float] = None):
+        self.name = name
+        self._check = check
+        self._interval = interval_seconds
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._status: Dict[str, Any] = {"status": "pending", "last_checked": None}
+
+    def start(self) -> "BackgroundCheck":
+        """Start the check thread (idempotent)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"{self.name}-check", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop periodic checking"""
+        self._stop.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first result is available (for tests and scripts)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.get_status()["status"] == "pending":
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    @property
+    def healthy(self) -> bool:
+        """Latest check passed; False while pending"""
+        return self.get_status()["status"] == "healthy"
+
+    def get_status(self) -> Dict[str, Any]:
+        """Latest check result"""
+        with self._lock:
+            return dict(self._status)
+
+    def health_check(self) -> Any:
+        """
+        Latest result as a HealthCheckResult for the monitoring health checker.
+
+        Only reads the cached status, so /health/detailed never waits on the
+        network; a check that has not finished yet reports "unknown".
+        """
+        from monitoring.interfaces.health_checker import HealthCheckResult, HealthStatus
+
+        status = self.get_status()
+        state = {"healthy": HealthStatus.HEALTHY, "unhealthy": HealthStatus.UNHEALTHY}.get(
+            status["status"], HealthStatus.UNKNOWN
+        )
+        message = status.get("error") or f"Background check {status['status']}"
+        return HealthCheckResult(self.name, state, message, datetime.now(), metadata=status)
+
+    def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            try:
+                ok = bool(self._check())
+                status = {"status": "healthy" if ok else "unhealthy"}
+            except Exception as e:
+                status = {"status": "unhealthy", "error": str(e)}
+            status["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+            status["last_checked"] = datetime.now().isoformat()
+            with self._lock:
+                self._status = status
+
+            if not self._interval or self._stop.wait(self._interval):
+                return
+
+
+def lazy_instruction(loader: Callable[[], str]) -> Callable[..., str]:
+    """
+    Wrap a prompt loader as an ADK instruction provider.
+
+    The prompt file is read on the first agent turn rather than at import,
+    then cached for the life of the process.
+    """
+    prompt = Lazy(loader, name=getattr(loader, "__name__", "instruction"))
+
+    def provide_instruction(context: Any = None) -> str:
+        return prompt.get()
+
+    return provide_instruction
+
+
+def policy_server_reachable(url: Optional[str] = None, timeout_seconds: float = 5.0) -> bool:
+    """Whether the policy server answers HTTP at all (the MCP endpoint rejects plain GETs with 4xx)"""
+    import requests
+
+    response = requests.get(url or os.getenv("POLICY_SERVER_URL", "http://localhost:8001/mcp"), timeout=timeout_seconds)
+    return response.status_code < 500
+
+
+def create_policy_server_check(agent_name: str, check: Optional[Callable[[], bool]] = None) -> BackgroundCheck:
+    """
+    Periodic policy server connectivity check for an agent, started unless
+    MCP_STARTUP_CHECK=false. Named per agent because `adk web` serves every
+    agent from one process and they share one health checker.
+    """
+    background = BackgroundCheck(
+        f"{agent_name}_policy_server",
+        check or policy_server_reachable,
+        interval_seconds=float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30"))
+    )
+    if os.getenv("MCP_STARTUP_CHECK", "true").lower() == "true":
+        background.start()
+    return background
+
+
+def create_lazy_monitoring(agent_label: str, health_checks: Sequence[BackgroundCheck] = ()) -> Lazy:
+    """
+    Lazily build the shared MonitoringManager, or None if unavailable.
+
+    `health_checks` are registered with the manager's health checker when it
+    is built, so their latest results appear in /health/detailed.
+    """
+
+    def build():
+        try:
+            from monitoring.setup.monitoring_setup import get_monitoring_manager
+        except ImportError:
+            logger.info(f"ℹ️  {agent_label}: Monitoring not available")
+            return None
+        manager = get_monitoring_manager()
+        checker = manager.get_health_checker()
+        for check in health_checks:
+            checker.register_health_check(check.name, check.health_check, critical=False, ttl_seconds=1.0)
+        if manager.is_monitoring_enabled():
+            logger.info(f"✅ {agent_label}: Monitoring enabled")
+        else:
+            logger.info(f"ℹ️  {agent_label}: Monitoring disabled")
+        # `adk web` owns the app, so metrics are scraped from a side port
+        metrics_port = os.getenv("METRICS_PORT")
+        if metrics_port:
+            try:
+                from monitoring.setup.metrics_endpoint import start_metrics_server
+                start_metrics_server(int(metrics_port))
+            except (ImportError, OSError, ValueError) as e:
+                logger.warning(f"⚠️  {agent_label}: Metrics endpoint not started: {e}")
+        return manager
+
+    return Lazy(build, name=f"{agent_label} monitoring")
+
+
+_agent_span: contextvars.ContextVar[Optional[Any]] = contextvars.ContextVar("agent_span", default=None)
+
+
+def _start_agent_span(agent_label: str, manager: Any, callback_context: Any) -> None:
+    """Make the agent turn the current span, continuing the UI's trace from session state."""
+    provider = manager.get_distributed_trace_provider() if hasattr(manager, "get_distributed_trace_provider") else None
+    if provider is None or _agent_span.get() is not None:
+        return
+    state = getattr(callback_context, "state", None)
+    carrier = state.get("trace_context") if state is not None else None
+    span = provider.start_trace(agent_label, attributes={"agent": agent_label}, carrier=carrier, kind="server")
+    span.__enter__()
+    _agent_span.set((agent_label, span))
+
+
+def _end_agent_span(agent_label: str) -> None:
+    current = _agent_span.get()
+    if current is not None and current[0] == agent_label:
+        _agent_span.set(None)
+        current[1].__exit__(None, None, None)
+
+
+def create_request_timing_callbacks(agent_label: str, monitoring: Optional[Callable[[], Any]] = None):
+    """
+    Build before/after agent callbacks that time and trace each agent turn.
+
+    `adk web` owns the HTTP response, so the breakdown is recorded to the
+    current span and the request_phase_duration_seconds histogram instead of
+    a Server-Timing header. The turn's span continues the W3C trace context
+    the UI puts in session state ("trace_context"), so policy tool calls made
+    during the turn join the UI's trace. Sub-agent turns fold into the outer turn.
+    """
+
+    def before_agent(callback_context: Any = None) -> None:
+        manager = monitoring() if monitoring else None
+        if manager is None:
+            return None
+        _start_agent_span(agent_label, manager, callback_context)
+        from monitoring.setup.request_timing import begin_request, current_timings
+        if current_timings() is None:
+            begin_request(agent_label)
+        return None
+
+    def after_agent(callback_context: Any = None) -> None:
+        manager = monitoring() if monitoring else None
+        if manager is None:
+            return None
+        from monitoring.setup.request_timing import current_timings, end_request
+        timings = current_timings()
+        if timings is not None and timings.name == agent_label:
+            manager.record_request_timings(end_request(timings))
+        _end_agent_span(agent_label)
+        return None
+
+    return before_agent, after_agent
+
+
+if BaseToolset is not None:
+
+    class LazyToolset(BaseToolset):
+        """ADK toolset that builds the wrapped toolset on first tool discovery"""
+
+        def __init__(self, factory: Callable[[], Any], name: str = "toolset"):
+            super().__init__()
+            self._inner = Lazy(factory, name=name)
+
+        async def get_tools(self, readonly_context: Any = None) -> List[Any]:
+            inner = self._inner.get()
+            if inner is None:
+                return []
+            return await inner.get_tools(readonly_context)
+
+        async def close(self) -> None:
+            if self._inner.initialized and self._inner.get() is not None:
+                await self._inner.get().close()
@@ -4,8 +4,13 @@ Monitoring middleware for automatic instrumentation.
 
 from .fastapi_middleware import MonitoringMiddleware
 from .mcp_middleware import MCPMonitoringWrapper
+from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError, CircuitState
 
 __all__ = [
     "MonitoringMiddleware",
-    "MCPMonitoringWrapper"
-] 
\ No newline at end of file
+    "MCPMonitoringWrapper",
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
+    "CircuitOpenError",
+    "CircuitState"
+] 
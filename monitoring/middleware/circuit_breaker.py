@@ -0,0 +1,217 @@
+"""
+Circuit Breaker
+
+Per-endpoint circuit breaker for outbound MCP calls.
+Trips on error rate or slow-call rate so callers fail fast instead of
+waiting out full timeouts while the policy server is unhealthy.
+"""
+
+import time
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Any, Optional, Callable, Deque, Tuple
+
+
+class CircuitState(Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Thresholds controlling when a circuit opens and recovers"""
+    failure_rate_threshold: float = 0.5
+    slow_call_rate_threshold: float = 0.5
+    slow_call_duration_seconds: float = 5.0
+    window_size: int = 20
+    minimum_calls: int = 5
+    open_duration_seconds: float = 30.0
+    half_open_max_calls: int = 1
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, endpoint: str, retry_after_seconds: float):
+        self.endpoint = endpoint
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"Circuit for {endpoint} is open; retry in {retry_after_seconds:.1f}s"
+        )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a rolling window of recent call outcomes.
+
+    CLOSED: calls flow normally; outcomes are tracked in the window.
+    OPEN: calls are rejected until open_duration_seconds has elapsed.
+    HALF_OPEN: a limited number of probe calls decide whether to close or re-open.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: Optional[CircuitBreakerConfig] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Endpoint name the breaker protects
+            config: Optional thresholds, defaults to CircuitBreakerConfig()
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._state = CircuitState.CLOSED
+        # Each entry is (failed, slow)
+        self._window: Deque[Tuple[bool, bool]] = deque(maxlen=self.config.window_size)
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+
+        self._rejected_calls = 0
+        self._times_opened = 0
+        self._last_failure: Optional[str] = None
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, advancing OPEN -> HALF_OPEN once the cool-down has elapsed."""
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            True if the call is permitted, False if it should be short-circuited
+        """
+        with self._lock:
+            self._maybe_half_open()
+
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            if self._state == CircuitState.HALF_OPEN:
+                if self._half_open_in_flight < self.config.half_open_max_calls:
+                    self._half_open_in_flight += 1
+                    return True
+
+            self._rejected_calls += 1
+            return False
+
+    def record_success(self, duration_seconds: float) -> None:
+        """Record a successful call and its duration."""
+        slow = duration_seconds >= self.config.slow_call_duration_seconds
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if slow:
+                    self._trip()
+                    return
+                self._half_open_successes += 1
+                if self._half_open_successes >= self.config.half_open_max_calls:
+                    self._close()
+                return
+
+            self._window.append((False, slow))
+            self._evaluate()
+
+    def record_failure(self, duration_seconds: float, error: Optional[str] = None) -> None:
+        """Record a failed call and its duration."""
+        slow = duration_seconds >= self.config.slow_call_duration_seconds
+        with self._lock:
+            self._last_failure = error
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._trip()
+                return
+
+            self._window.append((True, slow))
+            self._evaluate()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call that ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def retry_after_seconds(self) -> float:
+        """Seconds until an open circuit will admit a probe call."""
+        with self._lock:
+            if self._state != CircuitState.OPEN:
+                return 0.0
+            remaining = self._opened_at + self.config.open_duration_seconds - self._clock()
+            return max(0.0, remaining)
+
+    def reset(self) -> None:
+        """Force the circuit back to CLOSED and clear history."""
+        with self._lock:
+            self._close()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get a snapshot of breaker state for status endpoints."""
+        with self._lock:
+            self._maybe_half_open()
+            calls = len(self._window)
+            failures = sum(1 for failed, _ in self._window if failed)
+            slow_calls = sum(1 for _, slow in self._window if slow)
+            return {
+                "state": self._state.value,
+                "window_calls": calls,
+                "failure_rate": failures / calls if calls else 0.0,
+                "slow_call_rate": slow_calls / calls if calls else 0.0,
+                "rejected_calls": self._rejected_calls,
+                "times_opened": self._times_opened,
+                "last_failure": self._last_failure,
+            }
+
+    # Internal transitions - callers must hold self._lock
+
+    def _maybe_half_open(self) -> None:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.config.open_duration_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+            self._half_open_successes = 0
+
+    def _evaluate(self) -> None:
+        calls = len(self._window)
+        if calls < self.config.minimum_calls:
+            return
+
+        failures = sum(1 for failed, _ in self._window if failed)
+        slow_calls = sum(1 for _, slow in self._window if slow)
+
+        if (
+            failures / calls >= self.config.failure_rate_threshold
+            or slow_calls / calls >= self.config.slow_call_rate_threshold
+        ):
+            self._trip()
+
+    def _trip(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = self._clock()
+        self._times_opened += 1
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._window.clear()
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._half_open_in_flight = 0
+        self._half_open_successes = 0
+        self._window.clear()
@@ -12,6 +12,8 @@ from starlette.requests import Request
 from starlette.responses import Response
 
 from ..setup.monitoring_setup import get_monitoring_manager
+from ..providers.opentelemetry_provider import DummyTraceContext
+from ..setup.request_timing import begin_request, end_request
 
 
 class MonitoringMiddleware(BaseHTTPMiddleware):
@@ -23,6 +25,10 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
     - Request/response sizes
     - Status codes and error rates
     - Request paths and methods
+    - A server span per request, continuing the caller's W3C trace context
+      when OpenTelemetry tracing is configured
+    - A per-phase latency breakdown (see request_timing), returned in the
+      Server-Timing response header
     """
 
     def __init__(self, app, exclude_paths: list = None):
@@ -67,8 +73,26 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         # Record request start time
         start_time = time.time()
         
-        # Process request
-        response = await call_next(request)
+        # Process request inside a server span so downstream calls inherit the trace
+        tracing = self.monitoring.get_distributed_trace_provider()
+        span = tracing.start_trace(
+            f"{method} {path}",
+            attributes={"http.method": method, "http.route": path},
+            carrier=request.headers,
+            kind="server"
+        ) if tracing else DummyTraceContext()
+        with span:
+            timings = begin_request(f"{method} {path}")
+            try:
+                response = await call_next(request)
+            finally:
+                end_request(timings)
+            span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                span.set_status("error", f"HTTP {response.status_code}")
+            if timings is not None:
+                response.headers["Server-Timing"] = timings.server_timing_header()
+                self.monitoring.record_request_timings(timings)
         
         # Calculate duration
         duration = time.time() - start_time
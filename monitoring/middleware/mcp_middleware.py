@@ -5,12 +5,18 @@ Wrapper for MCP client calls to add monitoring and observability.
 Automatically tracks MCP tool calls, performance, and errors.
 """
 
+import json
 import time
 import asyncio
-from typing import Dict, Any, Optional, Callable
+import inspect
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Tuple
 from functools import wraps
 
 from ..setup.monitoring_setup import get_monitoring_manager
+from ..providers.opentelemetry_provider import inject_trace_context
+from ..setup.request_timing import begin_request, end_request, phase
+from .circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitOpenError
 
 
 class MCPMonitoringWrapper:
@@ -22,20 +28,60 @@ class MCPMonitoringWrapper:
     - Call duration and performance
     - Retry attempts and patterns
     - Error types and frequencies
+
+    Calls are guarded by a per-endpoint circuit breaker. While the circuit
+    is open, calls fail fast with CircuitOpenError or, when enabled, are
+    served from the last successful result for the same tool and parameters.
+
+    With OpenTelemetry tracing configured, each attempt runs in a client span
+    whose W3C trace context is sent in the request `_meta` when the client's
+    call_tool accepts `meta` (FastMCP and MCP SDK clients do).
     """
 
-    def __init__(self, mcp_client, tool_prefix: str = ""):
+    def __init__(
+        self,
+        mcp_client,
+        tool_prefix: str = "",
+        endpoint: Optional[str] = None,
+        breaker_config: Optional[CircuitBreakerConfig] = None,
+        serve_stale_on_open: bool = True,
+        stale_ttl_seconds: float = 300.0,
+        stale_cache_size: int = 256
+    ):
         """
         Initialize MCP monitoring wrapper.
         
         Args:
             mcp_client: Original MCP client instance
             tool_prefix: Optional prefix for tool names in metrics
+            endpoint: Endpoint name for the circuit breaker (default: tool_prefix or "mcp")
+            breaker_config: Optional circuit breaker thresholds
+            serve_stale_on_open: Return cached results while the circuit is open
+            stale_ttl_seconds: Maximum age of a cached result served as fallback
+            stale_cache_size: Maximum number of cached results kept for fallback
         """
         self.mcp_client = mcp_client
         self.tool_prefix = tool_prefix
         self.monitoring = get_monitoring_manager()
 
+        self.endpoint = endpoint or tool_prefix.rstrip("_.:") or "mcp"
+        self.circuit_breaker = self.monitoring.register_circuit_breaker(
+            self.endpoint, CircuitBreaker(self.endpoint, breaker_config)
+        )
+        if breaker_config is not None and self.circuit_breaker.config != breaker_config:
+            print(
+                f"Warning: Circuit breaker for {self.endpoint} already registered with "
+                f"{self.circuit_breaker.config}; ignoring breaker_config {breaker_config}"
+            )
+        self.serve_stale_on_open = serve_stale_on_open
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.stale_cache_size = stale_cache_size
+        self._stale_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        try:
+            self._accepts_meta = "meta" in inspect.signature(mcp_client.call_tool).parameters
+        except (AttributeError, TypeError, ValueError):
+            self._accepts_meta = False
+
     async def call_tool(
         self, 
         tool_name: str, 
@@ -52,22 +98,23 @@ class MCPMonitoringWrapper:
             
         Returns:
             Tool call result
+
+        Raises:
+            CircuitOpenError: If the circuit is open and no cached result is available
         """
         prefixed_tool_name = f"{self.tool_prefix}{tool_name}" if self.tool_prefix else tool_name
         start_time = time.time()
         retry_count = 0
+
+        if not self.circuit_breaker.allow_request():
+            return self._short_circuit(tool_name, parameters, prefixed_tool_name)
         
         try:
-            # Call the original MCP tool
-            if timeout:
-                result = await asyncio.wait_for(
-                    self.mcp_client.call_tool(tool_name, parameters),
-                    timeout=timeout
-                )
-            else:
-                result = await self.mcp_client.call_tool(tool_name, parameters)
+            result = await self._invoke(tool_name, parameters, timeout)
             
             duration = time.time() - start_time
+            self.circuit_breaker.record_success(duration)
+            self._remember(tool_name, parameters, result)
             
             # Record successful call
             if self.monitoring.is_monitoring_enabled():
@@ -79,9 +126,14 @@ class MCPMonitoringWrapper:
                 )
             
             return result
+
+        except asyncio.CancelledError:
+            self.circuit_breaker.release()
+            raise
             
         except Exception as e:
             duration = time.time() - start_time
+            self.circuit_breaker.record_failure(duration, type(e).__name__)
             
             # Record failed call
             if self.monitoring.is_monitoring_enabled():
@@ -106,6 +158,9 @@ class MCPMonitoringWrapper:
         """
         Call MCP tool with retry logic and monitoring.
         
+        Retries stop as soon as the circuit opens, so a failing endpoint
+        does not keep absorbing retry traffic.
+        
         Args:
             tool_name: Name of the tool to call
             parameters: Tool parameters
@@ -115,22 +170,24 @@ class MCPMonitoringWrapper:
             
         Returns:
             Tool call result
+
+        Raises:
+            CircuitOpenError: If the circuit is open and no cached result is available
         """
         prefixed_tool_name = f"{self.tool_prefix}{tool_name}" if self.tool_prefix else tool_name
         start_time = time.time()
-        last_exception = None
         
         for attempt in range(max_retries + 1):
+            if not self.circuit_breaker.allow_request():
+                return self._short_circuit(tool_name, parameters, prefixed_tool_name)
+
+            attempt_start = time.time()
             try:
-                if timeout:
-                    result = await asyncio.wait_for(
-                        self.mcp_client.call_tool(tool_name, parameters),
-                        timeout=timeout
-                    )
-                else:
-                    result = await self.mcp_client.call_tool(tool_name, parameters)
+                result = await self._invoke(tool_name, parameters, timeout)
                 
                 duration = time.time() - start_time
+                self.circuit_breaker.record_success(time.time() - attempt_start)
+                self._remember(tool_name, parameters, result)
                 
                 # Record successful call with retry count
                 if self.monitoring.is_monitoring_enabled():
@@ -142,9 +199,13 @@ class MCPMonitoringWrapper:
                     )
                 
                 return result
+
+            except asyncio.CancelledError:
+                self.circuit_breaker.release()
+                raise
                 
             except Exception as e:
-                last_exception = e
+                self.circuit_breaker.record_failure(time.time() - attempt_start, type(e).__name__)
                 
                 # If this was the last attempt, record failure
                 if attempt == max_retries:
@@ -165,6 +226,81 @@ class MCPMonitoringWrapper:
                 if retry_delay > 0:
                     await asyncio.sleep(retry_delay)
 
+    async def _invoke(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float]
+    ) -> Any:
+        """Call the underlying MCP client in a client span, applying the timeout if given."""
+        tracing = self.monitoring.get_distributed_trace_provider()
+        if tracing is None:
+            return await self._call_client(tool_name, parameters, timeout)
+
+        with tracing.start_span(
+            f"mcp.call_tool {tool_name}",
+            attributes={"mcp.tool_name": tool_name, "mcp.endpoint": self.endpoint},
+            kind="client"
+        ):
+            meta = inject_trace_context({}) if self._accepts_meta else None
+            return await self._call_client(tool_name, parameters, timeout, meta)
+
+    async def _call_client(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float],
+        meta: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Await the client's call_tool, passing trace context `meta` when present."""
+        call = (
+            self.mcp_client.call_tool(tool_name, parameters, meta=meta) if meta
+            else self.mcp_client.call_tool(tool_name, parameters)
+        )
+        with phase("mcp"):
+            if timeout:
+                return await asyncio.wait_for(call, timeout=timeout)
+            return await call
+
+    def _short_circuit(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        prefixed_tool_name: str
+    ) -> Any:
+        """Serve a rejected call from the stale cache or raise CircuitOpenError."""
+        if self.serve_stale_on_open:
+            cached = self._stale_cache.get(self._cache_key(tool_name, parameters))
+            if cached and time.monotonic() - cached[0] <= self.stale_ttl_seconds:
+                if self.monitoring.is_monitoring_enabled():
+                    self.monitoring.increment_counter(
+                        'mcp_circuit_stale_responses_total',
+                        labels={'endpoint': self.endpoint, 'tool_name': prefixed_tool_name}
+                    )
+                return cached[1]
+
+        if self.monitoring.is_monitoring_enabled():
+            self.monitoring.increment_counter(
+                'mcp_circuit_rejections_total',
+                labels={'endpoint': self.endpoint, 'tool_name': prefixed_tool_name}
+            )
+        raise CircuitOpenError(self.endpoint, self.circuit_breaker.retry_after_seconds())
+
+    def _remember(self, tool_name: str, parameters: Dict[str, Any], result: Any) -> None:
+        """Keep the latest successful result for stale fallback."""
+        if not self.serve_stale_on_open:
+            return
+        key = self._cache_key(tool_name, parameters)
+        self._stale_cache[key] = (time.monotonic(), result)
+        self._stale_cache.move_to_end(key)
+        while len(self._stale_cache) > self.stale_cache_size:
+            self._stale_cache.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(tool_name: str, parameters: Dict[str, Any]) -> str:
+        """Build a stable cache key from tool name and parameters."""
+        return f"{tool_name}:{json.dumps(parameters, sort_keys=True, default=str)}"
+
     def __getattr__(self, name):
         """
         Forward other attributes to the original MCP client.
@@ -283,15 +419,138 @@ class MCPCallContext:
         self.metadata[key] = value
 
 
-def create_monitored_mcp_client(original_client, tool_prefix: str = ""):
+def _request_meta(context) -> Dict[str, Any]:
+    """MCP `_meta` of a tools/call request, from the params or the FastMCP request context."""
+    meta = getattr(context.message, "meta", None)
+    if not meta and context.fastmcp_context is not None:
+        try:
+            meta = context.fastmcp_context.request_context.meta
+        except (AttributeError, RuntimeError):
+            meta = None
+    if hasattr(meta, "model_dump"):
+        meta = meta.model_dump()
+    return meta if isinstance(meta, dict) else {}
+
+
+def create_mcp_tracing_middleware():
+    """
+    Create a FastMCP server middleware that runs each tool call in a server
+    span, continuing the caller's trace from the request `_meta` or HTTP headers.
+
+    The monitoring manager is resolved on the first call so server import
+    does not pay for provider initialization. Returns None when the
+    installed FastMCP has no middleware support.
+    """
+    try:
+        from fastmcp.server.dependencies import get_http_headers
+        from fastmcp.server.middleware import Middleware
+    except ImportError:
+        return None
+
+    class MCPTracingMiddleware(Middleware):
+        """Wraps tools/call requests in server spans"""
+
+        async def on_call_tool(self, context, call_next):
+            tracing = get_monitoring_manager().get_distributed_trace_provider()
+            if tracing is None:
+                return await call_next(context)
+
+            tool_name = getattr(context.message, "name", "")
+            carrier = {**get_http_headers(), **_request_meta(context)}
+
+            with tracing.start_trace(
+                f"mcp.tool {tool_name}", attributes={"mcp.tool_name": tool_name}, carrier=carrier, kind="server"
+            ):
+                return await call_next(context)
+
+    return MCPTracingMiddleware()
+
+
+def create_mcp_timing_middleware():
+    """
+    Create a FastMCP server middleware that times each tool call by phase
+    (see request_timing) and exports the breakdown when the call ends.
+
+    The breakdown goes to the current span and the
+    request_phase_duration_seconds histogram only. Unlike
+    MonitoringMiddleware it cannot set a Server-Timing header, because
+    streamable-http runs tool calls on the MCP session task, outside the
+    HTTP request that carries the response headers.
+
+    Add it after the tracing middleware so the breakdown lands on the tool
+    call's span. Returns None when the installed FastMCP has no middleware support.
+    """
+    try:
+        from fastmcp.server.middleware import Middleware
+    except ImportError:
+        return None
+
+    class MCPTimingMiddleware(Middleware):
+        """Times tools/call requests"""
+
+        async def on_call_tool(self, context, call_next):
+            timings = begin_request(f"mcp.tool {getattr(context.message, 'name', '')}")
+            if timings is None:
+                return await call_next(context)
+            try:
+                return await call_next(context)
+            finally:
+                end_request(timings)
+                get_monitoring_manager().record_request_timings(timings)
+
+    return MCPTimingMiddleware()
+
+
+def create_timed_tool_decorator(server):
+    """
+    Create a drop-in replacement for `server.tool()` that charges the
+    encoding of each tool's return value to the "serialization" phase.
+
+    FastMCP converts a tool's return value to MCP content inside the tool
+    call, so the conversion is timed by overriding FunctionTool.convert_result.
+    Returns `server.tool` unchanged when the installed FastMCP has no such hook.
+    """
+    try:
+        from fastmcp.tools import FunctionTool
+    except ImportError:
+        return server.tool
+    if not hasattr(FunctionTool, "convert_result"):
+        return server.tool
+
+    class SerializationTimedTool(FunctionTool):
+        """FunctionTool whose result conversion is timed as serialization"""
+
+        def convert_result(self, raw_value):
+            with phase("serialization"):
+                return super().convert_result(raw_value)
+
+    def tool(**kwargs):
+        def register(fn):
+            server.add_tool(SerializationTimedTool.from_function(fn, **kwargs))
+            return fn
+        return register
+
+    return tool
+
+
+def create_monitored_mcp_client(
+    original_client,
+    tool_prefix: str = "",
+    endpoint: Optional[str] = None,
+    breaker_config: Optional[CircuitBreakerConfig] = None
+):
     """
     Create a monitored version of an MCP client.
     
     Args:
         original_client: Original MCP client instance
         tool_prefix: Optional prefix for tool names
+        endpoint: Optional endpoint name for the circuit breaker
+        breaker_config: Optional circuit breaker thresholds
         
     Returns:
         Monitored MCP client wrapper
     """
-    return MCPMonitoringWrapper(original_client, tool_prefix) 
\ No newline at end of file
+    return MCPMonitoringWrapper(
+        original_client, tool_prefix, endpoint=endpoint, breaker_config=breaker_config
+    ) 
\ No newline at end of file
@@ -5,9 +5,11 @@ Monitoring providers implementing the abstract interfaces.
 from .langfuse_provider import LangfuseProvider
 from .prometheus_provider import PrometheusProvider
 from .opentelemetry_provider import OpenTelemetryProvider
+from .health_provider import ConcurrentHealthChecker
 
 __all__ = [
     "LangfuseProvider",
     "PrometheusProvider", 
-    "OpenTelemetryProvider"
+    "OpenTelemetryProvider",
+    "ConcurrentHealthChecker"
 ] 
\ No newline at end of file
@@ -0,0 +1,324 @@
+"""
+Health Check Provider Implementation
+
+Implements HealthChecker with concurrent, individually cached checks.
+Each registered check runs with its own timeout and cache TTL; results are
+kept in a fixed-size ring buffer per component for history queries.
+"""
+
+import asyncio
+import concurrent.futures
+import inspect
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Deque, Tuple
+
+from ..interfaces.health_checker import HealthChecker, HealthCheckResult, HealthStatus, SystemHealth
+
+
+@dataclass
+class RegisteredCheck:
+    """A health check and its scheduling settings"""
+    component: str
+    function: Callable[[], Any]
+    critical: bool = True
+    timeout_seconds: float = 5.0
+    ttl_seconds: float = 15.0
+
+
+def _run_sync(coroutine: Any) -> Any:
+    """Run a coroutine from synchronous code, even when a loop is already running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+def result_to_dict(result: HealthCheckResult) -> Dict[str, Any]:
+    """JSON-friendly form of a HealthCheckResult."""
+    return {
+        "component": result.component,
+        "status": result.status.value,
+        "message": result.message,
+        "timestamp": result.timestamp.isoformat(),
+        "duration_ms": result.duration_ms,
+        "metadata": result.metadata or {}
+    }
+
+
+def system_health_to_dict(health: SystemHealth) -> Dict[str, Any]:
+    """JSON-friendly form of a SystemHealth summary."""
+    return {
+        "status": health.overall_status.value,
+        "timestamp": health.timestamp.isoformat(),
+        "components": {result.component: result_to_dict(result) for result in health.components},
+        "summary": {
+            "total_checks": health.total_checks,
+            "healthy_checks": health.healthy_checks,
+            "degraded_checks": health.degraded_checks,
+            "unhealthy_checks": health.unhealthy_checks
+        }
+    }
+
+
+class ConcurrentHealthChecker(HealthChecker):
+    """
+    HealthChecker that runs registered checks concurrently on asyncio.
+
+    Check functions may be sync or async and return a HealthCheckResult, a
+    HealthStatus, a bool, or None (healthy); raising marks the component
+    unhealthy. Results are cached per component for its TTL, and concurrent
+    callers share a single in-flight check. With serve_stale, an expired
+    result is returned immediately while a refresh runs in the background.
+    """
+
+    def __init__(
+        self,
+        default_timeout_seconds: float = 5.0,
+        default_ttl_seconds: float = 15.0,
+        history_size: int = 100,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize health checker.
+
+        Args:
+            default_timeout_seconds: Timeout for checks registered without one
+            default_ttl_seconds: Cache TTL for checks registered without one
+            history_size: Results kept per component
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.default_timeout_seconds = default_timeout_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+        self.history_size = history_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checks: Dict[str, RegisteredCheck] = {}
+        self._cache: Dict[str, Tuple[HealthCheckResult, float]] = {}
+        self._history: Dict[str, Deque[HealthCheckResult]] = {}
+        self._inflight: Dict[str, "asyncio.Future[HealthCheckResult]"] = {}
+
+    def register_health_check(
+        self,
+        component_name: str,
+        check_function: callable,
+        critical: bool = True,
+        timeout_seconds: Optional[float] = None,
+        ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        Register a health check for a component.
+
+        Args:
+            component_name: Name of the component
+            check_function: Function that performs the health check
+            critical: Whether this component is critical for overall health
+            timeout_seconds: Per-check timeout, defaults to default_timeout_seconds
+            ttl_seconds: How long a result is reused, defaults to default_ttl_seconds
+        """
+        with self._lock:
+            self._checks[component_name] = RegisteredCheck(
+                component_name,
+                check_function,
+                critical,
+                timeout_seconds if timeout_seconds is not None else self.default_timeout_seconds,
+                ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+            )
+            self._cache.pop(component_name, None)
+            self._history.setdefault(component_name, deque(maxlen=self.history_size))
+
+    def unregister_health_check(self, component_name: str) -> None:
+        """Stop checking a component (its history is kept)."""
+        with self._lock:
+            self._checks.pop(component_name, None)
+            self._cache.pop(component_name, None)
+
+    def get_registered_components(self) -> List[str]:
+        """Names of all registered components."""
+        with self._lock:
+            return list(self._checks)
+
+    async def _execute(self, check: RegisteredCheck) -> HealthCheckResult:
+        """Run one check with its timeout and normalize the outcome."""
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(check.function):
+                outcome = await asyncio.wait_for(check.function(), check.timeout_seconds)
+            else:
+                outcome = await asyncio.wait_for(asyncio.to_thread(check.function), check.timeout_seconds)
+            result = self._normalize(check.component, outcome)
+            result.component = check.component
+        except asyncio.TimeoutError:
+            result = HealthCheckResult(
+                check.component, HealthStatus.UNHEALTHY,
+                f"Health check timed out after {check.timeout_seconds}s", datetime.now()
+            )
+        except Exception as e:
+            result = HealthCheckResult(
+                check.component, HealthStatus.UNHEALTHY, f"Health check failed: {e}", datetime.now()
+            )
+
+        if result.duration_ms is None:
+            result.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        metadata = dict(result.metadata or {})
+        metadata.setdefault("critical", check.critical)
+        result.metadata = metadata
+
+        with self._lock:
+            if self._checks.get(check.component) is check:
+                self._cache[check.component] = (result, self._clock())
+            self._history.setdefault(check.component, deque(maxlen=self.history_size)).append(result)
+        return result
+
+    @staticmethod
+    def _normalize(component: str, outcome: Any) -> HealthCheckResult:
+        if isinstance(outcome, HealthCheckResult):
+            return outcome
+        if isinstance(outcome, HealthStatus):
+            return HealthCheckResult(component, outcome, outcome.value, datetime.now())
+        if outcome is None or outcome is True:
+            return HealthCheckResult(component, HealthStatus.HEALTHY, "OK", datetime.now())
+        if outcome is False:
+            return HealthCheckResult(component, HealthStatus.UNHEALTHY, "Check reported failure", datetime.now())
+        raise TypeError(f"Unsupported health check result: {type(outcome).__name__}")
+
+    def _start(self, check: RegisteredCheck) -> "asyncio.Future[HealthCheckResult]":
+        """Start a check unless one is already in flight for the component."""
+        future = self._inflight.get(check.component)
+        if future is None or future.done() or future.get_loop() is not asyncio.get_running_loop():
+            future = asyncio.ensure_future(self._execute(check))
+            self._inflight[check.component] = future
+            future.add_done_callback(lambda f, name=check.component: self._finished(name, f))
+        return future
+
+    def _finished(self, component: str, future: "asyncio.Future[HealthCheckResult]") -> None:
+        if self._inflight.get(component) is future:
+            del self._inflight[component]
+
+    async def check_component_health_async(
+        self,
+        component_name: str,
+        force: bool = False,
+        serve_stale: bool = False
+    ) -> HealthCheckResult:
+        """
+        Check one component, reusing its cached result while fresh.
+
+        Args:
+            component_name: Name of component to check
+            force: Ignore the cache and check now
+            serve_stale: Return an expired cached result and refresh in the background
+        """
+        with self._lock:
+            check = self._checks.get(component_name)
+            cached = self._cache.get(component_name)
+        if check is None:
+            return HealthCheckResult(
+                component_name, HealthStatus.UNKNOWN, "No health check registered", datetime.now()
+            )
+
+        if cached and not force:
+            result, checked_at = cached
+            if self._clock() - checked_at < check.ttl_seconds:
+                return result
+            if serve_stale:
+                self._start(check)
+                return result
+        return await asyncio.shield(self._start(check))
+
+    async def check_all_health_async(self, force: bool = False, serve_stale: bool = False) -> SystemHealth:
+        """Check every registered component concurrently and aggregate the results."""
+        components = self.get_registered_components()
+        results = await asyncio.gather(*(
+            self.check_component_health_async(name, force, serve_stale) for name in components
+        ))
+        return self.aggregate(list(results))
+
+    def check_component_health(self, component_name: str) -> HealthCheckResult:
+        """Check the health of a specific component."""
+        return _run_sync(self.check_component_health_async(component_name))
+
+    def check_all_health(self) -> SystemHealth:
+        """Check the health of all registered components."""
+        return _run_sync(self.check_all_health_async())
+
+    def get_cached_health(self) -> SystemHealth:
+        """Aggregate of the latest cached results without running any check."""
+        with self._lock:
+            results = [self._cache[name][0] for name in self._checks if name in self._cache]
+        return self.aggregate(results)
+
+    def aggregate(self, results: List[HealthCheckResult]) -> SystemHealth:
+        """
+        Combine component results into a SystemHealth.
+
+        Any unhealthy critical component makes the system unhealthy; unhealthy
+        non-critical or degraded components make it degraded.
+        """
+        with self._lock:
+            critical = {name: check.critical for name, check in self._checks.items()}
+
+        healthy = sum(1 for result in results if result.status == HealthStatus.HEALTHY)
+        degraded = sum(1 for result in results if result.status == HealthStatus.DEGRADED)
+        unhealthy = sum(1 for result in results if result.status == HealthStatus.UNHEALTHY)
+
+        if not results:
+            overall = HealthStatus.UNKNOWN
+        elif any(result.status == HealthStatus.UNHEALTHY and critical.get(result.component, True)
+                 for result in results):
+            overall = HealthStatus.UNHEALTHY
+        elif healthy < len(results):
+            overall = HealthStatus.DEGRADED
+        else:
+            overall = HealthStatus.HEALTHY
+
+        return SystemHealth(
+            overall_status=overall,
+            components=results,
+            timestamp=datetime.now(),
+            total_checks=len(results),
+            healthy_checks=healthy,
+            degraded_checks=degraded,
+            unhealthy_checks=unhealthy
+        )
+
+    def get_health_history(
+        self,
+        component_name: Optional[str] = None,
+        hours: int = 24
+    ) -> List[HealthCheckResult]:
+        """Health check results from the last `hours`, oldest first."""
+        cutoff = datetime.now() - timedelta(hours=hours)
+        with self._lock:
+            if component_name is not None:
+                buffers = [self._history.get(component_name, ())]
+            else:
+                buffers = list(self._history.values())
+            results = [result for buffer in buffers for result in buffer if result.timestamp >= cutoff]
+        return sorted(results, key=lambda result: result.timestamp)
+
+
+def http_health_check(
+    url: str,
+    healthy_statuses: Tuple[int, ...] = (200,),
+    timeout_seconds: float = 5.0
+) -> Callable[[], Any]:
+    """Build an async check that GETs `url` and expects one of `healthy_statuses`."""
+
+    async def check() -> HealthCheckResult:
+        import httpx
+
+        async with httpx.AsyncClient(timeout=timeout_seconds) as client:
+            response = await client.get(url)
+        status = HealthStatus.HEALTHY if response.status_code in healthy_statuses else HealthStatus.UNHEALTHY
+        return HealthCheckResult(
+            url, status, f"HTTP {response.status_code}", datetime.now(),
+            metadata={"url": url, "status_code": response.status_code}
+        )
+
+    return check
@@ -9,10 +9,12 @@ import os
 import time
 from typing import Dict, Any, Optional, ContextManager
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from ..interfaces.metrics_collector import LLMMetricsCollector
 from ..interfaces.trace_provider import LLMTraceProvider, SpanContext
+from .llm_sampling import LLMTraceSampler
+from .prometheus_provider import _json_env
 
 
 class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
@@ -23,13 +25,36 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
     - LANGFUSE_SECRET_KEY: Langfuse secret key
     - LANGFUSE_PUBLIC_KEY: Langfuse public key  
     - LANGFUSE_HOST: Langfuse host (optional, defaults to cloud)
+
+    Optional environment variables:
+    - LANGFUSE_SAMPLE_RATE: Share of LLM calls traced (default: 1.0)
+    - LANGFUSE_SAMPLE_ERRORS: Always trace failed calls (default: true)
+    - LANGFUSE_SAMPLING_RULES: JSON per-field rates, e.g. {"customer_id": {"CUST-001": 1.0}}
+    - LANGFUSE_MAX_CONTENT_CHARS: Truncate prompts/completions beyond this length (default: 0, no limit)
+    - LANGFUSE_HASH_CONTENT: Send a SHA-256 digest instead of prompts/completions (default: false)
+    - LANGFUSE_FLUSH_AT: Events per background batch (default: 50)
+    - LANGFUSE_FLUSH_INTERVAL: Seconds between background flushes (default: 5)
     """
 
-    def __init__(self):
-        """Initialize Langfuse provider with environment configuration."""
+    def __init__(self, sampler: Optional[LLMTraceSampler] = None):
+        """
+        Initialize Langfuse provider with environment configuration.
+
+        Args:
+            sampler: Sampling and payload policy, defaults to one built from the environment
+        """
         self.secret_key = os.getenv("LANGFUSE_SECRET_KEY")
         self.public_key = os.getenv("LANGFUSE_PUBLIC_KEY")
         self.host = os.getenv("LANGFUSE_HOST", "https://cloud.langfuse.com")
+        self.flush_at = int(os.getenv("LANGFUSE_FLUSH_AT", "50"))
+        self.flush_interval = float(os.getenv("LANGFUSE_FLUSH_INTERVAL", "5"))
+        self.sampler = sampler or LLMTraceSampler(
+            sample_rate=float(os.getenv("LANGFUSE_SAMPLE_RATE", "1.0")),
+            always_on_error=os.getenv("LANGFUSE_SAMPLE_ERRORS", "true").lower() == "true",
+            rules=_json_env("LANGFUSE_SAMPLING_RULES"),
+            max_content_chars=int(os.getenv("LANGFUSE_MAX_CONTENT_CHARS", "0")),
+            hash_content=os.getenv("LANGFUSE_HASH_CONTENT", "false").lower() == "true"
+        )
         
         self._client = None
         self._initialized = False
@@ -43,10 +68,13 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
             # Import langfuse only when needed to avoid dependency issues
             from langfuse import Langfuse
             
+            # Events are queued and sent in batches by the SDK's background thread
             self._client = Langfuse(
                 secret_key=self.secret_key,
                 public_key=self.public_key,
-                host=self.host
+                host=self.host,
+                flush_at=self.flush_at,
+                flush_interval=self.flush_interval
             )
             self._initialized = True
         except ImportError:
@@ -68,19 +96,21 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
         duration_seconds: float,
         success: bool,
         error: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        end_time: Optional[datetime] = None
     ) -> None:
-        """Record LLM call metrics in Langfuse."""
-        if not self.is_enabled():
+        """Record LLM call metrics in Langfuse (sampled; end_time defaults to now)."""
+        if not self.is_enabled() or not self.sampler.should_sample(success, metadata):
             return
 
         try:
             # Create a generation in Langfuse
+            end_time = end_time or datetime.now()
             generation = self._client.generation(
                 name=f"llm_call_{model}",
                 model=model,
-                start_time=datetime.now(),
-                end_time=datetime.now(),
+                start_time=end_time - timedelta(seconds=duration_seconds),
+                end_time=end_time,
                 usage={
                     "prompt_tokens": prompt_tokens,
                     "completion_tokens": completion_tokens,
@@ -108,8 +138,8 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
         success: bool,
         duration_seconds: float
     ) -> None:
-        """Record intent analysis metrics in Langfuse."""
-        if not self.is_enabled():
+        """Record intent analysis metrics in Langfuse (sampled)."""
+        if not self.is_enabled() or not self.sampler.should_sample(success, {"intent": intent}):
             return
 
         try:
@@ -135,43 +165,41 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
         completion: str,
         metadata: Optional[Dict[str, Any]] = None
     ) -> ContextManager[SpanContext]:
-        """Trace an LLM call with full context."""
+        """
+        Trace an LLM call with full context.
+
+        Attributes are buffered and the generation is only created when the
+        call ends, so unsampled calls never build a Langfuse payload and
+        failed calls can still be kept.
+        """
         if not self.is_enabled():
             yield DummySpanContext()
             return
 
-        start_time = time.time()
-        generation = None
-        
+        start = time.time()
+        start_time = datetime.now()
+        span_context = BufferedSpanContext(metadata)
         try:
-            generation = self._client.generation(
-                name=f"llm_call_{model}",
-                model=model,
-                input=prompt,
-                start_time=datetime.now(),
-                metadata=metadata or {}
-            )
-            
-            span_context = LangfuseSpanContext(generation)
             yield span_context
-            
         except Exception as e:
-            print(f"Warning: Failed to start LLM trace in Langfuse: {e}")
-            yield DummySpanContext()
+            span_context.record_exception(e)
+            raise
         finally:
-            if generation:
+            if self.sampler.should_sample(span_context.error is None, span_context.metadata):
                 try:
-                    duration = time.time() - start_time
-                    generation.end(
-                        output=completion,
+                    self._client.generation(
+                        name=f"llm_call_{model}",
+                        model=model,
+                        input=self.sampler.prepare_content(prompt),
+                        output=self.sampler.prepare_content(completion),
+                        start_time=start_time,
                         end_time=datetime.now(),
-                        metadata={
-                            "duration_seconds": duration,
-                            **(metadata or {})
-                        }
+                        metadata={"duration_seconds": time.time() - start, **span_context.metadata},
+                        level="ERROR" if span_context.error else "DEFAULT",
+                        status_message=span_context.error
                     )
                 except Exception as e:
-                    print(f"Warning: Failed to end LLM trace in Langfuse: {e}")
+                    print(f"Warning: Failed to record LLM trace in Langfuse: {e}")
 
     @contextmanager
     def trace_intent_analysis(
@@ -181,15 +209,15 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
         confidence: float,
         method: str
     ) -> ContextManager[SpanContext]:
-        """Trace intent analysis operation."""
-        if not self.is_enabled():
+        """Trace intent analysis operation (sampled)."""
+        if not self.is_enabled() or not self.sampler.should_sample(True, {"intent": detected_intent}):
             yield DummySpanContext()
             return
 
         try:
             span = self._client.span(
                 name="intent_analysis",
-                input=input_text,
+                input=self.sampler.prepare_content(input_text),
                 metadata={
                     "detected_intent": detected_intent,
                     "confidence": confidence,
@@ -211,16 +239,16 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
         formatted_response: str,
         template_used: Optional[str] = None
     ) -> ContextManager[SpanContext]:
-        """Trace response formatting operation."""
-        if not self.is_enabled():
+        """Trace response formatting operation (sampled)."""
+        if not self.is_enabled() or not self.sampler.should_sample(True, {"template_used": template_used}):
             yield DummySpanContext()
             return
 
         try:
             span = self._client.span(
                 name="response_formatting",
-                input=raw_data,
-                output=formatted_response,
+                input=self.sampler.prepare_content(raw_data),
+                output=self.sampler.prepare_content(formatted_response),
                 metadata={
                     "template_used": template_used
                 }
@@ -234,6 +262,26 @@ class LangfuseProvider(LLMMetricsCollector, LLMTraceProvider):
             yield DummySpanContext()
 
 
+    def flush(self) -> None:
+        """Send queued Langfuse events now instead of waiting for the background batch."""
+        if not self.is_enabled():
+            return
+
+        try:
+            self._client.flush()
+        except Exception as e:
+            print(f"Warning: Failed to flush Langfuse events: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Sampling counters and batching settings."""
+        return {
+            "enabled": self.is_enabled(),
+            "flush_at": self.flush_at,
+            "flush_interval": self.flush_interval,
+            **self.sampler.get_status()
+        }
+
+
 class LangfuseSpanContext(SpanContext):
     """Langfuse-specific span context implementation."""
 
@@ -277,6 +325,35 @@ class LangfuseSpanContext(SpanContext):
             print(f"Warning: Failed to record exception in Langfuse span: {e}")
 
 
+class BufferedSpanContext(SpanContext):
+    """Collects span attributes until the sampling decision is made at the end of the call."""
+
+    def __init__(self, metadata: Optional[Dict[str, Any]] = None):
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+        self.error: Optional[str] = None
+
+    def __enter__(self) -> "BufferedSpanContext":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type:
+            self.record_exception(exc_val)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.metadata[key] = value
+
+    def set_status(self, status: str, description: Optional[str] = None) -> None:
+        self.metadata["status"] = status
+        if description:
+            self.metadata["status_description"] = description
+        if status.lower() == "error":
+            self.error = description or "error"
+
+    def record_exception(self, exception: Exception) -> None:
+        self.metadata["error_type"] = type(exception).__name__
+        self.error = str(exception) or type(exception).__name__
+
+
 class DummySpanContext(SpanContext):
     """Dummy span context for when Langfuse is not available."""
 
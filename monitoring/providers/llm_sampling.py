@@ -0,0 +1,94 @@
+"""
+LLM Trace Sampling
+
+Decides which LLM calls are sent to Langfuse and shrinks the prompt and
+completion payloads that are. Failed calls can always be kept, rules can pin
+the rate for specific customers or intents, and everything else is sampled
+probabilistically.
+"""
+
+import hashlib
+import random
+from typing import Dict, Any, Optional
+
+
+class LLMTraceSampler:
+    """
+    Sampling decisions and payload reduction for LLM traces.
+
+    Rules map a metadata field to per-value rates, e.g.
+    {"customer_id": {"CUST-001": 1.0}, "intent": {"general_inquiry": 0.01}}.
+    The first rule whose field and value match the call's metadata sets its
+    rate; calls no rule matches use sample_rate.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 1.0,
+        always_on_error: bool = True,
+        rules: Optional[Dict[str, Dict[str, float]]] = None,
+        max_content_chars: int = 0,
+        hash_content: bool = False,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize sampler.
+
+        Args:
+            sample_rate: Share of calls kept when no rule matches
+            always_on_error: Keep every failed call regardless of rate
+            rules: Per-field, per-value sample rates
+            max_content_chars: Truncate prompts/completions beyond this length (0 = no limit)
+            hash_content: Replace prompts/completions with a SHA-256 digest
+            rng: Random source (injectable for tests)
+        """
+        self.sample_rate = sample_rate
+        self.always_on_error = always_on_error
+        self.rules = rules or {}
+        self.max_content_chars = max_content_chars
+        self.hash_content = hash_content
+        self._rng = rng or random.Random()
+        self.sampled = 0
+        self.skipped = 0
+
+    def rate_for(self, metadata: Optional[Dict[str, Any]] = None) -> float:
+        """Sample rate for a call with this metadata."""
+        if metadata:
+            for field, rates in self.rules.items():
+                value = metadata.get(field)
+                if value is not None and str(value) in rates:
+                    return float(rates[str(value)])
+        return self.sample_rate
+
+    def should_sample(self, success: bool = True, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Whether to send this call to Langfuse."""
+        if not success and self.always_on_error:
+            keep = True
+        else:
+            rate = self.rate_for(metadata)
+            keep = rate >= 1.0 or (rate > 0.0 and self._rng.random() < rate)
+        if keep:
+            self.sampled += 1
+        else:
+            self.skipped += 1
+        return keep
+
+    def prepare_content(self, text: Any) -> Any:
+        """Hash or truncate a prompt/completion according to the payload options."""
+        if not isinstance(text, str):
+            return text
+        if self.hash_content:
+            return f"sha256:{hashlib.sha256(text.encode('utf-8')).hexdigest()} ({len(text)} chars)"
+        if self.max_content_chars and len(text) > self.max_content_chars:
+            return f"{text[:self.max_content_chars]}... [truncated {len(text) - self.max_content_chars} chars]"
+        return text
+
+    def get_status(self) -> Dict[str, Any]:
+        """Sampling settings and counters for status endpoints."""
+        return {
+            "sample_rate": self.sample_rate,
+            "always_on_error": self.always_on_error,
+            "rules": self.rules,
+            "sampled": self.sampled,
+            "skipped": self.skipped
+        }
@@ -1,48 +1,279 @@
 """
-OpenTelemetry Provider Implementation (Stub)
+OpenTelemetry Provider Implementation
 
-Placeholder for OpenTelemetry distributed tracing implementation.
-Can be extended to provide comprehensive distributed tracing across services.
+Distributed tracing across the UI, agents and policy server with OpenTelemetry.
+Spans are exported through a batch span processor. Head sampling decides at
+the root whether a trace is recorded; tail sampling decides, once the local
+root span ends, whether a recorded trace is exported. Trace context crosses
+service boundaries as W3C traceparent/tracestate headers (or MCP `_meta`).
 """
 
 import os
-from typing import Dict, Any, Optional, ContextManager
-from contextlib import contextmanager
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Mapping, MutableMapping
 
 from ..interfaces.trace_provider import TraceProvider, TraceContext, SpanContext
 
+try:
+    from opentelemetry.sdk.trace import SpanProcessor
+    from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+    from opentelemetry.trace import StatusCode
+except ImportError:  # OpenTelemetry SDK not installed - tracing is disabled
+    SpanProcessor = None
+
+
+def _attribute(value: Any) -> Any:
+    """Span attribute value: primitives as-is, anything else as a string."""
+    return value if isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def inject_trace_context(carrier: Optional[MutableMapping[str, str]] = None) -> MutableMapping[str, str]:
+    """
+    Add W3C trace context for the current span to a header or MCP `_meta` dict.
+
+    Returns the carrier unchanged when there is no active trace or the
+    OpenTelemetry API is not installed.
+    """
+    carrier = {} if carrier is None else carrier
+    try:
+        from opentelemetry import propagate
+        propagate.inject(carrier)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Warning: Failed to inject trace context: {e}")
+    return carrier
+
+
+def extract_trace_context(carrier: Optional[Mapping[str, Any]]) -> Optional[Any]:
+    """OpenTelemetry context continuing the W3C trace in a header or `_meta` mapping, if any."""
+    if not carrier:
+        return None
+    try:
+        from opentelemetry import propagate
+        return propagate.extract({
+            str(key).lower(): value for key, value in carrier.items() if isinstance(value, str)
+        })
+    except ImportError:
+        return None
+    except Exception as e:
+        print(f"Warning: Failed to extract trace context: {e}")
+        return None
+
+
+# Tail ratio decisions use the low 64 bits of the trace id, as TraceIdRatioBased does
+_TRACE_ID_LIMIT = 1 << 64
+
+
+if SpanProcessor is not None:
+
+    class TailSamplingSpanProcessor(SpanProcessor):
+        """
+        Buffers each trace's spans until its local root span ends, then
+        forwards them to the next processor if the trace had an error, was
+        slower than the latency threshold, or falls within sample_ratio.
+        Spans that end after the decision follow it.
+
+        The ratio decision is derived from the trace id (like
+        TraceIdRatioBased), so every service a trace crosses keeps or drops
+        the same fast, successful traces and exported traces have no holes.
+        """
+
+        def __init__(
+            self,
+            next_processor: Any,
+            latency_threshold_seconds: float = 1.0,
+            sample_ratio: float = 0.1,
+            max_traces: int = 2048
+        ):
+            self._next = next_processor
+            self.latency_threshold_seconds = latency_threshold_seconds
+            self.sample_ratio = sample_ratio
+            self.max_traces = max_traces
+            self._id_bound = round(min(max(sample_ratio, 0.0), 1.0) * _TRACE_ID_LIMIT)
+            self._pending: "OrderedDict[int, List[Any]]" = OrderedDict()
+            self._decided: "OrderedDict[int, bool]" = OrderedDict()
+            self._lock = threading.Lock()
+            self.kept = 0
+            self.dropped = 0
+
+        def on_start(self, span: Any, parent_context: Optional[Any] = None) -> None:
+            self._next.on_start(span, parent_context=parent_context)
+
+        def on_end(self, span: Any) -> None:
+            trace_id = span.context.trace_id
+            with self._lock:
+                keep = self._decided.get(trace_id)
+                if keep is None:
+                    spans = self._pending.setdefault(trace_id, [])
+                    spans.append(span)
+                    if span.parent is not None and not span.parent.is_remote:
+                        if len(self._pending) > self.max_traces:
+                            self._pending.popitem(last=False)
+                            self.dropped += 1
+                        return
+
+                    del self._pending[trace_id]
+                    keep = self._keep(span, spans)
+                    self._decided[trace_id] = keep
+                    if len(self._decided) > self.max_traces:
+                        self._decided.popitem(last=False)
+                    if keep:
+                        self.kept += 1
+                    else:
+                        self.dropped += 1
+                else:
+                    spans = [span]
+
+            if keep:
+                for finished in spans:
+                    self._next.on_end(finished)
+
+        def _keep(self, root: Any, spans: List[Any]) -> bool:
+            if any(span.status.status_code is StatusCode.ERROR for span in spans):
+                return True
+            if (root.end_time - root.start_time) / 1e9 >= self.latency_threshold_seconds:
+                return True
+            return (root.context.trace_id & (_TRACE_ID_LIMIT - 1)) < self._id_bound
+
+        def shutdown(self) -> None:
+            self._next.shutdown()
+
+        def force_flush(self, timeout_millis: int = 30000) -> bool:
+            return self._next.force_flush(timeout_millis)
+
+    class FileSpanExporter(SpanExporter):
+        """Appends finished spans to a file as JSON lines, for offline runs and tests."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans: Any) -> Any:
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    for span in spans:
+                        f.write(span.to_json(indent=None) + "\n")
+                return SpanExportResult.SUCCESS
+            except OSError as e:
+                print(f"Warning: Failed to write spans to {self.path}: {e}")
+                return SpanExportResult.FAILURE
+
+        def shutdown(self) -> None:
+            pass
+
 
 class OpenTelemetryProvider(TraceProvider):
     """
     OpenTelemetry implementation for distributed tracing.
-    
-    Currently a stub implementation that can be extended with:
-    - Jaeger exporter for trace visualization
-    - Custom span processors
-    - Service mesh integration
-    - Cross-service correlation
+
+    Optional environment variables:
+    - OTEL_SERVICE_NAME: Service name on every span (default: insurance-ai-poc)
+    - OTEL_TRACES_EXPORTER: otlp, console, file, memory or none (default: otlp)
+    - OTEL_EXPORTER_OTLP_ENDPOINT: Collector endpoint for the otlp exporter
+    - OTEL_TRACES_FILE: Output path for the file exporter (default: traces.jsonl)
+    - OTEL_TRACES_SAMPLER_ARG: Head sampling ratio for new traces (default: 1.0)
+    - OTEL_TAIL_SAMPLE_RATIO: Share of fast, successful traces exported (default: 1.0, no tail sampling)
+    - OTEL_TAIL_LATENCY_THRESHOLD_MS: Traces at least this slow are always exported (default: 1000)
+    - OTEL_BSP_SCHEDULE_DELAY, OTEL_BSP_MAX_QUEUE_SIZE, OTEL_BSP_MAX_EXPORT_BATCH_SIZE:
+      Standard batch span processor settings
     """
 
-    def __init__(self):
-        """Initialize OpenTelemetry provider."""
+    def __init__(
+        self,
+        service_name: Optional[str] = None,
+        exporter: Optional[Any] = None,
+        head_sample_ratio: Optional[float] = None,
+        tail_sample_ratio: Optional[float] = None,
+        tail_latency_threshold_ms: Optional[float] = None,
+        set_global: bool = True
+    ):
+        """
+        Initialize OpenTelemetry provider.
+
+        Args:
+            service_name: Service name, overrides OTEL_SERVICE_NAME
+            exporter: Span exporter to use instead of the one named by OTEL_TRACES_EXPORTER
+            head_sample_ratio: Share of new traces recorded, overrides OTEL_TRACES_SAMPLER_ARG
+            tail_sample_ratio: Share of fast, successful traces exported, overrides OTEL_TAIL_SAMPLE_RATIO
+            tail_latency_threshold_ms: Always export traces this slow, overrides OTEL_TAIL_LATENCY_THRESHOLD_MS
+            set_global: Install as the global tracer provider so library spans
+                (e.g. ADK's built-in instrumentation) are exported too
+        """
+        self.service_name = service_name or os.getenv("OTEL_SERVICE_NAME", "insurance-ai-poc")
+        self.exporter_name = os.getenv("OTEL_TRACES_EXPORTER", "otlp").lower()
+        self.head_sample_ratio = (
+            head_sample_ratio if head_sample_ratio is not None else float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "1.0"))
+        )
+        self.tail_sample_ratio = (
+            tail_sample_ratio if tail_sample_ratio is not None else float(os.getenv("OTEL_TAIL_SAMPLE_RATIO", "1.0"))
+        )
+        self.tail_latency_threshold_ms = (
+            tail_latency_threshold_ms if tail_latency_threshold_ms is not None
+            else float(os.getenv("OTEL_TAIL_LATENCY_THRESHOLD_MS", "1000"))
+        )
+
+        self._exporter = exporter
+        self._tracer_provider = None
+        self._tail_sampler = None
         self._initialized = False
         self._tracer = None
-        
+
         # Initialize if OpenTelemetry is available
-        self._initialize_tracer()
+        self._initialize_tracer(set_global)
+
+    def _create_exporter(self) -> Optional[Any]:
+        """Build the exporter named by OTEL_TRACES_EXPORTER (None for "none")."""
+        if self.exporter_name == "console":
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+            return ConsoleSpanExporter()
+        if self.exporter_name == "file":
+            return FileSpanExporter(os.getenv("OTEL_TRACES_FILE", "traces.jsonl"))
+        if self.exporter_name == "memory":
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+            return InMemorySpanExporter()
+        if self.exporter_name == "otlp":
+            try:
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            except ImportError:
+                from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+            return OTLPSpanExporter()
+        return None
 
-    def _initialize_tracer(self) -> None:
-        """Initialize OpenTelemetry tracer."""
+    def _initialize_tracer(self, set_global: bool) -> None:
+        """Initialize the tracer provider, samplers and batch exporter."""
         try:
             from opentelemetry import trace
+            from opentelemetry.sdk.resources import Resource
             from opentelemetry.sdk.trace import TracerProvider
             from opentelemetry.sdk.trace.export import BatchSpanProcessor
-            
-            # This is a basic setup - can be extended with Jaeger exporter
-            trace.set_tracer_provider(TracerProvider())
-            self._tracer = trace.get_tracer(__name__)
+            from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+            exporter = self._exporter or self._create_exporter()
+            if exporter is None:
+                return
+            self._exporter = exporter
+
+            tracer_provider = TracerProvider(
+                resource=Resource.create({"service.name": self.service_name}),
+                sampler=ParentBased(TraceIdRatioBased(self.head_sample_ratio))
+            )
+            processor = BatchSpanProcessor(exporter)
+            if self.tail_sample_ratio < 1.0:
+                processor = self._tail_sampler = TailSamplingSpanProcessor(
+                    processor,
+                    latency_threshold_seconds=self.tail_latency_threshold_ms / 1000,
+                    sample_ratio=self.tail_sample_ratio
+                )
+            tracer_provider.add_span_processor(processor)
+            if set_global:
+                trace.set_tracer_provider(tracer_provider)
+
+            self._tracer_provider = tracer_provider
+            self._tracer = tracer_provider.get_tracer(__name__)
             self._initialized = True
-            
+
         except ImportError:
             print("Warning: OpenTelemetry packages not installed. Distributed tracing will be disabled.")
         except Exception as e:
@@ -52,64 +283,77 @@ class OpenTelemetryProvider(TraceProvider):
         """Check if OpenTelemetry is properly configured."""
         return self._initialized and self._tracer is not None
 
+    def _start(self, name: str, context: Optional[Any], attributes: Optional[Dict[str, Any]], kind: str) -> Any:
+        """Start an SDK span with the given parent context, attributes and kind name."""
+        from opentelemetry.trace import SpanKind
+
+        span = self._tracer.start_span(name, context=context, kind=getattr(SpanKind, kind.upper(), SpanKind.INTERNAL))
+        for key, value in (attributes or {}).items():
+            span.set_attribute(key, _attribute(value))
+        return span
+
     def start_trace(
-        self, 
-        name: str, 
-        attributes: Optional[Dict[str, Any]] = None
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        carrier: Optional[Mapping[str, Any]] = None,
+        kind: str = "internal"
     ) -> TraceContext:
-        """Start a new trace with the given name."""
+        """
+        Start the local root span of a trace.
+
+        Continues the caller's trace when `carrier` (request headers or MCP
+        `_meta`) holds a W3C traceparent, otherwise starts a new trace.
+        """
         if not self.is_enabled():
             return DummyTraceContext()
 
         try:
-            span = self._tracer.start_span(name)
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, str(value))
-            return OpenTelemetryTraceContext(span)
+            from opentelemetry.context import Context
+            return OpenTelemetryTraceContext(
+                self._start(name, extract_trace_context(carrier) or Context(), attributes, kind)
+            )
         except Exception as e:
             print(f"Warning: Failed to start trace: {e}")
             return DummyTraceContext()
 
     def start_span(
-        self, 
-        name: str, 
+        self,
+        name: str,
         parent_context: Optional[TraceContext] = None,
-        attributes: Optional[Dict[str, Any]] = None
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: str = "internal"
     ) -> SpanContext:
-        """Start a new span within a trace."""
+        """Start a new span under `parent_context`, or under the current span."""
         if not self.is_enabled():
             return DummySpanContext()
 
         try:
-            span = self._tracer.start_span(name)
-            if attributes:
-                for key, value in attributes.items():
-                    span.set_attribute(key, str(value))
-            return OpenTelemetrySpanContext(span)
+            context = None
+            if isinstance(parent_context, _ActiveSpan):
+                from opentelemetry import trace
+                context = trace.set_span_in_context(parent_context._span)
+            return OpenTelemetrySpanContext(self._start(name, context, attributes, kind))
         except Exception as e:
             print(f"Warning: Failed to start span: {e}")
             return DummySpanContext()
 
     def get_current_trace_id(self) -> Optional[str]:
         """Get the current trace ID if available."""
-        if not self.is_enabled():
-            return None
-
         try:
             from opentelemetry import trace
-            current_span = trace.get_current_span()
-            if current_span:
-                return format(current_span.get_span_context().trace_id, '032x')
+            span_context = trace.get_current_span().get_span_context()
+            if span_context.is_valid:
+                return format(span_context.trace_id, '032x')
         except Exception:
             pass
-        
+
         return None
 
     def set_trace_attribute(
-        self, 
-        key: str, 
-        value: Any, 
+        self,
+        key: str,
+        value: Any,
         context: Optional[TraceContext] = None
     ) -> None:
         """Set an attribute on the current or specified trace."""
@@ -117,63 +361,100 @@ class OpenTelemetryProvider(TraceProvider):
             return
 
         try:
+            if context is not None:
+                context.set_attribute(key, value)
+                return
             from opentelemetry import trace
-            current_span = trace.get_current_span()
-            if current_span:
-                current_span.set_attribute(key, str(value))
+            trace.get_current_span().set_attribute(key, _attribute(value))
         except Exception as e:
             print(f"Warning: Failed to set trace attribute: {e}")
 
     def record_exception(
-        self, 
-        exception: Exception, 
+        self,
+        exception: Exception,
         context: Optional[TraceContext] = None
     ) -> None:
-        """Record an exception in the current or specified trace."""
+        """Record an exception in the current or specified trace and mark it as an error."""
         if not self.is_enabled():
             return
 
         try:
             from opentelemetry import trace
-            current_span = trace.get_current_span()
-            if current_span:
-                current_span.record_exception(exception)
+            from opentelemetry.trace import Status, StatusCode
+            span = context._span if isinstance(context, _ActiveSpan) else trace.get_current_span()
+            span.record_exception(exception)
+            span.set_status(Status(StatusCode.ERROR, type(exception).__name__))
         except Exception as e:
             print(f"Warning: Failed to record exception: {e}")
 
-
-class OpenTelemetryTraceContext(TraceContext):
-    """OpenTelemetry-specific trace context implementation."""
+    def flush(self) -> None:
+        """Export buffered spans now."""
+        if self.is_enabled():
+            self._tracer_provider.force_flush()
+
+    def shutdown(self) -> None:
+        """Flush and stop the span processors."""
+        if self.is_enabled():
+            self._tracer_provider.shutdown()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Exporter and sampling settings plus tail sampling counters."""
+        status = {
+            "enabled": self.is_enabled(),
+            "exporter": type(self._exporter).__name__ if self._exporter is not None else None,
+            "head_sample_ratio": self.head_sample_ratio,
+            "tail_sample_ratio": self.tail_sample_ratio
+        }
+        if self._tail_sampler is not None:
+            status["tail_kept"] = self._tail_sampler.kept
+            status["tail_dropped"] = self._tail_sampler.dropped
+        return status
+
+
+class _ActiveSpan:
+    """Shared span handling: the span is current while the context is entered."""
 
     def __init__(self, span):
         self._span = span
+        self._token = None
 
-    def __enter__(self) -> "OpenTelemetryTraceContext":
+    def __enter__(self):
+        from opentelemetry import context, trace
+        self._token = context.attach(trace.set_span_in_context(self._span))
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         if exc_type:
             self._span.record_exception(exc_val)
+            self.set_status("error", exc_type.__name__)
+        if self._token is not None:
+            from opentelemetry import context
+            context.detach(self._token)
+            self._token = None
         self._span.end()
 
     def set_attribute(self, key: str, value: Any) -> None:
-        """Set an attribute on this trace."""
+        """Set an attribute on this span."""
         try:
-            self._span.set_attribute(key, str(value))
+            self._span.set_attribute(key, _attribute(value))
         except Exception as e:
             print(f"Warning: Failed to set attribute: {e}")
 
     def set_status(self, status: str, description: Optional[str] = None) -> None:
-        """Set the status of this trace."""
+        """Set the status of this span."""
         try:
             from opentelemetry.trace import Status, StatusCode
             if status.lower() == "ok":
-                self._span.set_status(Status(StatusCode.OK, description))
+                self._span.set_status(Status(StatusCode.OK))
             elif status.lower() == "error":
                 self._span.set_status(Status(StatusCode.ERROR, description))
         except Exception as e:
             print(f"Warning: Failed to set status: {e}")
 
+
+class OpenTelemetryTraceContext(_ActiveSpan, TraceContext):
+    """OpenTelemetry-specific trace context implementation."""
+
     def get_trace_id(self) -> str:
         """Get the trace ID."""
         try:
@@ -182,38 +463,9 @@ class OpenTelemetryTraceContext(TraceContext):
             return "unknown"
 
 
-class OpenTelemetrySpanContext(SpanContext):
+class OpenTelemetrySpanContext(_ActiveSpan, SpanContext):
     """OpenTelemetry-specific span context implementation."""
 
-    def __init__(self, span):
-        self._span = span
-
-    def __enter__(self) -> "OpenTelemetrySpanContext":
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        if exc_type:
-            self._span.record_exception(exc_val)
-        self._span.end()
-
-    def set_attribute(self, key: str, value: Any) -> None:
-        """Set an attribute on this span."""
-        try:
-            self._span.set_attribute(key, str(value))
-        except Exception as e:
-            print(f"Warning: Failed to set attribute: {e}")
-
-    def set_status(self, status: str, description: Optional[str] = None) -> None:
-        """Set the status of this span."""
-        try:
-            from opentelemetry.trace import Status, StatusCode
-            if status.lower() == "ok":
-                self._span.set_status(Status(StatusCode.OK, description))
-            elif status.lower() == "error":
-                self._span.set_status(Status(StatusCode.ERROR, description))
-        except Exception as e:
-            print(f"Warning: Failed to set status: {e}")
-
     def record_exception(self, exception: Exception) -> None:
         """Record an exception on this span."""
         try:
@@ -258,4 +510,4 @@ class DummySpanContext(SpanContext):
         pass
 
     def record_exception(self, exception: Exception) -> None:
-        pass 
\ No newline at end of file
+        pass
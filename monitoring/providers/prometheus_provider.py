@@ -5,13 +5,37 @@ Implements metrics collection using Prometheus.
 Provides comprehensive system and business metrics.
 """
 
+import json
 import os
+import socket
+import threading
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Set, Tuple
 from collections import defaultdict
 
 from ..interfaces.metrics_collector import MetricsCollector, MetricType, APIMetricsCollector
 
+# Label value that replaces values beyond a label's cardinality limit
+OVERFLOW_LABEL_VALUE = "other"
+
+
+def _metric_name(metric: Any) -> str:
+    """Exposed metric name (prometheus_client strips "_total" from counter names)."""
+    return f"{metric._name}_total" if metric._type == "counter" else metric._name
+
+
+def _json_env(name: str) -> Dict[str, Any]:
+    """Parse a JSON object from an environment variable ({} if unset or invalid)."""
+    raw = os.getenv(name)
+    if not raw:
+        return {}
+    try:
+        value = json.loads(raw)
+        return value if isinstance(value, dict) else {}
+    except ValueError:
+        print(f"Warning: Ignoring invalid JSON in {name}")
+        return {}
+
 
 class PrometheusProvider(MetricsCollector, APIMetricsCollector):
     """
@@ -20,14 +44,47 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
     Optional environment variables:
     - PROMETHEUS_GATEWAY_URL: Push gateway URL for batch metrics
     - PROMETHEUS_JOB_NAME: Job name for metrics (default: insurance-ai-poc)
+    - PROMETHEUS_INSTANCE: Instance grouping key for pushes, so scaled-out
+      workers keep separate metric groups (default: HOSTNAME / host name)
+    - PROMETHEUS_GROUPING_KEY: JSON extra grouping labels, e.g. {"region": "eu"}
+    - PROMETHEUS_MAX_LABEL_VALUES: Distinct values kept per label before
+      collapsing into "other" (default: 100)
+    - PROMETHEUS_LABEL_LIMITS: JSON per-metric overrides, e.g. {"mcp_errors_total": 20}
+    - PROMETHEUS_HISTOGRAM_BUCKETS: JSON per-metric bucket layouts,
+      e.g. {"llm_call_duration_seconds": [0.5, 1, 2, 5, 10, 30]}
     """
 
-    def __init__(self):
-        """Initialize Prometheus provider."""
+    def __init__(
+        self,
+        max_label_values: Optional[int] = None,
+        label_limits: Optional[Dict[str, int]] = None,
+        histogram_buckets: Optional[Dict[str, Sequence[float]]] = None
+    ):
+        """
+        Initialize Prometheus provider.
+        
+        Args:
+            max_label_values: Default distinct values per label, overrides PROMETHEUS_MAX_LABEL_VALUES
+            label_limits: Per-metric label value limits, overrides PROMETHEUS_LABEL_LIMITS
+            histogram_buckets: Per-metric bucket layouts, overrides PROMETHEUS_HISTOGRAM_BUCKETS
+        """
         self.gateway_url = os.getenv("PROMETHEUS_GATEWAY_URL")
         self.job_name = os.getenv("PROMETHEUS_JOB_NAME", "insurance-ai-poc")
+        self.grouping_key = {
+            "instance": os.getenv("PROMETHEUS_INSTANCE") or os.getenv("HOSTNAME") or socket.gethostname(),
+            **{str(k): str(v) for k, v in _json_env("PROMETHEUS_GROUPING_KEY").items()},
+        }
+        self.max_label_values = max_label_values or int(os.getenv("PROMETHEUS_MAX_LABEL_VALUES", "100"))
+        self.label_limits = label_limits if label_limits is not None else _json_env("PROMETHEUS_LABEL_LIMITS")
+        self.histogram_buckets = (
+            histogram_buckets if histogram_buckets is not None else _json_env("PROMETHEUS_HISTOGRAM_BUCKETS")
+        )
         
         self._metrics = {}
+        # Bound label children keyed by (metric, label values), plus values seen per (metric, label index)
+        self._children: Dict[Tuple[Any, Tuple[str, ...]], Any] = {}
+        self._label_values: Dict[Tuple[Any, int], Set[str]] = {}
+        self._children_lock = threading.RLock()
         self._initialized = False
         
         self._initialize_client()
@@ -66,7 +123,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             registry=self._registry
         )
         
-        self._http_request_duration = self._Histogram(
+        self._http_request_duration = self._new_histogram(
             'http_request_duration_seconds',
             'HTTP request duration in seconds',
             ['method', 'endpoint'],
@@ -88,7 +145,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             registry=self._registry
         )
         
-        self._llm_call_duration = self._Histogram(
+        self._llm_call_duration = self._new_histogram(
             'llm_call_duration_seconds',
             'LLM call duration in seconds',
             ['model'],
@@ -103,7 +160,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             registry=self._registry
         )
         
-        self._mcp_call_duration = self._Histogram(
+        self._mcp_call_duration = self._new_histogram(
             'mcp_call_duration_seconds',
             'MCP call duration in seconds',
             ['tool_name'],
@@ -118,12 +175,160 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             registry=self._registry
         )
         
-        self._intent_confidence = self._Histogram(
+        self._intent_confidence = self._new_histogram(
             'intent_confidence_score',
             'Intent analysis confidence scores',
             ['intent', 'method'],
             registry=self._registry
         )
+        
+        # Admission control metrics
+        self._admission_requests_total = self._Counter(
+            'admission_requests_total',
+            'Requests seen by admission control',
+            ['lane', 'outcome'],  # outcome: admitted, rate_limited, queue_full, queue_timeout
+            registry=self._registry
+        )
+        
+        self._admission_shed_total = self._Counter(
+            'admission_shed_total',
+            'Requests shed by admission control',
+            ['lane', 'reason'],
+            registry=self._registry
+        )
+        
+        self._admission_queue_wait = self._new_histogram(
+            'admission_queue_wait_seconds',
+            'Time requests spent queued before admission or shedding',
+            ['lane'],
+            buckets=(0.0, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+            registry=self._registry
+        )
+        
+        # Prompt size / context compaction metrics
+        self._llm_prompt_tokens = self._new_histogram(
+            'llm_prompt_tokens',
+            'Estimated prompt tokens per model call',
+            ['agent', 'stage'],  # stage: before_compaction, after_compaction
+            buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000),
+            registry=self._registry
+        )
+        
+        self._context_compactions_total = self._Counter(
+            'context_compactions_total',
+            'Rolling conversation summary refreshes',
+            ['agent'],
+            registry=self._registry
+        )
+        
+        self._context_deduplicated_tool_results_total = self._Counter(
+            'context_deduplicated_tool_results_total',
+            'Repeated tool results replaced by a stub in the prompt',
+            ['agent'],
+            registry=self._registry
+        )
+        
+        # Response cache metrics
+        self._response_cache_requests_total = self._Counter(
+            'response_cache_requests_total',
+            'Response cache lookups',
+            ['agent', 'result'],  # result: exact_hit, semantic_hit, miss
+            registry=self._registry
+        )
+        
+        # Cardinality guard
+        self._label_overflow_total = self._Counter(
+            'prometheus_label_overflow_total',
+            'Label values collapsed into "other" by the cardinality limit',
+            ['metric', 'label'],
+            registry=self._registry
+        )
+        
+        # Metrics pipeline health
+        self._metrics_events_processed_total = self._Counter(
+            'metrics_events_processed_total',
+            'Monitoring events handled by the background pipeline',
+            registry=self._registry
+        )
+        
+        self._metrics_events_dropped_total = self._Counter(
+            'metrics_events_dropped_total',
+            'Monitoring events dropped because the pipeline queue was full',
+            registry=self._registry
+        )
+        
+        self._metrics_event_queue_depth = self._Gauge(
+            'metrics_event_queue_depth',
+            'Monitoring events waiting in the pipeline queue',
+            multiprocess_mode='livesum',
+            registry=self._registry
+        )
+
+        # Per-request latency breakdown
+        self._request_phase_duration = self._new_histogram(
+            'request_phase_duration_seconds',
+            'Time per request spent in each phase (llm, mcp, data_lookup, other, ...)',
+            ['request', 'phase'],
+            registry=self._registry
+        )
+
+        # Push gateway metrics
+        self._metrics_push_duration = self._new_histogram(
+            'metrics_push_duration_seconds',
+            'Push gateway request duration in seconds',
+            ['success'],
+            buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+            registry=self._registry
+        )
+
+    def _new_histogram(self, name: str, documentation: str, labelnames=(), buckets=None, registry=None):
+        """Create a histogram, applying any configured bucket layout for it."""
+        buckets = self.histogram_buckets.get(name, buckets)
+        if buckets is None:
+            return self._Histogram(name, documentation, labelnames, registry=registry)
+        return self._Histogram(name, documentation, labelnames, buckets=tuple(buckets), registry=registry)
+
+    def _child(self, metric: Any, *values: Any) -> Any:
+        """
+        Bound label child for positional label values.
+        
+        Children are cached so repeat observations skip prometheus_client's
+        label dict and lock; values past the label's cardinality limit are
+        collapsed into OVERFLOW_LABEL_VALUE and counted.
+        """
+        key = (metric, values)
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
+        with self._children_lock:
+            labels = tuple(str(value) for value in values)
+            name = _metric_name(metric)
+            limit = self.label_limits.get(name, self.max_label_values)
+            guarded = []
+            for index, value in enumerate(labels):
+                seen = self._label_values.setdefault((metric, index), set())
+                if value in seen or len(seen) < limit:
+                    seen.add(value)
+                    guarded.append(value)
+                else:
+                    guarded.append(OVERFLOW_LABEL_VALUE)
+                    if metric is not self._label_overflow_total:
+                        self._child(self._label_overflow_total, name, metric._labelnames[index]).inc()
+            guarded = tuple(guarded)
+
+            child = self._children.get((metric, guarded))
+            if child is None:
+                child = metric.labels(*guarded)
+                self._children[(metric, guarded)] = child
+            if guarded == labels:
+                # Only in-limit values get their own cache entry, so the cache stays bounded too
+                self._children[key] = child
+            return child
+
+    def _labeled(self, metric: Any, labels: Dict[str, Any]) -> Any:
+        """Bound child for a label dict (ordered by the metric's label names)."""
+        return self._child(metric, *(labels[name] for name in metric._labelnames))
 
     def is_enabled(self) -> bool:
         """Check if Prometheus is properly configured."""
@@ -150,7 +355,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
                 )
             
             if labels:
-                self._metrics[name].labels(**labels).inc(value)
+                self._labeled(self._metrics[name], labels).inc(value)
             else:
                 self._metrics[name].inc(value)
                 
@@ -177,7 +382,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
                 )
             
             if labels:
-                self._metrics[name].labels(**labels).set(value)
+                self._labeled(self._metrics[name], labels).set(value)
             else:
                 self._metrics[name].set(value)
                 
@@ -196,7 +401,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
 
         try:
             if name not in self._metrics:
-                self._metrics[name] = self._Histogram(
+                self._metrics[name] = self._new_histogram(
                     name,
                     f'Custom histogram metric: {name}',
                     list(labels.keys()) if labels else [],
@@ -204,7 +409,7 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
                 )
             
             if labels:
-                self._metrics[name].labels(**labels).observe(value)
+                self._labeled(self._metrics[name], labels).observe(value)
             else:
                 self._metrics[name].observe(value)
                 
@@ -237,17 +442,34 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             self.record_histogram(name, value, labels)
         # Summary type would require different implementation
 
-    def flush(self) -> None:
-        """Push metrics to gateway if configured."""
+    def push(self, timeout: Optional[float] = 30) -> None:
+        """
+        Push metrics to the gateway, raising on failure.
+
+        The push duration is recorded in metrics_push_duration_seconds and
+        reaches the gateway with the following push.
+        """
         if not self.is_enabled() or not self.gateway_url:
             return
 
+        start = time.perf_counter()
+        success = False
         try:
             self._push_to_gateway(
                 self.gateway_url, 
                 job=self.job_name, 
-                registry=self._registry
+                registry=self._registry,
+                grouping_key=self.grouping_key,
+                timeout=timeout
             )
+            success = True
+        finally:
+            self._child(self._metrics_push_duration, success).observe(time.perf_counter() - start)
+
+    def flush(self) -> None:
+        """Push metrics to gateway if configured."""
+        try:
+            self.push()
         except Exception as e:
             print(f"Warning: Failed to push metrics to Prometheus gateway: {e}")
 
@@ -267,17 +489,10 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
 
         try:
             # Record request count
-            self._http_requests_total.labels(
-                method=method,
-                endpoint=endpoint,
-                status_code=str(status_code)
-            ).inc()
+            self._child(self._http_requests_total, method, endpoint, status_code).inc()
             
             # Record request duration
-            self._http_request_duration.labels(
-                method=method,
-                endpoint=endpoint
-            ).observe(duration_seconds)
+            self._child(self._http_request_duration, method, endpoint).observe(duration_seconds)
             
             # Record request/response sizes if provided
             if request_size_bytes is not None:
@@ -311,15 +526,10 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
 
         try:
             # Record call count
-            self._mcp_calls_total.labels(
-                tool_name=tool_name,
-                success=str(success)
-            ).inc()
+            self._child(self._mcp_calls_total, tool_name, success).inc()
             
             # Record call duration
-            self._mcp_call_duration.labels(
-                tool_name=tool_name
-            ).observe(duration_seconds)
+            self._child(self._mcp_call_duration, tool_name).observe(duration_seconds)
             
             # Record retry count if any
             if retry_count > 0:
@@ -355,18 +565,15 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
 
         try:
             # Record call count
-            self._llm_calls_total.labels(
-                model=model,
-                success=str(success)
-            ).inc()
+            self._child(self._llm_calls_total, model, success).inc()
             
             # Record token usage
-            self._llm_tokens_total.labels(model=model, type='prompt').inc(prompt_tokens)
-            self._llm_tokens_total.labels(model=model, type='completion').inc(completion_tokens)
-            self._llm_tokens_total.labels(model=model, type='total').inc(total_tokens)
+            self._child(self._llm_tokens_total, model, 'prompt').inc(prompt_tokens)
+            self._child(self._llm_tokens_total, model, 'completion').inc(completion_tokens)
+            self._child(self._llm_tokens_total, model, 'total').inc(total_tokens)
             
             # Record call duration
-            self._llm_call_duration.labels(model=model).observe(duration_seconds)
+            self._child(self._llm_call_duration, model).observe(duration_seconds)
             
         except Exception as e:
             print(f"Warning: Failed to record LLM metrics: {e}")
@@ -385,17 +592,10 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
 
         try:
             # Record analysis count
-            self._intent_analysis_total.labels(
-                intent=intent,
-                method=method,
-                success=str(success)
-            ).inc()
+            self._child(self._intent_analysis_total, intent, method, success).inc()
             
             # Record confidence score
-            self._intent_confidence.labels(
-                intent=intent,
-                method=method
-            ).observe(confidence)
+            self._child(self._intent_confidence, intent, method).observe(confidence)
             
             # Record analysis duration
             self.record_duration(
@@ -405,4 +605,85 @@ class PrometheusProvider(MetricsCollector, APIMetricsCollector):
             )
             
         except Exception as e:
-            print(f"Warning: Failed to record intent metrics: {e}") 
\ No newline at end of file
+            print(f"Warning: Failed to record intent metrics: {e}")
+
+    def record_admission_decision(
+        self,
+        lane: str,
+        admitted: bool,
+        reason: str,
+        queue_wait_seconds: float
+    ) -> None:
+        """Record an admission control decision."""
+        if not self.is_enabled():
+            return
+
+        try:
+            self._child(self._admission_requests_total, lane, reason).inc()
+            
+            if not admitted:
+                self._child(self._admission_shed_total, lane, reason).inc()
+            
+            self._child(self._admission_queue_wait, lane).observe(queue_wait_seconds)
+            
+        except Exception as e:
+            print(f"Warning: Failed to record admission metrics: {e}")
+
+    def record_prompt_tokens(
+        self,
+        agent: str,
+        tokens_before: int,
+        tokens_after: int,
+        summary_refreshed: bool = False,
+        deduplicated: int = 0
+    ) -> None:
+        """Record prompt size before and after context compaction."""
+        if not self.is_enabled():
+            return
+
+        try:
+            self._child(self._llm_prompt_tokens, agent, 'before_compaction').observe(tokens_before)
+            self._child(self._llm_prompt_tokens, agent, 'after_compaction').observe(tokens_after)
+            
+            if summary_refreshed:
+                self._child(self._context_compactions_total, agent).inc()
+            
+            if deduplicated:
+                self._child(self._context_deduplicated_tool_results_total, agent).inc(deduplicated)
+            
+        except Exception as e:
+            print(f"Warning: Failed to record prompt token metrics: {e}")
+
+    def record_response_cache(self, agent: str, result: str) -> None:
+        """Record a response cache lookup."""
+        if not self.is_enabled():
+            return
+
+        try:
+            self._child(self._response_cache_requests_total, agent, result).inc()
+        except Exception as e:
+            print(f"Warning: Failed to record response cache metrics: {e}")
+
+    def record_request_phases(self, request: str, phases: Dict[str, float]) -> None:
+        """Record one request's seconds per phase."""
+        if not self.is_enabled():
+            return
+
+        try:
+            for phase, seconds in phases.items():
+                self._child(self._request_phase_duration, request, phase).observe(seconds)
+        except Exception as e:
+            print(f"Warning: Failed to record request phases: {e}")
+
+    def record_metrics_pipeline(self, processed: int, dropped: int, queue_depth: int) -> None:
+        """Record a metrics pipeline batch: events handled, newly dropped events and remaining depth."""
+        if not self.is_enabled():
+            return
+
+        try:
+            self._metrics_events_processed_total.inc(processed)
+            if dropped:
+                self._metrics_events_dropped_total.inc(dropped)
+            self._metrics_event_queue_depth.set(queue_depth)
+        except Exception as e:
+            print(f"Warning: Failed to record metrics pipeline stats: {e}")
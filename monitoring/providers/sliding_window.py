@@ -0,0 +1,174 @@
+"""
+Sliding-Window Metrics
+
+In-process rolling aggregates for live summaries without a Prometheus server.
+Each series keeps a ring of time slots; each slot holds counters and a
+DDSketch for latency quantiles, so memory per series is bounded regardless
+of traffic.
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Any, Optional, Callable, List
+
+
+class DDSketch:
+    """
+    Streaming quantile sketch with relative-error guarantees (DDSketch).
+
+    Values are counted in logarithmic buckets; any quantile is reported within
+    `relative_accuracy` of the true value. When more than `max_buckets` are
+    used, the lowest buckets are collapsed, trading accuracy on the fastest
+    observations for bounded memory.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048, min_value: float = 1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.min_value = min_value
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._bins: Dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        if value <= self.min_value:
+            self._zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._bins[key] = self._bins.get(key, 0) + 1
+        if len(self._bins) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "DDSketch") -> None:
+        for key, count in other._bins.items():
+            self._bins[key] = self._bins.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        while len(self._bins) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        lowest, second = sorted(self._bins)[:2]
+        self._bins[second] += self._bins.pop(lowest)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q in [0, 1] (None when empty)"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._bins):
+            seen += self._bins[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._bins) / (self._gamma + 1)
+
+
+class _Slot:
+    __slots__ = ("epoch", "count", "errors", "sketch")
+
+    def __init__(self, epoch: int, relative_accuracy: float):
+        self.epoch = epoch
+        self.count = 0
+        self.errors = 0
+        self.sketch = DDSketch(relative_accuracy)
+
+
+class SlidingWindow:
+    """
+    Counts, errors and value quantiles over the last `window_seconds`.
+
+    The window is split into `slots` buckets that are recycled as time moves
+    on, so old observations age out without per-event bookkeeping.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 60.0,
+        slots: int = 12,
+        relative_accuracy: float = 0.01,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self.relative_accuracy = relative_accuracy
+        self._clock = clock
+        self._slots: List[Optional[_Slot]] = [None] * slots
+        self._lock = threading.Lock()
+
+    def _epoch(self) -> int:
+        return int(self._clock() // self.slot_seconds)
+
+    def add(self, value: float, error: bool = False) -> None:
+        epoch = self._epoch()
+        index = epoch % len(self._slots)
+        with self._lock:
+            slot = self._slots[index]
+            if slot is None or slot.epoch != epoch:
+                slot = self._slots[index] = _Slot(epoch, self.relative_accuracy)
+            slot.count += 1
+            slot.errors += int(error)
+            slot.sketch.add(value)
+
+    def snapshot(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """Aggregate of the live slots"""
+        oldest = self._epoch() - len(self._slots) + 1
+        merged = DDSketch(self.relative_accuracy)
+        count = errors = 0
+        with self._lock:
+            for slot in self._slots:
+                if slot is not None and slot.epoch >= oldest:
+                    count += slot.count
+                    errors += slot.errors
+                    merged.merge(slot.sketch)
+
+        per_minute = count * 60.0 / self.window_seconds
+        summary = {
+            "count": count,
+            "errors": errors,
+            "per_minute": round(per_minute, 2),
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "average": round(merged.sum / count, 6) if count else 0.0,
+        }
+        for q in quantiles:
+            value = merged.quantile(q)
+            summary[f"p{round(q * 100):d}"] = round(value, 6) if value is not None else None
+        return summary
+
+
+class WindowedMetrics:
+    """Named sliding windows created on first use"""
+
+    def __init__(self, window_seconds: float = 60.0, slots: int = 12, clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.slots = slots
+        self._clock = clock
+        self._series: Dict[str, SlidingWindow] = {}
+        self._lock = threading.Lock()
+
+    def _window(self, series: str) -> SlidingWindow:
+        window = self._series.get(series)
+        if window is None:
+            with self._lock:
+                window = self._series.setdefault(
+                    series, SlidingWindow(self.window_seconds, self.slots, clock=self._clock)
+                )
+        return window
+
+    def record(self, series: str, value: float, error: bool = False) -> None:
+        self._window(series).add(value, error)
+
+    def snapshot(self, series: str) -> Dict[str, Any]:
+        return self._window(series).snapshot()
+
+    def series(self) -> List[str]:
+        return list(self._series)
@@ -5,11 +5,17 @@ FastAPI endpoints for system health monitoring.
 Provides REST API access to health check functionality.
 """
 
-from typing import Dict, Any
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
 
 from .monitoring_setup import get_monitoring_manager
+from ..providers.health_provider import result_to_dict, system_health_to_dict
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 def create_health_router() -> APIRouter:
@@ -27,6 +33,8 @@ def create_health_router() -> APIRouter:
         """
         Basic health check endpoint.
         
+        Served from the last cached check results, so probes never trigger checks.
+        
         Returns:
             System health status
         """
@@ -35,10 +43,15 @@ def create_health_router() -> APIRouter:
             
             # Determine overall health
             is_healthy = status.get("initialized", False) and len(status.get("providers", {})) > 0
+            cached = monitoring.get_health_checker().get_cached_health()
+            if cached.total_checks and cached.overall_status.value != "healthy":
+                overall = cached.overall_status.value
+            else:
+                overall = "healthy" if is_healthy else "degraded"
             
             return {
-                "status": "healthy" if is_healthy else "degraded",
-                "timestamp": "2024-01-01T00:00:00Z",  # Should use datetime.utcnow()
+                "status": overall,
+                "timestamp": _utc_now(),
                 "monitoring": status,
                 "version": "1.0.0"
             }
@@ -46,54 +59,47 @@ def create_health_router() -> APIRouter:
             return {
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": "2024-01-01T00:00:00Z"
+                "timestamp": _utc_now()
             }
 
     @router.get("/detailed")
-    async def detailed_health_check() -> Dict[str, Any]:
+    async def detailed_health_check(refresh: bool = False) -> JSONResponse:
         """
         Detailed health check with component status.
         
+        Component checks run concurrently and are reused for their TTL; an
+        expired result is served while it refreshes in the background.
+        Pass refresh=true to force fresh checks.
+        
         Returns:
-            Comprehensive system health information
+            Comprehensive system health information (503 when unhealthy)
         """
         try:
-            monitoring_status = monitoring.get_monitoring_status()
-            
-            # Basic component checks
-            components = {}
-            
-            # Check monitoring providers
-            for provider_name, provider_info in monitoring_status.get("providers", {}).items():
-                components[f"monitoring_{provider_name}"] = {
-                    "status": "healthy" if provider_info.get("enabled") else "unhealthy",
-                    "type": provider_info.get("type"),
-                    "enabled": provider_info.get("enabled")
-                }
-            
-            # Overall status
-            healthy_components = sum(1 for comp in components.values() if comp["status"] == "healthy")
-            total_components = len(components)
-            
-            overall_status = "healthy" if healthy_components == total_components else "degraded"
-            if healthy_components == 0:
-                overall_status = "unhealthy"
-            
-            return {
-                "status": overall_status,
-                "timestamp": "2024-01-01T00:00:00Z",
-                "components": components,
-                "summary": {
-                    "total_components": total_components,
-                    "healthy_components": healthy_components,
-                    "unhealthy_components": total_components - healthy_components
-                },
-                "monitoring": monitoring_status
-            }
+            checker = monitoring.get_health_checker()
+            health = await checker.check_all_health_async(force=refresh, serve_stale=not refresh)
+            body = system_health_to_dict(health)
+            body["monitoring"] = monitoring.get_monitoring_status()
+            status_code = 503 if body["status"] == "unhealthy" else 200
+            return JSONResponse(content=body, status_code=status_code)
             
         except Exception as e:
             raise HTTPException(status_code=503, detail=f"Health check failed: {str(e)}")
 
+    @router.get("/history")
+    async def health_history(component: Optional[str] = None, hours: int = 1) -> Dict[str, Any]:
+        """
+        Recent health check results from the per-component ring buffers.
+        
+        Returns:
+            Results oldest first, optionally for a single component
+        """
+        history = monitoring.get_health_checker().get_health_history(component, hours)
+        return {
+            "timestamp": _utc_now(),
+            "component": component,
+            "results": [result_to_dict(result) for result in history]
+        }
+
     @router.get("/monitoring")
     async def monitoring_status() -> Dict[str, Any]:
         """
@@ -116,22 +122,16 @@ def create_health_router() -> APIRouter:
         """
         Get basic metrics summary.
         
+        Computed in-process from sliding-window aggregates; no Prometheus
+        server is queried.
+        
         Returns:
             Summary of key system metrics
         """
         try:
-            # This would typically query the metrics backend
-            # For now, return placeholder data
             return {
-                "timestamp": "2024-01-01T00:00:00Z",
-                "summary": {
-                    "requests_per_minute": 0,
-                    "average_response_time": 0.0,
-                    "error_rate": 0.0,
-                    "llm_calls_per_minute": 0,
-                    "successful_llm_calls": 0
-                },
-                "note": "Metrics integration would require Prometheus query API"
+                "timestamp": _utc_now(),
+                "summary": monitoring.get_metrics_summary()
             }
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Failed to get metrics summary: {str(e)}")
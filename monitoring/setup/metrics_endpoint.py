@@ -0,0 +1,168 @@
+"""
+Prometheus Scrape Endpoint
+
+Exposes metrics for pull-based scraping instead of push-gateway flushes.
+The exposition text is cached for a short interval so frequent scrapes do
+not re-serialize every metric. With PROMETHEUS_MULTIPROC_DIR set, metrics
+from all worker processes are aggregated from the shared mmap directory.
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .monitoring_setup import get_monitoring_manager
+
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsExporter:
+    """
+    Renders Prometheus exposition text with a short-lived cache.
+
+    Optional environment variables:
+    - PROMETHEUS_MULTIPROC_DIR: Shared mmap directory for multi-worker aggregation
+      (must be set before prometheus_client is first imported)
+    - METRICS_CACHE_SECONDS: How long a rendered scrape is reused (default: 1)
+    """
+
+    def __init__(
+        self,
+        registry: Optional[Any] = None,
+        cache_seconds: Optional[float] = None,
+        multiproc_dir: Optional[str] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize exporter.
+
+        Args:
+            registry: Registry to expose, defaults to the monitoring manager's Prometheus registry
+            cache_seconds: Scrape cache lifetime, overrides METRICS_CACHE_SECONDS
+            multiproc_dir: Shared mmap directory, overrides PROMETHEUS_MULTIPROC_DIR
+            clock: Monotonic time source (injectable for tests)
+        """
+        self._registry = registry
+        self.cache_seconds = cache_seconds if cache_seconds is not None else float(
+            os.getenv("METRICS_CACHE_SECONDS", "1")
+        )
+        self.multiproc_dir = multiproc_dir or os.getenv("PROMETHEUS_MULTIPROC_DIR")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cached: Optional[bytes] = None
+        self._rendered_at = 0.0
+        self._multiproc_registry = None
+
+    def _collect_registry(self) -> Optional[Any]:
+        if self.multiproc_dir:
+            if self._multiproc_registry is None:
+                from prometheus_client import CollectorRegistry, multiprocess
+
+                registry = CollectorRegistry()
+                multiprocess.MultiProcessCollector(registry, path=self.multiproc_dir)
+                self._multiproc_registry = registry
+            return self._multiproc_registry
+        if self._registry is not None:
+            return self._registry
+        return get_monitoring_manager().get_metrics_registry()
+
+    def render(self) -> Tuple[bytes, str]:
+        """Exposition text and its content type, reusing a recent render."""
+        with self._lock:
+            now = self._clock()
+            if self._cached is not None and now - self._rendered_at < self.cache_seconds:
+                return self._cached, CONTENT_TYPE_LATEST
+
+            registry = self._collect_registry()
+            if registry is None:
+                body = b"# Prometheus metrics are disabled\n"
+            else:
+                from prometheus_client import generate_latest
+
+                body = generate_latest(registry)
+            self._cached, self._rendered_at = body, now
+            return body, CONTENT_TYPE_LATEST
+
+
+_default_exporter: Optional[MetricsExporter] = None
+_servers: Dict[int, ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def get_metrics_exporter() -> MetricsExporter:
+    """Get or create the process-wide exporter."""
+    global _default_exporter
+    if _default_exporter is None:
+        _default_exporter = MetricsExporter()
+    return _default_exporter
+
+
+def create_metrics_router(exporter: Optional[MetricsExporter] = None, path: str = "/metrics"):
+    """
+    Create a FastAPI router serving the scrape endpoint.
+
+    Args:
+        exporter: Exporter to serve, defaults to get_metrics_exporter()
+        path: Route path
+    """
+    from fastapi import APIRouter, Response
+
+    router = APIRouter(tags=["metrics"])
+
+    @router.get(path, include_in_schema=False)
+    async def metrics() -> Response:
+        body, content_type = (exporter or get_metrics_exporter()).render()
+        return Response(content=body, media_type=content_type)
+
+    return router
+
+
+async def metrics_route(request: Any) -> Any:
+    """Starlette handler for servers without FastAPI routers (e.g. FastMCP custom routes)."""
+    from starlette.responses import Response
+
+    body, content_type = get_metrics_exporter().render()
+    return Response(content=body, media_type=content_type)
+
+
+def start_metrics_server(port: int, addr: str = "0.0.0.0", exporter: Optional[MetricsExporter] = None) -> ThreadingHTTPServer:
+    """
+    Serve /metrics on a separate port from a daemon thread.
+
+    For processes whose web app cannot be extended (e.g. the `adk web` CLI).
+    Starting a server for a port that is already served returns the existing one.
+    """
+    with _servers_lock:
+        if port in _servers:
+            return _servers[port]
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body, content_type = (exporter or get_metrics_exporter()).render()
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((addr, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name=f"metrics-server-{port}", daemon=True).start()
+        _servers[port] = server
+        return server
+
+
+def mark_process_dead(pid: int) -> None:
+    """Remove a dead worker's live gauges from the multiprocess directory (gunicorn child_exit hook)."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
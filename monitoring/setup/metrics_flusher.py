@@ -0,0 +1,119 @@
+"""
+Periodic Metrics Flusher
+
+Pushes metrics to the Prometheus push gateway from a background thread so
+short-lived jobs and scaled-out workers report without blocking requests.
+Each pod waits a jittered interval between pushes, backs off exponentially
+while the gateway is failing, and pushes once more on shutdown.
+"""
+
+import atexit
+import random
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+
+
+class PeriodicFlusher:
+    """
+    Background thread that calls a push function on a jittered interval.
+
+    The push function should raise on failure; consecutive failures double
+    the delay up to max_backoff_seconds, and a success resets it.
+    """
+
+    def __init__(
+        self,
+        push: Callable[[], None],
+        interval_seconds: float = 15.0,
+        jitter: float = 0.1,
+        max_backoff_seconds: float = 300.0,
+        rng: Optional[random.Random] = None,
+        start: bool = True
+    ):
+        """
+        Initialize the flusher and, by default, start its thread.
+
+        Args:
+            push: Performs one push, raising on failure
+            interval_seconds: Delay between successful pushes
+            jitter: Fraction of the delay randomized (+/-) to spread pods apart
+            max_backoff_seconds: Upper bound on the delay after repeated failures
+            rng: Random source for jitter (injectable for tests)
+            start: Start the background thread immediately
+        """
+        self.push = push
+        self.interval_seconds = interval_seconds
+        self.jitter = jitter
+        self.max_backoff_seconds = max_backoff_seconds
+        self._rng = rng or random.Random()
+        self._stopped = threading.Event()
+        self._push_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.pushes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_push_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        if start:
+            self.start()
+
+    def next_delay(self) -> float:
+        """Delay before the next push: backed off after failures, then jittered."""
+        delay = min(self.interval_seconds * (2 ** self.consecutive_failures), self.max_backoff_seconds)
+        spread = delay * self.jitter
+        return max(0.0, delay + self._rng.uniform(-spread, spread))
+
+    def push_once(self) -> bool:
+        """Push now in the calling thread; returns whether the push succeeded."""
+        with self._push_lock:
+            start = time.perf_counter()
+            try:
+                self.push()
+            except Exception as e:
+                self.failures += 1
+                self.consecutive_failures += 1
+                self.last_error = str(e)
+                print(f"Warning: Failed to push metrics (attempt {self.consecutive_failures}): {e}")
+                return False
+            finally:
+                self.last_push_seconds = time.perf_counter() - start
+            self.pushes += 1
+            self.consecutive_failures = 0
+            self.last_error = None
+            return True
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.next_delay()):
+            self.push_once()
+
+    def start(self) -> None:
+        """Start the background thread and register the final flush on exit."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="metrics-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, final_flush: bool = True) -> None:
+        """Stop the thread and, by default, push one last time."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if final_flush:
+            self.push_once()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Push counters and the latest outcome for status endpoints."""
+        return {
+            "interval_seconds": self.interval_seconds,
+            "pushes": self.pushes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "last_push_seconds": self.last_push_seconds,
+            "last_error": self.last_error
+        }
@@ -0,0 +1,132 @@
+"""
+Metrics Event Pipeline
+
+Moves provider work off the request path. Record calls append a compact
+(handler, args) tuple to a bounded queue; a background worker drains it in
+batches and runs the handlers against the providers.
+"""
+
+import atexit
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, Callable, Deque, List, Tuple
+
+Event = Tuple[Callable[..., None], tuple]
+
+
+class MetricsPipeline:
+    """
+    Bounded, non-blocking event queue with a batching worker thread.
+
+    `submit` never blocks: deque appends are atomic under the GIL, so no lock
+    is taken on the request path. When the queue is full the event is
+    dropped and counted instead of slowing the caller down.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.05,
+        on_batch: Optional[Callable[[int, int, int], None]] = None
+    ):
+        """
+        Initialize the pipeline and start its worker.
+
+        Args:
+            max_queue_size: Events held before new ones are dropped
+            batch_size: Events handled per worker iteration
+            flush_interval_seconds: Worker sleep when the queue is empty
+            on_batch: Called with (batch_size, dropped_since_last, queue_depth) after each batch
+        """
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.on_batch = on_batch
+        self._queue: Deque[Event] = deque()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._dispatch_lock = threading.Lock()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.processed = 0
+        self.failed = 0
+        self._dropped_reported = 0
+
+        self._worker = threading.Thread(target=self._run, name="metrics-pipeline", daemon=True)
+        self._worker.start()
+        atexit.register(self.stop)
+
+    def submit(self, handler: Callable[..., None], args: tuple) -> bool:
+        """Queue an event; returns False if it was dropped because the queue is full."""
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped += 1
+            return False
+        self._queue.append((handler, args))
+        self.enqueued += 1
+        return True
+
+    def _drain(self) -> List[Event]:
+        batch: List[Event] = []
+        popleft = self._queue.popleft
+        try:
+            while len(batch) < self.batch_size:
+                batch.append(popleft())
+        except IndexError:
+            pass
+        return batch
+
+    def _dispatch(self, batch: List[Event]) -> None:
+        for handler, args in batch:
+            try:
+                handler(*args)
+            except Exception as e:
+                self.failed += 1
+                print(f"Warning: Failed to process metrics event {getattr(handler, '__name__', handler)}: {e}")
+        self.processed += len(batch)
+
+        if self.on_batch is not None:
+            dropped = self.dropped
+            try:
+                self.on_batch(len(batch), dropped - self._dropped_reported, len(self._queue))
+            except Exception as e:
+                print(f"Warning: Failed to record metrics pipeline stats: {e}")
+            self._dropped_reported = dropped
+
+    def _process_once(self) -> int:
+        with self._dispatch_lock:
+            batch = self._drain()
+            if batch:
+                self._dispatch(batch)
+            return len(batch)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            if not self._process_once():
+                self._wake.wait(self.flush_interval_seconds)
+                self._wake.clear()
+
+    def flush(self) -> None:
+        """Process every queued event in the calling thread."""
+        while self._process_once():
+            pass
+
+    def stop(self) -> None:
+        """Stop the worker after handling what is already queued."""
+        if not self._stopped.is_set():
+            self._stopped.set()
+            self._wake.set()
+            self._worker.join(timeout=5)
+            self.flush()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth and event counters for status endpoints."""
+        return {
+            "queue_depth": len(self._queue),
+            "max_queue_size": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "failed": self.failed
+        }
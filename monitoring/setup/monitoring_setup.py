@@ -5,15 +5,39 @@ Central manager for initializing and coordinating all monitoring components.
 Follows Dependency Inversion principle by depending on abstractions.
 """
 
+import functools
 import os
+from datetime import datetime
 from typing import Dict, Any, Optional, List
 from contextlib import contextmanager
 
 from ..interfaces.metrics_collector import MetricsCollector, LLMMetricsCollector, APIMetricsCollector
 from ..interfaces.trace_provider import TraceProvider, LLMTraceProvider, MCPTraceProvider
-from ..interfaces.health_checker import HealthChecker, LLMHealthChecker, MCPHealthChecker, APIHealthChecker
+from ..interfaces.health_checker import (
+    HealthChecker, LLMHealthChecker, MCPHealthChecker, APIHealthChecker, HealthStatus, SystemHealth
+)
 from ..providers.langfuse_provider import LangfuseProvider
 from ..providers.prometheus_provider import PrometheusProvider
+from ..providers.opentelemetry_provider import OpenTelemetryProvider
+from ..providers.health_provider import ConcurrentHealthChecker, http_health_check
+from ..providers.sliding_window import WindowedMetrics
+from .metrics_pipeline import MetricsPipeline
+from .metrics_flusher import PeriodicFlusher
+from .request_timing import RequestTimings, record_phase as record_request_phase
+
+
+def _queued(method):
+    """Run a record method on the metrics pipeline instead of the caller's thread, when enabled."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        pipeline = self._pipeline
+        if pipeline is None:
+            return method(self, *args, **kwargs)
+        if kwargs:
+            pipeline.submit(functools.partial(method, self, *args, **kwargs), ())
+        else:
+            pipeline.submit(method, (self,) + args)
+    return wrapper
 
 
 class MonitoringManager:
@@ -33,10 +57,18 @@ class MonitoringManager:
         """
         self.config = config or {}
         self._providers = {}
+        self._circuit_breakers = {}
+        self._health_checker = None
         self._initialized = False
+        # In-process rolling aggregates behind /health/metrics/summary
+        self._windows = WindowedMetrics(
+            window_seconds=float(self.config.get("metrics_window_seconds", os.getenv("METRICS_WINDOW_SECONDS", "60")))
+        )
         
         # Initialize providers based on configuration
         self._setup_providers()
+        self._pipeline = self._create_pipeline()
+        self._flusher = self._create_flusher()
 
     def _setup_providers(self) -> None:
         """Set up monitoring providers based on configuration."""
@@ -59,8 +91,75 @@ class MonitoringManager:
         else:
             print("⚠️  Prometheus failed to initialize")
 
+        # Setup OpenTelemetry for distributed tracing
+        if self._is_opentelemetry_enabled():
+            opentelemetry = OpenTelemetryProvider()
+            if opentelemetry.is_enabled():
+                self._providers['opentelemetry'] = opentelemetry
+                print("✅ OpenTelemetry distributed tracing enabled")
+            else:
+                print("⚠️  OpenTelemetry configured but failed to initialize")
+
         self._initialized = True
 
+    def _create_pipeline(self) -> Optional[MetricsPipeline]:
+        """
+        Create the background metrics pipeline unless disabled.
+
+        Configured by METRICS_PIPELINE_ENABLED (default true),
+        METRICS_QUEUE_SIZE, METRICS_BATCH_SIZE and METRICS_FLUSH_INTERVAL_SECONDS,
+        or the matching config keys.
+        """
+        enabled = self.config.get("metrics_pipeline_enabled", os.getenv("METRICS_PIPELINE_ENABLED", "true"))
+        if str(enabled).lower() in ("false", "0", "no"):
+            return None
+        prometheus = self._providers.get('prometheus')
+        on_batch = getattr(prometheus, 'record_metrics_pipeline', None) if prometheus else None
+        return MetricsPipeline(
+            max_queue_size=int(self.config.get("metrics_queue_size", os.getenv("METRICS_QUEUE_SIZE", "10000"))),
+            batch_size=int(self.config.get("metrics_batch_size", os.getenv("METRICS_BATCH_SIZE", "256"))),
+            flush_interval_seconds=float(self.config.get(
+                "metrics_flush_interval_seconds", os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "0.05")
+            )),
+            on_batch=on_batch
+        )
+
+    def _create_flusher(self) -> Optional[PeriodicFlusher]:
+        """
+        Create the background push-gateway flusher when a gateway is configured.
+
+        Configured by METRICS_PUSH_INTERVAL_SECONDS (default 15, 0 disables),
+        METRICS_PUSH_JITTER (default 0.1) and METRICS_PUSH_MAX_BACKOFF_SECONDS
+        (default 300), or the matching config keys.
+        """
+        prometheus = self._providers.get('prometheus')
+        if prometheus is None or not getattr(prometheus, 'gateway_url', None):
+            return None
+        interval = float(self.config.get("metrics_push_interval_seconds", os.getenv("METRICS_PUSH_INTERVAL_SECONDS", "15")))
+        if interval <= 0:
+            return None
+        return PeriodicFlusher(
+            self._push_metrics,
+            interval_seconds=interval,
+            jitter=float(self.config.get("metrics_push_jitter", os.getenv("METRICS_PUSH_JITTER", "0.1"))),
+            max_backoff_seconds=float(self.config.get(
+                "metrics_push_max_backoff_seconds", os.getenv("METRICS_PUSH_MAX_BACKOFF_SECONDS", "300")
+            ))
+        )
+
+    def _push_metrics(self) -> None:
+        """Drain queued events, then push to the gateway (raises on failure)."""
+        if self._pipeline is not None:
+            self._pipeline.flush()
+        self._providers['prometheus'].push()
+
+    def _is_opentelemetry_enabled(self) -> bool:
+        """Check if OpenTelemetry tracing is configured via environment variables."""
+        exporter = os.getenv("OTEL_TRACES_EXPORTER", "").lower()
+        if exporter:
+            return exporter != "none"
+        return bool(os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"))
+
     def _is_langfuse_enabled(self) -> bool:
         """Check if Langfuse is configured via environment variables."""
         return bool(
@@ -77,6 +176,11 @@ class MonitoringManager:
         # Langfuse provides LLM metrics, Prometheus can supplement
         return self._providers.get('langfuse')
 
+    def get_metrics_registry(self) -> Optional[Any]:
+        """Get the Prometheus registry to expose for scraping, if Prometheus is enabled."""
+        prometheus = self._providers.get('prometheus')
+        return getattr(prometheus, '_registry', None) if prometheus else None
+
     def get_api_metrics_collector(self) -> Optional[APIMetricsCollector]:
         """Get API-specific metrics collector."""
         return self._providers.get('prometheus')
@@ -86,9 +190,12 @@ class MonitoringManager:
         return self._providers.get('langfuse')
 
     def get_trace_provider(self) -> Optional[TraceProvider]:
-        """Get general trace provider."""
-        # Could return OpenTelemetry provider when implemented
-        return self._providers.get('langfuse')
+        """Get general trace provider (OpenTelemetry when configured, else Langfuse)."""
+        return self._providers.get('opentelemetry') or self._providers.get('langfuse')
+
+    def get_distributed_trace_provider(self) -> Optional[OpenTelemetryProvider]:
+        """Get the OpenTelemetry provider used for cross-service traces, if configured."""
+        return self._providers.get('opentelemetry')
 
     def record_llm_call(
         self,
@@ -99,19 +206,42 @@ class MonitoringManager:
         duration_seconds: float,
         success: bool,
         error: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        end_time: Optional[datetime] = None
     ) -> None:
         """
         Record LLM call metrics across all enabled providers.
         
         This is a convenience method that calls all relevant providers.
+        The call's end time is taken here, on the caller's thread, so queued
+        recording does not shift the call's position on the trace timeline.
         """
+        self._record_llm_call(
+            model, prompt_tokens, completion_tokens, total_tokens, duration_seconds,
+            success, error, metadata, end_time or datetime.now()
+        )
+
+    @_queued
+    def _record_llm_call(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        total_tokens: int,
+        duration_seconds: float,
+        success: bool,
+        error: Optional[str],
+        metadata: Optional[Dict[str, Any]],
+        end_time: datetime
+    ) -> None:
+        self._windows.record("llm", duration_seconds, error=not success)
+
         # Record in Langfuse for detailed LLM observability
         langfuse = self._providers.get('langfuse')
         if langfuse:
             langfuse.record_llm_call(
                 model, prompt_tokens, completion_tokens, total_tokens,
-                duration_seconds, success, error, metadata
+                duration_seconds, success, error, metadata, end_time=end_time
             )
 
         # Record in Prometheus for system metrics
@@ -122,6 +252,33 @@ class MonitoringManager:
                 duration_seconds, success
             )
 
+    def record_phase(self, phase: str, seconds: float) -> None:
+        """Charge an already-measured duration to a phase of the request being handled, if timed."""
+        record_request_phase(phase, seconds)
+
+    def record_request_timings(self, timings: Optional[RequestTimings]) -> None:
+        """
+        Export a finished request's phase breakdown.
+
+        Phase times are set as `timing.<phase>_ms` attributes on the current
+        trace span right away; the per-phase histograms go through the pipeline.
+        """
+        if timings is None:
+            return
+        phases = timings.breakdown()
+        tracing = self.get_distributed_trace_provider()
+        if tracing is not None:
+            for phase, seconds in phases.items():
+                tracing.set_trace_attribute(f"timing.{phase}_ms", round(seconds * 1000, 2))
+        self._record_request_phases(timings.name, phases)
+
+    @_queued
+    def _record_request_phases(self, request: str, phases: Dict[str, float]) -> None:
+        prometheus = self._providers.get('prometheus')
+        if prometheus and hasattr(prometheus, 'record_request_phases'):
+            prometheus.record_request_phases(request, phases)
+
+    @_queued
     def record_intent_analysis(
         self,
         intent: str,
@@ -141,6 +298,7 @@ class MonitoringManager:
         if prometheus and hasattr(prometheus, 'record_intent_metrics'):
             prometheus.record_intent_metrics(intent, confidence, method, success, duration_seconds)
 
+    @_queued
     def record_http_request(
         self,
         method: str,
@@ -151,6 +309,7 @@ class MonitoringManager:
         response_size_bytes: Optional[int] = None
     ) -> None:
         """Record HTTP request metrics."""
+        self._windows.record("http", duration_seconds, error=status_code >= 500)
         prometheus = self._providers.get('prometheus')
         if prometheus:
             prometheus.record_http_request(
@@ -158,6 +317,7 @@ class MonitoringManager:
                 request_size_bytes, response_size_bytes
             )
 
+    @_queued
     def record_mcp_call(
         self,
         tool_name: str,
@@ -167,10 +327,46 @@ class MonitoringManager:
         error: Optional[str] = None
     ) -> None:
         """Record MCP tool call metrics."""
+        self._windows.record("mcp", duration_seconds, error=not success)
         prometheus = self._providers.get('prometheus')
         if prometheus:
             prometheus.record_mcp_call(tool_name, success, duration_seconds, retry_count, error)
 
+    @_queued
+    def record_admission_decision(
+        self,
+        lane: str,
+        admitted: bool,
+        reason: str,
+        queue_wait_seconds: float
+    ) -> None:
+        """Record a server-side admission control decision."""
+        prometheus = self._providers.get('prometheus')
+        if prometheus and hasattr(prometheus, 'record_admission_decision'):
+            prometheus.record_admission_decision(lane, admitted, reason, queue_wait_seconds)
+
+    @_queued
+    def record_prompt_tokens(
+        self,
+        agent: str,
+        tokens_before: int,
+        tokens_after: int,
+        summary_refreshed: bool = False,
+        deduplicated: int = 0
+    ) -> None:
+        """Record prompt size before and after context compaction."""
+        prometheus = self._providers.get('prometheus')
+        if prometheus and hasattr(prometheus, 'record_prompt_tokens'):
+            prometheus.record_prompt_tokens(agent, tokens_before, tokens_after, summary_refreshed, deduplicated)
+
+    @_queued
+    def record_response_cache(self, agent: str, result: str) -> None:
+        """Record a response cache lookup (exact_hit, semantic_hit or miss)."""
+        prometheus = self._providers.get('prometheus')
+        if prometheus and hasattr(prometheus, 'record_response_cache'):
+            prometheus.record_response_cache(agent, result)
+
+    @_queued
     def increment_counter(
         self,
         name: str,
@@ -182,6 +378,7 @@ class MonitoringManager:
         if prometheus:
             prometheus.increment_counter(name, value, labels)
 
+    @_queued
     def record_duration(
         self,
         name: str,
@@ -235,7 +432,14 @@ class MonitoringManager:
             yield DummySpanContext()
 
     def flush_metrics(self) -> None:
-        """Flush all metrics to their respective backends."""
+        """
+        Flush all metrics to their respective backends.
+
+        Blocks on the gateway push; the background flusher already pushes
+        periodically when PROMETHEUS_GATEWAY_URL is set.
+        """
+        if self._pipeline is not None:
+            self._pipeline.flush()
         for provider in self._providers.values():
             if hasattr(provider, 'flush'):
                 try:
@@ -243,6 +447,99 @@ class MonitoringManager:
                 except Exception as e:
                     print(f"Warning: Failed to flush metrics for {type(provider).__name__}: {e}")
 
+    def register_circuit_breaker(self, name: str, breaker: Any) -> Any:
+        """
+        Register a circuit breaker so its state is reported in monitoring status.
+
+        If a breaker is already registered under the same name it is returned
+        instead, so every client of an endpoint shares one breaker.
+
+        Args:
+            name: Endpoint name the breaker protects
+            breaker: Circuit breaker instance exposing get_status()
+
+        Returns:
+            The breaker registered for this name
+        """
+        registered = self._circuit_breakers.setdefault(name, breaker)
+        if self._health_checker is not None and registered is breaker:
+            self._register_circuit_breaker_check(name, breaker)
+        return registered
+
+    def get_circuit_breaker(self, name: str) -> Optional[Any]:
+        """Get the circuit breaker registered for an endpoint, if any."""
+        return self._circuit_breakers.get(name)
+
+    def get_health_checker(self) -> ConcurrentHealthChecker:
+        """
+        Get the health checker, creating it with the default checks on first use.
+
+        Default checks cover the monitoring providers, registered circuit
+        breakers, and any dependencies listed in HEALTH_CHECK_URLS
+        ("name=url,name=url"). Timeouts and TTLs come from
+        HEALTH_CHECK_TIMEOUT_SECONDS and HEALTH_CHECK_TTL_SECONDS.
+        """
+        if self._health_checker is None:
+            checker = ConcurrentHealthChecker(
+                default_timeout_seconds=float(os.getenv("HEALTH_CHECK_TIMEOUT_SECONDS", "5")),
+                default_ttl_seconds=float(os.getenv("HEALTH_CHECK_TTL_SECONDS", "15")),
+                history_size=int(os.getenv("HEALTH_HISTORY_SIZE", "100"))
+            )
+            for name, provider in self._providers.items():
+                checker.register_health_check(
+                    f"monitoring_{name}",
+                    lambda provider=provider: hasattr(provider, 'is_enabled') and provider.is_enabled(),
+                    critical=False
+                )
+            for entry in filter(None, os.getenv("HEALTH_CHECK_URLS", "").split(",")):
+                name, _, url = entry.partition("=")
+                if url:
+                    checker.register_health_check(name.strip(), http_health_check(url.strip()))
+            self._health_checker = checker
+            for name, breaker in self._circuit_breakers.items():
+                self._register_circuit_breaker_check(name, breaker)
+        return self._health_checker
+
+    def _register_circuit_breaker_check(self, name: str, breaker: Any) -> None:
+        """Report an open circuit as degraded (the breaker already fails fast)."""
+        def check():
+            state = breaker.get_status().get("state")
+            return HealthStatus.DEGRADED if state == "open" else HealthStatus.HEALTHY
+
+        self._health_checker.register_health_check(f"circuit_breaker_{name}", check, critical=False, ttl_seconds=1.0)
+
+    def check_all_health(self) -> SystemHealth:
+        """Check the health of all registered components (cached per check TTL)."""
+        return self.get_health_checker().check_all_health()
+
+    def get_metrics_summary(self) -> Dict[str, Any]:
+        """
+        Live sliding-window summary of HTTP, LLM and MCP traffic.
+
+        Rates are per minute, latencies in seconds; percentiles come from
+        DDSketch with 1% relative error. The windows are read as they are,
+        without draining the metrics pipeline on the caller's thread, so
+        events still queued (at most one worker interval old) are not counted.
+        """
+        http = self._windows.snapshot("http")
+        llm = self._windows.snapshot("llm")
+        mcp = self._windows.snapshot("mcp")
+        return {
+            "window_seconds": self._windows.window_seconds,
+            "requests_per_minute": http["per_minute"],
+            "average_response_time": http["average"],
+            "response_time_p50": http["p50"],
+            "response_time_p95": http["p95"],
+            "response_time_p99": http["p99"],
+            "error_rate": http["error_rate"],
+            "llm_calls_per_minute": llm["per_minute"],
+            "successful_llm_calls": llm["count"] - llm["errors"],
+            "llm_latency_p95": llm["p95"],
+            "mcp_calls_per_minute": mcp["per_minute"],
+            "mcp_error_rate": mcp["error_rate"],
+            "mcp_latency_p95": mcp["p95"]
+        }
+
     def get_monitoring_status(self) -> Dict[str, Any]:
         """Get the status of all monitoring providers."""
         status = {
@@ -255,6 +552,20 @@ class MonitoringManager:
                 "enabled": hasattr(provider, 'is_enabled') and provider.is_enabled(),
                 "type": type(provider).__name__
             }
+            if hasattr(provider, 'get_status'):
+                status["providers"][name].update(provider.get_status())
+
+        if self._pipeline is not None:
+            status["metrics_pipeline"] = self._pipeline.get_status()
+
+        if self._flusher is not None:
+            status["metrics_flusher"] = self._flusher.get_status()
+
+        if self._circuit_breakers:
+            status["circuit_breakers"] = {
+                name: breaker.get_status()
+                for name, breaker in self._circuit_breakers.items()
+            }
             
         return status
 
@@ -0,0 +1,187 @@
+"""
+Request Latency Breakdown
+
+Attributes each request's wall time to phases (LLM, MCP, data lookup,
+serialization, session I/O, ...) through a context variable, so any code on
+the request path can record into the active request without passing it
+around. Phases are exclusive: time spent in a nested phase is charged to the
+inner phase only, and whatever no phase claims is reported as "other".
+
+With no active request (or REQUEST_TIMING_ENABLED=false) `phase()` costs a
+single context-variable lookup and returns a shared no-op context manager.
+
+Usage:
+    timings = begin_request("GET /policies")
+    with phase("mcp"):
+        await client.call_tool(...)
+    end_request(timings)
+    timings.breakdown()  # {"mcp": 0.041, "other": 0.003}
+"""
+
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+UNATTRIBUTED_PHASE = "other"
+
+_current_request: contextvars.ContextVar[Optional["RequestTimings"]] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+_current_phase: contextvars.ContextVar[Optional["_Phase"]] = contextvars.ContextVar(
+    "request_phase", default=None
+)
+
+
+def timing_enabled() -> bool:
+    """Whether new requests are timed (REQUEST_TIMING_ENABLED, default true)."""
+    return os.getenv("REQUEST_TIMING_ENABLED", "true").lower() == "true"
+
+
+class RequestTimings:
+    """Per-request phase totals, safe to update from tasks and threads of the request."""
+
+    def __init__(self, name: str, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize timings.
+
+        Args:
+            name: Request name used as the histogram label (route, tool or agent)
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.name = name
+        self._clock = clock
+        self.started = clock()
+        self.ended: Optional[float] = None
+        self.phases: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._token: Optional[contextvars.Token] = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Charge `seconds` to `phase`."""
+        with self._lock:
+            self.phases[phase] = self.phases.get(phase, 0.0) + max(seconds, 0.0)
+
+    @property
+    def total_seconds(self) -> float:
+        """Request wall time so far, or until end_request."""
+        return (self.ended if self.ended is not None else self._clock()) - self.started
+
+    def breakdown(self) -> Dict[str, float]:
+        """Seconds per phase plus the unattributed remainder."""
+        with self._lock:
+            result = dict(self.phases)
+        result[UNATTRIBUTED_PHASE] = max(self.total_seconds - sum(result.values()), 0.0)
+        return result
+
+    def server_timing_header(self) -> str:
+        """W3C Server-Timing header value, e.g. "llm;dur=812.4, mcp;dur=40.1, total;dur=861.0"."""
+        entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.breakdown().items()]
+        entries.append(f"total;dur={self.total_seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+
+class _Phase:
+    """Times one phase; nested phases are deducted from their parent."""
+
+    __slots__ = ("timings", "name", "started", "child_seconds", "_parent", "_token")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+        self.child_seconds = 0.0
+
+    def __enter__(self) -> "_Phase":
+        self._parent = _current_phase.get()
+        self._token = _current_phase.set(self)
+        self.started = self.timings._clock()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        elapsed = self.timings._clock() - self.started
+        _current_phase.reset(self._token)
+        self.timings.add(self.name, elapsed - self.child_seconds)
+        if self._parent is not None:
+            self._parent.child_seconds += elapsed
+
+
+class _NoopPhase:
+    """Shared context manager returned when no request is being timed."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopPhase":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
+
+
+_NOOP_PHASE = _NoopPhase()
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the request being handled in this context, if any."""
+    return _current_request.get()
+
+
+def begin_request(name: str) -> Optional[RequestTimings]:
+    """Start timing a request in the current context (None when timing is disabled)."""
+    if not timing_enabled():
+        return None
+    timings = RequestTimings(name)
+    timings._token = _current_request.set(timings)
+    return timings
+
+
+def end_request(timings: Optional[RequestTimings]) -> Optional[RequestTimings]:
+    """Stop timing and detach the request from the current context."""
+    if timings is None:
+        return None
+    timings.ended = timings._clock()
+    try:
+        _current_request.reset(timings._token)
+    except (TypeError, ValueError):  # ended from a different context than it began in
+        if _current_request.get() is timings:
+            _current_request.set(None)
+    return timings
+
+
+def phase(name: str) -> Any:
+    """Context manager charging the enclosed time to `name` in the current request."""
+    timings = _current_request.get()
+    if timings is None:
+        return _NOOP_PHASE
+    return _Phase(timings, name)
+
+
+def record_phase(name: str, seconds: float) -> None:
+    """Charge an already-measured duration to `name` (and out of the enclosing phase)."""
+    timings = _current_request.get()
+    if timings is None:
+        return
+    timings.add(name, seconds)
+    parent = _current_phase.get()
+    if parent is not None:
+        parent.child_seconds += seconds
+
+
+def timed(name: str) -> Callable[[Callable], Callable]:
+    """Decorator charging each call of a sync or async function to phase `name`."""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with phase(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Admission Control for the Policy FastMCP Server
+Global concurrency limit, queue-length shedding, per-client token buckets
+and priority lanes in front of the MCP tools
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class Lane(IntEnum):
+    """Priority lanes - lower value is served first"""
+    INTERACTIVE = 0
+    ANALYTICS = 1
+
+
+# Tools that aggregate across policies, agents and business rules.
+# Everything else is a cheap per-customer lookup.
+ANALYTICS_TOOLS = {
+    "get_recommendations",
+    "get_customer_policies",
+}
+
+
+def lane_for_tool(tool_name: str) -> Lane:
+    """Map a tool name to its priority lane"""
+    return Lane.ANALYTICS if tool_name in ANALYTICS_TOOLS else Lane.INTERACTIVE
+
+
+@dataclass
+class AdmissionConfig:
+    """Admission control limits"""
+    max_concurrency: int = 32
+    max_queue: Dict[Lane, int] = field(
+        default_factory=lambda: {Lane.INTERACTIVE: 64, Lane.ANALYTICS: 16}
+    )
+    queue_timeout_seconds: float = 5.0
+    rate_per_second: float = 20.0
+    burst: float = 40.0
+    max_tracked_clients: int = 10000
+
+    @classmethod
+    def from_env(cls) -> "AdmissionConfig":
+        """Build configuration from POLICY_SERVER_* environment variables"""
+        max_queue = int(os.getenv("POLICY_SERVER_MAX_QUEUE", "64"))
+        return cls(
+            max_concurrency=int(os.getenv("POLICY_SERVER_MAX_CONCURRENCY", "32")),
+            max_queue={
+                Lane.INTERACTIVE: max_queue,
+                Lane.ANALYTICS: int(os.getenv("POLICY_SERVER_MAX_ANALYTICS_QUEUE", str(max(1, max_queue // 4)))),
+            },
+            queue_timeout_seconds=float(os.getenv("POLICY_SERVER_QUEUE_TIMEOUT", "5.0")),
+            rate_per_second=float(os.getenv("POLICY_SERVER_RATE_LIMIT", "20")),
+            burst=float(os.getenv("POLICY_SERVER_RATE_BURST", "40")),
+        )
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed before reaching a tool"""
+
+    def __init__(self, reason: str, lane: Lane, client_key: str):
+        self.reason = reason
+        self.lane = lane
+        self.client_key = client_key
+        super().__init__(f"Request rejected ({reason}) for lane {lane.name.lower()}")
+
+
+class TokenBucket:
+    """Classic token bucket refilled lazily on each take"""
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def take(self, now: float, cost: float = 1.0) -> bool:
+        """Take `cost` tokens if available"""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class AdmissionController:
+    """
+    Admits tool calls under a global concurrency limit.
+
+    Requests first pass the per-client token bucket, then either take a free
+    slot or wait in their lane's queue. Freed slots go to the oldest waiter in
+    the highest-priority non-empty lane. Full queues and waits longer than
+    queue_timeout_seconds are shed.
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdmissionConfig] = None,
+        on_decision: Optional[Callable[[Lane, bool, str, float], None]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.config = config or AdmissionConfig()
+        self._on_decision = on_decision
+        self._clock = clock
+
+        self._in_flight = 0
+        self._queues: Dict[Lane, Deque[asyncio.Future]] = {lane: deque() for lane in Lane}
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self._shed: Dict[str, int] = {}
+
+    async def acquire(self, lane: Lane, client_key: str) -> float:
+        """
+        Wait for an execution slot.
+
+        Returns:
+            Seconds spent queued
+
+        Raises:
+            AdmissionRejected: If the request is rate limited or shed
+        """
+        if not self._take_token(client_key):
+            self._reject("rate_limited", lane, client_key)
+
+        if self._in_flight < self.config.max_concurrency and not self._has_waiters():
+            self._in_flight += 1
+            self._report(lane, True, "admitted", 0.0)
+            return 0.0
+
+        queue = self._queues[lane]
+        if len(queue) >= self.config.max_queue.get(lane, 0):
+            self._reject("queue_full", lane, client_key)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        start = self._clock()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.config.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed over just as the timeout fired - keep it
+                pass
+            else:
+                self._discard(queue, waiter)
+                self._reject("queue_timeout", lane, client_key, self._clock() - start)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(queue, waiter)
+            raise
+
+        waited = self._clock() - start
+        self._report(lane, True, "admitted", waited)
+        return waited
+
+    def release(self) -> None:
+        """Release a slot, handing it directly to the next waiter if any"""
+        for lane in Lane:
+            queue = self._queues[lane]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    # Slot ownership moves to the waiter; in-flight count is unchanged
+                    waiter.set_result(None)
+                    return
+        self._in_flight = max(0, self._in_flight - 1)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Snapshot of admission state"""
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.config.max_concurrency,
+            "queued": {lane.name.lower(): len(q) for lane, q in self._queues.items()},
+            "tracked_clients": len(self._buckets),
+            "shed": dict(self._shed),
+        }
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues[lane] for lane in Lane)
+
+    def _take_token(self, client_key: str) -> bool:
+        if self.config.rate_per_second <= 0:
+            return True
+        now = self._clock()
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            bucket = TokenBucket(self.config.rate_per_second, self.config.burst, now)
+            self._buckets[client_key] = bucket
+            if len(self._buckets) > self.config.max_tracked_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_key)
+        return bucket.take(now)
+
+    @staticmethod
+    def _discard(queue: Deque[asyncio.Future], waiter: asyncio.Future) -> None:
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            pass
+        waiter.cancel()
+
+    def _reject(self, reason: str, lane: Lane, client_key: str, waited: float = 0.0) -> None:
+        self._shed[reason] = self._shed.get(reason, 0) + 1
+        self._report(lane, False, reason, waited)
+        logger.warning(f"Shedding {lane.name.lower()} request from {client_key}: {reason}")
+        raise AdmissionRejected(reason, lane, client_key)
+
+    def _report(self, lane: Lane, admitted: bool, reason: str, waited: float) -> None:
+        if self._on_decision:
+            try:
+                self._on_decision(lane, admitted, reason, waited)
+            except Exception as e:
+                logger.warning(f"Failed to record admission metrics: {e}")
+
+
+def client_key_from_request(headers: Dict[str, str], session_id: Optional[str]) -> str:
+    """
+    Derive the rate-limit key for a request.
+
+    API keys win over MCP session IDs; credentials are hashed so they are never
+    kept in memory or logs in the clear.
+    """
+    api_key = headers.get("x-api-key")
+    if not api_key:
+        authorization = headers.get("authorization", "")
+        if authorization.lower().startswith("bearer "):
+            api_key = authorization[7:].strip()
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+    if session_id:
+        return f"session:{session_id}"
+    return "anonymous"
+
+
+def create_admission_middleware(controller: AdmissionController):
+    """
+    Create a FastMCP middleware that runs tool calls through the controller.
+
+    Returns None when the installed FastMCP has no middleware support.
+    """
+    try:
+        from fastmcp.exceptions import ToolError
+        from fastmcp.server.dependencies import get_http_headers
+        from fastmcp.server.middleware import Middleware
+    except ImportError:
+        logger.warning("FastMCP middleware not available - admission control disabled")
+        return None
+
+    class AdmissionControlMiddleware(Middleware):
+        """Applies admission control to tools/call requests"""
+
+        async def on_call_tool(self, context, call_next):
+            tool_name = getattr(context.message, "name", "")
+            lane = lane_for_tool(tool_name)
+
+            session_id = None
+            if context.fastmcp_context is not None:
+                try:
+                    session_id = context.fastmcp_context.session_id
+                except RuntimeError:
+                    session_id = None
+            client_key = client_key_from_request(get_http_headers(), session_id)
+
+            try:
+                await controller.acquire(lane, client_key)
+            except AdmissionRejected as e:
+                raise ToolError(f"Policy server busy ({e.reason}), please retry shortly")
+
+            try:
+                return await call_next(context)
+            finally:
+                controller.release()
+
+    return AdmissionControlMiddleware()
+
+
+def build_metrics_callback() -> Optional[Callable[[Lane, bool, str, float], None]]:
+    """
+    Wire admission decisions into the shared monitoring manager if available,
+    and charge queue waits to the request's "admission_wait" phase.
+
+    The manager is resolved on the first decision so server import does not
+    pay for provider initialization.
+    """
+    try:
+        from monitoring.setup.monitoring_setup import get_monitoring_manager
+        from monitoring.setup.request_timing import record_phase
+    except ImportError:
+        return None
+
+    def on_decision(lane: Lane, admitted: bool, reason: str, waited: float) -> None:
+        if waited:
+            record_phase("admission_wait", waited)
+        monitoring = get_monitoring_manager()
+        if monitoring.is_monitoring_enabled():
+            monitoring.record_admission_decision(lane.name.lower(), admitted, reason, waited)
+
+    return on_decision
@@ -5,6 +5,7 @@ Simple, business-focused API design for insurance policy management
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -24,11 +25,67 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Make the project root importable so shared packages (monitoring) resolve
+# when the server is started as `python policy_server/main.py`
+PROJECT_ROOT = Path(__file__).parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from policy_server.admission import (
+    AdmissionConfig,
+    AdmissionController,
+    build_metrics_callback,
+    create_admission_middleware,
+)
+
 # Initialize FastMCP server
 mcp = FastMCP("Policy Service")
 
-# Load mock data
-DATA_FILE = Path(__file__).parent.parent / "data" / "mock_data.json"
+# Distributed tracing: tool calls continue the caller's W3C trace context
+# (active when OTEL_TRACES_EXPORTER or OTEL_EXPORTER_OTLP_ENDPOINT is set).
+# Request timing: per-call phase breakdown (REQUEST_TIMING_ENABLED), added
+# inside the tracing middleware so the breakdown lands on the tool call's span.
+# Tools are registered through `tool()`, which charges result encoding to the
+# "serialization" phase
+try:
+    from monitoring.middleware.mcp_middleware import (
+        create_mcp_timing_middleware, create_mcp_tracing_middleware, create_timed_tool_decorator
+    )
+    from monitoring.setup.request_timing import timed
+    for server_middleware in (create_mcp_tracing_middleware(), create_mcp_timing_middleware()):
+        if server_middleware is not None:
+            mcp.add_middleware(server_middleware)
+    tool = create_timed_tool_decorator(mcp)
+except ImportError:
+    logger.info("Monitoring not available - distributed tracing and request timing disabled")
+    tool = mcp.tool
+
+    def timed(phase):
+        return lambda func: func
+
+# Admission control: global concurrency limit, queue shedding,
+# per-client token buckets and priority lanes in front of every tool
+admission_controller = None
+if os.getenv("POLICY_SERVER_ADMISSION_CONTROL", "true").lower() == "true":
+    admission_controller = AdmissionController(
+        AdmissionConfig.from_env(),
+        on_decision=build_metrics_callback()
+    )
+    admission_middleware = create_admission_middleware(admission_controller)
+    if admission_middleware is not None:
+        mcp.add_middleware(admission_middleware)
+        logger.info(f"Admission control enabled (max concurrency {admission_controller.config.max_concurrency})")
+
+# Prometheus scrape endpoint (pull-based; aggregates workers via PROMETHEUS_MULTIPROC_DIR)
+if os.getenv("POLICY_SERVER_METRICS_ENDPOINT", "true").lower() == "true":
+    try:
+        from monitoring.setup.metrics_endpoint import metrics_route
+        mcp.custom_route("/metrics", methods=["GET"])(metrics_route)
+    except ImportError:
+        logger.info("Monitoring not available - /metrics endpoint disabled")
+
+# Load mock data (POLICY_DATA_FILE points at an alternative dataset, e.g. for benchmarks)
+DATA_FILE = Path(os.getenv("POLICY_DATA_FILE", Path(__file__).parent.parent / "data" / "mock_data.json"))
 
 def load_data() -> Dict[str, Any]:
     """Load mock data from JSON file"""
@@ -44,6 +101,7 @@ def load_data() -> Dict[str, Any]:
 # Global data store
 DATA = load_data()
 
+@timed("data_lookup")
 def get_agent_info(agent_id: str) -> Dict[str, Any]:
     """Get agent information by ID"""
     for user in DATA.get("users", []):
@@ -57,6 +115,7 @@ def get_agent_info(agent_id: str) -> Dict[str, Any]:
             }
     return {}
 
+@timed("data_lookup")
 def get_customer_policies_internal(customer_id: str) -> List[Dict[str, Any]]:
     """Internal helper to get customer policies"""
     return [
@@ -68,7 +127,7 @@ def get_customer_policies_internal(customer_id: str) -> List[Dict[str, Any]]:
 # SIMPLE BUSINESS-FOCUSED APIS
 # ============================================
 
-@mcp.tool()
+@tool()
 def get_policies(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get basic list of customer policies with essential billing information
@@ -101,7 +160,7 @@ def get_policies(customer_id: str) -> List[Dict[str, Any]]:
     logger.info(f"Returning {len(policies)} policies with billing cycle information")
     return policies
 
-@mcp.tool()
+@tool()
 def get_agent(customer_id: str) -> Dict[str, Any]:
     """
     Get agent information for customer
@@ -133,7 +192,7 @@ def get_agent(customer_id: str) -> Dict[str, Any]:
     logger.info(f"Found agent: {agent_info.get('name')}")
     return agent_info
 
-@mcp.tool()
+@tool()
 def get_policy_types(customer_id: str) -> List[str]:
     """
     Get policy types for customer
@@ -153,7 +212,7 @@ def get_policy_types(customer_id: str) -> List[str]:
     logger.info(f"Found policy types: {policy_types}")
     return policy_types
 
-@mcp.tool()
+@tool()
 def get_policy_list(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get detailed policy list with more information than get_policies
@@ -189,7 +248,7 @@ def get_policy_list(customer_id: str) -> List[Dict[str, Any]]:
     logger.info(f"Returning detailed list of {len(policy_list)} policies")
     return policy_list
 
-@mcp.tool()
+@tool()
 def get_payment_information(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get payment information for customer policies
@@ -219,7 +278,7 @@ def get_payment_information(customer_id: str) -> List[Dict[str, Any]]:
     logger.info(f"Returning payment info for {len(payment_info)} policies")
     return payment_info
 
-@mcp.tool()
+@tool()
 def get_coverage_information(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get coverage information for customer policies
@@ -250,7 +309,7 @@ def get_coverage_information(customer_id: str) -> List[Dict[str, Any]]:
     logger.info(f"Returning coverage info for {len(coverage_info)} policies")
     return coverage_info
 
-@mcp.tool()
+@tool()
 def get_policy_details(policy_id: str) -> Dict[str, Any]:
     """
     Get complete details for a specific policy
@@ -298,7 +357,7 @@ def get_policy_details(policy_id: str) -> Dict[str, Any]:
     logger.info(f"Returning policy details for {policy_id}")
     return policy_details
 
-@mcp.tool()
+@tool()
 def get_deductibles(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get deductible information for customer policies
@@ -326,7 +385,7 @@ def get_deductibles(customer_id: str) -> List[Dict[str, Any]]:
     logger.info(f"Returning deductibles for {len(deductibles)} policies")
     return deductibles
 
-@mcp.tool()
+@tool()
 def get_recommendations(customer_id: str) -> List[Dict[str, Any]]:
     """
     Get product recommendations for customer
@@ -393,7 +452,7 @@ def get_recommendations(customer_id: str) -> List[Dict[str, Any]]:
 # LEGACY COMPREHENSIVE API (for backward compatibility)
 # ============================================
 
-@mcp.tool()
+@tool()
 def get_customer_policies(customer_id: str) -> List[Dict[str, Any]]:
     """
     LEGACY: Get all policies for a specific customer with comprehensive details
@@ -0,0 +1,61 @@
+"""
+Benchmark Statistics Helpers
+Latency percentiles, throughput and process RSS shared by the benchmark scripts
+"""
+
+import os
+import resource
+import sys
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (rank - lower)
+
+
+def latency_summary(samples: List[float], elapsed_seconds: Optional[float] = None) -> Dict[str, float]:
+    """
+    Summarize latencies (seconds) as milliseconds.
+
+    Throughput is samples / elapsed_seconds; when elapsed is not given the
+    samples are assumed to have run back to back.
+    """
+    ordered = sorted(samples)
+    elapsed = elapsed_seconds if elapsed_seconds is not None else sum(ordered)
+    return {
+        "count": len(ordered),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+    }
+
+
+def rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Resident set size of `pid` (default: this process) in MB.
+
+    Reads /proc on Linux; elsewhere only the current process's peak RSS is
+    available.
+    """
+    status_file = f"/proc/{pid or os.getpid()}/status"
+    try:
+        with open(status_file) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is None or pid == os.getpid():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes on Linux
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    return None
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Synthetic Policy Data Generator
+Produces 10k / 1M / 10M policy datasets shaped like data/mock_data.json
+
+Records carry the mock_data.json keys (policy_id, policy_type, coverage_limits,
+effective_date, ...) plus the keys the policy server reads (id, type,
+assigned_agent_id, billing_cycle, details, users), so every MCP tool returns
+real results. Generation is deterministic for a given seed and files are
+streamed record by record, so a 10M-policy file never sits in memory.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
+
+SIZES = {
+    "10k": 10_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+POLICY_TYPES = {
+    "auto": {
+        "label": "Auto",
+        "premium": (600, 2400),
+        "deductibles": [250, 500, 1000],
+        "limits": {"liability": 100000, "collision": 50000, "comprehensive": 25000},
+    },
+    "home": {
+        "label": "Home",
+        "premium": (800, 3000),
+        "deductibles": [500, 1000, 2500],
+        "limits": {"dwelling": 300000, "personal_property": 150000, "liability": 300000},
+    },
+    "life": {
+        "label": "Life",
+        "premium": (300, 1800),
+        "deductibles": [0],
+        "limits": {"death_benefit": 500000},
+    },
+    "renters": {
+        "label": "Renters",
+        "premium": (120, 400),
+        "deductibles": [250, 500],
+        "limits": {"personal_property": 30000, "liability": 100000},
+    },
+    "umbrella": {
+        "label": "Umbrella",
+        "premium": (200, 600),
+        "deductibles": [0],
+        "limits": {"liability": 1000000},
+    },
+}
+
+TYPE_WEIGHTS = [("auto", 40), ("home", 25), ("life", 15), ("renters", 12), ("umbrella", 8)]
+STATUSES = [("active", 85), ("pending", 5), ("lapsed", 5), ("cancelled", 5)]
+BILLING_CYCLES = ["monthly", "quarterly", "annual"]
+PAYMENT_METHODS = ["auto_pay", "credit_card", "bank_transfer", "check"]
+FIRST_NAMES = ["John", "Jane", "Robert", "Maria", "David", "Aisha", "Wei", "Sofia", "Liam", "Priya"]
+LAST_NAMES = ["Smith", "Doe", "Johnson", "Garcia", "Brown", "Khan", "Chen", "Rossi", "Murphy", "Patel"]
+STATES = ["NY", "CA", "TX", "FL", "IL", "WA", "MA", "GA"]
+TERRITORIES = ["Northeast", "West", "South", "Midwest"]
+
+BASE_DATE = date(2024, 1, 1)
+CLAIM_RATE = 0.05
+
+
+def agent_count(n_policies: int) -> int:
+    """Roughly one agent per 2,000 policies, at least 3"""
+    return max(3, n_policies // 2000)
+
+
+def customer_layout(n_policies: int, seed: int) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (customer_index, policy_count) until n_policies are assigned.
+
+    Customers hold 1-4 policies; the same seed always yields the same layout
+    so policies and customers can be streamed in separate passes.
+    """
+    rng = random.Random(seed)
+    assigned = 0
+    customer = 0
+    while assigned < n_policies:
+        count = min(rng.choice((1, 1, 2, 2, 2, 3, 4)), n_policies - assigned)
+        yield customer, count
+        assigned += count
+        customer += 1
+
+
+def customer_id(index: int) -> str:
+    return f"CUST{index + 1:08d}"
+
+
+def policy_id(index: int) -> str:
+    return f"POL{index + 1:09d}"
+
+
+def agent_id(index: int) -> str:
+    return f"AGT{index + 1:05d}"
+
+
+def _weighted(rng: random.Random, choices: List[Tuple[str, int]]) -> str:
+    return rng.choices([c for c, _ in choices], weights=[w for _, w in choices])[0]
+
+
+def iter_policies(n_policies: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield policy records in policy-id order"""
+    rng = random.Random(seed + 1)
+    n_agents = agent_count(n_policies)
+    index = 0
+    for customer, count in customer_layout(n_policies, seed):
+        agent = agent_id(customer % n_agents)
+        for _ in range(count):
+            policy_type = _weighted(rng, TYPE_WEIGHTS)
+            spec = POLICY_TYPES[policy_type]
+            start = BASE_DATE + timedelta(days=rng.randrange(730))
+            end = start + timedelta(days=365)
+            limits = dict(spec["limits"])
+            pid = policy_id(index)
+            yield {
+                # mock_data.json schema
+                "policy_id": pid,
+                "customer_id": customer_id(customer),
+                "policy_type": spec["label"],
+                "premium": round(rng.uniform(*spec["premium"]), 2),
+                "deductible": rng.choice(spec["deductibles"]),
+                "coverage_limits": limits,
+                "status": _weighted(rng, STATUSES),
+                "effective_date": start.isoformat(),
+                "expiry_date": end.isoformat(),
+                # Fields read by policy_server/main.py
+                "id": pid,
+                "type": policy_type,
+                "coverage_amount": max(limits.values()),
+                "start_date": start.isoformat(),
+                "end_date": end.isoformat(),
+                "billing_cycle": rng.choice(BILLING_CYCLES),
+                "next_payment_due": (start + timedelta(days=rng.randrange(1, 365))).isoformat(),
+                "payment_method": rng.choice(PAYMENT_METHODS),
+                "assigned_agent_id": agent,
+                "details": {"coverage_types": sorted(limits), "policy_limits": limits},
+            }
+            index += 1
+
+
+def iter_customers(n_policies: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield customer records with their policy ids"""
+    rng = random.Random(seed + 2)
+    index = 0
+    for customer, count in customer_layout(n_policies, seed):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            "customer_id": customer_id(customer),
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{customer}@email.com",
+            "phone": f"+1-555-{customer % 10000:04d}",
+            "address": {
+                "street": f"{rng.randrange(1, 9999)} Main St",
+                "city": "Anytown",
+                "state": rng.choice(STATES),
+                "zip": f"{rng.randrange(10000, 99999)}",
+            },
+            "date_of_birth": (date(1950, 1, 1) + timedelta(days=rng.randrange(18000))).isoformat(),
+            "policies": [policy_id(index + i) for i in range(count)],
+        }
+        index += count
+
+
+def iter_claims(n_policies: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield claims for roughly CLAIM_RATE of policies"""
+    rng = random.Random(seed + 3)
+    claim = 0
+    index = 0
+    for customer, count in customer_layout(n_policies, seed):
+        for _ in range(count):
+            if rng.random() < CLAIM_RATE:
+                incident = BASE_DATE + timedelta(days=rng.randrange(700))
+                claimed = round(rng.uniform(500, 25000), 2)
+                status = rng.choice(["under_review", "approved", "denied", "paid"])
+                claim += 1
+                yield {
+                    "claim_id": f"CLM{claim:09d}",
+                    "policy_id": policy_id(index),
+                    "customer_id": customer_id(customer),
+                    "claim_type": rng.choice(["collision", "theft", "water_damage", "liability"]),
+                    "incident_date": incident.isoformat(),
+                    "reported_date": (incident + timedelta(days=rng.randrange(1, 10))).isoformat(),
+                    "status": status,
+                    "amount_claimed": claimed,
+                    "amount_approved": claimed if status in ("approved", "paid") else 0,
+                    "description": "Synthetic benchmark claim",
+                }
+            index += 1
+
+
+def iter_agents(n_policies: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield agent records (mock_data.json `agents` schema)"""
+    n_agents = agent_count(n_policies)
+    n_customers = sum(1 for _ in customer_layout(n_policies, seed))
+    for index in range(n_agents):
+        first = FIRST_NAMES[index % len(FIRST_NAMES)]
+        last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        yield {
+            "agent_id": agent_id(index),
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{index}@insurance.com",
+            "phone": f"+1-555-{1000 + index % 9000:04d}",
+            "territory": TERRITORIES[index % len(TERRITORIES)],
+            "customers": [customer_id(c) for c in range(index, n_customers, n_agents)],
+        }
+
+
+def iter_users(n_policies: int, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """Yield agents in the `users` shape the policy server looks up"""
+    for agent in iter_agents(n_policies, seed):
+        first, _, last = agent["name"].partition(" ")
+        yield {
+            "id": agent["agent_id"],
+            "first_name": first,
+            "last_name": last,
+            "email": agent["email"],
+            "phone": agent["phone"],
+            "role": "agent",
+        }
+
+
+SECTIONS = [
+    ("policies", iter_policies),
+    ("customers", iter_customers),
+    ("claims", iter_claims),
+    ("agents", iter_agents),
+    ("users", iter_users),
+]
+
+
+def generate_dataset(n_policies: int, seed: int = 42) -> Dict[str, Any]:
+    """Build a dataset in memory (practical up to ~1M policies)"""
+    data = {name: list(section(n_policies, seed)) for name, section in SECTIONS}
+    data["metadata"] = _metadata(n_policies, seed, {name: len(records) for name, records in data.items()})
+    return data
+
+
+def write_dataset(n_policies: int, out: TextIO, seed: int = 42) -> Dict[str, int]:
+    """Stream a dataset as JSON to `out`; returns record counts per section"""
+    counts = {}
+    out.write("{\n")
+    for name, section in SECTIONS:
+        out.write(f'  "{name}": [')
+        count = 0
+        for record in section(n_policies, seed):
+            out.write(",\n    " if count else "\n    ")
+            out.write(json.dumps(record, separators=(",", ":")))
+            count += 1
+        out.write("\n  ],\n" if count else "],\n")
+        counts[name] = count
+    out.write('  "metadata": ' + json.dumps(_metadata(n_policies, seed, counts)) + "\n}\n")
+    return counts
+
+
+def _metadata(n_policies: int, seed: int, counts: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "version": "synthetic-1.0",
+        "seed": seed,
+        "total_policies": counts.get("policies", n_policies),
+        "total_customers": counts.get("customers", 0),
+        "total_claims": counts.get("claims", 0),
+        "total_agents": counts.get("agents", 0),
+    }
+
+
+def metadata_path(data_file: Path) -> Path:
+    """Sidecar holding a dataset's metadata, so readers need not parse the dataset"""
+    return Path(f"{data_file}.meta.json")
+
+
+def write_metadata(data_file: Path, n_policies: int, seed: int, counts: Dict[str, int]) -> None:
+    """Write the metadata sidecar for a generated dataset"""
+    metadata_path(data_file).write_text(json.dumps(_metadata(n_policies, seed, counts), indent=2) + "\n")
+
+
+def parse_size(value: str) -> int:
+    """Accept a preset (10k, 1m, 10m) or a plain policy count"""
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic policy data for benchmarks")
+    parser.add_argument("--size", default="10k", help=f"Policies: one of {', '.join(SIZES)} or a number")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Output file (default: data/synthetic_<size>.json)")
+    args = parser.parse_args()
+
+    n_policies = parse_size(args.size)
+    output = Path(args.output or Path(__file__).parent.parent.parent / "data" / f"synthetic_{args.size.lower()}.json")
+
+    start = time.perf_counter()
+    with open(output, "w") as f:
+        counts = write_dataset(n_policies, f, args.seed)
+    write_metadata(output, n_policies, args.seed, counts)
+    elapsed = time.perf_counter() - start
+
+    size_mb = output.stat().st_size / (1024 * 1024)
+    print(f"✅ Wrote {output} ({size_mb:.1f} MB) in {elapsed:.1f}s")
+    for name, count in counts.items():
+        print(f"   {name}: {count:,}")
+    print(f"   Serve it with: POLICY_DATA_FILE={output} python policy_server/main.py")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Policy Server Load Generator
+Drives the streamable-http MCP endpoint with concurrent asyncio clients
+
+Each worker holds its own MCP session and issues tool calls back to back
+(closed loop) for the configured duration. Runs one stage per concurrency
+level and reports throughput, p50/p95/p99 latency, errors and server RSS.
+
+Either target a running server with --url, or let the script start one with
+--spawn on a generated or existing dataset.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_stats import latency_summary, rss_mb
+from generate_policy_data import customer_id, metadata_path, parse_size, policy_id, write_dataset
+
+# Weighted toward the cheap interactive lookups an agent conversation makes
+DEFAULT_MIX = {
+    "get_policies": 20,
+    "get_policy_types": 15,
+    "get_payment_information": 15,
+    "get_coverage_information": 10,
+    "get_deductibles": 10,
+    "get_agent": 10,
+    "get_policy_details": 10,
+    "get_policy_list": 5,
+    "get_recommendations": 3,
+    "get_customer_policies": 2,
+}
+
+
+class StageResult:
+    """Latencies and errors collected by one concurrency stage"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.peak_rss_mb: Optional[float] = None
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+
+async def worker(url: str, deadline: float, mix: Dict[str, int], n_customers: int,
+                 n_policies: int, rng: random.Random, result: StageResult, timeout: float) -> None:
+    """One MCP session issuing calls until the deadline"""
+    from fastmcp import Client
+    from fastmcp.exceptions import ToolError
+
+    names, weights = list(mix), list(mix.values())
+    try:
+        async with Client(url, timeout=timeout) as client:
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                if name == "get_policy_details":
+                    arguments = {"policy_id": policy_id(rng.randrange(n_policies))}
+                else:
+                    arguments = {"customer_id": customer_id(rng.randrange(n_customers))}
+
+                start = time.perf_counter()
+                try:
+                    await client.call_tool(name, arguments)
+                    result.latencies.append(time.perf_counter() - start)
+                except ToolError as e:
+                    # Admission control sheds with "Policy server busy (reason)"
+                    result.error("shed" if "busy" in str(e) else "tool_error")
+                except Exception as e:
+                    result.error(type(e).__name__)
+    except Exception as e:
+        result.error(f"session_{type(e).__name__}")
+
+
+async def sample_rss(pid: Optional[int], result: StageResult, stop: asyncio.Event) -> None:
+    """Track peak server RSS while a stage runs"""
+    while pid and not stop.is_set():
+        current = rss_mb(pid)
+        if current is not None:
+            result.peak_rss_mb = max(result.peak_rss_mb or 0, current)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_stage(url: str, concurrency: int, duration: float, mix: Dict[str, int],
+                    n_customers: int, n_policies: int, server_pid: Optional[int],
+                    seed: int, timeout: float) -> Dict[str, Any]:
+    """Run `concurrency` workers for `duration` seconds"""
+    result = StageResult()
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server_pid, result, stop))
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        worker(url, deadline, mix, n_customers, n_policies, random.Random(seed + i), result, timeout)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await sampler
+    return {
+        "concurrency": concurrency,
+        "duration_seconds": round(elapsed, 2),
+        **latency_summary(result.latencies, elapsed),
+        "errors": result.errors,
+        "error_rate": round(sum(result.errors.values()) / max(1, len(result.latencies) + sum(result.errors.values())), 4),
+        "server_rss_mb": rss_mb(server_pid) if server_pid else None,
+        "server_peak_rss_mb": result.peak_rss_mb,
+    }
+
+
+def wait_for_port(host: str, port: int, process: subprocess.Popen, timeout: float) -> None:
+    """Block until the spawned server accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Policy server exited with code {process.returncode}")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Policy server did not start within {timeout}s")
+
+
+def spawn_server(data_file: Path, port: int, rate_limit: str, timeout: float) -> subprocess.Popen:
+    """Start policy_server/main.py on `data_file`"""
+    env = dict(os.environ)
+    env["POLICY_DATA_FILE"] = str(data_file)
+    env["POLICY_SERVER_RATE_LIMIT"] = rate_limit
+    process = subprocess.Popen(
+        [sys.executable, str(PROJECT_ROOT / "policy_server" / "main.py"), str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port("127.0.0.1", port, process, timeout)
+    except Exception:
+        process.kill()
+        raise
+    return process
+
+
+def dataset_counts(data_file: Path) -> Dict[str, int]:
+    """
+    Read policy/customer totals from a dataset's metadata sidecar.
+
+    Only datasets without a sidecar (hand-written ones such as
+    data/mock_data.json) are parsed in full.
+    """
+    sidecar = metadata_path(data_file)
+    if sidecar.exists():
+        metadata = json.loads(sidecar.read_text())
+    else:
+        with open(data_file) as f:
+            metadata = json.load(f).get("metadata", {})
+    return {"policies": metadata.get("total_policies", 0), "customers": metadata.get("total_customers", 0)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent load test for the policy MCP server")
+    parser.add_argument("--url", default="http://127.0.0.1:8001/mcp", help="Streamable-http MCP endpoint")
+    parser.add_argument("--spawn", action="store_true", help="Start a policy server for the test")
+    parser.add_argument("--size", default="10k", help="Dataset size when spawning (10k, 1m, 10m or a number)")
+    parser.add_argument("--data-file", help="Existing dataset for the spawned server")
+    parser.add_argument("--port", type=int, default=8101, help="Port for the spawned server")
+    parser.add_argument("--rate-limit", default="0",
+                        help="POLICY_SERVER_RATE_LIMIT for the spawned server (0 disables per-client limits)")
+    parser.add_argument("--customers", type=int, help="Customer id range to target (default: from dataset)")
+    parser.add_argument("--policies", type=int, help="Policy id range to target (default: from dataset)")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per concurrency level")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--server-pid", type=int, help="PID of an external server to sample RSS from")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="policy_load_test.json", help="JSON report path")
+    args = parser.parse_args()
+
+    process = None
+    data_file = Path(args.data_file) if args.data_file else None
+    temp_dir = None
+    url, server_pid = args.url, args.server_pid
+    try:
+        counts = None
+        if args.spawn:
+            if data_file is None:
+                temp_dir = tempfile.TemporaryDirectory()
+                data_file = Path(temp_dir.name) / f"synthetic_{args.size}.json"
+                print(f"📦 Generating {args.size} policies → {data_file}")
+                with open(data_file, "w") as f:
+                    generated = write_dataset(parse_size(args.size), f, args.seed)
+                counts = {"policies": generated["policies"], "customers": generated["customers"]}
+            print(f"🚀 Starting policy server on port {args.port}")
+            process = spawn_server(data_file, args.port, args.rate_limit, timeout=600)
+            url, server_pid = f"http://127.0.0.1:{args.port}/mcp", process.pid
+
+        if counts is None:
+            counts = dataset_counts(data_file) if data_file else {"policies": 5, "customers": 4}
+        n_customers = args.customers or counts["customers"]
+        n_policies = args.policies or counts["policies"]
+
+        stages = []
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            print(f"⏱️  {concurrency} concurrent sessions for {args.duration}s")
+            stage = asyncio.run(run_stage(
+                url, concurrency, args.duration, DEFAULT_MIX, n_customers, n_policies,
+                server_pid, args.seed, args.timeout
+            ))
+            stages.append(stage)
+            print(f"    {stage['throughput_rps']:.1f} req/s  p50 {stage['p50_ms']:.1f}ms  "
+                  f"p95 {stage['p95_ms']:.1f}ms  p99 {stage['p99_ms']:.1f}ms  "
+                  f"errors {sum(stage['errors'].values())}  RSS {stage['server_rss_mb']} MB")
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        if temp_dir is not None:
+            temp_dir.cleanup()
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "url": url,
+        "dataset": {"source": str(data_file) if data_file else "external", **counts},
+        "mix": DEFAULT_MIX,
+        "stages": stages,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Policy Server Tool Micro-benchmarks
+Times every @mcp.tool() in policy_server/main.py against a synthetic dataset
+
+Two modes:
+- direct: call the tool functions in-process (pure lookup cost)
+- mcp:    call through FastMCP's in-memory client (adds middleware,
+          validation and serialization)
+
+Reports p50/p95/p99, throughput and RSS per tool to a JSON report.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import structlog
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_stats import latency_summary, rss_mb
+from generate_policy_data import generate_dataset, parse_size
+
+
+def load_policy_server(data: Dict[str, Any]):
+    """Import the policy server quietly and swap in `data`"""
+    from policy_server import main as policy_server
+
+    # Per-call INFO logging would dominate the timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(40))
+    policy_server.DATA = data
+    return policy_server
+
+
+def sample_arguments(data: Dict[str, Any], rng: random.Random) -> Callable[[str], Dict[str, str]]:
+    """Build a picker of realistic arguments for a tool parameter name"""
+    customers = [c["customer_id"] for c in data.get("customers", [])] or ["CUST001"]
+    policies = [p.get("id") or p.get("policy_id") for p in data.get("policies", [])] or ["POL001"]
+
+    def pick(parameter: str) -> Dict[str, str]:
+        if parameter == "policy_id":
+            return {"policy_id": rng.choice(policies)}
+        return {parameter: rng.choice(customers)}
+
+    return pick
+
+
+async def list_tool_parameters(policy_server) -> Dict[str, str]:
+    """Map each registered tool to its single argument name"""
+    tools = await policy_server.mcp.list_tools()
+    return {
+        tool.name: next(iter(tool.parameters.get("properties", {})), "customer_id")
+        for tool in tools
+    }
+
+
+def bench_direct(policy_server, tools: Dict[str, str], pick, iterations: int,
+                 max_seconds: float) -> Dict[str, Any]:
+    """Time the plain tool functions"""
+    results = {}
+    for name, parameter in tools.items():
+        fn = getattr(policy_server, name)
+        samples = []
+        deadline = time.perf_counter() + max_seconds
+        for _ in range(iterations):
+            kwargs = pick(parameter)
+            start = time.perf_counter()
+            fn(**kwargs)
+            samples.append(time.perf_counter() - start)
+            if time.perf_counter() > deadline:
+                break
+        results[name] = {**latency_summary(samples), "rss_mb": rss_mb()}
+        print(f"  {name:28s} p50 {results[name]['p50_ms']:9.3f}ms  p99 {results[name]['p99_ms']:9.3f}ms  "
+              f"{results[name]['throughput_rps']:10.1f} ops/s")
+    return results
+
+
+async def bench_mcp(policy_server, tools: Dict[str, str], pick, iterations: int,
+                    max_seconds: float) -> Dict[str, Any]:
+    """Time tool calls through the in-memory FastMCP client"""
+    from fastmcp import Client
+
+    results = {}
+    async with Client(policy_server.mcp) as client:
+        for name, parameter in tools.items():
+            samples = []
+            deadline = time.perf_counter() + max_seconds
+            for _ in range(iterations):
+                kwargs = pick(parameter)
+                start = time.perf_counter()
+                await client.call_tool(name, kwargs)
+                samples.append(time.perf_counter() - start)
+                if time.perf_counter() > deadline:
+                    break
+            results[name] = {**latency_summary(samples), "rss_mb": rss_mb()}
+            print(f"  {name:28s} p50 {results[name]['p50_ms']:9.3f}ms  p99 {results[name]['p99_ms']:9.3f}ms  "
+                  f"{results[name]['throughput_rps']:10.1f} ops/s")
+    return results
+
+
+async def run(args) -> Dict[str, Any]:
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    if args.data_file:
+        with open(args.data_file) as f:
+            data = json.load(f)
+    else:
+        data = generate_dataset(parse_size(args.size), args.seed)
+    load_seconds = time.perf_counter() - start
+    print(f"📦 Loaded {len(data['policies']):,} policies in {load_seconds:.1f}s "
+          f"(RSS {rss_before} → {rss_mb()} MB)")
+
+    policy_server = load_policy_server(data)
+    if args.mode == "mcp" and policy_server.admission_controller is not None:
+        # Measure tool cost, not the rate limiter
+        policy_server.admission_controller.config.rate_per_second = 0
+
+    tools = await list_tool_parameters(policy_server)
+    if args.tools:
+        tools = {name: tools[name] for name in args.tools.split(",")}
+    pick = sample_arguments(data, random.Random(args.seed))
+
+    print(f"⏱️  {args.mode} mode, up to {args.iterations} calls or {args.max_seconds}s per tool")
+    if args.mode == "direct":
+        tool_results = bench_direct(policy_server, tools, pick, args.iterations, args.max_seconds)
+    else:
+        tool_results = await bench_mcp(policy_server, tools, pick, args.iterations, args.max_seconds)
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "mode": args.mode,
+        "dataset": {
+            "source": args.data_file or f"generated:{args.size}",
+            "policies": len(data["policies"]),
+            "customers": len(data.get("customers", [])),
+            "load_seconds": round(load_seconds, 2),
+        },
+        "rss_mb": {"before_load": rss_before, "after_load": rss_mb()},
+        "tools": tool_results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark each policy server MCP tool")
+    parser.add_argument("--size", default="10k", help="Generated dataset size (10k, 1m, 10m or a number)")
+    parser.add_argument("--data-file", help="Use an existing dataset instead of generating one")
+    parser.add_argument("--mode", choices=["direct", "mcp"], default="direct")
+    parser.add_argument("--iterations", type=int, default=200, help="Calls per tool")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="Time budget per tool")
+    parser.add_argument("--tools", help="Comma-separated subset of tools")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="policy_tool_benchmark.json", help="JSON report path")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark for the ADK Agents and Policy Server
+Cold-start numbers measured in fresh interpreters:
+- `python -X importtime` profile of each module (slowest imports)
+- time until `root_agent` is ready for each insurance-adk agent
+- time until the first MCP tool response from policy_server/main.py
+
+LLM and network access are stubbed: no API key is used, the startup MCP
+check is disabled, and the policy server is driven over FastMCP's in-memory
+transport. Results are written to a JSON report and compared against
+regression thresholds.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ADK_ROOT = PROJECT_ROOT / "insurance-adk"
+DEFAULT_THRESHOLDS = Path(__file__).parent / "startup_thresholds.json"
+
+AGENT_MODULES = [
+    "insurance_customer_service.agent",
+    "insurance_technical_agent.agent",
+    "insurance_orchestrator.agent",
+]
+
+AGENT_READY_SNIPPET = (
+    "import time; start = time.perf_counter(); "
+    "import {module} as m; m.root_agent; "
+    "print(time.perf_counter() - start)"
+)
+
+POLICY_SERVER_SNIPPET = """
+import asyncio, time
+start = time.perf_counter()
+from policy_server import main as policy_server
+import_seconds = time.perf_counter() - start
+from fastmcp import Client
+
+async def first_call():
+    async with Client(policy_server.mcp) as client:
+        await client.call_tool("get_policy_types", {"customer_id": "CUST001"})
+
+asyncio.run(first_call())
+print(import_seconds, time.perf_counter() - start)
+"""
+
+
+def stub_env() -> Dict[str, str]:
+    """Environment for a fresh interpreter with LLM and network access stubbed"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ADK_ROOT), str(PROJECT_ROOT), env.get("PYTHONPATH", "")])
+    env["OPENROUTER_API_KEY"] = "sk-benchmark-stub"
+    env["MCP_STARTUP_CHECK"] = "false"
+    # Closed local port (discard): anything that still reaches for the network is refused at once
+    env["POLICY_SERVER_URL"] = "http://127.0.0.1:9/mcp"
+    env.pop("LANGFUSE_SECRET_KEY", None)
+    env.pop("LANGFUSE_PUBLIC_KEY", None)
+    env.pop("PROMETHEUS_GATEWAY_URL", None)
+    return env
+
+
+def run_snippet(code: str, cwd: Path, extra_args: Optional[List[str]] = None) -> subprocess.CompletedProcess:
+    """Run `code` in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, *(extra_args or []), "-c", code],
+        cwd=cwd, env=stub_env(), capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        raise RuntimeError(lines[-1] if lines else "snippet failed")
+    return result
+
+
+def parse_importtime(stderr: str, top: int) -> Dict[str, Any]:
+    """
+    Parse `-X importtime` output.
+
+    Lines look like: `import time:   self [us] | cumulative | imported package`
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_field, cumulative_field, name = line.split(":", 1)[1].split("|", 2)
+            self_us = int(self_field)
+            cumulative_us = int(cumulative_field)
+        except ValueError:
+            continue
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000,
+        })
+
+    top_level = [e for e in entries if e["depth"] == 0]
+    return {
+        "modules_imported": len(entries),
+        "total_ms": round(sum(e["cumulative_ms"] for e in top_level), 2),
+        "slowest_cumulative": sorted(entries, key=lambda e: e["cumulative_ms"], reverse=True)[:top],
+        "slowest_self": sorted(entries, key=lambda e: e["self_ms"], reverse=True)[:top],
+    }
+
+
+def profile_imports(module: str, cwd: Path, top: int) -> Dict[str, Any]:
+    """Profile imports of `module` with -X importtime"""
+    result = run_snippet(f"import {module}", cwd, ["-X", "importtime"])
+    return parse_importtime(result.stderr, top)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Median/min/max of a list of seconds"""
+    return {
+        "median_seconds": round(statistics.median(samples), 4),
+        "min_seconds": round(min(samples), 4),
+        "max_seconds": round(max(samples), 4),
+        "runs": len(samples),
+    }
+
+
+def bench_agent(module: str, runs: int, top: int) -> Dict[str, Any]:
+    """Time to root_agent ready, plus an import profile"""
+    samples = [
+        float(run_snippet(AGENT_READY_SNIPPET.format(module=module), ADK_ROOT).stdout.split()[-1])
+        for _ in range(runs)
+    ]
+    return {"ready": summarize(samples), "imports": profile_imports(module, ADK_ROOT, top)}
+
+
+def bench_policy_server(runs: int, top: int) -> Dict[str, Any]:
+    """Time to import the policy server and serve its first tool call"""
+    import_samples, first_response_samples = [], []
+    for _ in range(runs):
+        import_seconds, total_seconds = run_snippet(POLICY_SERVER_SNIPPET, PROJECT_ROOT).stdout.split()[-2:]
+        import_samples.append(float(import_seconds))
+        first_response_samples.append(float(total_seconds))
+    return {
+        "import": summarize(import_samples),
+        "first_tool_response": summarize(first_response_samples),
+        "imports": profile_imports("policy_server.main", PROJECT_ROOT, top),
+    }
+
+
+def check_thresholds(results: Dict[str, Any], thresholds: Dict[str, float]) -> List[str]:
+    """
+    Compare median timings against thresholds.
+
+    Threshold keys are dotted paths into the results, e.g.
+    `policy_server.first_tool_response` or `agents.insurance_orchestrator.agent.ready`.
+    A thresholded key with no measurement (the target failed to start) counts
+    as a regression.
+    """
+    regressions = []
+    for key, limit in thresholds.items():
+        section, _, metric = key.partition(".")
+        if section == "agents":
+            module, _, metric = metric.rpartition(".")
+            entry = results.get("agents", {}).get(module, {}).get(metric)
+        else:
+            entry = results.get(section, {}).get(metric)
+        if not entry or "median_seconds" not in entry:
+            regressions.append(f"{key}: no measurement")
+        elif entry["median_seconds"] > limit:
+            regressions.append(f"{key}: {entry['median_seconds']:.3f}s > {limit:.3f}s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for agents and policy server")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter runs per target")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to keep per module")
+    parser.add_argument("--output", default="startup_report.json", help="JSON report path")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Regression thresholds JSON")
+    parser.add_argument("--skip-agents", action="store_true", help="Only benchmark the policy server")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "agents": {},
+        "errors": {},
+    }
+
+    try:
+        results["policy_server"] = bench_policy_server(args.runs, args.top)
+        ps = results["policy_server"]
+        print(f"policy_server: import {ps['import']['median_seconds']:.3f}s, "
+              f"first tool response {ps['first_tool_response']['median_seconds']:.3f}s")
+    except Exception as e:
+        results["errors"]["policy_server"] = str(e)
+        print(f"policy_server: ❌ {e}")
+
+    if not args.skip_agents:
+        for module in AGENT_MODULES:
+            try:
+                results["agents"][module] = bench_agent(module, args.runs, args.top)
+                print(f"{module}: root_agent ready {results['agents'][module]['ready']['median_seconds']:.3f}s")
+            except Exception as e:
+                results["errors"][module] = str(e)
+                print(f"{module}: ❌ {e}")
+
+    thresholds = {}
+    if args.thresholds and Path(args.thresholds).exists():
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    if args.skip_agents:
+        thresholds = {key: limit for key, limit in thresholds.items() if not key.startswith("agents.")}
+    results["thresholds"] = thresholds
+    results["regressions"] = check_thresholds(results, thresholds)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Report written to {args.output}")
+
+    if results["errors"]:
+        print("❌ Startup failures:")
+        for target, error in results["errors"].items():
+            print(f"    {target}: {error}")
+    if results["regressions"]:
+        print("❌ Startup regressions:")
+        for regression in results["regressions"]:
+            print(f"    {regression}")
+    if results["errors"] or results["regressions"]:
+        sys.exit(1)
+    print("✅ Startup within thresholds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Unit tests for endpoint caching and ADK session reuse in the agent client
+"""
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.components import agent_client
+from ui.components.agent_client import ADKAgentClient, EndpointResolver
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Serves ADK session creation and /run"""
+
+    def __init__(self):
+        self.posts = []
+        self.expired = set()
+        self._next_id = 0
+
+    def post(self, url, **kwargs):
+        self.posts.append(url)
+        if url.endswith("/sessions"):
+            self._next_id += 1
+            return FakeResponse(200, {"id": f"session-{self._next_id}"})
+        if kwargs["json"]["sessionId"] in self.expired:
+            return FakeResponse(404, {"detail": "Session not found"})
+        return FakeResponse(200, [{"content": {"parts": [{"text": "Your deductible is $500."}]}}])
+
+
+class CountingProbe:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, endpoints):
+        self.calls += 1
+        return endpoints[-1]
+
+
+def make_client(session):
+    client = ADKAgentClient()
+    client.session = session
+    client.customer_service_endpoint = EndpointResolver(["http://adk:8000"], probe=CountingProbe())
+    return client
+
+
+def test_resolver_caches_endpoint_until_ttl():
+    now = [0.0]
+    probe = CountingProbe()
+    resolver = EndpointResolver(["http://down:8000", "http://up:8000"], health_ttl=60, probe=probe, clock=lambda: now[0])
+
+    assert resolver.resolve() == "http://up:8000"
+    assert resolver.resolve() == "http://up:8000"
+    assert probe.calls == 1
+
+    now[0] = 61.0
+    resolver.resolve()
+    assert probe.calls == 2
+
+    resolver.invalidate()
+    resolver.resolve()
+    assert probe.calls == 3
+
+
+def test_one_adk_session_per_customer_conversation():
+    session = FakeSession()
+    client = make_client(session)
+
+    for _ in range(3):
+        result = client.send_customer_service_message("What is my deductible?", "CUST001")
+        assert result["response"] == "Your deductible is $500."
+    client.send_customer_service_message("What is my deductible?", "CUST002")
+
+    assert [url for url in session.posts if url.endswith("/sessions")] == [
+        "http://adk:8000/apps/insurance_customer_service/users/CUST001/sessions",
+        "http://adk:8000/apps/insurance_customer_service/users/CUST002/sessions",
+    ]
+    assert client.customer_service_endpoint._probe.calls == 1
+
+    client.reset_session("CUST001")
+    client.send_customer_service_message("Hello again", "CUST001")
+    assert sum(url.endswith("/sessions") for url in session.posts) == 3
+
+
+def test_expired_session_is_recreated_once():
+    session = FakeSession()
+    client = make_client(session)
+    client.send_customer_service_message("Hi", "CUST001")
+    session.expired.add("session-1")
+
+    result = client.send_customer_service_message("What is my deductible?", "CUST001")
+    assert result["response"] == "Your deductible is $500."
+    assert result["session_id"] == "session-2"
+
+
+def test_browser_conversations_of_one_customer_stay_separate():
+    session = FakeSession()
+    client = make_client(session)
+
+    first = client.send_customer_service_message("Hi", "CUST-001", conversation_id="tab-1")
+    second = client.send_customer_service_message("Hi", "CUST-001", conversation_id="tab-2")
+    assert first["session_id"] != second["session_id"]
+
+    client.reset_session("CUST-001", "tab-1")
+    assert client.send_customer_service_message("Hi", "CUST-001", conversation_id="tab-2")["session_id"] == \
+        second["session_id"]
+    assert client.send_customer_service_message("Hi", "CUST-001", conversation_id="tab-1")["session_id"] not in (
+        first["session_id"], second["session_id"]
+    )
+
+
+def test_session_map_is_bounded_and_expires_idle_entries():
+    now = [0.0]
+    client = make_client(FakeSession())
+    client._clock = lambda: now[0]
+    client.config.ADK_SESSION_CACHE_SIZE = 2
+    client.config.ADK_SESSION_IDLE_TTL = 60
+
+    for tab in ("tab-1", "tab-2", "tab-3"):
+        client.get_adk_session("http://adk:8000", "app", "CUST-001", tab)
+    assert [key[3] for key in client._adk_sessions] == ["tab-2", "tab-3"]
+
+    session_id = client.get_adk_session("http://adk:8000", "app", "CUST-001", "tab-3")
+    now[0] = 61.0
+    assert client.get_adk_session("http://adk:8000", "app", "CUST-001", "tab-3") != session_id
+
+
+def test_chat_helpers_share_one_client(monkeypatch):
+    monkeypatch.setattr(agent_client, "_shared_client", None)
+    assert agent_client.get_agent_client() is agent_client.get_agent_client()
+    assert agent_client.DomainAgentClient().adk_client is agent_client.get_agent_client()
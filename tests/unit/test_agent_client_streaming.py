@@ -0,0 +1,110 @@
+"""
+Unit tests for streaming ADK replies to the Streamlit UI
+"""
+import json
+import re
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.components.agent_client import ADKAgentClient, EndpointResolver, adk_event_updates, iter_sse_events, trace_context_headers
+
+
+def sse(*events):
+    lines = [": keep-alive"]
+    for event in events:
+        lines += [f"data: {json.dumps(event)}", ""]
+    return lines
+
+
+def text_event(text, partial):
+    return {"author": "insurance_customer_service", "partial": partial,
+            "content": {"role": "model", "parts": [{"text": text}]}}
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, lines=()):
+        self.status_code = status_code
+        self._body = body or {}
+        self._lines = lines
+
+    def json(self):
+        return self._body
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self._lines
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, lines):
+        self.lines = lines
+        self.posts = []
+
+    def post(self, url, **kwargs):
+        self.posts.append((url, kwargs))
+        if url.endswith("/sessions"):
+            return FakeResponse(200, {"id": "session-1"})
+        return FakeResponse(200, lines=self.lines)
+
+
+def test_sse_parser_handles_multiline_data_and_comments():
+    lines = [": ping", "event: message", "data: {\"a\":", "data:  1}", "", "data: not json", "", "data: {\"b\": 2}"]
+    assert list(iter_sse_events(lines)) == [{"a": 1}, {"b": 2}]
+
+
+def test_adk_events_become_ui_updates():
+    call_event = {"author": "insurance_orchestrator", "content": {"parts": [
+        {"functionCall": {"name": "get_policies", "args": {"customer_id": "CUST001"}}}
+    ]}, "actions": {"transferToAgent": "insurance_technical_agent"}}
+
+    kinds = [update["type"] for update in adk_event_updates(call_event)]
+    assert kinds == ["thinking", "orchestration", "orchestration"]
+    assert adk_event_updates(text_event("Hel", True))[0] == {
+        "type": "token", "text": "Hel", "author": "insurance_customer_service"
+    }
+    assert adk_event_updates({"error": "boom"}) == [{"type": "error", "text": "boom"}]
+
+
+def test_stream_yields_tokens_before_final_result():
+    client = ADKAgentClient()
+    client.session = FakeSession(sse(
+        text_event("Your deductible ", True), text_event("is $500.", True), text_event("Your deductible is $500.", False)
+    ))
+    client.customer_service_endpoint = EndpointResolver(["http://adk:8000"], probe=lambda endpoints: endpoints[0])
+
+    updates = list(client.stream_customer_service_message("What is my deductible?", "CUST001"))
+    assert [update["type"] for update in updates] == ["token", "token", "text", "final"]
+
+    result = updates[-1]["result"]
+    assert result["response"] == "Your deductible is $500."
+    assert result["time_to_first_token_seconds"] is not None
+    run_url, run_kwargs = client.session.posts[-1]
+    assert run_url == "http://adk:8000/run_sse" and run_kwargs["stream"] and run_kwargs["json"]["streaming"]
+
+
+def test_run_requests_start_a_trace_the_agent_can_continue(monkeypatch):
+    client = ADKAgentClient()
+    client.session = FakeSession(sse(text_event("Done.", False)))
+    client.customer_service_endpoint = EndpointResolver(["http://adk:8000"], probe=lambda endpoints: endpoints[0])
+
+    list(client.stream_customer_service_message("Hi", "CUST001"))
+    _, run_kwargs = client.session.posts[-1]
+    traceparent = run_kwargs["headers"]["traceparent"]
+    assert run_kwargs["headers"]["Accept"] == "text/event-stream"
+    assert run_kwargs["json"]["stateDelta"]["trace_context"] == {"traceparent": traceparent}
+    assert re.fullmatch(r"00-[0-9a-f]{32}-[0-9a-f]{16}-01", traceparent)
+
+    monkeypatch.setenv("OTEL_TRACES_SAMPLER_ARG", "0")
+    assert trace_context_headers()["traceparent"].endswith("-00")
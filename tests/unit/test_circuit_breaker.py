@@ -0,0 +1,178 @@
+"""
+Unit tests for the MCP circuit breaker and its integration with MCPMonitoringWrapper
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.middleware.circuit_breaker import (
+    CircuitBreaker, CircuitBreakerConfig, CircuitOpenError, CircuitState
+)
+from monitoring.middleware.mcp_middleware import MCPMonitoringWrapper
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyMCPClient:
+    """MCP client stub that fails while `failing` is set"""
+
+    def __init__(self):
+        self.failing = False
+        self.calls = 0
+
+    async def call_tool(self, tool_name, parameters):
+        self.calls += 1
+        if self.failing:
+            raise ConnectionError("policy server down")
+        return {"tool": tool_name, "customer_id": parameters.get("customer_id")}
+
+
+def make_breaker(clock, **overrides):
+    config = CircuitBreakerConfig(
+        window_size=10, minimum_calls=4, open_duration_seconds=30.0, **overrides
+    )
+    return CircuitBreaker("policy_server", config, clock=clock)
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions"""
+
+    def test_opens_on_error_rate(self):
+        breaker = make_breaker(FakeClock())
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitState.CLOSED
+
+        breaker.record_failure(0.1)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow_request() is False
+        assert breaker.get_status()["rejected_calls"] == 1
+
+    def test_opens_on_slow_calls(self):
+        breaker = make_breaker(FakeClock(), slow_call_duration_seconds=1.0)
+        for _ in range(4):
+            breaker.record_success(2.0)
+        assert breaker.state == CircuitState.OPEN
+
+    def test_half_open_probe_closes_circuit(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure(0.1)
+        assert breaker.retry_after_seconds() == pytest.approx(30.0)
+
+        clock.now += 30.0
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow_request() is True
+        # Only one probe at a time
+        assert breaker.allow_request() is False
+
+        breaker.record_success(0.1)
+        assert breaker.state == CircuitState.CLOSED
+
+    def test_half_open_failure_reopens(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(4):
+            breaker.record_failure(0.1)
+        clock.now += 30.0
+        assert breaker.allow_request() is True
+
+        breaker.record_failure(0.1, "TimeoutError")
+        status = breaker.get_status()
+        assert status["state"] == "open"
+        assert status["times_opened"] == 2
+        assert status["last_failure"] == "TimeoutError"
+
+
+class TestMCPWrapperCircuitBreaker:
+    """Test fast failure and stale fallback in MCPMonitoringWrapper"""
+
+    async def test_open_circuit_serves_stale_result(self):
+        client = FlakyMCPClient()
+        wrapper = MCPMonitoringWrapper(
+            client,
+            endpoint="test-stale-endpoint",
+            breaker_config=CircuitBreakerConfig(minimum_calls=3, window_size=4)
+        )
+        params = {"customer_id": "CUST001"}
+        fresh = await wrapper.call_tool("get_policies", params)
+
+        client.failing = True
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await wrapper.call_tool("get_policies", params)
+        assert wrapper.circuit_breaker.state == CircuitState.OPEN
+
+        calls_before = client.calls
+        assert await wrapper.call_tool("get_policies", params) == fresh
+        assert client.calls == calls_before
+
+    async def test_open_circuit_fails_fast_without_cache(self):
+        client = FlakyMCPClient()
+        client.failing = True
+        wrapper = MCPMonitoringWrapper(
+            client,
+            endpoint="test-fast-fail-endpoint",
+            breaker_config=CircuitBreakerConfig(minimum_calls=2, window_size=4)
+        )
+
+        with pytest.raises(ConnectionError):
+            await wrapper.call_tool_with_retry(
+                "get_agent", {"customer_id": "CUST002"}, max_retries=1, retry_delay=0
+            )
+        with pytest.raises(CircuitOpenError):
+            await wrapper.call_tool("get_agent", {"customer_id": "CUST002"})
+
+        status = wrapper.monitoring.get_monitoring_status()
+        assert status["circuit_breakers"]["test-fast-fail-endpoint"]["state"] == "open"
+
+    async def test_cancelled_probe_releases_half_open_slot(self):
+        client = FlakyMCPClient()
+        client.failing = True
+        wrapper = MCPMonitoringWrapper(
+            client,
+            endpoint="test-cancelled-probe-endpoint",
+            serve_stale_on_open=False,
+            breaker_config=CircuitBreakerConfig(minimum_calls=1, open_duration_seconds=0.05)
+        )
+        with pytest.raises(ConnectionError):
+            await wrapper.call_tool("get_policies", {"customer_id": "CUST001"})
+        await asyncio.sleep(0.06)
+
+        hang = asyncio.Event()
+        client.call_tool = lambda tool_name, parameters: hang.wait()
+        probe = asyncio.ensure_future(wrapper.call_tool("get_policies", {"customer_id": "CUST001"}))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        del client.call_tool
+        client.failing = False
+        assert await wrapper.call_tool("get_policies", {"customer_id": "CUST001"}) is not None
+        assert wrapper.circuit_breaker.state == CircuitState.CLOSED
+
+    def test_conflicting_breaker_config_is_reported(self, capsys):
+        MCPMonitoringWrapper(FlakyMCPClient(), endpoint="test-shared-endpoint",
+                             breaker_config=CircuitBreakerConfig(minimum_calls=3))
+        shared = MCPMonitoringWrapper(FlakyMCPClient(), endpoint="test-shared-endpoint",
+                                      breaker_config=CircuitBreakerConfig(minimum_calls=7))
+
+        assert shared.circuit_breaker.config.minimum_calls == 3
+        assert "already registered" in capsys.readouterr().out
@@ -0,0 +1,117 @@
+"""
+Unit tests for conversation context compaction
+"""
+import sys
+from pathlib import Path
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from context_compaction import (
+    SUMMARIZED_TURNS_STATE_KEY, SUMMARY_PREFIX, ContextCompactor, ContextItem,
+    create_compaction_callback, extractive_summarizer
+)
+
+
+def conversation(turns, tool_result=None):
+    """User/model items for `turns` turns, optionally with a tool result per turn"""
+    items = []
+    for i in range(turns):
+        items.append(ContextItem(role="user", text=f"question {i} " + "x" * 200, starts_turn=True))
+        if tool_result is not None:
+            items.append(ContextItem(role="tool", text=tool_result, tool_name="policy_lookup",
+                                     tool_fingerprint=str(hash(tool_result))))
+        items.append(ContextItem(role="model", text=f"answer {i} " + "y" * 200))
+    return items
+
+
+class TestContextCompactor:
+    """Test keep-recent, rolling summary and dedupe policies"""
+
+    def test_short_conversations_are_untouched(self):
+        compactor = ContextCompactor(keep_last_turns=4, summary_trigger_tokens=10_000)
+        items = conversation(10)
+        state = {}
+
+        result = compactor.compact(items, state)
+        assert [item.text for item in result.items] == [item.text for item in items]
+        assert not result.summary_refreshed and state == {}
+
+    def test_summary_replaces_older_turns_past_threshold(self):
+        compactor = ContextCompactor(keep_last_turns=4, summary_trigger_tokens=500)
+        state = {}
+
+        result = compactor.compact(conversation(10), state)
+        assert result.summary_refreshed and result.summarized_turns == 6
+        assert result.summary.startswith(SUMMARY_PREFIX)
+        assert [item.text.split()[1] for item in result.items if item.role == "user"] == ["6", "7", "8", "9"]
+        assert result.tokens_after < result.tokens_before
+
+    def test_summary_refreshed_incrementally(self):
+        compactor = ContextCompactor(
+            keep_last_turns=4, summary_trigger_tokens=1000, summarizer=extractive_summarizer(max_line_chars=20)
+        )
+        state = {}
+        compactor.compact(conversation(10), state)
+
+        # One more turn: only the newly aged-out turn is pending, under the threshold
+        result = compactor.compact(conversation(11), state)
+        assert not result.summary_refreshed
+        assert state[SUMMARIZED_TURNS_STATE_KEY] == 6
+        assert "question 6" in result.items[0].text
+
+        result = compactor.compact(conversation(16), state)
+        assert result.summary_refreshed and state[SUMMARIZED_TURNS_STATE_KEY] == 12
+        assert "question 0" in result.summary and "question 11" in result.summary
+
+    def test_repeated_tool_results_kept_once(self):
+        compactor = ContextCompactor(keep_last_turns=10, summary_trigger_tokens=100_000)
+        result = compactor.compact(conversation(3, tool_result='{"policies": ["POL-1"]}'), {})
+
+        tool_items = [item for item in result.items if item.role == "tool"]
+        assert result.deduplicated == 2
+        assert [item.deduplicated for item in tool_items] == [True, True, False]
+        assert tool_items[-1].text == '{"policies": ["POL-1"]}'
+
+
+def test_callback_records_prompt_tokens():
+    class FakeManager:
+        def __init__(self):
+            self.calls = []
+
+        def record_prompt_tokens(self, *args):
+            self.calls.append(args)
+
+    class FakeContext:
+        state = {}
+
+    class FakeRequest:
+        contents = []
+
+    manager = FakeManager()
+    callback = create_compaction_callback(
+        "insurance_technical_agent", ContextCompactor(), monitoring=lambda: manager
+    )
+
+    assert callback(FakeContext(), FakeRequest()) is None
+    assert manager.calls == [("insurance_technical_agent", 0, 0, False, 0)]
+
+
+def test_callback_puts_summary_in_system_instruction(monkeypatch):
+    from types import SimpleNamespace
+    import context_compaction
+
+    items = conversation(10)
+    monkeypatch.setattr(context_compaction, "items_from_contents", lambda contents: items)
+    monkeypatch.setattr(context_compaction, "contents_from_items", lambda compacted: [item.role for item in compacted])
+    request = SimpleNamespace(contents=[], config=SimpleNamespace(system_instruction="You are an insurance agent."))
+
+    callback = create_compaction_callback(
+        "insurance_technical_agent", ContextCompactor(keep_last_turns=4, summary_trigger_tokens=500)
+    )
+    callback(SimpleNamespace(state={}), request)
+
+    # Kept turns still alternate user/model; the summary is not a synthetic user turn
+    assert request.contents == ["user", "model"] * 4
+    assert request.config.system_instruction.startswith("You are an insurance agent.\n\n" + SUMMARY_PREFIX)
@@ -0,0 +1,105 @@
+"""
+Unit tests for bounded conversation history with compressed spill segments
+"""
+import os
+import sys
+from pathlib import Path
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from conversation_history import ConversationHistory
+from session_store import SQLiteSessionStore
+from session_tools import SessionManager
+
+
+def turn(i):
+    return {"message": f"question {i}", "response": f"answer {i}"}
+
+
+class TestConversationHistory:
+    """Test window bounds, spilling and last-k reads"""
+
+    def test_window_stays_bounded_and_spills_segments(self, tmp_path):
+        history = ConversationHistory(window_size=4, spill_batch=3, spill_dir=str(tmp_path))
+        session = {}
+        for i in range(20):
+            history.append("s1", session, turn(i))
+
+        assert history.count(session) == 20
+        assert len(session["conversation_history"]) < 4 + 3
+        segments = sorted(os.listdir(tmp_path / "s1"))
+        assert segments and all(name.endswith(".jsonl.gz") for name in segments)
+        assert history.get_status()["spilled_turns_total"] == 20 - len(session["conversation_history"])
+
+    def test_last_k_reads_across_window_and_segments(self, tmp_path):
+        history = ConversationHistory(window_size=4, spill_batch=3, spill_dir=str(tmp_path))
+        session = {}
+        for i in range(20):
+            history.append("s1", session, turn(i))
+
+        assert [t["message"] for t in history.last("s1", session, 2)] == ["question 18", "question 19"]
+        assert [t["message"] for t in history.last("s1", session, 11)] == [f"question {i}" for i in range(9, 20)]
+        assert len(history.last("s1", session, 100)) == 20
+
+    def test_without_spill_dir_old_turns_are_discarded(self):
+        history = ConversationHistory(window_size=2, spill_batch=2, spill_dir=None)
+        session = {}
+        for i in range(10):
+            history.append("s1", session, turn(i))
+
+        assert len(history.last("s1", session, 10)) == len(session["conversation_history"])
+        assert history.get_status()["discarded_turns_total"] > 0
+
+
+def test_session_manager_history_round_trip(tmp_path):
+    history = ConversationHistory(window_size=3, spill_batch=2, spill_dir=str(tmp_path))
+    manager = SessionManager(history=history)
+    session_id = manager.create_session("CUST001")
+
+    for i in range(8):
+        assert manager.add_conversation_entry(session_id, f"question {i}", f"answer {i}")
+
+    assert len(manager.get_session_data(session_id)["conversation_history"]) < 5
+    recent = manager.get_conversation_history(session_id, limit=6)
+    assert [entry["message"] for entry in recent] == [f"question {i}" for i in range(2, 8)]
+    assert manager.get_customer_context(session_id)["conversation_count"] == 8
+
+
+def test_replicas_read_spilled_turns_through_shared_store(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    replicas = []
+    for _ in range(2):
+        store = SQLiteSessionStore(path)
+        history = ConversationHistory(window_size=3, spill_batch=2, store=store, segment_ttl_seconds=3600)
+        replicas.append(SessionManager(store=store, history=history))
+    writer, reader = replicas
+    assert SessionManager(store=SQLiteSessionStore(path)).get_status()["history"]["spill_backend"] == "sqlite"
+    session_id = writer.create_session("CUST001")
+
+    for i in range(9):
+        assert writer.add_conversation_entry(session_id, f"question {i}", f"answer {i}")
+
+    assert writer.get_session_data(session_id)["conversation_segments"] == [0, 2, 4]
+    recent = reader.get_conversation_history(session_id, limit=8)
+    assert [entry["message"] for entry in recent] == [f"question {i}" for i in range(1, 9)]
+
+    assert reader.delete_session(session_id)
+    assert writer.store.get(f"{session_id}#history#{0:010d}") is None
+    assert writer.get_conversation_history(session_id, limit=8) == []
+
+
+def test_spilled_segments_are_private(tmp_path):
+    spill_dir = tmp_path / "history"
+    spill_dir.mkdir(mode=0o755)
+    os.chmod(spill_dir, 0o755)
+    history = ConversationHistory(window_size=2, spill_batch=2, spill_dir=str(spill_dir))
+    session = {}
+    for i in range(4):
+        history.append("s1", session, turn(i))
+
+    segments = list((spill_dir / "s1").iterdir())
+    assert segments and all(segment.stat().st_mode & 0o777 == 0o600 for segment in segments)
+    assert (spill_dir / "s1").stat().st_mode & 0o777 == 0o700
+    assert spill_dir.stat().st_mode & 0o777 == 0o700
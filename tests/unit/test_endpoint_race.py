@@ -0,0 +1,74 @@
+"""
+Unit tests for concurrent endpoint probing and parallel health checks
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.components import endpoint_race
+from ui.components.endpoint_race import race_endpoints
+from ui.components.monitoring import check_service_health_async
+
+
+def transport(hosts):
+    """Mock transport: hosts map to (delay_seconds, status_code or None for refused)"""
+    cancelled = []
+
+    async def handler(request):
+        delay, status = hosts[request.url.host]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(request.url.host)
+            raise
+        if status is None:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(status)
+
+    return httpx.MockTransport(handler), cancelled
+
+
+async def test_race_takes_first_healthy_and_cancels_the_rest():
+    mock, cancelled = transport({"k8s": (5.0, 200), "svc": (0.0, None), "localhost": (0.01, 200)})
+    urls = ["http://k8s:8000/list-apps", "http://svc:8000/list-apps", "http://localhost:8000/list-apps"]
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=mock) as client:
+        winner = await race_endpoints(client, urls, stagger=0.2)
+
+    assert winner["url"] == "http://localhost:8000/list-apps" and winner["status_code"] == 200
+    assert time.perf_counter() - started < 1.0
+    assert cancelled == ["k8s"]
+
+
+async def test_race_returns_none_when_nothing_is_healthy():
+    mock, _ = transport({"a": (0.0, 503), "b": (0.0, None)})
+    async with httpx.AsyncClient(transport=mock) as client:
+        assert await race_endpoints(client, ["http://a/", "http://b/"], stagger=0.05) is None
+
+
+async def test_health_checks_run_in_parallel(monkeypatch):
+    mock, _ = transport({"slow-a": (0.3, 200), "slow-b": (0.3, 200), "down": (0.3, None)})
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(endpoint_race.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=mock, **kwargs))
+
+    started = time.perf_counter()
+    status = await check_service_health_async({
+        "ADK Orchestrator": "http://slow-a:8003/health",
+        "Monitoring API": "http://slow-b:9000",
+        "Policy Server (MCP)": ["http://down:8001/mcp"],
+    })
+
+    assert time.perf_counter() - started < 0.8
+    assert status["ADK Orchestrator"]["status"] == "healthy"
+    assert status["ADK Orchestrator"]["endpoint"] == "http://slow-a:8003/"
+    assert status["Monitoring API"]["endpoint"] == "http://slow-b:9000/health"
+    assert status["Policy Server (MCP)"]["status"] == "unreachable"
@@ -0,0 +1,125 @@
+"""
+Unit tests for the concurrent health checker and the cached health endpoints
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.interfaces.health_checker import HealthStatus
+from monitoring.providers.health_provider import ConcurrentHealthChecker
+from monitoring.setup import health_endpoints, monitoring_setup
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def slow_check(calls, delay=0.2, outcome=True):
+    async def check():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return outcome
+    return check
+
+
+async def test_checks_run_concurrently_and_are_cached():
+    clock = FakeClock()
+    checker = ConcurrentHealthChecker(default_ttl_seconds=10, clock=clock)
+    calls = []
+    for name in ("policy_server", "orchestrator", "technical_agent"):
+        checker.register_health_check(name, slow_check(calls))
+
+    started = time.perf_counter()
+    health = await checker.check_all_health_async()
+    assert time.perf_counter() - started < 0.5
+    assert health.overall_status == HealthStatus.HEALTHY and health.total_checks == 3
+
+    await checker.check_all_health_async()
+    assert len(calls) == 3
+
+    clock.now += 11
+    await checker.check_all_health_async()
+    assert len(calls) == 6
+
+
+async def test_concurrent_callers_share_one_check_and_stale_results_are_served():
+    clock = FakeClock()
+    checker = ConcurrentHealthChecker(default_ttl_seconds=10, clock=clock)
+    calls = []
+    checker.register_health_check("policy_server", slow_check(calls, delay=0.05))
+
+    await asyncio.gather(*(checker.check_component_health_async("policy_server") for _ in range(5)))
+    assert len(calls) == 1
+
+    clock.now += 11
+    started = time.perf_counter()
+    result = await checker.check_component_health_async("policy_server", serve_stale=True)
+    assert result.status == HealthStatus.HEALTHY and time.perf_counter() - started < 0.04
+    await asyncio.sleep(0.1)
+    assert len(calls) == 2
+
+
+async def test_timeouts_failures_and_aggregation():
+    checker = ConcurrentHealthChecker()
+    checker.register_health_check("llm", slow_check([], delay=1.0), timeout_seconds=0.05)
+    checker.register_health_check("cache", lambda: False, critical=False)
+    checker.register_health_check("mcp", lambda: HealthStatus.DEGRADED)
+
+    health = await checker.check_all_health_async()
+    results = {result.component: result for result in health.components}
+    assert "timed out" in results["llm"].message
+    assert results["cache"].status == HealthStatus.UNHEALTHY
+    assert health.overall_status == HealthStatus.UNHEALTHY
+    assert (health.healthy_checks, health.degraded_checks, health.unhealthy_checks) == (0, 1, 2)
+
+    checker.unregister_health_check("llm")
+    assert (await checker.check_all_health_async(force=True)).overall_status == HealthStatus.DEGRADED
+
+
+def test_history_ring_buffer_and_sync_api():
+    checker = ConcurrentHealthChecker(default_ttl_seconds=0, history_size=3)
+    outcomes = iter([True, False, True, True])
+    checker.register_health_check("policy_server", lambda: next(outcomes))
+
+    for _ in range(4):
+        checker.check_component_health("policy_server")
+
+    history = checker.get_health_history("policy_server")
+    assert [result.status for result in history] == [HealthStatus.UNHEALTHY, HealthStatus.HEALTHY, HealthStatus.HEALTHY]
+    assert checker.get_health_history("unknown") == []
+
+
+def test_detailed_endpoint_serves_cached_results(monkeypatch):
+    manager = monitoring_setup.MonitoringManager()
+    calls = []
+    manager.get_health_checker().register_health_check("policy_server", slow_check(calls, delay=0.0))
+    monkeypatch.setattr(health_endpoints, "get_monitoring_manager", lambda: manager)
+
+    app = FastAPI()
+    health_endpoints.add_health_endpoints(app)
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.get("/health/detailed")
+        assert response.status_code == 200
+    body = response.json()
+    assert body["components"]["policy_server"]["status"] == "healthy"
+    assert body["timestamp"] != "2024-01-01T00:00:00Z"
+    assert len(calls) == 1
+
+    history = client.get("/health/history", params={"component": "policy_server"}).json()
+    assert len(history["results"]) == 1
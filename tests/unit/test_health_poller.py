@@ -0,0 +1,69 @@
+"""
+Unit tests for the background health poller
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from ui.components.health_poller import HealthPoller
+
+
+class FakeCheck:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self):
+        status = self.statuses[min(self.calls, len(self.statuses) - 1)]
+        self.calls += 1
+        if status == "error":
+            raise RuntimeError("network down")
+        return {"Policy Server (MCP)": {"status": status, "response_time_ms": 12.0}}
+
+
+def test_snapshot_and_rolling_history():
+    check = FakeCheck(["healthy", "unreachable", "healthy", "healthy"])
+    poller = HealthPoller(check, history_size=3)
+    assert poller.snapshot() == ({}, None)
+
+    for _ in range(4):
+        poller.poll_once()
+
+    results, checked_at = poller.snapshot()
+    assert results["Policy Server (MCP)"]["status"] == "healthy" and checked_at is not None
+    assert [status for _, status, _ in poller.history("Policy Server (MCP)")] == ["unreachable", "healthy", "healthy"]
+    assert round(poller.uptime("Policy Server (MCP)"), 2) == 0.67
+    assert check.calls == 4
+
+
+def test_failed_poll_is_stored_as_unknown():
+    poller = HealthPoller(FakeCheck(["healthy", "error"]))
+    poller.poll_once()
+    status = poller.poll_once()["Policy Server (MCP)"]
+    assert status["status"] == "unknown" and "network down" in status["error"]
+    assert [status for _, status, _ in poller.history("Policy Server (MCP)")] == ["healthy", "unknown"]
+    assert poller.last_error == "network down"
+
+
+def test_failed_first_poll_still_records_a_snapshot_time():
+    poller = HealthPoller(FakeCheck(["error"]))
+    assert poller.poll_once() == {}
+    results, checked_at = poller.snapshot()
+    assert results == {} and checked_at is not None
+
+
+def test_jittered_interval_and_background_thread():
+    poller = HealthPoller(FakeCheck(["healthy"]), interval=10, jitter=0.2, rng=random.Random(7))
+    delays = [poller.next_delay() for _ in range(50)]
+    assert all(8 <= delay <= 12 for delay in delays) and len(set(delays)) > 1
+
+    check = FakeCheck(["healthy"])
+    poller = HealthPoller(check, interval=0.01).start()
+    time.sleep(0.1)
+    poller.stop()
+    assert check.calls >= 2
@@ -0,0 +1,125 @@
+"""
+Unit tests for the rules-based intent fast path
+"""
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from intent_router import IntentClassifier, IntentRouter, PolicyToolClient
+
+
+@pytest.mark.parametrize("message,intent", [
+    ("What's my deductible?", "deductible"),
+    ("What are the deductibles on my policies?", "deductible"),
+    ("Show me my policies", "policy_list"),
+    ("When is my next payment due?", "payment_due"),
+    ("How do I contact my agent?", "agent_contact"),
+])
+def test_simple_intents_are_confident(message, intent):
+    match = IntentClassifier().classify(message)
+    assert match.intent == intent and match.confidence >= 0.85
+
+
+@pytest.mark.parametrize("message", [
+    "Why did my deductible go up?",
+    "Can I change my payment due date?",
+    "What is my deductible and when is my next payment due?",
+    "I was in an accident yesterday",
+])
+def test_ambiguous_or_action_requests_go_to_llm(message):
+    assert IntentClassifier().classify(message).confidence < 0.85
+
+
+class FakeManager:
+    def __init__(self):
+        self.phases = []
+        self.intents = []
+        self.mcp_calls = []
+
+    def record_phase(self, phase, seconds):
+        self.phases.append(phase)
+
+    def record_intent_analysis(self, intent, confidence, method, success, duration_seconds):
+        self.intents.append((intent, method, success))
+
+    def record_mcp_call(self, tool_name, success, duration_seconds):
+        self.mcp_calls.append((tool_name, success))
+
+
+class TestIntentRouter:
+    """Test direct tool calls, templating and fallthrough"""
+
+    async def test_answers_from_policy_tool(self):
+        calls = []
+
+        async def call_tool(name, arguments):
+            calls.append((name, arguments))
+            return [{"policy_id": "POL001", "policy_type": "auto", "deductible": 500}]
+
+        manager = FakeManager()
+        router = IntentRouter(call_tool, monitoring=lambda: manager)
+        answer = await router.answer("what's my deductible", "CUST001")
+
+        assert calls == [("get_deductibles", {"customer_id": "CUST001"})]
+        assert "Auto policy POL001: $500.00" in answer
+        assert manager.intents == [("deductible", "rules", True)]
+        assert manager.mcp_calls == [("get_deductibles", True)]
+
+    async def test_tool_failure_falls_through(self):
+        async def call_tool(name, arguments):
+            raise ConnectionError("policy server down")
+
+        manager = FakeManager()
+        router = IntentRouter(call_tool, monitoring=lambda: manager)
+        assert await router.answer("who is my agent", "CUST001") is None
+        assert manager.intents == [("agent_contact", "rules", False)]
+
+    async def test_low_confidence_skips_tool(self):
+        async def call_tool(name, arguments):
+            raise AssertionError("tool should not be called")
+
+        router = IntentRouter(call_tool)
+        assert await router.answer("Should I raise my deductible?", "CUST001") is None
+        assert await router.answer("What's my deductible?", None) is None
+
+
+async def test_policy_tool_client_unwraps_results():
+    from fastmcp import FastMCP
+
+    server = FastMCP("Policy Test")
+
+    @server.tool()
+    def get_deductibles(customer_id: str) -> List[Dict[str, Any]]:
+        return [{"policy_id": "POL001", "deductible": 500, "customer": customer_id}]
+
+    client = PolicyToolClient(url=server)
+    assert await client("get_deductibles", {"customer_id": "CUST001"}) == [
+        {"policy_id": "POL001", "deductible": 500, "customer": "CUST001"}
+    ]
+
+
+async def test_policy_tools_become_functions_with_schema_signatures():
+    import inspect
+    from policy_toolset import tool_function
+
+    calls = []
+
+    async def call_tool(tool, arguments):
+        calls.append((tool, arguments))
+        return []
+
+    schema = {"properties": {"customer_id": {"type": "string"}, "limit": {"type": "integer"}},
+              "required": ["customer_id"]}
+    get_policies = tool_function("get_policies", "List a customer's policies", schema, call_tool)
+
+    assert get_policies.__name__ == "get_policies" and get_policies.__doc__ == "List a customer's policies"
+    params = inspect.signature(get_policies).parameters
+    assert params["customer_id"].annotation is str and params["limit"].default is None
+    assert await get_policies(customer_id="CUST001") == []
+    assert calls == [("get_policies", {"customer_id": "CUST001"})]
@@ -0,0 +1,98 @@
+"""
+Unit tests for Langfuse LLM trace sampling and payload reduction
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.providers.langfuse_provider import LangfuseProvider
+from monitoring.providers.llm_sampling import LLMTraceSampler
+
+
+class FakeLangfuse:
+    """Records generations instead of sending them"""
+
+    def __init__(self):
+        self.generations = []
+
+    def generation(self, **kwargs):
+        self.generations.append(kwargs)
+        return self
+
+
+def make_provider(**sampler_options):
+    provider = LangfuseProvider(sampler=LLMTraceSampler(rng=random.Random(3), **sampler_options))
+    provider._client = FakeLangfuse()
+    provider._initialized = True
+    return provider
+
+
+def test_rules_override_rate_and_errors_are_always_kept():
+    sampler = LLMTraceSampler(sample_rate=0.0, rules={"customer_id": {"CUST-001": 1.0}, "intent": {"claims": 0.0}})
+
+    assert sampler.should_sample(True, {"customer_id": "CUST-001", "intent": "claims"})
+    assert not sampler.should_sample(True, {"customer_id": "CUST-002"})
+    assert sampler.should_sample(False, {"intent": "claims"})
+    assert sampler.get_status()["sampled"] == 2 and sampler.get_status()["skipped"] == 1
+
+
+def test_probabilistic_rate_is_respected():
+    sampler = LLMTraceSampler(sample_rate=0.25, rng=random.Random(11))
+    kept = sum(sampler.should_sample() for _ in range(4000))
+    assert 900 < kept < 1100
+
+
+def test_content_is_truncated_or_hashed():
+    assert LLMTraceSampler(max_content_chars=5).prepare_content("policy details") == \
+        "polic... [truncated 9 chars]"
+    hashed = LLMTraceSampler(hash_content=True, max_content_chars=5).prepare_content("policy details")
+    assert hashed.startswith("sha256:") and hashed.endswith("(14 chars)")
+
+
+def test_record_llm_call_spans_the_call_duration():
+    provider = make_provider()
+    provider.record_llm_call("gpt-4o-mini", 10, 5, 15, 2.5, True)
+
+    generation = provider._client.generations[0]
+    assert (generation["end_time"] - generation["start_time"]).total_seconds() == pytest.approx(2.5)
+
+
+def test_queued_llm_call_keeps_its_call_site_end_time(monkeypatch):
+    import time
+    from datetime import datetime
+    from monitoring.setup.monitoring_setup import MonitoringManager
+
+    manager = MonitoringManager({"metrics_push_interval_seconds": 0})
+    provider = make_provider()
+    monkeypatch.setitem(manager._providers, "langfuse", provider)
+
+    manager._pipeline.submit(time.sleep, (0.2,))  # backlog ahead of the call
+    ended = datetime.now()
+    manager.record_llm_call("gpt-4o-mini", 10, 5, 15, 2.5, True)
+    manager.flush_metrics()
+
+    generation = provider._client.generations[0]
+    assert (generation["end_time"] - ended).total_seconds() < 0.1
+    assert (generation["end_time"] - generation["start_time"]).total_seconds() == pytest.approx(2.5)
+
+
+def test_unsampled_trace_builds_no_payload_unless_it_fails():
+    provider = make_provider(sample_rate=0.0, max_content_chars=4)
+    with provider.trace_llm_call("gpt-4o-mini", "prompt text", "completion") as span:
+        span.set_attribute("agent", "technical")
+    assert provider._client.generations == []
+
+    with pytest.raises(TimeoutError):
+        with provider.trace_llm_call("gpt-4o-mini", "prompt text", "completion", {"customer_id": "CUST-001"}):
+            raise TimeoutError("model timed out")
+
+    generation, = provider._client.generations
+    assert generation["level"] == "ERROR" and generation["status_message"] == "model timed out"
+    assert generation["input"] == "prom... [truncated 7 chars]"
+    assert generation["metadata"]["customer_id"] == "CUST-001"
@@ -0,0 +1,74 @@
+"""
+Unit tests for the Prometheus scrape endpoint and multiprocess aggregation
+"""
+import os
+import subprocess
+import sys
+import urllib.request
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.providers.prometheus_provider import PrometheusProvider
+from monitoring.setup.metrics_endpoint import MetricsExporter, create_metrics_router, start_metrics_server
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_scrapes_are_cached_between_renders():
+    provider = PrometheusProvider()
+    clock = FakeClock()
+    exporter = MetricsExporter(registry=provider._registry, cache_seconds=5, clock=clock)
+    app = FastAPI()
+    app.include_router(create_metrics_router(exporter))
+    client = TestClient(app)
+
+    provider.record_mcp_call("get_policies", True, 0.1)
+    first = client.get("/metrics")
+    assert first.status_code == 200 and first.headers["content-type"].startswith("text/plain")
+    assert 'mcp_calls_total{success="True",tool_name="get_policies"} 1.0' in first.text
+
+    provider.record_mcp_call("get_policies", True, 0.1)
+    assert client.get("/metrics").text == first.text
+
+    clock.now += 6
+    assert 'tool_name="get_policies"} 2.0' in client.get("/metrics").text
+
+
+def test_side_port_server_serves_metrics():
+    provider = PrometheusProvider()
+    provider.record_llm_metrics("gpt-4o-mini", 10, 5, 15, 0.5, True)
+    server = start_metrics_server(0, addr="127.0.0.1", exporter=MetricsExporter(registry=provider._registry))
+    port = server.server_address[1]
+    try:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read().decode()
+    finally:
+        server.shutdown()
+    assert 'llm_calls_total{model="gpt-4o-mini",success="True"} 1.0' in body
+
+
+def test_worker_processes_are_aggregated(tmp_path):
+    worker = (
+        "import sys; sys.path.insert(0, sys.argv[1]);"
+        "from monitoring.providers.prometheus_provider import PrometheusProvider;"
+        "PrometheusProvider().record_mcp_call('get_policies', True, 0.1)"
+    )
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", worker, str(project_root)], env=env, check=True, capture_output=True)
+
+    body, _ = MetricsExporter(multiproc_dir=str(tmp_path)).render()
+    assert 'mcp_calls_total{success="True",tool_name="get_policies"} 3.0' in body.decode()
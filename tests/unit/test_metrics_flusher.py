@@ -0,0 +1,94 @@
+"""
+Unit tests for the background push-gateway flusher
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.setup.metrics_flusher import PeriodicFlusher
+from monitoring.setup.monitoring_setup import MonitoringManager
+
+
+def test_failures_back_off_and_success_resets():
+    outcomes = [ConnectionError("gateway down")] * 3 + [None]
+
+    def push():
+        outcome = outcomes.pop(0)
+        if outcome:
+            raise outcome
+
+    flusher = PeriodicFlusher(push, interval_seconds=10, jitter=0, max_backoff_seconds=60, start=False)
+    delays = []
+    for _ in range(4):
+        flusher.push_once()
+        delays.append(flusher.next_delay())
+
+    assert delays == [20, 40, 60, 10]
+    assert flusher.get_status()["failures"] == 3 and flusher.get_status()["pushes"] == 1
+    assert flusher.get_status()["last_error"] is None
+
+
+def test_jitter_spreads_delays_within_bounds():
+    flusher = PeriodicFlusher(lambda: None, interval_seconds=10, jitter=0.2, rng=random.Random(7), start=False)
+    delays = [flusher.next_delay() for _ in range(50)]
+
+    assert all(8 <= delay <= 12 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_background_pushes_and_final_flush_on_stop():
+    pushes = []
+    flusher = PeriodicFlusher(lambda: pushes.append(time.time()), interval_seconds=0.01, jitter=0)
+
+    deadline = time.time() + 2
+    while len(pushes) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    flusher.stop()
+    stopped_with = len(pushes)
+
+    assert stopped_with >= 3  # two periodic pushes plus the final flush
+    time.sleep(0.05)
+    assert len(pushes) == stopped_with
+
+
+def test_manager_pushes_in_background_and_records_latency(monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_GATEWAY_URL", "http://gateway:9091")
+    manager = MonitoringManager({"metrics_push_interval_seconds": 0.01, "metrics_push_jitter": 0})
+    prometheus = manager._providers["prometheus"]
+    pushed = []
+    prometheus._push_to_gateway = lambda url, job, registry, timeout, grouping_key: pushed.append(
+        registry.get_sample_value("mcp_calls_total", {"tool_name": "get_policies", "success": "True"})
+    )
+
+    manager.record_mcp_call("get_policies", True, 0.1)
+    deadline = time.time() + 2
+    while not pushed and time.time() < deadline:
+        time.sleep(0.01)
+    manager._flusher.stop()
+
+    assert pushed[0] == 1.0  # queued events were drained before the push
+    assert prometheus._registry.get_sample_value("metrics_push_duration_seconds_count", {"success": "True"}) >= 1
+    assert manager.get_monitoring_status()["metrics_flusher"]["failures"] == 0
+
+
+def test_replicas_push_under_their_own_grouping_key(monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_GATEWAY_URL", "http://gateway:9091")
+    monkeypatch.setenv("PROMETHEUS_GROUPING_KEY", '{"region": "eu"}')
+    groups = []
+    for pod in ("worker-a", "worker-b"):
+        monkeypatch.setenv("PROMETHEUS_INSTANCE", pod)
+        prometheus = MonitoringManager({"metrics_push_interval_seconds": 0})._providers["prometheus"]
+        prometheus._push_to_gateway = lambda url, job, registry, timeout, grouping_key: groups.append(grouping_key)
+        prometheus.push()
+
+    assert groups == [{"instance": "worker-a", "region": "eu"}, {"instance": "worker-b", "region": "eu"}]
+
+
+def test_no_flusher_without_gateway(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_GATEWAY_URL", raising=False)
+    assert MonitoringManager()._flusher is None
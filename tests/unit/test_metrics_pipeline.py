@@ -0,0 +1,72 @@
+"""
+Unit tests for the background metrics pipeline
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.setup.metrics_pipeline import MetricsPipeline
+from monitoring.setup.monitoring_setup import MonitoringManager
+
+
+def test_events_are_batched_in_order_and_overflow_is_counted():
+    handled, batches = [], []
+    pipeline = MetricsPipeline(max_queue_size=5, batch_size=2, on_batch=lambda *stats: batches.append(stats))
+
+    with pipeline._dispatch_lock:  # hold the worker off while the queue fills
+        results = [pipeline.submit(handled.append, (index,)) for index in range(7)]
+    pipeline.flush()
+    pipeline.stop()
+
+    assert results == [True] * 5 + [False] * 2
+    assert handled == [0, 1, 2, 3, 4]
+    assert pipeline.get_status()["dropped"] == 2 and pipeline.get_status()["processed"] == 5
+    assert sum(batch[1] for batch in batches) == 2
+    assert max(batch[0] for batch in batches) == 2
+
+
+def test_worker_drains_in_background_and_survives_handler_errors():
+    handled = []
+
+    def explode():
+        raise ValueError("bad label")
+
+    pipeline = MetricsPipeline(flush_interval_seconds=0.01)
+    pipeline.submit(explode, ())
+    pipeline.submit(handled.append, ("ok",))
+
+    deadline = time.time() + 2
+    while pipeline.get_status()["processed"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    pipeline.stop()
+    assert handled == ["ok"] and pipeline.get_status()["failed"] == 1
+
+
+def test_manager_records_off_the_request_path():
+    manager = MonitoringManager({"metrics_flush_interval_seconds": 10})
+    prometheus = manager._providers["prometheus"]
+
+    manager.record_http_request("GET", "/policies", 200, 0.05)
+    manager.record_llm_call("gpt-4o-mini", 10, 5, 15, 0.4, True, metadata={"agent": "test"})
+    manager.flush_metrics()
+
+    registry = prometheus._registry
+    assert registry.get_sample_value(
+        "http_requests_total", {"method": "GET", "endpoint": "/policies", "status_code": "200"}
+    ) == 1.0
+    assert registry.get_sample_value("llm_calls_total", {"model": "gpt-4o-mini", "success": "True"}) == 1.0
+    assert registry.get_sample_value("metrics_events_processed_total") >= 2
+    assert manager.get_monitoring_status()["metrics_pipeline"]["dropped"] == 0
+
+
+def test_pipeline_can_be_disabled():
+    manager = MonitoringManager({"metrics_pipeline_enabled": "false"})
+    manager.record_mcp_call("get_policies", True, 0.1)
+
+    registry = manager._providers["prometheus"]._registry
+    assert registry.get_sample_value("mcp_calls_total", {"tool_name": "get_policies", "success": "True"}) == 1.0
+    assert "metrics_pipeline" not in manager.get_monitoring_status()
@@ -0,0 +1,145 @@
+"""
+Unit tests for complexity-based model routing
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from model_router import ModelRouter, estimate_complexity, load_routing_config
+
+
+def request(text):
+    content = SimpleNamespace(role="user", parts=[SimpleNamespace(text=text)])
+    return SimpleNamespace(contents=[content], tools_dict={})
+
+
+def reply(text):
+    return SimpleNamespace(content=SimpleNamespace(role="model", parts=[SimpleNamespace(text=text)]))
+
+
+class FakeModel:
+    def __init__(self, answer=None, error=None):
+        self.answer = answer
+        self.error = error
+        self.calls = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        yield reply(self.answer)
+
+
+class FakeManager:
+    def __init__(self):
+        self.phases = []
+        self.calls = []
+
+    def record_phase(self, phase, seconds):
+        self.phases.append(phase)
+
+    def record_llm_call(self, model, prompt_tokens, completion_tokens, total_tokens,
+                        duration_seconds, success, error=None, metadata=None):
+        self.calls.append((model, success, metadata["routing_decision"]))
+
+
+async def collect(router, llm_request, stream=False):
+    return [response async for response in router.generate(llm_request, stream)]
+
+
+def test_complexity_score_separates_simple_and_hard_requests():
+    assert estimate_complexity(request("What is my deductible?")) < 0.6
+    hard = "Compare my auto and home coverage and explain why the risk assessment changed. Should I raise limits?"
+    assert estimate_complexity(request(hard)) >= 0.6
+
+
+class TestModelRouter:
+    """Test routing, escalation and fallback"""
+
+    async def test_simple_request_stays_on_cheap_tier(self):
+        cheap, strong = FakeModel("Your deductible is $500."), FakeModel("strong")
+        manager = FakeManager()
+        router = ModelRouter([("cheap", cheap), ("strong", strong)], monitoring=lambda: manager)
+
+        responses = await collect(router, request("What is my deductible?"))
+        assert responses[-1].content.parts[0].text == "Your deductible is $500."
+        assert (cheap.calls, strong.calls) == (1, 0)
+        assert manager.calls == [("cheap", True, "routed")]
+
+    async def test_low_confidence_escalates(self):
+        cheap, strong = FakeModel("I'm not sure about that."), FakeModel("Here is the answer.")
+        manager = FakeManager()
+        router = ModelRouter([("cheap", cheap), ("strong", strong)], monitoring=lambda: manager)
+
+        responses = await collect(router, request("What is my deductible?"))
+        assert responses[-1].content.parts[0].text == "Here is the answer."
+        assert manager.calls == [("cheap", True, "routed"), ("strong", True, "escalated")]
+
+    async def test_failed_validation_escalates(self):
+        cheap, strong = FakeModel("$5"), FakeModel("$500")
+        router = ModelRouter(
+            [("cheap", cheap), ("strong", strong)],
+            validator=lambda req, resp: None if "00" in resp.content.parts[0].text else "implausible amount"
+        )
+        responses = await collect(router, request("What is my deductible?"))
+        assert responses[-1].content.parts[0].text == "$500"
+
+    async def test_provider_errors_fall_back(self):
+        cheap, strong = FakeModel("cheap answer"), FakeModel(error=ConnectionError("provider down"))
+        manager = FakeManager()
+        router = ModelRouter([("cheap", cheap), ("strong", strong)], monitoring=lambda: manager)
+
+        hard = "Compare my auto and home coverage and explain why the risk assessment changed. Should I raise limits?"
+        responses = await collect(router, request(hard), stream=True)
+        assert responses[-1].content.parts[0].text == "cheap answer"
+        assert manager.calls == [("strong", False, "routed"), ("cheap", True, "fallback")]
+
+    async def test_streaming_low_confidence_final_response_escalates(self):
+        class StreamingModel(FakeModel):
+            async def generate_content_async(self, llm_request, stream=False):
+                self.calls += 1
+                for word in self.answer.split():
+                    yield SimpleNamespace(partial=True, content=SimpleNamespace(parts=[SimpleNamespace(text=word)]))
+                yield SimpleNamespace(partial=False, **vars(reply(self.answer)))
+
+        cheap, strong = StreamingModel("I'm not sure about that."), StreamingModel("Your deductible is $500.")
+        manager = FakeManager()
+        router = ModelRouter([("cheap", cheap), ("strong", strong)], monitoring=lambda: manager)
+
+        responses = await collect(router, request("What is my deductible?"), stream=True)
+        assert [response.content.parts[0].text for response in responses] == \
+            ["Your", "deductible", "is", "$500.", "Your deductible is $500."]
+        assert manager.calls == [("cheap", True, "routed"), ("strong", True, "escalated")]
+
+    async def test_monitoring_errors_do_not_fail_the_turn(self):
+        class BrokenManager(FakeManager):
+            def record_phase(self, phase, seconds):
+                raise RuntimeError("metrics backend down")
+
+        router = ModelRouter([("cheap", FakeModel("Your deductible is $500."))], monitoring=lambda: BrokenManager())
+        responses = await collect(router, request("What is my deductible?"))
+        assert responses[-1].content.parts[0].text == "Your deductible is $500."
+
+    async def test_all_tiers_failing_raises(self):
+        router = ModelRouter([("only", FakeModel(error=TimeoutError("timeout")))])
+        with pytest.raises(TimeoutError):
+            await collect(router, request("hello"))
+
+
+def test_models_yaml_defines_cheapest_first_tiers():
+    config = load_routing_config("orchestrator")
+    assert config["tiers"][0] == "openrouter/openai/gpt-4o-mini"
+    assert len(config["tiers"]) == 2 and 0 < config["min_confidence"] <= 1
+
+
+def test_primary_model_is_honored_as_strongest_tier():
+    config = load_routing_config("orchestrator", primary_model="openrouter/openai/gpt-4.1")
+    assert config["tiers"][-1] == "openrouter/openai/gpt-4.1" and len(config["tiers"]) == 3
+    assert load_routing_config("orchestrator", primary_model="openrouter/openai/gpt-4o-mini")["tiers"] == \
+        load_routing_config("orchestrator")["tiers"]
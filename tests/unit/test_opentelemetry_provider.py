@@ -0,0 +1,189 @@
+"""
+Unit tests for OpenTelemetry tracing: batching, W3C propagation and sampling
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from monitoring.providers.opentelemetry_provider import (
+    OpenTelemetryProvider, extract_trace_context, inject_trace_context
+)
+from monitoring.setup.monitoring_setup import get_monitoring_manager
+
+pytest.importorskip("opentelemetry.sdk")
+from opentelemetry import context as otel_context
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+def make_provider(**overrides):
+    exporter = InMemorySpanExporter()
+    provider = OpenTelemetryProvider(service_name="test", exporter=exporter, set_global=False, **overrides)
+    return provider, exporter
+
+
+def finished(provider, exporter):
+    provider.flush()
+    return {span.name: span for span in exporter.get_finished_spans()}
+
+
+@pytest.fixture
+def tracing(monkeypatch):
+    provider, exporter = make_provider(head_sample_ratio=1.0, tail_sample_ratio=1.0)
+    monkeypatch.setitem(get_monitoring_manager()._providers, "opentelemetry", provider)
+    return provider, exporter
+
+
+def test_propagation_round_trip():
+    token = otel_context.attach(extract_trace_context({"Traceparent": TRACEPARENT}))
+    try:
+        assert inject_trace_context()["traceparent"] == TRACEPARENT
+    finally:
+        otel_context.detach(token)
+    assert extract_trace_context({}) is None
+
+
+def test_nested_spans_are_batched_under_one_trace():
+    provider, exporter = make_provider(tail_sample_ratio=1.0)
+    with provider.start_trace("request") as trace_ctx:
+        with provider.start_span("lookup", attributes={"customer_id": "CUST001"}):
+            assert provider.get_current_trace_id() == trace_ctx.get_trace_id()
+
+    spans = finished(provider, exporter)
+    assert spans["lookup"].parent.span_id == spans["request"].context.span_id
+    assert spans["lookup"].attributes["customer_id"] == "CUST001"
+    assert provider.get_current_trace_id() is None
+
+
+def test_middleware_continues_the_callers_trace(tracing):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from monitoring.middleware.fastapi_middleware import MonitoringMiddleware
+
+    provider, exporter = tracing
+    app = FastAPI()
+    app.add_middleware(MonitoringMiddleware)
+
+    @app.get("/policies/{customer_id}")
+    async def policies(customer_id: str):
+        return inject_trace_context({})
+
+    outgoing = TestClient(app).get("/policies/CUST001", headers={"traceparent": TRACEPARENT}).json()
+
+    server = finished(provider, exporter)["GET /policies/CUST001"]
+    assert server.kind == SpanKind.SERVER
+    assert format(server.context.trace_id, "032x") == TRACE_ID
+    assert server.parent.is_remote and format(server.parent.span_id, "016x") == "00f067aa0ba902b7"
+    assert outgoing["traceparent"] == f"00-{TRACE_ID}-{format(server.context.span_id, '016x')}-01"
+
+
+async def test_trace_crosses_mcp_call_to_server_span(tracing):
+    from fastmcp import Client, FastMCP
+    from monitoring.middleware.mcp_middleware import MCPMonitoringWrapper, create_mcp_tracing_middleware
+
+    provider, exporter = tracing
+    server = FastMCP("Policy Service")
+    server.add_middleware(create_mcp_tracing_middleware())
+
+    @server.tool()
+    def get_policies(customer_id: str) -> list:
+        return []
+
+    async with Client(server) as client:
+        wrapper = MCPMonitoringWrapper(client, endpoint="test-trace-endpoint")
+        with provider.start_trace("agent turn"):
+            await wrapper.call_tool("get_policies", {"customer_id": "CUST001"})
+
+    spans = finished(provider, exporter)
+    client_span, server_span = spans["mcp.call_tool get_policies"], spans["mcp.tool get_policies"]
+    assert client_span.kind == SpanKind.CLIENT and server_span.kind == SpanKind.SERVER
+    assert server_span.parent.span_id == client_span.context.span_id
+    assert server_span.context.trace_id == spans["agent turn"].context.trace_id
+
+
+def test_tail_sampling_keeps_errors_and_slow_traces_only():
+    provider, exporter = make_provider(tail_sample_ratio=0.0, tail_latency_threshold_ms=60000)
+    with provider.start_trace("fast ok"):
+        with provider.start_span("child"):
+            pass
+    with pytest.raises(ValueError):
+        with provider.start_trace("failed"):
+            with provider.start_span("failing child"):
+                raise ValueError("policy missing")
+
+    spans = finished(provider, exporter)
+    assert set(spans) == {"failed", "failing child"}
+    assert provider.get_status()["tail_kept"] == 1 and provider.get_status()["tail_dropped"] == 1
+
+
+def test_tail_ratio_decision_agrees_across_services():
+    agent, agent_exporter = make_provider(tail_sample_ratio=0.5, tail_latency_threshold_ms=60000)
+    server, server_exporter = make_provider(tail_sample_ratio=0.5, tail_latency_threshold_ms=60000)
+    for _ in range(40):
+        with agent.start_trace("agent turn"):
+            carrier = inject_trace_context({})
+        with server.start_trace("tool call", carrier=carrier):
+            pass
+
+    def exported(provider, exporter):
+        provider.flush()
+        return {span.context.trace_id for span in exporter.get_finished_spans()}
+
+    kept = exported(agent, agent_exporter)
+    assert kept == exported(server, server_exporter)
+    assert 0 < len(kept) < 40
+
+
+def test_head_sampling_and_file_exporter(tmp_path, monkeypatch):
+    monkeypatch.setenv("OTEL_TRACES_EXPORTER", "file")
+    monkeypatch.setenv("OTEL_TRACES_FILE", str(tmp_path / "traces.jsonl"))
+    provider = OpenTelemetryProvider(head_sample_ratio=0.0, set_global=False)
+    with provider.start_trace("unsampled"):
+        pass
+    provider.flush()
+    assert not (tmp_path / "traces.jsonl").exists()
+
+    provider = OpenTelemetryProvider(head_sample_ratio=1.0, set_global=False)
+    with provider.start_trace("sampled", attributes={"agent": "technical"}):
+        pass
+    provider.flush()
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["sampled"]
+
+
+async def test_agent_turn_continues_ui_trace_to_policy_server(tracing):
+    from types import SimpleNamespace
+    from fastmcp import FastMCP
+    from intent_router import PolicyToolClient
+    from monitoring.middleware.mcp_middleware import create_mcp_tracing_middleware
+    from startup_tools import create_request_timing_callbacks
+
+    provider, exporter = tracing
+    server = FastMCP("Policy Service")
+    server.add_middleware(create_mcp_tracing_middleware())
+
+    @server.tool()
+    def get_policies(customer_id: str) -> list:
+        return []
+
+    before_agent, after_agent = create_request_timing_callbacks("insurance_technical_agent", get_monitoring_manager)
+    turn = SimpleNamespace(state={"trace_context": {"traceparent": TRACEPARENT}})
+    before_agent(turn)
+    await PolicyToolClient(url=server)("get_policies", {"customer_id": "CUST001"})
+    after_agent(turn)
+
+    spans = finished(provider, exporter)
+    agent_span, server_span = spans["insurance_technical_agent"], spans["mcp.tool get_policies"]
+    assert format(agent_span.context.trace_id, "032x") == TRACE_ID and agent_span.kind == SpanKind.SERVER
+    assert server_span.parent.span_id == agent_span.context.span_id
+    assert provider.get_current_trace_id() is None
@@ -0,0 +1,72 @@
+"""
+Unit tests for the policy server benchmark data generator and statistics
+"""
+import io
+import json
+import sys
+from pathlib import Path
+
+# Add benchmarks and project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "tests" / "benchmarks"))
+
+from bench_stats import latency_summary, percentile
+from generate_policy_data import generate_dataset, parse_size, write_dataset, write_metadata
+
+
+class TestGenerator:
+    """Test synthetic dataset generation"""
+
+    def test_streamed_and_in_memory_datasets_match(self):
+        data = generate_dataset(500, seed=7)
+        buffer = io.StringIO()
+        counts = write_dataset(500, buffer, seed=7)
+
+        assert json.loads(buffer.getvalue()) == data
+        assert counts["policies"] == 500
+        assert data["metadata"]["total_customers"] == len(data["customers"])
+
+        mock = json.loads((project_root / "data" / "mock_data.json").read_text())
+        for section in ("policies", "customers", "claims", "agents"):
+            assert set(mock[section][0]) <= set(data[section][0]), section
+
+        owned = {pid for customer in data["customers"] for pid in customer["policies"]}
+        assert owned == {policy["policy_id"] for policy in data["policies"]}
+
+    def test_policy_server_tools_return_generated_records(self, monkeypatch):
+        from policy_server import main as policy_server
+
+        data = generate_dataset(200)
+        monkeypatch.setattr(policy_server, "DATA", data)
+        customer = data["customers"][0]
+
+        policies = policy_server.get_policies(customer["customer_id"])
+        assert [p["id"] for p in policies] == customer["policies"]
+        assert policy_server.get_agent(customer["customer_id"])["name"]
+
+    def test_parse_size(self):
+        assert parse_size("1M") == 1_000_000
+        assert parse_size("25_000") == 25_000
+
+    def test_load_test_reads_counts_from_metadata_sidecar(self, tmp_path):
+        from policy_load_test import dataset_counts
+
+        data_file = tmp_path / "synthetic.json"
+        with open(data_file, "w") as f:
+            counts = write_dataset(300, f, seed=7)
+        write_metadata(data_file, 300, 7, counts)
+        data_file.write_text("not parsed")
+
+        assert dataset_counts(data_file) == {"policies": 300, "customers": counts["customers"]}
+
+
+def test_latency_summary_percentiles():
+    samples = [i / 1000 for i in range(1, 101)]
+
+    assert percentile(sorted(samples), 50) == 0.0505
+    summary = latency_summary(samples, elapsed_seconds=2.0)
+    assert summary["count"] == 100
+    assert summary["throughput_rps"] == 50.0
+    assert summary["p99_ms"] == 99.01
+    assert summary["max_ms"] == 100.0
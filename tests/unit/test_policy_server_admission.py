@@ -0,0 +1,121 @@
+"""
+Unit tests for policy server admission control
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from policy_server.admission import (
+    AdmissionConfig, AdmissionController, AdmissionRejected, Lane,
+    client_key_from_request, lane_for_tool
+)
+
+
+def make_controller(**overrides):
+    config = AdmissionConfig(
+        max_concurrency=1,
+        max_queue={Lane.INTERACTIVE: 2, Lane.ANALYTICS: 1},
+        queue_timeout_seconds=1.0,
+        rate_per_second=0,
+    )
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    decisions = []
+    controller = AdmissionController(
+        config, on_decision=lambda lane, admitted, reason, waited: decisions.append((lane, reason))
+    )
+    return controller, decisions
+
+
+class TestAdmissionController:
+    """Test concurrency limiting, shedding and priority lanes"""
+
+    async def test_interactive_lane_served_before_analytics(self):
+        controller, _ = make_controller()
+        await controller.acquire(Lane.INTERACTIVE, "a")
+
+        order = []
+
+        async def waiter(lane, name):
+            await controller.acquire(lane, name)
+            order.append(name)
+            controller.release()
+
+        analytics = asyncio.create_task(waiter(Lane.ANALYTICS, "analytics"))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(waiter(Lane.INTERACTIVE, "interactive"))
+        await asyncio.sleep(0)
+
+        controller.release()
+        await asyncio.gather(analytics, interactive)
+        assert order == ["interactive", "analytics"]
+        assert controller.get_status()["in_flight"] == 0
+
+    async def test_full_queue_is_shed(self):
+        controller, decisions = make_controller()
+        await controller.acquire(Lane.ANALYTICS, "a")
+        queued = asyncio.create_task(controller.acquire(Lane.ANALYTICS, "b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire(Lane.ANALYTICS, "c")
+        assert exc.value.reason == "queue_full"
+        assert (Lane.ANALYTICS, "queue_full") in decisions
+
+        controller.release()
+        await queued
+        controller.release()
+
+    async def test_queue_timeout_is_shed(self):
+        controller, _ = make_controller(queue_timeout_seconds=0.01)
+        await controller.acquire(Lane.INTERACTIVE, "a")
+
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire(Lane.INTERACTIVE, "b")
+        assert exc.value.reason == "queue_timeout"
+        assert controller.get_status()["queued"]["interactive"] == 0
+
+    async def test_token_bucket_limits_each_client(self):
+        controller, _ = make_controller(max_concurrency=10, rate_per_second=1.0, burst=2.0)
+        for _ in range(2):
+            await controller.acquire(Lane.INTERACTIVE, "noisy")
+        with pytest.raises(AdmissionRejected) as exc:
+            await controller.acquire(Lane.INTERACTIVE, "noisy")
+        assert exc.value.reason == "rate_limited"
+
+        # Other clients keep their own budget
+        await controller.acquire(Lane.INTERACTIVE, "quiet")
+        assert controller.get_status()["shed"] == {"rate_limited": 1}
+
+
+class TestAdmissionHelpers:
+    """Test lane mapping and client key derivation"""
+
+    def test_lane_for_tool(self):
+        assert lane_for_tool("get_deductibles") == Lane.INTERACTIVE
+        assert lane_for_tool("get_recommendations") == Lane.ANALYTICS
+
+    def test_client_key_prefers_api_key(self):
+        key = client_key_from_request({"x-api-key": "secret"}, "session-1")
+        assert key.startswith("key:") and "secret" not in key
+        assert client_key_from_request({"authorization": "Bearer secret"}, None) == key
+        assert client_key_from_request({}, "session-1") == "session:session-1"
+        assert client_key_from_request({}, None) == "anonymous"
+
+
+async def test_policy_server_tools_pass_through_admission():
+    """Tool calls over the in-memory transport go through the middleware"""
+    fastmcp = pytest.importorskip("fastmcp")
+    from policy_server import main as policy_server
+
+    async with fastmcp.Client(policy_server.mcp) as client:
+        result = await client.call_tool("get_policy_types", {"customer_id": "CUST001"})
+
+    assert result is not None
+    assert policy_server.admission_controller.get_status()["in_flight"] == 0
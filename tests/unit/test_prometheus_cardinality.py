@@ -0,0 +1,53 @@
+"""
+Unit tests for Prometheus label-child caching, cardinality limits and bucket layouts
+"""
+import sys
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.providers.prometheus_provider import PrometheusProvider
+
+
+def test_label_children_are_cached():
+    provider = PrometheusProvider()
+    provider.record_mcp_call("get_policies", True, 0.1)
+    children = dict(provider._children)
+    provider.record_mcp_call("get_policies", True, 0.2)
+
+    assert provider._children == children
+    assert provider._registry.get_sample_value(
+        "mcp_calls_total", {"tool_name": "get_policies", "success": "True"}
+    ) == 2.0
+
+
+def test_overflow_label_values_collapse_into_other():
+    provider = PrometheusProvider(label_limits={"mcp_errors_total": 2})
+    for index in range(5):
+        provider.record_mcp_call("get_policies", False, 0.1, error=f"Timeout after {index}ms")
+
+    registry = provider._registry
+    assert registry.get_sample_value(
+        "mcp_errors_total", {"tool_name": "get_policies", "error_type": "other"}
+    ) == 3.0
+    assert registry.get_sample_value(
+        "prometheus_label_overflow_total", {"metric": "mcp_errors_total", "label": "error_type"}
+    ) == 3.0
+    series = [s for m in registry.collect() if m.name == "mcp_errors" for s in m.samples
+              if s.name == "mcp_errors_total"]
+    assert len(series) == 3
+    assert len([key for key in provider._children if key[0] is provider._metrics["mcp_errors_total"]]) == 3
+
+
+def test_bucket_layouts_are_configurable_per_metric():
+    provider = PrometheusProvider(histogram_buckets={"llm_call_duration_seconds": [1, 5, 30]})
+    provider.record_llm_metrics("gpt-4o-mini", 10, 5, 15, 2.0, True)
+
+    bounds = {
+        sample.labels["le"]
+        for metric in provider._registry.collect() if metric.name == "llm_call_duration_seconds"
+        for sample in metric.samples if sample.name.endswith("_bucket")
+    }
+    assert bounds == {"1.0", "5.0", "30.0", "+Inf"}
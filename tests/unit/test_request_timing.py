@@ -0,0 +1,174 @@
+"""
+Unit tests for per-request phase timing
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.setup.monitoring_setup import MonitoringManager
+from monitoring.setup.request_timing import (
+    RequestTimings, begin_request, current_timings, end_request, phase, record_phase, timed
+)
+from monitoring.setup import request_timing
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+def begin_with_clock(clock, name="GET /policies"):
+    timings = RequestTimings(name, clock=clock)
+    timings._token = request_timing._current_request.set(timings)
+    return timings
+
+
+def test_nested_phases_are_exclusive():
+    clock = FakeClock()
+    timings = begin_with_clock(clock)
+    with phase("data_lookup"):
+        clock.advance(0.010)
+        with phase("serialization"):
+            clock.advance(0.005)
+        record_phase("admission_wait", 0.002)
+    clock.advance(0.003)
+    end_request(timings)
+
+    assert timings.breakdown() == pytest.approx({
+        "data_lookup": 0.008, "serialization": 0.005, "admission_wait": 0.002, "other": 0.003
+    })
+    header = dict(entry.split(";dur=") for entry in timings.server_timing_header().split(", "))
+    assert header == {
+        "serialization": "5.0", "admission_wait": "2.0", "data_lookup": "8.0", "other": "3.0", "total": "18.0"
+    }
+    assert current_timings() is None
+
+
+def test_no_op_without_request_or_when_disabled(monkeypatch):
+    assert phase("llm") is phase("mcp")  # shared no-op
+    record_phase("llm", 1.0)
+
+    monkeypatch.setenv("REQUEST_TIMING_ENABLED", "false")
+    assert begin_request("GET /") is None
+    assert current_timings() is None
+    assert end_request(None) is None
+
+
+def test_timed_decorator_and_concurrent_requests_stay_separate():
+    @timed("llm")
+    async def call_model(delay):
+        await asyncio.sleep(delay)
+
+    async def handle(name, delay):
+        timings = begin_request(name)
+        await call_model(delay)
+        return end_request(timings)
+
+    async def main():
+        return await asyncio.gather(handle("a", 0.02), handle("b", 0.0))
+
+    slow, fast = asyncio.run(main())
+    assert slow.name == "a" and slow.breakdown()["llm"] >= 0.02
+    assert fast.breakdown()["llm"] < 0.02
+
+
+def test_middleware_sets_server_timing_and_records_histogram(monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from monitoring.middleware import fastapi_middleware
+    from monitoring.middleware.fastapi_middleware import MonitoringMiddleware
+
+    manager = MonitoringManager()
+    monkeypatch.setattr(fastapi_middleware, "get_monitoring_manager", lambda: manager)
+    app = FastAPI()
+    app.add_middleware(MonitoringMiddleware)
+
+    @app.get("/policies/{customer_id}")
+    @timed("data_lookup")
+    def policies(customer_id: str):
+        return []
+
+    response = TestClient(app).get("/policies/CUST001")
+    manager.flush_metrics()
+
+    entries = [entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")]
+    assert entries == ["data_lookup", "other", "total"]
+    registry = manager._providers["prometheus"]._registry
+    labels = {"request": "GET /policies/CUST001", "phase": "data_lookup"}
+    assert registry.get_sample_value("request_phase_duration_seconds_count", labels) == 1.0
+
+
+async def test_mcp_wrapper_charges_tool_calls_to_mcp_phase():
+    from fastmcp import Client, FastMCP
+    from monitoring.middleware.mcp_middleware import MCPMonitoringWrapper
+
+    server = FastMCP("Policy Service")
+
+    @server.tool()
+    def get_policies(customer_id: str) -> list:
+        return []
+
+    async with Client(server) as client:
+        wrapper = MCPMonitoringWrapper(client, endpoint="test-timing-endpoint")
+        timings = begin_request("agent turn")
+        await wrapper.call_tool("get_policies", {"customer_id": "CUST001"})
+        end_request(timings)
+
+    assert set(timings.breakdown()) == {"mcp", "other"}
+    assert timings.breakdown()["mcp"] > 0
+
+
+async def test_policy_tool_result_encoding_is_charged_to_serialization(monkeypatch):
+    from fastmcp import Client, FastMCP
+    from monitoring.middleware import mcp_middleware
+
+    class RecordingManager:
+        def __init__(self):
+            self.recorded = []
+
+        def record_request_timings(self, timings):
+            self.recorded.append(timings)
+
+    manager = RecordingManager()
+    monkeypatch.setattr(mcp_middleware, "get_monitoring_manager", lambda: manager)
+    server = FastMCP("Policy Service")
+    server.add_middleware(mcp_middleware.create_mcp_timing_middleware())
+    tool = mcp_middleware.create_timed_tool_decorator(server)
+
+    @tool()
+    def get_policies(customer_id: str) -> list:
+        return [{"policy_id": f"POL{i}", "customer_id": customer_id} for i in range(100)]
+
+    async with Client(server) as client:
+        await client.call_tool("get_policies", {"customer_id": "CUST001"})
+
+    assert get_policies("CUST001")[0]["policy_id"] == "POL0"
+    assert manager.recorded and manager.recorded[0].breakdown()["serialization"] > 0
+
+
+def test_session_store_calls_are_charged_to_session_io(tmp_path):
+    sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+    from conversation_history import ConversationHistory
+    from session_tools import SessionManager
+
+    manager = SessionManager(history=ConversationHistory(window_size=2, spill_batch=1, spill_dir=str(tmp_path)))
+    session_id = manager.create_session("CUST001")
+    timings = begin_request("agent turn")
+    for i in range(4):
+        manager.add_conversation_entry(session_id, f"question {i}", f"answer {i}")
+    manager.get_conversation_history(session_id, limit=4)
+    end_request(timings)
+
+    assert timings.breakdown()["session_io"] > 0
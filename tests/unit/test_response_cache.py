@@ -0,0 +1,120 @@
+"""
+Unit tests for the customer service response cache
+"""
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from response_cache import (
+    ResponseCache, VectorIndex, bump_data_version, context_digest, data_version_of, dataset_version,
+    hashing_embedder, normalize_prompt
+)
+
+
+def message(role, text):
+    return SimpleNamespace(role=role, parts=[SimpleNamespace(text=text)])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_prompt_collapses_trivial_variations():
+    assert normalize_prompt("What's my deductible?") == "what is my deductible"
+    assert normalize_prompt("  Hi, what is my   DEDUCTIBLE please!") == "what is my deductible"
+    assert normalize_prompt("Is my premium $1,250.50?") == "is my premium $1 250.50"
+
+
+class TestResponseCache:
+    """Test exact and semantic tiers, scoping, TTL and invalidation"""
+
+    def test_exact_tier_hits_normalized_prompts(self):
+        cache = ResponseCache()
+        cache.put("What's my deductible?", "$500", scope="CUST001", data_version="1")
+
+        hit = cache.get("what is my deductible", scope="CUST001", data_version="1")
+        assert hit.response == "$500" and hit.tier == "exact"
+        assert cache.get("what is my deductible", scope="CUST002", data_version="1") is None
+        assert cache.get("what is my deductible", scope="CUST001", data_version="2") is None
+        assert cache.get_status()["exact_hits"] == 1 and cache.hit_rate() == 1 / 3
+
+    def test_entries_expire_and_can_be_invalidated(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttl_seconds=60, clock=clock)
+        cache.put("when is my next payment", "June 1", scope="CUST001")
+        cache.put("what is my deductible", "$500", scope="CUST001")
+        cache.put("what is my deductible", "$250", scope="CUST002")
+
+        clock.now += 30
+        assert cache.invalidate(scope="CUST001") == 2
+        assert cache.get("what is my deductible", scope="CUST001") is None
+        clock.now += 31
+        assert cache.get("what is my deductible", scope="CUST002") is None
+
+    def test_semantic_tier_matches_rewordings(self):
+        cache = ResponseCache(embedder=hashing_embedder(), similarity_threshold=0.8)
+        cache.put("what is the deductible on my auto policy", "$500", scope="CUST001")
+
+        hit = cache.get("what is the deductible on my auto policy please tell me", scope="CUST001")
+        assert hit is not None and hit.tier == "semantic" and 0.8 <= hit.similarity < 1.0
+        assert cache.get("how do I file a claim", scope="CUST001") is None
+        assert cache.get("what is the deductible on my auto policy now", scope="CUST002") is None
+
+    def test_lru_eviction_removes_vectors(self):
+        cache = ResponseCache(max_entries=2, embedder=hashing_embedder())
+        for i in range(3):
+            cache.put(f"question number {i}", f"answer {i}")
+
+        assert cache.get_status()["evictions"] == 1
+        assert len(cache._index) == 2
+
+
+def test_follow_ups_are_keyed_by_preceding_turns():
+    first = [message("user", "Tell me about my auto policy"), message("model", "Auto policy POL001..."),
+             message("user", "yes")]
+    second = [message("user", "Should I add roadside assistance?"), message("model", "It costs $5/month."),
+              message("user", "Yes!")]
+    assert context_digest(first[-1:]) == ""
+    assert context_digest(first) != context_digest(second)
+
+    cache = ResponseCache()
+    cache.put("yes", "Here are the auto policy details", scope="CUST001", context=context_digest(first))
+    assert cache.get("yes", scope="CUST001", context=context_digest(second)) is None
+    assert cache.get("yes", scope="CUST001") is None
+    assert cache.get("Yes.", scope="CUST001", context=context_digest(first)) is not None
+
+
+def test_data_version_follows_dataset_and_state_changes(tmp_path, monkeypatch):
+    dataset = tmp_path / "policies.json"
+    dataset.write_text("{}")
+    monkeypatch.setenv("POLICY_DATA_FILE", str(dataset))
+    state = {}
+    before = data_version_of(state)
+
+    bump_data_version(state)
+    assert state == {"user:customer_data_version": 1}
+    after_bump = data_version_of(state)
+    assert after_bump != before
+
+    stat = dataset.stat()
+    os.utime(dataset, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert data_version_of(state) != after_bump
+    assert dataset_version(tmp_path / "missing.json") == "0"
+
+
+def test_vector_index_returns_best_match():
+    index = VectorIndex()
+    index.add("bucket", "a", [1.0, 0.0])
+    index.add("bucket", "b", [0.6, 0.8])
+    key, score = index.search("bucket", [0.0, 2.0])
+    assert key == "b" and abs(score - 0.8) < 1e-6
+    assert index.search("other", [1.0, 0.0]) is None
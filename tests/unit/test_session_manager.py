@@ -0,0 +1,105 @@
+"""
+Unit tests for SessionManager expiry, LRU bounds and the timing wheel
+"""
+import sys
+from pathlib import Path
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from session_expiry import TimingWheel
+from session_tools import SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_manager(**kwargs):
+    clock = FakeClock()
+    return SessionManager(clock=clock, **kwargs), clock
+
+
+class TestTimingWheel:
+    """Test deadline bucketing"""
+
+    def test_keys_expire_on_or_after_deadline(self):
+        wheel = TimingWheel(tick_seconds=10, now=0)
+        wheel.schedule("a", 15)
+        wheel.schedule("b", 35)
+
+        assert wheel.pop_expired(14) == []
+        assert wheel.pop_expired(20) == ["a"]
+        wheel.schedule("b", 60)  # rescheduled on activity
+        assert wheel.pop_expired(45) == []
+        assert wheel.pop_expired(10_000) == ["b"]
+        assert len(wheel) == 0
+
+    def test_cancel(self):
+        wheel = TimingWheel(tick_seconds=1, now=0)
+        wheel.schedule("a", 5)
+        wheel.cancel("a")
+        assert "a" not in wheel
+        assert wheel.pop_expired(10) == []
+
+
+class TestSessionManager:
+    """Test bounded, TTL-indexed sessions"""
+
+    def test_idle_sessions_fail_validation(self):
+        manager, clock = make_manager(ttl_seconds=60)
+        session_id = manager.create_session("CUST001")
+
+        clock.now += 59
+        assert manager.validate_session(session_id)
+        clock.now += 59  # activity above reset the idle timer
+        assert manager.validate_session(session_id)
+
+        clock.now += 61
+        assert not manager.validate_session(session_id)
+        assert session_id not in manager.sessions
+        assert manager.get_session_data(session_id)["customer_id"] is None
+
+    def test_cleanup_only_removes_expired_sessions(self):
+        manager, clock = make_manager(ttl_seconds=3600)
+        stale = [manager.create_session() for _ in range(3)]
+        clock.now += 1800
+        fresh = manager.create_session("CUST002")
+
+        clock.now += 1900
+        assert manager.cleanup_expired_sessions() == 3
+        assert list(manager.sessions) == [fresh]
+        assert manager.get_status()["expired_total"] == 3
+        assert all(session_id not in manager.sessions for session_id in stale)
+
+    def test_least_recently_used_session_evicted_at_cap(self):
+        manager, clock = make_manager(max_sessions=2)
+        first = manager.create_session("CUST001")
+        second = manager.create_session("CUST002")
+        manager.get_session_data(first)  # first is now most recently used
+
+        third = manager.create_session("CUST003")
+        assert list(manager.sessions) == [first, third]
+        assert second not in manager.store._expiry
+        assert manager.get_status()["evicted_total"] == 1
+
+    def test_background_reaper_runs_cleanup(self):
+        manager, clock = make_manager(ttl_seconds=1, reaper_interval_seconds=0.01)
+        manager.create_session()
+        clock.now += 120
+
+        manager.start_reaper()
+        try:
+            for _ in range(500):
+                if not manager.sessions:
+                    break
+                manager._reaper_stop.wait(0.01)
+            assert not manager.sessions
+        finally:
+            manager.stop_reaper()
+        assert manager.get_status()["reaper_running"] is False
@@ -0,0 +1,134 @@
+"""
+Unit tests for the pluggable session store backends
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from session_store import (
+    EXPIRED, MISSING, TOUCHED, InMemorySessionStore, InProcessRedis,
+    NearCacheSessionStore, RedisSessionStore, SQLiteSessionStore
+)
+from session_tools import SessionManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def store_and_clock(request, tmp_path):
+    clock = FakeClock()
+    if request.param == "memory":
+        store = InMemorySessionStore(tick_seconds=1, clock=clock)
+    elif request.param == "sqlite":
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"), clock=clock)
+    else:
+        store = RedisSessionStore(InProcessRedis(clock=clock))
+    yield store, clock
+    store.close()
+
+
+class TestSessionStoreBackends:
+    """Behaviour shared by every backend"""
+
+    def test_versions_increase_on_write(self, store_and_clock):
+        store, _ = store_and_clock
+        assert store.put("s1", {"customer_id": "CUST001"}, 60) == 1
+        assert store.put("s1", {"customer_id": "CUST002"}, 60) == 2
+
+        version, data = store.get("s1")
+        assert version == 2 and data["customer_id"] == "CUST002"
+        assert store.versions(["s1", "unknown"]) == {"s1": 2}
+
+    def test_expiry_and_sliding_ttl(self, store_and_clock):
+        store, clock = store_and_clock
+        store.put("s1", {"n": 1}, 60)
+        store.put("s2", {"n": 2}, 60)
+
+        clock.now += 50
+        assert store.get("s1", refresh_ttl=60) is not None
+        assert store.touch("unknown", 60) == MISSING
+
+        clock.now += 20
+        assert store.get("s2") is None
+        assert store.touch("s1", 60) == TOUCHED
+        store.purge_expired()
+        assert set(store.get_many(["s1", "s2"])) == {"s1"}
+
+    def test_batched_reads_and_writes(self, store_and_clock):
+        store, _ = store_and_clock
+        versions = store.put_many({f"s{i}": {"n": i} for i in range(5)}, 60)
+        assert versions == {f"s{i}": 1 for i in range(5)}
+
+        fetched = store.get_many([f"s{i}" for i in range(6)])
+        assert {sid: data["n"] for sid, (_, data) in fetched.items()} == {f"s{i}": i for i in range(5)}
+        assert store.delete("s0") and store.get("s0") is None
+
+
+def test_redis_pipelines_multi_session_operations():
+    server = InProcessRedis()
+    store = RedisSessionStore(server)
+
+    store.put_many({f"s{i}": {"n": i} for i in range(10)}, 60)
+    store.get_many([f"s{i}" for i in range(10)], refresh_ttl=60)
+    assert server.round_trips == 2
+
+
+def test_memory_store_reports_expired_sessions():
+    clock = FakeClock()
+    store = InMemorySessionStore(clock=clock)
+    store.put("s1", {}, 10)
+    clock.now += 11
+    assert store.touch("s1", 10) == EXPIRED
+
+
+class TestNearCache:
+    """Test version-checked local caching in front of a shared store"""
+
+    def test_cached_copy_revalidated_by_version(self):
+        server = InProcessRedis()
+        shared = RedisSessionStore(server)
+        replica_a = NearCacheSessionStore(RedisSessionStore(server))
+        replica_b = NearCacheSessionStore(RedisSessionStore(server))
+
+        replica_a.put("s1", {"turns": 1}, 60)
+        assert replica_a.get("s1")[1] == {"turns": 1}
+        assert replica_a.get_status()["near_cache"]["revalidated"] == 1
+
+        replica_b.put("s1", {"turns": 2}, 60)
+        assert replica_a.get("s1")[1] == {"turns": 2}
+        assert replica_a.get_status()["near_cache"]["misses"] == 1
+
+        shared.delete("s1")
+        assert replica_a.get("s1") is None
+
+    def test_callers_get_private_copies(self):
+        near = NearCacheSessionStore(InMemorySessionStore(), revalidate_after_seconds=60)
+        near.put("s1", {"history": []}, 60)
+        near.get("s1")[1]["history"].append("unsaved")
+        assert near.get("s1")[1] == {"history": []}
+
+
+def test_managers_share_sessions_through_store(tmp_path):
+    """Two replicas on one store see each other's sessions without stickiness"""
+    path = str(tmp_path / "sessions.db")
+    replica_a = SessionManager(store=NearCacheSessionStore(SQLiteSessionStore(path)))
+    replica_b = SessionManager(store=NearCacheSessionStore(SQLiteSessionStore(path)))
+
+    session_id = replica_a.create_session("CUST001")
+    assert replica_b.get_session_data(session_id)["customer_id"] == "CUST001"
+
+    replica_b.add_conversation_entry(session_id, "What is my deductible?", "$500", "deductibles")
+    history = replica_a.get_conversation_history(session_id)
+    assert [entry["message"] for entry in history] == ["What is my deductible?"]
+    assert replica_a.validate_session(session_id)
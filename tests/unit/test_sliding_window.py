@@ -0,0 +1,107 @@
+"""
+Unit tests for sliding-window metrics and the live metrics summary
+"""
+import random
+import threading
+import time
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add the project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from monitoring.providers.sliding_window import DDSketch, SlidingWindow
+from monitoring.setup import health_endpoints, monitoring_setup
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(-2, 1) for _ in range(20000)]
+    sketch = DDSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    ordered = sorted(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(sketch.quantile(q) - exact) <= 0.011 * exact
+    assert len(sketch._bins) < 2048
+
+
+def test_sketch_memory_is_bounded():
+    sketch = DDSketch(relative_accuracy=0.01, max_buckets=64)
+    for exponent in range(-6, 6):
+        for step in range(100):
+            sketch.add(10 ** exponent * (1 + step / 100))
+    assert len(sketch._bins) <= 64
+    assert sketch.quantile(0.99) > 1e4
+
+
+def test_window_rates_and_ageing():
+    clock = FakeClock()
+    window = SlidingWindow(window_seconds=60, slots=6, clock=clock)
+    for index in range(30):
+        window.add(0.1 * (index % 10 + 1), error=index % 10 == 0)
+
+    snapshot = window.snapshot()
+    assert snapshot["count"] == 30 and snapshot["per_minute"] == 30.0
+    assert snapshot["error_rate"] == 0.1
+    assert 0.49 <= snapshot["p50"] <= 0.61
+
+    clock.now += 30
+    window.add(5.0)
+    assert window.snapshot()["count"] == 31
+
+    clock.now += 45
+    snapshot = window.snapshot()
+    assert snapshot["count"] == 1 and snapshot["p99"] > 4.9
+
+
+def test_metrics_summary_endpoint_reports_live_numbers(monkeypatch):
+    manager = monitoring_setup.MonitoringManager()
+    for status in (200, 200, 200, 503):
+        manager.record_http_request("GET", "/policies", status, 0.2)
+    manager.record_llm_call("gpt-4o-mini", 100, 20, 120, 1.5, True)
+    manager.record_mcp_call("get_policies", False, 0.3, error="timeout")
+    manager.flush_metrics()
+    monkeypatch.setattr(health_endpoints, "get_monitoring_manager", lambda: manager)
+
+    app = FastAPI()
+    health_endpoints.add_health_endpoints(app)
+    summary = TestClient(app).get("/health/metrics/summary").json()["summary"]
+
+    assert summary["requests_per_minute"] == 4.0
+    assert summary["error_rate"] == 0.25
+    assert 0.19 <= summary["response_time_p95"] <= 0.21
+    assert summary["llm_calls_per_minute"] == 1.0 and summary["successful_llm_calls"] == 1
+    assert summary["mcp_error_rate"] == 1.0
+
+
+def test_metrics_summary_does_not_drain_the_pipeline():
+    manager = monitoring_setup.MonitoringManager()
+    gate = threading.Event()
+    manager._pipeline.submit(gate.wait, (5.0,))
+    manager.record_http_request("GET", "/policies", 200, 0.2)
+
+    start = time.perf_counter()
+    summary = manager.get_metrics_summary()
+    assert time.perf_counter() - start < 0.5
+    assert summary["requests_per_minute"] == 0.0
+
+    gate.set()
+    manager.flush_metrics()
+    assert manager.get_metrics_summary()["requests_per_minute"] == 1.0
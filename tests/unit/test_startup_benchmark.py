@@ -0,0 +1,49 @@
+"""
+Unit tests for the startup benchmark report helpers
+"""
+import sys
+from pathlib import Path
+
+# Add benchmarks to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "tests" / "benchmarks"))
+
+from startup_benchmark import check_thresholds, parse_importtime
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:      2000 |       2120 | json
+import time:       500 |        500 |     structlog._base
+import time:      1500 |       2000 |   structlog
+import time:      3000 |       5000 | policy_server.main
+"""
+
+
+def test_parse_importtime():
+    profile = parse_importtime(IMPORTTIME_OUTPUT, top=2)
+
+    assert profile["modules_imported"] == 5
+    assert profile["total_ms"] == 7.12
+    assert [e["module"] for e in profile["slowest_cumulative"]] == ["policy_server.main", "json"]
+    assert profile["slowest_self"][0] == {
+        "module": "policy_server.main", "depth": 0, "self_ms": 3.0, "cumulative_ms": 5.0
+    }
+    assert any(e["module"] == "structlog._base" and e["depth"] == 2 for e in
+               parse_importtime(IMPORTTIME_OUTPUT, top=10)["slowest_self"])
+
+
+def test_check_thresholds_flags_regressions():
+    results = {
+        "policy_server": {"first_tool_response": {"median_seconds": 2.5}},
+        "agents": {"insurance_orchestrator.agent": {"ready": {"median_seconds": 1.0}}},
+    }
+    thresholds = {
+        "policy_server.first_tool_response": 2.0,
+        "agents.insurance_orchestrator.agent.ready": 3.0,
+        "agents.insurance_technical_agent.agent.ready": 3.0,
+    }
+
+    assert check_thresholds(results, thresholds) == [
+        "policy_server.first_tool_response: 2.500s > 2.000s",
+        "agents.insurance_technical_agent.agent.ready: no measurement",
+    ]
@@ -0,0 +1,84 @@
+"""
+Unit tests for the lazy startup helpers used by the ADK agent modules
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Add insurance-adk tools to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "insurance-adk" / "tools"))
+
+from startup_tools import BackgroundCheck, Lazy, create_lazy_monitoring, lazy_instruction
+
+
+class TestLazy:
+    """Test deferred construction"""
+
+    def test_factory_runs_once_on_first_access(self):
+        calls = []
+        value = Lazy(lambda: calls.append(1) or "built")
+        assert calls == [] and not value.initialized
+
+        assert value.get() == "built"
+        assert value.get() == "built"
+        assert calls == [1]
+        assert value.initialized and value.init_seconds is not None
+
+    def test_instruction_provider_reads_prompt_lazily(self):
+        reads = []
+
+        def load_prompts():
+            reads.append(1)
+            return "system prompt"
+
+        provider = lazy_instruction(load_prompts)
+        assert reads == []
+        assert provider(object()) == "system prompt"
+        assert provider(object()) == "system prompt"
+        assert reads == [1]
+
+
+class TestBackgroundCheck:
+    """Test non-blocking connectivity checks"""
+
+    def test_status_pending_until_check_completes(self):
+        release = threading.Event()
+        check = BackgroundCheck("slow", lambda: release.wait(5)).start()
+
+        assert check.get_status()["status"] == "pending"
+        assert check.healthy is False
+
+        release.set()
+        assert check.wait(timeout=5)
+        assert check.healthy is True
+        assert check.get_status()["last_checked"] is not None
+
+    def test_exceptions_reported_as_unhealthy(self):
+        def failing():
+            raise ConnectionError("policy server unreachable")
+
+        check = BackgroundCheck("failing", failing).start()
+        assert check.wait(timeout=5)
+        status = check.get_status()
+        assert status["status"] == "unhealthy"
+        assert "unreachable" in status["error"]
+
+    def test_registered_with_monitoring_health_checker(self, monkeypatch):
+        sys.path.insert(0, str(project_root))
+        from monitoring.interfaces.health_checker import HealthStatus
+        from monitoring.setup import monitoring_setup
+
+        manager = monitoring_setup.MonitoringManager()
+        monkeypatch.setattr(monitoring_setup, "get_monitoring_manager", lambda: manager)
+        release = threading.Event()
+        check = BackgroundCheck("agent_policy_server", lambda: release.wait(5)).start()
+        assert create_lazy_monitoring("Test Agent", health_checks=[check]).get() is manager
+
+        checker = manager.get_health_checker()
+        status = lambda: asyncio.run(checker.check_component_health_async("agent_policy_server", force=True)).status
+        assert status() == HealthStatus.UNKNOWN
+        release.set()
+        assert check.wait(timeout=5)
+        assert status() == HealthStatus.HEALTHY
@@ -7,40 +7,264 @@ Updated to communicate with Google ADK agents running with LiteLLM and OpenRoute
 
 import requests
 import json
+import os
+import secrets
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from .config import UIConfig
+from .endpoint_race import find_first_healthy
+
+
+def trace_context_headers() -> Dict[str, str]:
+    """
+    W3C trace context headers that start a new trace for one agent request.
+
+    The sampled flag follows the agents' head sampler (OTEL_TRACES_SAMPLER_ARG,
+    trace-id ratio) so the agents and policy server record the same share of
+    traces whether or not the UI is the root.
+    """
+    trace_id = secrets.token_hex(16)
+    ratio = float(os.getenv("OTEL_TRACES_SAMPLER_ARG", "1.0"))
+    sampled = int(trace_id[16:], 16) < ratio * (1 << 64)
+    return {"traceparent": f"00-{trace_id}-{secrets.token_hex(8)}-{'01' if sampled else '00'}"}
+
+
+def iter_sse_events(lines: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """Parse Server-Sent Events lines into JSON payloads as each event completes"""
+    data_lines: List[str] = []
+    for line in lines:
+        if line is None:
+            continue
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.rstrip("\r")
+        if line.startswith(":"):
+            continue  # comment / keep-alive
+        if line:
+            field, _, value = line.partition(":")
+            if field == "data":
+                data_lines.append(value[1:] if value.startswith(" ") else value)
+            continue
+        if data_lines:
+            payload = "\n".join(data_lines)
+            data_lines = []
+            try:
+                yield json.loads(payload)
+            except ValueError:
+                print(f"Skipping malformed SSE event: {payload[:100]}")
+    if data_lines:
+        try:
+            yield json.loads("\n".join(data_lines))
+        except ValueError:
+            pass
+
+
+def _get(data: Dict[str, Any], camel: str, snake: str) -> Any:
+    """ADK serializes events with camelCase aliases; accept either spelling"""
+    value = data.get(camel)
+    return data.get(snake) if value is None else value
+
+
+def adk_event_updates(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Translate one ADK event into UI stream updates"""
+    if event.get("error"):
+        return [{"type": "error", "text": str(event["error"])}]
+
+    updates = []
+    author = event.get("author") or "agent"
+    partial = bool(event.get("partial"))
+    for part in (event.get("content") or {}).get("parts") or []:
+        function_call = _get(part, "functionCall", "function_call")
+        function_response = _get(part, "functionResponse", "function_response")
+        if part.get("text") and part.get("thought"):
+            updates.append({"type": "thinking", "text": part["text"], "step_type": "reasoning", "author": author})
+        elif part.get("text"):
+            updates.append({"type": "token" if partial else "text", "text": part["text"], "author": author})
+        elif function_call:
+            args = json.dumps(function_call.get("args") or {}, default=str)
+            updates.append({"type": "thinking", "text": f"{author} calling {function_call.get('name')}({args})",
+                            "step_type": "decision", "author": author})
+            updates.append({"type": "orchestration", "event_type": "tool_call", "source": author,
+                            "target": function_call.get("name"), "text": f"Tool call: {function_call.get('name')}"})
+        elif function_response:
+            updates.append({"type": "thinking", "text": f"Received result from {function_response.get('name')}",
+                            "step_type": "analysis", "author": author})
+
+    transfer = _get(event.get("actions") or {}, "transferToAgent", "transfer_to_agent")
+    if transfer:
+        updates.append({"type": "orchestration", "event_type": "transfer", "source": author,
+                        "target": transfer, "text": f"{author} transferred to {transfer}"})
+    return updates
+
+
+class EndpointResolver:
+    """
+    Finds a reachable endpoint and remembers it.
+
+    Candidates are raced concurrently (see endpoint_race); the winner is
+    trusted for `health_ttl` seconds, after which, or after `invalidate()`
+    (a request to it failed), the candidates are probed again.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[str],
+        health_path: str = "/list-apps",
+        health_ttl: float = 60.0,
+        probe_timeout: float = 2.0,
+        probe: Optional[Callable[[List[str]], Optional[str]]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.endpoints = list(endpoints)
+        self.health_path = health_path
+        self.health_ttl = health_ttl
+        self.probe_timeout = probe_timeout
+        self._probe = probe or self._race
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._endpoint: Optional[str] = None
+        self._checked_at = 0.0
+
+    def _race(self, endpoints: List[str]) -> Optional[str]:
+        health_urls = {f"{endpoint}{self.health_path}": endpoint for endpoint in endpoints}
+        winner = find_first_healthy(list(health_urls), self.probe_timeout)
+        return health_urls[winner["url"]] if winner else None
+
+    def resolve(self) -> Optional[str]:
+        """The working endpoint, probing candidates only when the cache is stale"""
+        with self._lock:
+            if self._endpoint and self._clock() - self._checked_at < self.health_ttl:
+                return self._endpoint
+            self._endpoint = self._probe(self.endpoints)
+            self._checked_at = self._clock()
+            return self._endpoint
+
+    def invalidate(self) -> None:
+        """Forget the cached endpoint so the next resolve() probes again"""
+        with self._lock:
+            self._endpoint = None
+
 
 class ADKAgentClient:
-    """Client for communicating with Google ADK agents"""
+    """
+    Client for communicating with Google ADK agents.
+
+    One client is shared by the whole process, so ADK sessions are keyed by
+    the caller's conversation id (one per browser session) as well as the
+    customer: two tabs logged in as the same customer get separate ADK
+    conversations. The session map is LRU-bounded and idle entries expire.
+    """
     
-    def __init__(self):
+    CUSTOMER_SERVICE_APP = "insurance_customer_service"
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
         self.config = UIConfig()
         self.session = requests.Session()
         self.session.timeout = 30
+        # Keep-alive connection pool shared by every request from this client
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.config.HTTP_POOL_SIZE)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        resolver_options = {
+            "health_ttl": self.config.ENDPOINT_HEALTH_TTL,
+            "probe_timeout": self.config.ENDPOINT_PROBE_TIMEOUT
+        }
+        self.customer_service_endpoint = EndpointResolver(self.config.ADK_CUSTOMER_SERVICE_ENDPOINTS, **resolver_options)
+        self.technical_endpoint = EndpointResolver(
+            self.config.ADK_TECHNICAL_AGENT_ENDPOINTS, health_path="/", **resolver_options
+        )
+        self.orchestrator_endpoint = EndpointResolver(
+            self.config.ADK_ORCHESTRATOR_ENDPOINTS, health_path="/", **resolver_options
+        )
+        self._clock = clock
+        # (endpoint, app, customer_id, conversation_id) -> (ADK session id, last used)
+        self._adk_sessions: "OrderedDict[Tuple[str, str, str, str], Tuple[str, float]]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+    
+    def get_adk_session(
+        self, endpoint: str, app_name: str, customer_id: str, conversation_id: Optional[str] = None
+    ) -> Optional[str]:
+        """ADK session for this customer's conversation, created on first use"""
+        key = (endpoint, app_name, customer_id, conversation_id or "")
+        now = self._clock()
+        with self._sessions_lock:
+            cached = self._adk_sessions.get(key)
+            if cached and now - cached[1] < self.config.ADK_SESSION_IDLE_TTL:
+                self._adk_sessions[key] = (cached[0], now)
+                self._adk_sessions.move_to_end(key)
+                return cached[0]
+            self._adk_sessions.pop(key, None)
+        
+        session_url = f"{endpoint}/apps/{app_name}/users/{customer_id}/sessions"
+        session_response = self.session.post(session_url, json={}, timeout=10)
+        if session_response.status_code != 200:
+            print(f"Failed to create session: {session_response.status_code}")
+            return None
+        session_id = session_response.json().get("id")
+        if not session_id:
+            print("No session ID returned")
+            return None
         
-    def send_customer_service_message(self, message: str, customer_id: str) -> Dict[str, Any]:
+        with self._sessions_lock:
+            self._adk_sessions[key] = (session_id, now)
+            self._adk_sessions.move_to_end(key)
+            while len(self._adk_sessions) > self.config.ADK_SESSION_CACHE_SIZE:
+                self._adk_sessions.popitem(last=False)
+        return session_id
+    
+    def reset_session(self, customer_id: str, conversation_id: Optional[str] = None) -> None:
+        """Start a new ADK conversation on the next message (all of the customer's when no conversation_id)"""
+        with self._sessions_lock:
+            for key in [
+                key for key in self._adk_sessions
+                if key[2] == customer_id and (conversation_id is None or key[3] == conversation_id)
+            ]:
+                del self._adk_sessions[key]
+    
+    @staticmethod
+    def _resolved(resolver: EndpointResolver) -> List[str]:
+        endpoint = resolver.resolve()
+        return [endpoint] if endpoint else []
+    
+    def _post_run(
+        self, endpoint: str, path: str, payload: Dict[str, Any], conversation_id: Optional[str] = None, **kwargs
+    ) -> requests.Response:
+        """
+        POST a run request, recreating the ADK session once if the server no longer knows it.
+
+        The request starts a new trace: its traceparent is sent as a header and
+        in the run's state delta, where the agents' before-agent callback
+        continues it.
+        """
+        trace_context = trace_context_headers()
+        kwargs["headers"] = {**kwargs.get("headers", {}), **trace_context}
+        payload["stateDelta"] = {**payload.get("stateDelta", {}), "trace_context": trace_context}
+        response = self.session.post(f"{endpoint}{path}", json=payload, **kwargs)
+        if response.status_code == 404:
+            response.close()
+            self.reset_session(payload["userId"], conversation_id or "")
+            session_id = self.get_adk_session(endpoint, payload["appName"], payload["userId"], conversation_id)
+            if session_id:
+                payload["sessionId"] = session_id
+                response = self.session.post(f"{endpoint}{path}", json=payload, **kwargs)
+        return response
+        
+    def send_customer_service_message(
+        self, message: str, customer_id: str, conversation_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Send message to Google ADK customer service agent"""
         
-        # Try ADK customer service endpoints with proper API format
-        for endpoint in self.config.ADK_CUSTOMER_SERVICE_ENDPOINTS:
+        # Use the cached working endpoint and this conversation's existing ADK session
+        for endpoint in self._resolved(self.customer_service_endpoint):
             try:
-                # First create a session for the customer
-                session_url = f"{endpoint}/apps/insurance_customer_service/users/{customer_id}/sessions"
-                session_response = self.session.post(session_url, json={}, timeout=10)
-                
-                if session_response.status_code != 200:
-                    print(f"Failed to create session: {session_response.status_code}")
-                    continue
-                    
-                session_data = session_response.json()
-                session_id = session_data.get("id")
-                
+                session_id = self.get_adk_session(endpoint, self.CUSTOMER_SERVICE_APP, customer_id, conversation_id)
                 if not session_id:
-                    print("No session ID returned")
                     continue
                 
-                # Now try the proper ADK API endpoint with the created session
+                # Now try the proper ADK API endpoint with the customer's session
                 run_url = f"{endpoint}/run"
                 
                 # Create proper ADK AgentRunRequest payload based on OpenAPI spec
@@ -60,7 +284,8 @@ class ADKAgentClient:
                 }
                 
                 try:
-                    response = self.session.post(run_url, json=payload, timeout=30)
+                    response = self._post_run(endpoint, "/run", payload, conversation_id, timeout=30)
+                    session_id = payload["sessionId"]
                     
                     if response.status_code == 200:
                         result = response.json()
@@ -197,8 +422,8 @@ class ADKAgentClient:
                             
                 except requests.RequestException as e:
                     print(f"ADK API request failed: {e}")
-                    # Fall back to trying different endpoints
-                    pass
+                    # Re-probe endpoints on the next message
+                    self.customer_service_endpoint.invalidate()
                 
                 # Fall back to checking if web interface is available
                 for check_url in [f"{endpoint}/dev-ui/", f"{endpoint}/"]:
@@ -244,15 +469,100 @@ class ADKAgentClient:
                         
             except requests.RequestException as e:
                 print(f"ADK Customer Service endpoint {endpoint} failed: {e}")
+                self.customer_service_endpoint.invalidate()
                 continue
         
         # If all specific endpoints failed, try the orchestrator as fallback
         return self.send_orchestrator_message(message, customer_id)
     
+    def stream_customer_service_message(
+        self, message: str, customer_id: str, conversation_id: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the customer service reply from the ADK `/run_sse` endpoint.
+
+        Yields updates of type "token" (partial text), "text" (a complete
+        message), "thinking", "orchestration" and "error" as they arrive, then
+        one {"type": "final", "result": ...} with the same shape as
+        send_customer_service_message.
+        """
+        started = time.perf_counter()
+        for endpoint in self._resolved(self.customer_service_endpoint):
+            try:
+                session_id = self.get_adk_session(endpoint, self.CUSTOMER_SERVICE_APP, customer_id, conversation_id)
+                if not session_id:
+                    continue
+
+                payload = {
+                    "appName": self.CUSTOMER_SERVICE_APP,
+                    "userId": customer_id,
+                    "sessionId": session_id,
+                    "newMessage": {"role": "user", "parts": [{"text": message}]},
+                    "streaming": True
+                }
+                response = self._post_run(
+                    endpoint, "/run_sse", payload, conversation_id, stream=True,
+                    timeout=(10, self.config.STREAM_READ_TIMEOUT),
+                    headers={"Accept": "text/event-stream"}
+                )
+                session_id = payload["sessionId"]
+                if response.status_code != 200:
+                    print(f"ADK SSE error: {response.status_code}")
+                    response.close()
+                    continue
+            except requests.RequestException as e:
+                print(f"ADK Customer Service endpoint {endpoint} failed: {e}")
+                self.customer_service_endpoint.invalidate()
+                continue
+
+            tokens: List[str] = []
+            final_text = None
+            first_token_seconds = None
+            thinking_steps: List[str] = []
+            orchestration_events: List[str] = []
+            try:
+                with response:
+                    for event in iter_sse_events(response.iter_lines(decode_unicode=True)):
+                        for update in adk_event_updates(event):
+                            if update["type"] in ("token", "text"):
+                                if first_token_seconds is None:
+                                    first_token_seconds = time.perf_counter() - started
+                                if update["type"] == "token":
+                                    if final_text is not None:
+                                        tokens, final_text = [], None  # a new message has started
+                                    tokens.append(update["text"])
+                                else:
+                                    final_text = update["text"]
+                            elif update["type"] == "thinking":
+                                thinking_steps.append(update["text"])
+                            elif update["type"] == "orchestration":
+                                orchestration_events.append(update["text"])
+                            yield update
+            except requests.RequestException as e:
+                yield {"type": "error", "text": f"Stream interrupted: {e}"}
+
+            yield {"type": "final", "result": {
+                "response": final_text if final_text is not None else "".join(tokens)
+                or "Thank you for your insurance inquiry!",
+                "agent": "adk_customer_service",
+                "model": self.config.ADK_CONFIG["default_model"],
+                "endpoint": endpoint,
+                "connection_status": "stream_success",
+                "session_id": session_id,
+                "time_to_first_token_seconds": first_token_seconds,
+                "total_seconds": time.perf_counter() - started,
+                "thinking_steps": thinking_steps,
+                "orchestration_events": ["Streamlit UI → ADK Customer Service SSE"] + orchestration_events
+            }}
+            return
+
+        # No endpoint could stream - use the blocking path and its fallbacks
+        yield {"type": "final", "result": self.send_customer_service_message(message, customer_id, conversation_id)}
+
     def send_technical_message(self, message: str, customer_id: str) -> Dict[str, Any]:
         """Send message to Google ADK technical agent"""
         
-        for endpoint in self.config.ADK_TECHNICAL_AGENT_ENDPOINTS:
+        for endpoint in self._resolved(self.technical_endpoint):
             try:
                 # Try different technical agent endpoints
                 tech_urls = [
@@ -319,7 +629,7 @@ class ADKAgentClient:
     def send_orchestrator_message(self, message: str, customer_id: str) -> Dict[str, Any]:
         """Send message to Google ADK orchestrator agent"""
         
-        for endpoint in self.config.ADK_ORCHESTRATOR_ENDPOINTS:
+        for endpoint in self._resolved(self.orchestrator_endpoint):
             try:
                 # Try orchestrator endpoints
                 orch_urls = [
@@ -425,13 +735,28 @@ class DomainAgentClient:
     """Legacy client - redirects to ADK client"""
     
     def __init__(self):
-        self.adk_client = ADKAgentClient()
+        self.adk_client = get_agent_client()
     
-    def send_message(self, message: str, customer_id: str) -> Dict[str, Any]:
+    def send_message(self, message: str, customer_id: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
         """Legacy method - redirects to ADK customer service"""
-        return self.adk_client.send_customer_service_message(message, customer_id)
+        return self.adk_client.send_customer_service_message(message, customer_id, conversation_id)
 
-def send_chat_message_simple(message: str, customer_id: str) -> Dict[str, Any]:
+_shared_client: Optional[ADKAgentClient] = None
+_shared_client_lock = threading.Lock()
+
+def get_agent_client() -> ADKAgentClient:
+    """Process-wide client: one connection pool, endpoint cache and session map"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = ADKAgentClient()
+    return _shared_client
+
+def send_chat_message_simple(message: str, customer_id: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
     """Simple chat function that tries ADK agents first"""
-    client = ADKAgentClient()
-    return client.send_customer_service_message(message, customer_id) 
\ No newline at end of file
+    return get_agent_client().send_customer_service_message(message, customer_id, conversation_id)
+
+def stream_chat_message(message: str, customer_id: str, conversation_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Streaming chat function - yields incremental updates, then the final result"""
+    yield from get_agent_client().stream_customer_service_message(message, customer_id, conversation_id) 
\ No newline at end of file
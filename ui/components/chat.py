@@ -3,11 +3,13 @@
 Chat Interface Component for Insurance AI UI
 """
 
+import uuid
 import streamlit as st
 from datetime import datetime
 from typing import Dict, Any
 from .config import UIConfig
-from .agent_client import DomainAgentClient, send_chat_message_simple
+from .agent_client import DomainAgentClient, get_agent_client, send_chat_message_simple, stream_chat_message
+from .thinking import add_thinking_step, add_orchestration_event
 
 def initialize_chat_state():
     """Initialize chat-related session state"""
@@ -19,6 +21,9 @@ def initialize_chat_state():
         st.session_state.thinking_steps = []
     if 'orchestration_data' not in st.session_state:
         st.session_state.orchestration_data = []
+    if 'conversation_id' not in st.session_state:
+        # Keys this browser session's ADK conversation in the shared agent client
+        st.session_state.conversation_id = uuid.uuid4().hex
 
 def render_chat_interface():
     """Render the main chat interface"""
@@ -47,6 +52,10 @@ def render_chat_interface():
     with col2:
         if st.button("Clear Chat", use_container_width=True):
             st.session_state.conversation_history = []
+            # Next message starts a fresh ADK session
+            get_agent_client().reset_session(
+                st.session_state.get('customer_id', 'TEST-CUSTOMER'), st.session_state.get('conversation_id', '')
+            )
             if UIConfig.ENABLE_API_MONITORING:
                 st.session_state.api_calls = []
             if UIConfig.ENABLE_THINKING_STEPS:
@@ -59,48 +68,91 @@ def render_chat_interface():
     if send_button and message:
         process_chat_message(message)
 
+def render_streaming_response(message: str, customer_id: str, conversation_id: str = "") -> Dict[str, Any]:
+    """Render the reply, thinking steps and orchestration events as they stream in"""
+    st.markdown(f"**You:** {message}")
+    response_placeholder = st.empty()
+    activity_placeholder = st.empty()
+    response_placeholder.markdown("**Assistant:** 🤔 ...")
+    
+    text = ""
+    message_complete = False
+    result: Dict[str, Any] = {}
+    for update in stream_chat_message(message, customer_id, conversation_id):
+        kind = update["type"]
+        if kind == "token":
+            if message_complete:
+                text, message_complete = "", False
+            text += update["text"]
+            response_placeholder.markdown(f"**Assistant:** {text}▌")
+        elif kind == "text":
+            text, message_complete = update["text"], True
+            response_placeholder.markdown(f"**Assistant:** {text}")
+        elif kind == "thinking":
+            add_thinking_step(update["text"], update.get("step_type", "reasoning"))
+            activity_placeholder.caption(f"💭 {update['text']}")
+        elif kind == "orchestration":
+            add_orchestration_event(update.get("event_type", "event"), update.get("source", "agent"),
+                                    update.get("target", ""), update["text"], protocol="adk_sse")
+            activity_placeholder.caption(f"🎭 {update['text']}")
+        elif kind == "error":
+            activity_placeholder.warning(update["text"])
+        elif kind == "final":
+            result = update["result"]
+    
+    response_placeholder.markdown(f"**Assistant:** {result.get('response', text)}")
+    return result
+
 def process_chat_message(message: str):
     """Process a chat message and get response"""
     customer_id = st.session_state.get('customer_id', 'TEST-CUSTOMER')
+    conversation_id = st.session_state.get('conversation_id', '')
     
-    with st.spinner("🤔 Processing your request..."):
-        if UIConfig.is_advanced_mode():
-            # Use advanced client with full monitoring
-            agent_client = DomainAgentClient()
-            result = agent_client.send_message(message, customer_id)
-        else:
-            # Use simple chat function
-            result = send_chat_message_simple(message, customer_id)
-        
-        # Add to conversation history
-        exchange = {
-            "timestamp": datetime.now(),
-            "user_message": message,
-            "assistant_response": result.get("response", "No response received"),
-            "metadata": {
-                "customer_id": customer_id,
-                "thinking_steps_count": len(result.get("thinking_steps", [])),
-                "orchestration_events_count": len(result.get("orchestration_events", [])),
-                "api_calls_count": len(result.get("api_calls", []))
-            }
+    if UIConfig.ENABLE_STREAMING:
+        result = render_streaming_response(message, customer_id, conversation_id)
+    else:
+        with st.spinner("🤔 Processing your request..."):
+            if UIConfig.is_advanced_mode():
+                # Use advanced client with full monitoring
+                agent_client = DomainAgentClient()
+                result = agent_client.send_message(message, customer_id, conversation_id)
+            else:
+                # Use simple chat function
+                result = send_chat_message_simple(message, customer_id, conversation_id)
+    
+    # Add to conversation history
+    exchange = {
+        "timestamp": datetime.now(),
+        "user_message": message,
+        "assistant_response": result.get("response", "No response received"),
+        "metadata": {
+            "customer_id": customer_id,
+            "thinking_steps_count": len(result.get("thinking_steps", [])),
+            "orchestration_events_count": len(result.get("orchestration_events", [])),
+            "api_calls_count": len(result.get("api_calls", [])),
+            "time_to_first_token_seconds": result.get("time_to_first_token_seconds")
         }
+    }
+    
+    st.session_state.conversation_history.append(exchange)
+    
+    # Success message with details (if advanced features enabled)
+    if UIConfig.is_advanced_mode():
+        thinking_count = exchange["metadata"]["thinking_steps_count"]
+        orchestration_count = exchange["metadata"]["orchestration_events_count"]
+        api_count = exchange["metadata"]["api_calls_count"]
         
-        st.session_state.conversation_history.append(exchange)
-        
-        # Success message with details (if advanced features enabled)
-        if UIConfig.is_advanced_mode():
-            thinking_count = exchange["metadata"]["thinking_steps_count"]
-            orchestration_count = exchange["metadata"]["orchestration_events_count"]
-            api_count = exchange["metadata"]["api_calls_count"]
-            
-            st.success(f"✅ Response generated! "
-                      f"Thinking: {thinking_count} steps, "
-                      f"Orchestration: {orchestration_count} events, "
-                      f"API calls: {api_count}")
-        else:
-            st.success("✅ Response generated!")
+        ttft = exchange["metadata"]["time_to_first_token_seconds"]
         
-        st.rerun()
+        st.success(f"✅ Response generated! "
+                  f"Thinking: {thinking_count} steps, "
+                  f"Orchestration: {orchestration_count} events, "
+                  f"API calls: {api_count}"
+                  + (f", first token: {ttft:.2f}s" if ttft is not None else ""))
+    else:
+        st.success("✅ Response generated!")
+    
+    st.rerun()
 
 def render_quick_actions():
     """Render quick action buttons for common queries"""
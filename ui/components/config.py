@@ -17,6 +17,27 @@ class UIConfig:
     ENABLE_THINKING_STEPS = os.getenv("ENABLE_THINKING_STEPS", "true").lower() == "true"
     ENABLE_ORCHESTRATION_VIEW = os.getenv("ENABLE_ORCHESTRATION_VIEW", "true").lower() == "true"
     
+    # Stream agent replies over SSE (render tokens as they arrive)
+    ENABLE_STREAMING = os.getenv("ENABLE_STREAMING", "true").lower() == "true"
+    STREAM_READ_TIMEOUT = float(os.getenv("STREAM_READ_TIMEOUT", "60"))
+    
+    # Agent client connection reuse: cached endpoint lifetime, probe timeout, pool size
+    ENDPOINT_HEALTH_TTL = float(os.getenv("ENDPOINT_HEALTH_TTL", "60"))
+    ENDPOINT_PROBE_TIMEOUT = float(os.getenv("ENDPOINT_PROBE_TIMEOUT", "2"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    
+    # ADK sessions kept per browser conversation: map size and idle expiry in seconds
+    ADK_SESSION_CACHE_SIZE = int(os.getenv("ADK_SESSION_CACHE_SIZE", "1000"))
+    ADK_SESSION_IDLE_TTL = float(os.getenv("ADK_SESSION_IDLE_TTL", "3600"))
+    
+    # Per-request timeout for the (parallel) service health checks
+    HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "5"))
+    
+    # Background health poller: seconds between polls, jitter fraction, samples kept per service
+    HEALTH_POLL_INTERVAL = float(os.getenv("HEALTH_POLL_INTERVAL", "15"))
+    HEALTH_POLL_JITTER = float(os.getenv("HEALTH_POLL_JITTER", "0.2"))
+    HEALTH_HISTORY_SIZE = int(os.getenv("HEALTH_HISTORY_SIZE", "40"))
+    
     # UI Mode: "simple" or "advanced"
     UI_MODE = os.getenv("UI_MODE", "advanced")  # Default to advanced mode
     
@@ -133,6 +154,7 @@ class UIConfig:
             "api_monitoring": cls.ENABLE_API_MONITORING,
             "thinking_steps": cls.ENABLE_THINKING_STEPS,
             "orchestration_view": cls.ENABLE_ORCHESTRATION_VIEW,
+            "streaming": cls.ENABLE_STREAMING,
             "simple_mode": cls.is_simple_mode(),
             "advanced_mode": cls.is_advanced_mode()
         } 
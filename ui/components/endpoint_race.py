@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Concurrent Endpoint Probing for Insurance AI UI
+Races endpoint candidates over asyncio/httpx instead of trying them one by one
+"""
+
+import asyncio
+import concurrent.futures
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
+
+HealthCheck = Callable[[httpx.Response], bool]
+
+
+def default_is_healthy(response: httpx.Response) -> bool:
+    """Anything below 500 means a server is listening and serving"""
+    return response.status_code < 500
+
+
+def run_sync(coroutine: Awaitable[Any]) -> Any:
+    """Run a coroutine from synchronous code (Streamlit script threads have no event loop)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # Called from inside a running loop - use a private loop on a worker thread
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+async def _first_success(
+    tasks: Set["asyncio.Task[Any]"],
+    timeout: Optional[float]
+) -> Tuple[Optional[Any], Set["asyncio.Task[Any]"]]:
+    """
+    Wait for a task to succeed. With a timeout, also stop early as soon as
+    any task fails so the caller can start the next candidate.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    while tasks:
+        remaining = None if deadline is None else max(deadline - loop.time(), 0)
+        done, tasks = await asyncio.wait(tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not task.cancelled() and task.exception() is None:
+                return task.result(), tasks
+        if not done or deadline is not None:
+            break
+    return None, tasks
+
+
+async def race_endpoints(
+    client: httpx.AsyncClient,
+    urls: Sequence[str],
+    is_healthy: HealthCheck = default_is_healthy,
+    stagger: float = 0.25
+) -> Optional[Dict[str, Any]]:
+    """
+    Happy-eyeballs race: start the candidates in priority order, one every
+    `stagger` seconds (or immediately when a started probe fails), and
+    return the first healthy responder. Slower probes are cancelled.
+
+    Returns {"url", "status_code", "response_time_ms"} or None.
+    """
+    async def probe(url: str) -> Dict[str, Any]:
+        started = time.perf_counter()
+        response = await client.get(url)
+        if not is_healthy(response):
+            raise httpx.HTTPStatusError(f"unhealthy: HTTP {response.status_code}",
+                                        request=response.request, response=response)
+        return {
+            "url": url,
+            "status_code": response.status_code,
+            "response_time_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    running: Set["asyncio.Task[Any]"] = set()
+    try:
+        for url in urls:
+            running.add(asyncio.create_task(probe(url)))
+            winner, running = await _first_success(running, stagger)
+            if winner:
+                return winner
+        winner, running = await _first_success(running, None)
+        return winner
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+
+
+async def race_endpoints_async(
+    urls: Sequence[str],
+    timeout: float,
+    is_healthy: HealthCheck = default_is_healthy,
+    stagger: float = 0.25
+) -> Optional[Dict[str, Any]]:
+    """race_endpoints with its own short-lived httpx client"""
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        return await race_endpoints(client, urls, is_healthy, stagger)
+
+
+def find_first_healthy(
+    urls: Sequence[str],
+    timeout: float,
+    is_healthy: HealthCheck = default_is_healthy,
+    stagger: float = 0.25
+) -> Optional[Dict[str, Any]]:
+    """Synchronous wrapper around race_endpoints"""
+    return run_sync(race_endpoints_async(urls, timeout, is_healthy, stagger))
+
+
+async def race_many(
+    candidates: Dict[str, Tuple[List[str], HealthCheck]],
+    timeout: float,
+    stagger: float = 0.25
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Race several services' candidate lists at once, sharing one connection pool"""
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        names = list(candidates)
+        results = await asyncio.gather(*(
+            race_endpoints(client, candidates[name][0], candidates[name][1], stagger) for name in names
+        ))
+    return dict(zip(names, results))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Background Health Polling for Insurance AI UI
+Checks services on a jittered interval so UI reruns read a cached snapshot
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+HealthCheckFn = Callable[[], Dict[str, Dict[str, Any]]]
+
+
+class HealthPoller:
+    """
+    Runs `check` every `interval` seconds (± `jitter` as a fraction of the
+    interval) on a daemon thread. Readers get the latest snapshot and a rolling
+    per-service history without triggering any network traffic.
+
+    A failed poll is stored too: services from the previous snapshot are
+    marked "unknown" with the error and the time of the attempt, so readers
+    can tell a poll happened and never need to check inline.
+    """
+
+    def __init__(
+        self,
+        check: HealthCheckFn,
+        interval: float = 15.0,
+        jitter: float = 0.2,
+        history_size: int = 40,
+        rng: Optional[random.Random] = None
+    ):
+        self.check = check
+        self.interval = interval
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._checked_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._history: Dict[str, Deque[Tuple[datetime, str, Optional[float]]]] = {}
+        self._history_size = history_size
+
+    def next_delay(self) -> float:
+        """Seconds until the next poll; jitter keeps many UI replicas from polling in lockstep"""
+        spread = self.interval * self.jitter
+        return max(self.interval + self._rng.uniform(-spread, spread), 0.0)
+
+    def poll_once(self) -> Dict[str, Dict[str, Any]]:
+        """Check now, update the snapshot and history, and return the results"""
+        with self._poll_lock:
+            try:
+                results = self.check()
+                error = None
+            except Exception as e:
+                print(f"Warning: Health poll failed: {e}")
+                error = str(e)
+                results = {
+                    service_name: {
+                        **status,
+                        "status": "unknown",
+                        "status_code": None,
+                        "response_time_ms": None,
+                        "error": f"Health poll failed: {error}",
+                        "last_checked": datetime.now()
+                    }
+                    for service_name, status in self.snapshot()[0].items()
+                }
+            checked_at = datetime.now()
+            with self._lock:
+                self._snapshot = results
+                self._checked_at = checked_at
+                self.last_error = error
+                for service_name, status in results.items():
+                    history = self._history.setdefault(service_name, deque(maxlen=self._history_size))
+                    history.append((checked_at, status.get("status", "unknown"), status.get("response_time_ms")))
+            return results
+
+    def snapshot(self) -> Tuple[Dict[str, Dict[str, Any]], Optional[datetime]]:
+        """Latest results and when they were taken (None before the first poll)"""
+        with self._lock:
+            return dict(self._snapshot), self._checked_at
+
+    def history(self, service_name: str) -> List[Tuple[datetime, str, Optional[float]]]:
+        """Rolling (checked_at, status, response_time_ms) samples, oldest first"""
+        with self._lock:
+            return list(self._history.get(service_name, ()))
+
+    def uptime(self, service_name: str) -> Optional[float]:
+        """Share of recent checks in which the service was healthy"""
+        samples = self.history(service_name)
+        if not samples:
+            return None
+        return sum(1 for _, status, _ in samples if status == "healthy") / len(samples)
+
+    def start(self) -> "HealthPoller":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="health-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.next_delay())
@@ -4,85 +4,82 @@ System Monitoring Component for Insurance AI UI
 """
 
 import streamlit as st
-import requests
 import time
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from .config import UIConfig
+from .endpoint_race import race_many, run_sync
+from .health_poller import HealthPoller
 
-def check_service_health() -> Dict[str, Dict[str, Any]]:
-    """Check health of all monitored services"""
-    health_status = {}
-    
-    for service_name, endpoints in UIConfig.MONITORED_SERVICES.items():
+def _health_url(service_name: str, endpoint: str) -> str:
+    """Health check URL for a service endpoint"""
+    # Different health check strategies for different services
+    if "Policy Server" in service_name and "mcp" in endpoint:
+        # For Policy Server, try the MCP endpoint directly
+        return endpoint  # Already has /mcp/
+    if "ADK" in service_name:
+        # For ADK services, check the root endpoint or dev-ui
+        if service_name == "ADK Customer Service":
+            return endpoint.replace("/health", "/dev-ui/")
+        if service_name == "Google ADK Web UI":
+            return endpoint  # Already points to /dev-ui/
+        # For Technical Agent and Orchestrator, check root
+        return endpoint.replace("/health", "/")
+    # For other services, use standard health endpoint
+    if not endpoint.endswith('/health'):
+        return endpoint.rstrip('/') + '/health'
+    return endpoint
+
+def _health_check_for(service_name: str):
+    """Which responses count as healthy for a service"""
+    if "ADK" in service_name or "Policy Server" in service_name:
+        # For ADK services and Policy Server, 200, 307 (redirect), 404 (no health endpoint), and 406 (method not allowed for MCP) are all healthy
+        return lambda response: response.status_code in [200, 307, 404, 406]
+    # For other services, only 200 is healthy
+    return lambda response: response.status_code == 200
+
+def _endpoint_type(endpoint: str) -> str:
+    is_cluster = any(dns in endpoint for dns in [".svc.cluster.local", ":8000", ":8001", ":8002", ":8003"])
+    return "kubernetes" if is_cluster and "localhost" not in endpoint else "localhost"
+
+async def check_service_health_async(
+    services: Optional[Dict[str, Any]] = None,
+    timeout: float = 5.0
+) -> Dict[str, Dict[str, Any]]:
+    """Check all services concurrently; each service races its own endpoint candidates"""
+    services = services if services is not None else UIConfig.MONITORED_SERVICES
+    candidates = {}
+    for service_name, endpoints in services.items():
         # Handle both single endpoint (string) and multiple endpoints (list)
-        if isinstance(endpoints, str):
-            endpoints_list = [endpoints]
+        endpoints_list = [endpoints] if isinstance(endpoints, str) else list(endpoints)
+        candidates[service_name] = (
+            [_health_url(service_name, endpoint) for endpoint in endpoints_list],
+            _health_check_for(service_name)
+        )
+    
+    results = await race_many(candidates, timeout)
+    
+    health_status = {}
+    for service_name, winner in results.items():
+        if winner:
+            health_status[service_name] = {
+                "status": "healthy",
+                "status_code": winner["status_code"],
+                "response_time_ms": winner["response_time_ms"],
+                "endpoint": winner["url"],
+                "endpoint_type": _endpoint_type(winner["url"]),
+                "last_checked": datetime.now(),
+                "service_type": "adk" if "ADK" in service_name else "standard"
+            }
         else:
-            endpoints_list = endpoints
-        
-        # Try endpoints in order (Kubernetes DNS first, then localhost fallback)
-        service_found = False
-        for endpoint in endpoints_list:
-            try:
-                start_time = time.time()
-                
-                # Different health check strategies for different services
-                if "Policy Server" in service_name and "mcp" in endpoint:
-                    # For Policy Server, try the MCP endpoint directly
-                    health_url = endpoint  # Already has /mcp/
-                elif "ADK" in service_name:
-                    # For ADK services, check the root endpoint or dev-ui
-                    if service_name == "ADK Customer Service":
-                        health_url = endpoint.replace("/health", "/dev-ui/")
-                    elif service_name == "Google ADK Web UI":
-                        health_url = endpoint  # Already points to /dev-ui/
-                    else:
-                        # For Technical Agent and Orchestrator, check root
-                        health_url = endpoint.replace("/health", "/")
-                else:
-                    # For other services, use standard health endpoint
-                    if not endpoint.endswith('/health'):
-                        health_url = endpoint.rstrip('/') + '/health'
-                    else:
-                        health_url = endpoint
-                
-                response = requests.get(health_url, timeout=5)
-                response_time = (time.time() - start_time) * 1000
-                
-                # Determine health based on service type and response
-                if "ADK" in service_name or "Policy Server" in service_name:
-                    # For ADK services and Policy Server, 200, 307 (redirect), 404 (no health endpoint), and 406 (method not allowed for MCP) are all healthy
-                    is_healthy = response.status_code in [200, 307, 404, 406]
-                else:
-                    # For other services, only 200 is healthy
-                    is_healthy = response.status_code == 200
-                
-                if is_healthy:
-                    health_status[service_name] = {
-                        "status": "healthy",
-                        "status_code": response.status_code,
-                        "response_time_ms": round(response_time, 2),
-                        "endpoint": health_url,
-                        "endpoint_type": "kubernetes" if any(dns in endpoint for dns in [".svc.cluster.local", ":8000", ":8001", ":8002", ":8003"]) and "localhost" not in endpoint else "localhost",
-                        "last_checked": datetime.now(),
-                        "service_type": "adk" if "ADK" in service_name else "standard"
-                    }
-                    service_found = True
-                    break  # Stop trying other endpoints for this service
-                    
-            except requests.RequestException:
-                # Continue to next endpoint
-                continue
-        
-        # If no endpoint worked, record failure with the first endpoint
-        if not service_found:
+            # If no endpoint worked, record failure with the first endpoint
+            first_endpoint = candidates[service_name][0][0]
             health_status[service_name] = {
                 "status": "unreachable",
                 "status_code": None,
                 "response_time_ms": None,
-                "endpoint": endpoints_list[0],
-                "endpoint_type": "kubernetes" if any(dns in endpoints_list[0] for dns in [".svc.cluster.local", ":8000", ":8001", ":8002", ":8003"]) and "localhost" not in endpoints_list[0] else "localhost",
+                "endpoint": first_endpoint,
+                "endpoint_type": _endpoint_type(first_endpoint),
                 "error": "All endpoints failed",
                 "last_checked": datetime.now(),
                 "service_type": "unknown"
@@ -90,6 +87,28 @@ def check_service_health() -> Dict[str, Dict[str, Any]]:
     
     return health_status
 
+def check_service_health() -> Dict[str, Dict[str, Any]]:
+    """Check health of all monitored services (in parallel)"""
+    return run_sync(check_service_health_async(timeout=UIConfig.HEALTH_CHECK_TIMEOUT))
+
+@st.cache_resource
+def get_health_poller() -> HealthPoller:
+    """One background poller per UI process, shared by every session and rerun"""
+    return HealthPoller(
+        check_service_health,
+        interval=UIConfig.HEALTH_POLL_INTERVAL,
+        jitter=UIConfig.HEALTH_POLL_JITTER,
+        history_size=UIConfig.HEALTH_HISTORY_SIZE
+    ).start()
+
+def get_cached_health() -> Dict[str, Dict[str, Any]]:
+    """Latest polled health results (checks once if the poller has not attempted a poll yet)"""
+    poller = get_health_poller()
+    health_status, checked_at = poller.snapshot()
+    if checked_at is None:
+        health_status = poller.poll_once()
+    return health_status
+
 def render_system_health():
     """Render system health monitoring dashboard"""
     if not UIConfig.ENABLE_SYSTEM_MONITORING:
@@ -103,10 +122,15 @@ def render_system_health():
         st.write("Service status across the insurance AI architecture")
     with col2:
         if st.button("🔄 Refresh", use_container_width=True):
+            get_health_poller().poll_once()
             st.rerun()
     
-    # Check service health
-    health_status = check_service_health()
+    # Read the background poller's snapshot instead of probing on every rerun
+    poller = get_health_poller()
+    health_status = get_cached_health()
+    if not health_status:
+        st.warning(f"⚠️ Service health unknown: {poller.last_error or 'no results yet'}")
+        return
     
     # Count healthy/unhealthy services
     healthy_count = sum(1 for status in health_status.values() if status["status"] == "healthy")
@@ -130,8 +154,13 @@ def render_system_health():
                     st.success(f"✅ {service_name}")
                 elif status["status"] == "unhealthy":
                     st.error(f"❌ {service_name}")
+                elif status["status"] == "unknown":
+                    st.warning(f"❔ {service_name} (status unknown)")
                 else:
                     st.error(f"🔌 {service_name} (unreachable)")
+                uptime = poller.uptime(service_name)
+                if uptime is not None:
+                    st.caption(f"Uptime {uptime:.0%} over last {len(poller.history(service_name))} checks")
             
             with col2:
                 if status["status_code"]:
@@ -258,7 +287,7 @@ def get_system_status_summary() -> Dict[str, Any]:
     if not UIConfig.ENABLE_SYSTEM_MONITORING:
         return {"monitoring_disabled": True}
     
-    health_status = check_service_health()
+    health_status = get_cached_health()
     healthy_count = sum(1 for status in health_status.values() if status["status"] == "healthy")
     total_count = len(health_status)
     